@@ -0,0 +1,195 @@
+-- Migration: Ingestão de uma execução de scraping em uma única chamada
+-- Descrição: Função ingest_scrape_run (RPC) que grava ofertas, vínculos,
+--            histórico de preços e afiliação em uma única transação
+-- Data: 2026-10-16
+
+-- ============================================================================
+-- FUNÇÃO ingest_scrape_run
+-- ============================================================================
+--
+-- Parâmetros:
+--   p_run    JSON com os dados da execução:
+--              id                   UUID de uma execução já criada (opcional;
+--                                   sem ele a execução é criada aqui)
+--              min_discount_pct, max_scrolls, number_of_pages, config_snapshot
+--              finish               encerra a execução como 'completed'
+--                                   (padrão: true)
+--              save_price_history   grava price_history (padrão: true)
+--              save_affiliate_info  grava affiliate_info (padrão: true)
+--   p_offers Array JSON de ofertas (campos de ScrapedOffer: marketplace,
+--            external_id, title, url, image_url, price_cents, old_price_cents,
+--            discount_pct, commission_pct, affiliate_link, affiliation_id, source)
+--
+-- Retorna uma linha por oferta gravada:
+--   (scrape_run_id, external_id, offer_id, is_new, price_changed)
+--
+-- Ofertas repetidas no array são reduzidas à última ocorrência.
+-- Usado em: DatabaseService com DB_INGEST_MODE=rpc
+
+CREATE OR REPLACE FUNCTION ingest_scrape_run(p_run JSONB, p_offers JSONB)
+RETURNS TABLE (
+    scrape_run_id UUID,
+    external_id TEXT,
+    offer_id UUID,
+    is_new BOOLEAN,
+    price_changed BOOLEAN
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    v_run_id UUID := NULLIF(p_run->>'id', '')::UUID;
+    v_offers JSONB := COALESCE(p_offers, '[]'::JSONB);
+    v_saved JSONB;
+BEGIN
+    -- Execução de scraping
+    IF v_run_id IS NULL THEN
+        INSERT INTO scrape_runs (
+            status, started_at, min_discount_pct, max_scrolls,
+            number_of_pages, config_snapshot
+        )
+        VALUES (
+            'running',
+            CURRENT_TIMESTAMP,
+            (p_run->>'min_discount_pct')::INTEGER,
+            (p_run->>'max_scrolls')::INTEGER,
+            (p_run->>'number_of_pages')::INTEGER,
+            p_run->'config_snapshot'
+        )
+        RETURNING id INTO v_run_id;
+    END IF;
+
+    -- Marketplaces ainda não cadastrados
+    INSERT INTO marketplaces (name)
+    SELECT DISTINCT o->>'marketplace'
+    FROM jsonb_array_elements(v_offers) AS o
+    WHERE COALESCE(o->>'marketplace', '') <> ''
+    ON CONFLICT (name) DO NOTHING;
+
+    -- Ofertas, vínculos e histórico de preços em uma única instrução.
+    -- Todas as CTEs enxergam o mesmo snapshot: "previous" tem os preços
+    -- anteriores ao upsert.
+    WITH input AS (
+        SELECT DISTINCT ON (o->>'external_id', m.id)
+            m.id AS marketplace_id,
+            o->>'external_id' AS external_id,
+            o->>'title' AS title,
+            o->>'url' AS url,
+            o->>'image_url' AS image_url,
+            (o->>'price_cents')::INTEGER AS price_cents,
+            (o->>'old_price_cents')::INTEGER AS old_price_cents,
+            (o->>'discount_pct')::NUMERIC::INTEGER AS discount_pct,
+            COALESCE(o->>'source', 'ml_offers_playwright') AS source,
+            (o->>'commission_pct')::NUMERIC::INTEGER AS commission_pct,
+            o->>'affiliate_link' AS affiliate_link,
+            o->>'affiliation_id' AS affiliation_id
+        FROM jsonb_array_elements(v_offers) WITH ORDINALITY AS t(o, ord)
+        JOIN marketplaces m ON m.name = o->>'marketplace'
+        ORDER BY o->>'external_id', m.id, ord DESC
+    ),
+    previous AS (
+        SELECT cur.id, cur.external_id, cur.marketplace_id, cur.price_cents
+        FROM offers cur
+        JOIN input i
+          ON i.external_id = cur.external_id
+         AND i.marketplace_id = cur.marketplace_id
+    ),
+    upserted AS (
+        INSERT INTO offers (
+            marketplace_id, external_id, title, url, image_url,
+            price_cents, old_price_cents, discount_pct, source
+        )
+        SELECT
+            marketplace_id, external_id, title, url, image_url,
+            price_cents, old_price_cents, discount_pct, source
+        FROM input
+        ON CONFLICT (external_id, marketplace_id) DO UPDATE SET
+            title = EXCLUDED.title,
+            url = EXCLUDED.url,
+            image_url = EXCLUDED.image_url,
+            price_cents = EXCLUDED.price_cents,
+            old_price_cents = EXCLUDED.old_price_cents,
+            discount_pct = EXCLUDED.discount_pct,
+            source = EXCLUDED.source
+        RETURNING
+            offers.id, offers.external_id, offers.marketplace_id,
+            offers.price_cents, offers.old_price_cents, offers.discount_pct
+    ),
+    linked AS (
+        INSERT INTO offer_scrape_runs (offer_id, scrape_run_id)
+        SELECT u.id, v_run_id FROM upserted u
+        ON CONFLICT (offer_id, scrape_run_id) DO NOTHING
+    ),
+    history AS (
+        INSERT INTO price_history (
+            offer_id, price_cents, old_price_cents, discount_pct, scrape_run_id
+        )
+        SELECT u.id, u.price_cents, u.old_price_cents, u.discount_pct, v_run_id
+        FROM upserted u
+        WHERE COALESCE((p_run->>'save_price_history')::BOOLEAN, TRUE)
+    )
+    SELECT COALESCE(jsonb_agg(jsonb_build_object(
+        'external_id', u.external_id,
+        'offer_id', u.id,
+        'is_new', p.id IS NULL,
+        'price_changed', p.id IS NOT NULL AND p.price_cents IS DISTINCT FROM u.price_cents,
+        'commission_pct', i.commission_pct,
+        'affiliate_link', i.affiliate_link,
+        'affiliation_id', i.affiliation_id
+    )), '[]'::JSONB)
+    INTO v_saved
+    FROM upserted u
+    JOIN input i
+      ON i.external_id = u.external_id
+     AND i.marketplace_id = u.marketplace_id
+    LEFT JOIN previous p ON p.id = u.id;
+
+    -- Informações de afiliação (nova linha por execução) e ponteiro na oferta
+    IF COALESCE((p_run->>'save_affiliate_info')::BOOLEAN, TRUE) THEN
+        WITH affiliate AS (
+            INSERT INTO affiliate_info (
+                offer_id, commission_pct, affiliate_link, affiliation_id, scrape_run_id
+            )
+            SELECT
+                (s->>'offer_id')::UUID,
+                (s->>'commission_pct')::INTEGER,
+                s->>'affiliate_link',
+                s->>'affiliation_id',
+                v_run_id
+            FROM jsonb_array_elements(v_saved) AS s
+            WHERE COALESCE((s->>'commission_pct')::INTEGER, 0) <> 0
+               OR COALESCE(s->>'affiliate_link', '') <> ''
+               OR COALESCE(s->>'affiliation_id', '') <> ''
+            RETURNING affiliate_info.id, affiliate_info.offer_id
+        )
+        UPDATE offers
+        SET affiliate_info_id = affiliate.id
+        FROM affiliate
+        WHERE offers.id = affiliate.offer_id;
+    END IF;
+
+    -- Encerra a execução
+    IF COALESCE((p_run->>'finish')::BOOLEAN, TRUE) THEN
+        UPDATE scrape_runs
+        SET status = 'completed',
+            finished_at = CURRENT_TIMESTAMP,
+            filtered_count = (
+                SELECT COUNT(*) FROM offer_scrape_runs
+                WHERE offer_scrape_runs.scrape_run_id = v_run_id
+            )
+        WHERE scrape_runs.id = v_run_id;
+    END IF;
+
+    RETURN QUERY
+    SELECT
+        v_run_id,
+        s->>'external_id',
+        (s->>'offer_id')::UUID,
+        (s->>'is_new')::BOOLEAN,
+        (s->>'price_changed')::BOOLEAN
+    FROM jsonb_array_elements(v_saved) AS s;
+END;
+$$;
+
+COMMENT ON FUNCTION ingest_scrape_run(JSONB, JSONB) IS
+    'Grava uma execução de scraping (ofertas, vínculos, histórico e afiliação) em uma transação';
@@ -0,0 +1,81 @@
+"""Micro-benchmark do RateLimiter com centenas de corrotinas aguardando ao mesmo tempo.
+
+Uso: python scripts/bench_rate_limiter.py [waiters] [req_por_segundo]
+
+Mede o custo por aquisição (caminho rápido, com token livre) e, com a fila
+cheia, a vazão real contra a ideal, o atraso do timer e a ordem de
+atendimento (deve ser FIFO).
+"""
+
+import asyncio
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+src_dir = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_dir))
+
+from shared.utils.rate_limiter import RateLimiter
+
+
+async def bench_fast_path(iterations: int) -> float:
+    """Retorna o custo médio (µs) de um acquire com token livre."""
+    limiter = RateLimiter(
+        max_requests=iterations * 10, time_window=timedelta(seconds=1), name="bench_fast"
+    )
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await limiter.acquire()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def bench_waiters(waiters: int, rate_per_s: int) -> dict:
+    """Dispara ``waiters`` corrotinas de uma vez contra um balde de 1 token."""
+    limiter = RateLimiter(
+        max_requests=rate_per_s, time_window=timedelta(seconds=1), name="bench_fifo", burst=1
+    )
+    order: list[int] = []
+    lateness: list[float] = []
+    started = time.perf_counter()
+
+    async def waiter(index: int) -> None:
+        await limiter.acquire()
+        # Horário ideal do token desta corrotina (o primeiro é imediato)
+        ideal = started + index / rate_per_s
+        lateness.append(max(0.0, time.perf_counter() - ideal))
+        order.append(index)
+
+    await asyncio.gather(*(waiter(i) for i in range(waiters)))
+    elapsed = time.perf_counter() - started
+    lateness.sort()
+
+    return {
+        "elapsed_s": elapsed,
+        "ideal_s": (waiters - 1) / rate_per_s,
+        "throughput": waiters / elapsed,
+        "fifo": order == list(range(waiters)),
+        "p50_late_ms": lateness[len(lateness) // 2] * 1000,
+        "p99_late_ms": lateness[int(len(lateness) * 0.99)] * 1000,
+    }
+
+
+async def main() -> None:
+    waiters = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rate_per_s = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    fast_us = await bench_fast_path(100_000)
+    print(f"Caminho rápido: {fast_us:.2f} µs por acquire")
+
+    result = await bench_waiters(waiters, rate_per_s)
+    print(
+        f"{waiters} corrotinas a {rate_per_s} req/s: "
+        f"{result['elapsed_s']:.3f}s (ideal {result['ideal_s']:.3f}s), "
+        f"{result['throughput']:.0f} req/s, "
+        f"atraso p50 {result['p50_late_ms']:.2f} ms / p99 {result['p99_late_ms']:.2f} ms, "
+        f"FIFO: {'sim' if result['fifo'] else 'NÃO'}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
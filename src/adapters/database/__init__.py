@@ -1,11 +1,12 @@
 """Módulo de banco de dados."""
 
-from adapters.database.connection import get_client, get_session, init_db
+from adapters.database.connection import get_client, get_session, init_db, run_query
 from adapters.database.repositories import DatabaseService
 
 __all__ = [
     "get_client",
     "get_session",
     "init_db",
+    "run_query",
     "DatabaseService",
 ]
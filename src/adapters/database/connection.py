@@ -2,17 +2,62 @@
 
 from __future__ import annotations
 
+import asyncio
 import threading
-from typing import AsyncGenerator, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncGenerator, Optional
 
 from supabase import Client, create_client
 
 from shared.config.settings import DatabaseConfig, get_config
+from shared.constants import DEFAULT_DB_MAX_CONCURRENCY
 
 # Thread-local storage para clientes Supabase
 # Cada thread terá sua própria instância do cliente
 _thread_local = threading.local()
 
+# Executor dedicado às chamadas síncronas do supabase-py (compartilhado entre
+# threads); o número de workers limita as requisições simultâneas ao banco
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(max_workers: int | None = None) -> ThreadPoolExecutor:
+    """Retorna o executor do banco, criando-o (ou redimensionando) se necessário."""
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None and (
+            max_workers is None or _executor._max_workers == max_workers
+        ):
+            return _executor
+        previous = _executor
+        _executor = ThreadPoolExecutor(
+            max_workers=max_workers or DEFAULT_DB_MAX_CONCURRENCY,
+            thread_name_prefix="db",
+        )
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return _executor
+
+
+async def run_query(query: Any) -> Any:
+    """
+    Executa uma query do supabase-py sem bloquear o event loop.
+
+    O ``.execute()`` síncrono roda no executor dedicado do banco (limitado por
+    DB_MAX_CONCURRENCY), então outras tarefas do loop (ex.: o pool de browsers)
+    continuam andando enquanto a requisição HTTP ao PostgREST está em curso.
+
+    Args:
+        query: Builder do supabase-py pronto para ``execute()``
+
+    Returns:
+        Resposta do ``execute()``
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), query.execute)
+
 
 def init_db(config: DatabaseConfig | None = None) -> None:
     """
@@ -29,6 +74,7 @@ def init_db(config: DatabaseConfig | None = None) -> None:
     # Armazena no thread-local storage
     _thread_local.client = create_client(config.supabase_url, config.supabase_key)
     _thread_local.config = config
+    _get_executor(config.max_concurrency)
 
 
 def get_client() -> Client:
@@ -2,13 +2,101 @@
 
 from __future__ import annotations
 
+import asyncio
+from dataclasses import asdict
 from datetime import datetime, timezone
 from typing import Any
 
+from postgrest import ReturnMethod
 from supabase import Client
 
+from adapters.database.connection import run_query
 from core.domain.offer import ScrapedOffer
+from shared.config.settings import DatabaseConfig
 from shared.constants import DEFAULT_QUERY_LIMIT
+from shared.utils.logging import log
+
+# Restrição única das ofertas, usada como alvo do upsert em lote
+OFFER_CONFLICT_COLUMNS = "external_id,marketplace_id"
+
+
+def _chunks(rows: list[dict[str, Any]], size: int) -> list[list[dict[str, Any]]]:
+    """Divide as linhas em blocos de até ``size`` itens."""
+    size = max(1, size)
+    return [rows[i : i + size] for i in range(0, len(rows), size)]
+
+
+def _offer_row(scraped: ScrapedOffer, marketplace_id: str) -> dict[str, Any]:
+    """Monta a linha de ``offers`` a partir de um ScrapedOffer."""
+    return {
+        "marketplace_id": marketplace_id,
+        "external_id": scraped.external_id,
+        "title": scraped.title,
+        "url": scraped.url,
+        "image_url": scraped.image_url,
+        "price_cents": scraped.price_cents,
+        "old_price_cents": scraped.old_price_cents,
+        "discount_pct": (
+            int(scraped.discount_pct)
+            if scraped.discount_pct is not None
+            else None
+        ),
+        "source": scraped.source,
+    }
+
+
+def _price_history_row(
+    offer: dict[str, Any], scrape_run_id: str | None
+) -> dict[str, Any]:
+    """Monta a linha de ``price_history`` a partir de uma oferta salva."""
+    return {
+        "offer_id": offer["id"],
+        "price_cents": offer["price_cents"],
+        "old_price_cents": offer.get("old_price_cents"),
+        "discount_pct": (
+            int(offer["discount_pct"])
+            if offer.get("discount_pct") is not None
+            else None
+        ),
+        "scrape_run_id": scrape_run_id,
+    }
+
+
+def _affiliate_info_row(
+    offer_id: str, scraped: ScrapedOffer, scrape_run_id: str | None
+) -> dict[str, Any]:
+    """Monta a linha de ``affiliate_info`` a partir de um ScrapedOffer."""
+    return {
+        "offer_id": offer_id,
+        "commission_pct": (
+            int(scraped.commission_pct)
+            if scraped.commission_pct is not None
+            else None
+        ),
+        "affiliate_link": scraped.affiliate_link,
+        "affiliation_id": scraped.affiliation_id,
+        "scrape_run_id": scrape_run_id,
+    }
+
+
+def _has_affiliate_data(scraped: ScrapedOffer) -> bool:
+    """Indica se a oferta tem dados de afiliação a salvar."""
+    return bool(
+        scraped.commission_pct or scraped.affiliate_link or scraped.affiliation_id
+    )
+
+
+def _saved_from_ingest(rows: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Converte o retorno de ``ingest_scrape_run`` em external_id -> oferta salva."""
+    return {
+        row["external_id"]: {
+            "id": row["offer_id"],
+            "external_id": row["external_id"],
+            "is_new": row["is_new"],
+            "price_changed": row["price_changed"],
+        }
+        for row in rows
+    }
 
 
 class OfferRepository:
@@ -28,19 +116,18 @@ class OfferRepository:
         if cached:
             return cached
 
-        response = (
+        response = await run_query(
             self.client.table("marketplaces")
             .select("id")
             .eq("name", name)
-            .execute()
         )
         if response.data:
             marketplace_id = response.data[0]["id"]
             self._marketplace_cache[name] = marketplace_id
             return marketplace_id
 
-        insert_response = (
-            self.client.table("marketplaces").insert({"name": name}).execute()
+        insert_response = await run_query(
+            self.client.table("marketplaces").insert({"name": name})
         )
         marketplace_id = insert_response.data[0]["id"]
         self._marketplace_cache[name] = marketplace_id
@@ -50,12 +137,11 @@ class OfferRepository:
         self, external_id: str, marketplace_id: str
     ) -> dict[str, Any] | None:
         """Busca uma oferta pelo ID externo."""
-        response = (
+        response = await run_query(
             self.client.table("offers")
             .select("*")
             .eq("external_id", external_id)
             .eq("marketplace_id", marketplace_id)
-            .execute()
         )
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -77,12 +163,11 @@ class OfferRepository:
         if not external_ids:
             return {}
 
-        response = (
+        response = await run_query(
             self.client.table("offers")
             .select("*")
             .eq("marketplace_id", marketplace_id)
             .in_("external_id", external_ids)
-            .execute()
         )
 
         # Cria um mapa de external_id -> oferta para lookup rápido
@@ -93,6 +178,44 @@ class OfferRepository:
 
         return result
 
+    async def get_enrichment_state_many(
+        self, offer_ids: list[str], chunk_size: int
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Busca os campos já enriquecidos de várias ofertas.
+
+        O ``affiliate_info`` vem embutido (pela FK ``affiliate_info_id``):
+        a ingestão cria a linha só com a comissão, então o ID sozinho não
+        diz se o link de afiliado já foi capturado.
+
+        Args:
+            offer_ids: IDs das ofertas
+            chunk_size: IDs por requisição
+
+        Returns:
+            Dicionário mapeando offer_id -> oferta (old_price_cents,
+            discount_pct, affiliate_info_id e affiliate_info)
+        """
+        responses = await asyncio.gather(
+            *(
+                run_query(
+                    self.client.table("offers")
+                    .select(
+                        "id, old_price_cents, discount_pct, affiliate_info_id, "
+                        "affiliate_info!offers_affiliate_info_id_fkey"
+                        "(affiliate_link, affiliation_id)"
+                    )
+                    .in_("id", ids)
+                )
+                for ids in _chunks(offer_ids, chunk_size)
+            )
+        )
+        return {
+            offer["id"]: offer
+            for response in responses
+            for offer in response.data or []
+        }
+
     async def create_or_update_from_scraped(
         self, scraped: ScrapedOffer
     ) -> tuple[dict[str, Any], bool]:
@@ -103,53 +226,28 @@ class OfferRepository:
         marketplace_id = await self._get_marketplace_id(scraped.marketplace)
         existing = await self.get_by_external_id(scraped.external_id, marketplace_id)
 
-        offer_data = {
-            "marketplace_id": marketplace_id,
-            "external_id": scraped.external_id,
-            "title": scraped.title,
-            "url": scraped.url,
-            "image_url": scraped.image_url,
-            "price_cents": scraped.price_cents,
-            "old_price_cents": scraped.old_price_cents,
-            "discount_pct": (
-                int(scraped.discount_pct)
-                if scraped.discount_pct is not None
-                else None
-            ),
-            "source": scraped.source,
-        }
+        offer_data = _offer_row(scraped, marketplace_id)
 
         if existing:
             # Atualiza oferta existente
-            response = (
+            response = await run_query(
                 self.client.table("offers")
                 .update(offer_data)
                 .eq("id", existing["id"])
-                .execute()
             )
             return (response.data[0], False)
 
         # Cria nova oferta
-        response = self.client.table("offers").insert(offer_data).execute()
+        response = await run_query(self.client.table("offers").insert(offer_data))
         return (response.data[0], True)
 
     async def add_price_history(
         self, offer: dict[str, Any], scrape_run_id: str | None = None
     ) -> dict[str, Any]:
         """Adiciona um registro ao histórico de preços."""
-        price_history_data = {
-            "offer_id": offer["id"],
-            "price_cents": offer["price_cents"],
-            "old_price_cents": offer.get("old_price_cents"),
-            "discount_pct": (
-                int(offer["discount_pct"])
-                if offer.get("discount_pct") is not None
-                else None
-            ),
-            "scrape_run_id": scrape_run_id,
-        }
-        response = (
-            self.client.table("price_history").insert(price_history_data).execute()
+        price_history_data = _price_history_row(offer, scrape_run_id)
+        response = await run_query(
+            self.client.table("price_history").insert(price_history_data)
         )
         return response.data[0]
 
@@ -160,33 +258,139 @@ class OfferRepository:
         scrape_run_id: str | None = None,
     ) -> dict[str, Any]:
         """Adiciona um registro de informações de afiliação."""
-        affiliate_info_data = {
-            "offer_id": offer_id,
-            "commission_pct": (
-                int(scraped.commission_pct)
-                if scraped.commission_pct is not None
-                else None
-            ),
-            "affiliate_link": scraped.affiliate_link,
-            "affiliation_id": scraped.affiliation_id,
-            "scrape_run_id": scrape_run_id,
-        }
-        response = (
-            self.client.table("affiliate_info").insert(affiliate_info_data).execute()
+        affiliate_info_data = _affiliate_info_row(offer_id, scraped, scrape_run_id)
+        response = await run_query(
+            self.client.table("affiliate_info").insert(affiliate_info_data)
         )
         affiliate_info = response.data[0]
-        self.client.table("offers").update(
-            {"affiliate_info_id": affiliate_info["id"]}
-        ).eq("id", offer_id).execute()
+        await run_query(
+            self.client.table("offers")
+            .update({"affiliate_info_id": affiliate_info["id"]})
+            .eq("id", offer_id)
+        )
         return affiliate_info
 
+    async def upsert_many_from_scraped(
+        self, offers: list[ScrapedOffer], chunk_size: int
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Cria ou atualiza ofertas em lote (upsert em ``external_id, marketplace_id``).
+
+        Ofertas repetidas no lote são reduzidas à última ocorrência, já que o
+        Postgres não aceita atualizar a mesma linha duas vezes no mesmo upsert.
+
+        Args:
+            offers: Ofertas coletadas
+            chunk_size: Linhas por requisição
+
+        Returns:
+            Dicionário mapeando external_id -> oferta salva
+        """
+        rows_by_id: dict[str, dict[str, Any]] = {}
+        for scraped in offers:
+            marketplace_id = await self._get_marketplace_id(scraped.marketplace)
+            rows_by_id[scraped.external_id] = _offer_row(scraped, marketplace_id)
+
+        # Blocos disjuntos (já deduplicados) podem ser enviados em paralelo
+        responses = await asyncio.gather(
+            *(
+                run_query(
+                    self.client.table("offers").upsert(
+                        chunk, on_conflict=OFFER_CONFLICT_COLUMNS
+                    )
+                )
+                for chunk in _chunks(list(rows_by_id.values()), chunk_size)
+            )
+        )
+        saved: dict[str, dict[str, Any]] = {}
+        for response in responses:
+            for offer in response.data or []:
+                saved[offer["external_id"]] = offer
+        return saved
+
+    async def add_price_history_many(
+        self,
+        offers: list[dict[str, Any]],
+        scrape_run_id: str | None,
+        chunk_size: int,
+    ) -> None:
+        """Adiciona registros ao histórico de preços em lote."""
+        rows = [_price_history_row(offer, scrape_run_id) for offer in offers]
+        await asyncio.gather(
+            *(
+                run_query(
+                    self.client.table("price_history").insert(
+                        chunk, returning=ReturnMethod.minimal
+                    )
+                )
+                for chunk in _chunks(rows, chunk_size)
+            )
+        )
+
+    async def add_affiliate_info_many(
+        self,
+        offers: list[tuple[dict[str, Any], ScrapedOffer]],
+        scrape_run_id: str | None,
+        chunk_size: int,
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Adiciona informações de afiliação em lote e vincula às ofertas.
+
+        O ``affiliate_info_id`` é gravado com um segundo upsert das ofertas
+        (uma requisição por bloco, em vez de um update por oferta).
+
+        Args:
+            offers: Pares (oferta salva, ScrapedOffer de origem)
+            scrape_run_id: ID da execução de scraping
+            chunk_size: Linhas por requisição
+
+        Returns:
+            Dicionário mapeando offer_id -> affiliate_info criado
+        """
+        rows = [
+            _affiliate_info_row(offer["id"], scraped, scrape_run_id)
+            for offer, scraped in offers
+        ]
+        responses = await asyncio.gather(
+            *(
+                run_query(self.client.table("affiliate_info").insert(chunk))
+                for chunk in _chunks(rows, chunk_size)
+            )
+        )
+        created: dict[str, dict[str, Any]] = {}
+        for response in responses:
+            for info in response.data or []:
+                created[info["offer_id"]] = info
+
+        links = []
+        for offer, scraped in offers:
+            info = created.get(offer["id"])
+            if info is None:
+                continue
+            offer["affiliate_info_id"] = info["id"]
+            row = _offer_row(scraped, offer["marketplace_id"])
+            row["affiliate_info_id"] = info["id"]
+            links.append(row)
+        await asyncio.gather(
+            *(
+                run_query(
+                    self.client.table("offers").upsert(
+                        chunk,
+                        on_conflict=OFFER_CONFLICT_COLUMNS,
+                        returning=ReturnMethod.minimal,
+                    )
+                )
+                for chunk in _chunks(links, chunk_size)
+            )
+        )
+        return created
+
     async def get_by_id(self, offer_id: str) -> dict[str, Any] | None:
         """Busca uma oferta pelo ID."""
-        response = (
+        response = await run_query(
             self.client.table("offers")
             .select("*")
             .eq("id", offer_id)
-            .execute()
         )
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -223,11 +427,10 @@ class OfferRepository:
         if discount_pct is not None:
             update_data["discount_pct"] = int(discount_pct)
 
-        response = (
+        response = await run_query(
             self.client.table("offers")
             .update(update_data)
             .eq("id", offer_id)
-            .execute()
         )
 
         if not response.data:
@@ -241,11 +444,10 @@ class OfferRepository:
             existing_affiliate = None
             if updated_offer.get("affiliate_info_id"):
                 try:
-                    affiliate_response = (
+                    affiliate_response = await run_query(
                         self.client.table("affiliate_info")
                         .select("*")
                         .eq("id", updated_offer["affiliate_info_id"])
-                        .execute()
                     )
                     if affiliate_response.data:
                         existing_affiliate = affiliate_response.data[0]
@@ -264,26 +466,142 @@ class OfferRepository:
 
             if existing_affiliate:
                 # Atualiza affiliate_info existente
-                affiliate_response = (
+                affiliate_response = await run_query(
                     self.client.table("affiliate_info")
                     .update(affiliate_info_data)
                     .eq("id", existing_affiliate["id"])
-                    .execute()
                 )
             else:
                 # Cria novo affiliate_info
-                affiliate_response = (
+                affiliate_response = await run_query(
                     self.client.table("affiliate_info")
                     .insert(affiliate_info_data)
-                    .execute()
                 )
                 # Atualiza offer com affiliate_info_id
-                self.client.table("offers").update(
-                    {"affiliate_info_id": affiliate_response.data[0]["id"]}
-                ).eq("id", offer_id).execute()
+                await run_query(
+                    self.client.table("offers")
+                    .update({"affiliate_info_id": affiliate_response.data[0]["id"]})
+                    .eq("id", offer_id)
+                )
 
         return updated_offer
 
+    async def update_offer_enrichment_many(
+        self,
+        updates: list[dict[str, Any]],
+        chunk_size: int,
+    ) -> int:
+        """
+        Atualiza campos enriquecidos de várias ofertas em lote.
+
+        Mesma semântica de ``update_offer_enrichment`` (campos None não são
+        alterados; affiliate_info existente é atualizado, senão criado). Só
+        as colunas de enriquecimento são gravadas, com um ``update`` por
+        linha (em paralelo, limitado por DB_MAX_CONCURRENCY): jobs de tiers
+        diferentes da mesma oferta e a ingestão de uma coleta não sobrescrevem
+        os campos uns dos outros.
+
+        Args:
+            updates: Dicts com offer_id, old_price_cents, discount_pct,
+                affiliate_link e affiliation_id
+            chunk_size: Linhas por requisição das leituras e inserções
+
+        Returns:
+            Número de ofertas atualizadas
+        """
+        by_id = {update["offer_id"]: update for update in updates}
+        if not by_id:
+            return 0
+
+        # affiliate_info_id só é lido para as ofertas com dados de afiliado
+        with_affiliate = [
+            offer_id
+            for offer_id, update in by_id.items()
+            if update.get("affiliate_link") is not None
+            or update.get("affiliation_id") is not None
+        ]
+        responses = await asyncio.gather(
+            *(
+                run_query(
+                    self.client.table("offers")
+                    .select("id, affiliate_info_id")
+                    .in_("id", ids)
+                )
+                for ids in _chunks(with_affiliate, chunk_size)
+            )
+        )
+        info_ids = {
+            offer["id"]: offer.get("affiliate_info_id")
+            for response in responses
+            for offer in response.data or []
+        }
+
+        info_updates = []
+        new_infos: list[dict[str, Any]] = []
+        for offer_id in with_affiliate:
+            if offer_id not in info_ids:
+                continue
+            fields = {
+                field: by_id[offer_id][field]
+                for field in ("affiliate_link", "affiliation_id")
+                if by_id[offer_id].get(field) is not None
+            }
+            if info_ids[offer_id]:
+                info_updates.append(
+                    run_query(
+                        self.client.table("affiliate_info")
+                        .update(fields, returning=ReturnMethod.minimal)
+                        .eq("id", info_ids[offer_id])
+                    )
+                )
+            else:
+                new_infos.append({"offer_id": offer_id, "scrape_run_id": None, **fields})
+
+        results = await asyncio.gather(
+            *info_updates,
+            *(
+                run_query(self.client.table("affiliate_info").insert(chunk))
+                for chunk in _chunks(new_infos, chunk_size)
+            ),
+        )
+        created = {
+            info["offer_id"]: info["id"]
+            for response in results[len(info_updates) :]
+            for info in response.data or []
+        }
+
+        offer_updates = []
+        updated_ids = {offer_id for offer_id, info_id in info_ids.items() if info_id}
+        pending_ids = []
+        for offer_id, update in by_id.items():
+            fields: dict[str, Any] = {}
+            if update.get("old_price_cents") is not None:
+                fields["old_price_cents"] = update["old_price_cents"]
+            if update.get("discount_pct") is not None:
+                fields["discount_pct"] = int(update["discount_pct"])
+            if offer_id in created:
+                fields["affiliate_info_id"] = created[offer_id]
+            if fields:
+                pending_ids.append(offer_id)
+                offer_updates.append(
+                    run_query(
+                        self.client.table("offers")
+                        .update(fields)
+                        .eq("id", offer_id)
+                    )
+                )
+
+        responses = await asyncio.gather(*offer_updates)
+        missing = 0
+        for offer_id, response in zip(pending_ids, responses):
+            if response.data:
+                updated_ids.add(offer_id)
+            else:
+                missing += 1
+        if missing:
+            log(f"[db] Aviso: {missing} ofertas do lote não encontradas para enriquecimento")
+        return len(updated_ids)
+
     async def get_offers_needing_enrichment(
         self,
         limit: int = DEFAULT_QUERY_LIMIT,
@@ -311,12 +629,11 @@ class OfferRepository:
         # Busca ofertas sem old_price_cents
         if missing_old_price:
             try:
-                response = (
+                response = await run_query(
                     self.client.table("offers")
                     .select("id, url, price_cents, old_price_cents, discount_pct, affiliate_info_id")
                     .is_("old_price_cents", "null")
                     .limit(limit)
-                    .execute()
                 )
                 if response.data:
                     for offer in response.data:
@@ -329,12 +646,11 @@ class OfferRepository:
         # Busca ofertas sem discount_pct
         if missing_discount:
             try:
-                response = (
+                response = await run_query(
                     self.client.table("offers")
                     .select("id, url, price_cents, old_price_cents, discount_pct, affiliate_info_id")
                     .is_("discount_pct", "null")
                     .limit(limit)
-                    .execute()
                 )
                 if response.data:
                     for offer in response.data:
@@ -347,12 +663,11 @@ class OfferRepository:
         # Busca ofertas sem affiliate_info_id
         if missing_affiliate_link:
             try:
-                response = (
+                response = await run_query(
                     self.client.table("offers")
                     .select("id, url, price_cents, old_price_cents, discount_pct, affiliate_info_id")
                     .is_("affiliate_info_id", "null")
                     .limit(limit)
-                    .execute()
                 )
                 if response.data:
                     for offer in response.data:
@@ -389,7 +704,7 @@ class ScrapeRunRepository:
             "number_of_pages": number_of_pages,
             "config_snapshot": config_snapshot,
         }
-        response = self.client.table("scrape_runs").insert(scrape_run_data).execute()
+        response = await run_query(self.client.table("scrape_runs").insert(scrape_run_data))
         return response.data[0]
 
     async def update_status(
@@ -408,11 +723,10 @@ class ScrapeRunRepository:
         if status in ("completed", "failed"):
             update_data["finished_at"] = datetime.now(timezone.utc).isoformat()
 
-        response = (
+        response = await run_query(
             self.client.table("scrape_runs")
             .update(update_data)
             .eq("id", scrape_run["id"])
-            .execute()
         )
         return response.data[0]
 
@@ -421,12 +735,11 @@ class ScrapeRunRepository:
     ) -> dict[str, Any]:
         """Vincula uma oferta a uma execução de scraping."""
         # Verifica se já existe o relacionamento
-        response = (
+        response = await run_query(
             self.client.table("offer_scrape_runs")
             .select("*")
             .eq("offer_id", offer["id"])
             .eq("scrape_run_id", scrape_run["id"])
-            .execute()
         )
 
         if response.data and len(response.data) > 0:
@@ -437,16 +750,61 @@ class ScrapeRunRepository:
             "offer_id": offer["id"],
             "scrape_run_id": scrape_run["id"],
         }
-        response = self.client.table("offer_scrape_runs").insert(link_data).execute()
+        response = await run_query(self.client.table("offer_scrape_runs").insert(link_data))
         return response.data[0]
 
+    async def link_offers(
+        self,
+        scrape_run: dict[str, Any],
+        offers: list[dict[str, Any]],
+        chunk_size: int,
+    ) -> None:
+        """Vincula várias ofertas a uma execução (ignora vínculos já existentes)."""
+        rows = [
+            {"offer_id": offer["id"], "scrape_run_id": scrape_run["id"]}
+            for offer in offers
+        ]
+        await asyncio.gather(
+            *(
+                run_query(
+                    self.client.table("offer_scrape_runs").upsert(
+                        chunk,
+                        on_conflict="offer_id,scrape_run_id",
+                        ignore_duplicates=True,
+                        returning=ReturnMethod.minimal,
+                    )
+                )
+                for chunk in _chunks(rows, chunk_size)
+            )
+        )
+
+    async def ingest(
+        self, run: dict[str, Any], offers: list[ScrapedOffer]
+    ) -> list[dict[str, Any]]:
+        """
+        Grava execução e ofertas em uma única transação via RPC ``ingest_scrape_run``.
+
+        Args:
+            run: Dados da execução (ver migrations/006_ingest_scrape_run_rpc.sql)
+            offers: Ofertas coletadas
+
+        Returns:
+            Linhas (scrape_run_id, external_id, offer_id, is_new, price_changed)
+        """
+        response = await run_query(
+            self.client.rpc(
+                "ingest_scrape_run",
+                {"p_run": run, "p_offers": [asdict(offer) for offer in offers]},
+            )
+        )
+        return response.data or []
+
     async def get_by_id(self, scrape_run_id: str) -> dict[str, Any] | None:
         """Busca uma execução por ID."""
-        response = (
+        response = await run_query(
             self.client.table("scrape_runs")
             .select("*")
             .eq("id", scrape_run_id)
-            .execute()
         )
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -456,73 +814,270 @@ class ScrapeRunRepository:
 class DatabaseService:
     """Serviço principal para operações de banco de dados."""
 
-    def __init__(self, client: Client) -> None:
+    def __init__(self, client: Client, config: DatabaseConfig | None = None) -> None:
         self.client = client
+        self.config = config or DatabaseConfig.from_env()
         self.offers = OfferRepository(client)
         self.scrape_runs = ScrapeRunRepository(client)
+        self._rpc_available = self.config.ingest_mode == "rpc"
 
-    async def save_scrape_run_with_offers(
+    async def start_scrape_run(
         self,
-        offers: list[ScrapedOffer],
         min_discount_pct: int | None = None,
         max_scrolls: int | None = None,
         number_of_pages: int | None = None,
         config_snapshot: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Cria uma execução de scraping com status "running".
+
+        Usado pelo scraping em streaming, que salva as ofertas em lotes com
+        ``save_offers`` e encerra a execução com ``finish_scrape_run``.
+        """
+        return await self.scrape_runs.create(
+            min_discount_pct=min_discount_pct,
+            max_scrolls=max_scrolls,
+            number_of_pages=number_of_pages,
+            config_snapshot=config_snapshot,
+        )
+
+    async def save_offers(
+        self,
+        scrape_run: dict[str, Any],
+        offers: list[ScrapedOffer],
         save_price_history: bool = True,
         save_affiliate_info: bool = True,
-    ) -> dict[str, Any]:
+    ) -> dict[str, dict[str, Any]]:
         """
-        Salva uma execução de scraping com todas as ofertas coletadas.
+        Salva um lote de ofertas vinculado a uma execução de scraping.
 
         Args:
-            offers: Lista de ofertas coletadas
-            min_discount_pct: Desconto mínimo aplicado
-            max_scrolls: Número máximo de scrolls
-            number_of_pages: Número de páginas processadas
-            config_snapshot: Snapshot da configuração
+            scrape_run: Execução de scraping (dict com "id")
+            offers: Lote de ofertas coletadas
             save_price_history: Se deve salvar histórico de preços
             save_affiliate_info: Se deve salvar informações de afiliação
 
         Returns:
-            ScrapeRun criado (como dict)
+            Dicionário mapeando external_id -> oferta salva
         """
-        # Cria execução de scraping
-        scrape_run = await self.scrape_runs.create(
-            min_discount_pct=min_discount_pct,
-            max_scrolls=max_scrolls,
-            number_of_pages=number_of_pages,
-            config_snapshot=config_snapshot,
+        if self._rpc_available:
+            try:
+                rows = await self.scrape_runs.ingest(
+                    {
+                        "id": scrape_run["id"],
+                        "finish": False,
+                        "save_price_history": save_price_history,
+                        "save_affiliate_info": save_affiliate_info,
+                    },
+                    offers,
+                )
+                return _saved_from_ingest(rows)
+            except Exception as e:
+                self._disable_rpc(e)
+        if self.config.ingest_mode == "per_offer":
+            return await self._save_offers_per_offer(
+                scrape_run, offers, save_price_history, save_affiliate_info
+            )
+        return await self._save_offers_bulk(
+            scrape_run, offers, save_price_history, save_affiliate_info
         )
 
-        # Processa cada oferta
+    def _disable_rpc(self, error: Exception) -> None:
+        """Passa a usar o modo bulk quando a RPC falha (ex.: migration 006 ausente)."""
+        self._rpc_available = False
+        log(
+            f"[database] RPC ingest_scrape_run falhou ({type(error).__name__}: {error}). "
+            "Usando ingestão em lote (bulk)..."
+        )
+
+    async def _save_offers_bulk(
+        self,
+        scrape_run: dict[str, Any],
+        offers: list[ScrapedOffer],
+        save_price_history: bool,
+        save_affiliate_info: bool,
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Salva o lote com upserts/inserts em bloco.
+
+        Por bloco de DB_INGEST_CHUNK_SIZE ofertas: upsert das ofertas, vínculos
+        com a execução, histórico de preços, informações de afiliação e o
+        upsert que grava o ``affiliate_info_id``. Depois do upsert das ofertas,
+        as demais escritas são independentes e rodam em paralelo.
+        """
+        chunk_size = self.config.ingest_chunk_size
+        saved = await self.offers.upsert_many_from_scraped(offers, chunk_size)
+        saved_offers = list(saved.values())
+        if not saved_offers:
+            return saved
+
+        writes = [self.scrape_runs.link_offers(scrape_run, saved_offers, chunk_size)]
+
+        if save_price_history:
+            writes.append(
+                self.offers.add_price_history_many(
+                    saved_offers, scrape_run["id"], chunk_size
+                )
+            )
+
+        if save_affiliate_info:
+            # Última ocorrência de cada external_id, como no upsert
+            latest = {scraped.external_id: scraped for scraped in offers}
+            with_affiliate = [
+                (saved[external_id], scraped)
+                for external_id, scraped in latest.items()
+                if external_id in saved and _has_affiliate_data(scraped)
+            ]
+            if with_affiliate:
+                writes.append(
+                    self.offers.add_affiliate_info_many(
+                        with_affiliate, scrape_run["id"], chunk_size
+                    )
+                )
+
+        await asyncio.gather(*writes)
+        return saved
+
+    async def _save_offers_per_offer(
+        self,
+        scrape_run: dict[str, Any],
+        offers: list[ScrapedOffer],
+        save_price_history: bool,
+        save_affiliate_info: bool,
+    ) -> dict[str, dict[str, Any]]:
+        """Salva o lote oferta a oferta (select + insert/update por tabela)."""
+        saved: dict[str, dict[str, Any]] = {}
         for scraped_offer in offers:
             # Cria ou atualiza oferta
             offer, _is_new = await self.offers.create_or_update_from_scraped(
                 scraped_offer
             )
+            saved[scraped_offer.external_id] = offer
 
-            # Vincula à execução
-            await self.scrape_runs.link_offer(scrape_run, offer)
+            # Vínculo, histórico e afiliação são independentes entre si
+            writes = [self.scrape_runs.link_offer(scrape_run, offer)]
 
             # Salva histórico de preços se necessário
             if save_price_history:
-                await self.offers.add_price_history(offer, scrape_run["id"])
+                writes.append(self.offers.add_price_history(offer, scrape_run["id"]))
 
             # Salva informações de afiliação se necessário
-            if save_affiliate_info and (
-                scraped_offer.commission_pct
-                or scraped_offer.affiliate_link
-                or scraped_offer.affiliation_id
-            ):
-                await self.offers.add_affiliate_info(
-                    offer["id"], scraped_offer, scrape_run["id"]
+            if save_affiliate_info and _has_affiliate_data(scraped_offer):
+                writes.append(
+                    self.offers.add_affiliate_info(
+                        offer["id"], scraped_offer, scrape_run["id"]
+                    )
                 )
 
-        # Atualiza contadores
-        await self.scrape_runs.update_status(
+            await asyncio.gather(*writes)
+
+        return saved
+
+    async def finish_scrape_run(
+        self,
+        scrape_run: dict[str, Any],
+        offers_count: int,
+        error_message: str | None = None,
+    ) -> dict[str, Any]:
+        """Encerra a execução como "completed" (ou "failed" se houver erro)."""
+        return await self.scrape_runs.update_status(
+            scrape_run,
+            status="failed" if error_message else "completed",
+            filtered_count=offers_count,
+            error_message=error_message,
+        )
+
+    async def ingest_scrape_run(
+        self,
+        offers: list[ScrapedOffer],
+        min_discount_pct: int | None = None,
+        max_scrolls: int | None = None,
+        number_of_pages: int | None = None,
+        config_snapshot: dict[str, Any] | None = None,
+        save_price_history: bool = True,
+        save_affiliate_info: bool = True,
+    ) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+        """
+        Salva uma execução de scraping com todas as ofertas coletadas.
+
+        Com DB_INGEST_MODE=rpc, tudo é gravado em uma única chamada à função
+        ``ingest_scrape_run``; se ela falhar, cai para o modo bulk.
+
+        Args:
+            offers: Lista de ofertas coletadas
+            min_discount_pct: Desconto mínimo aplicado
+            max_scrolls: Número máximo de scrolls
+            number_of_pages: Número de páginas processadas
+            config_snapshot: Snapshot da configuração
+            save_price_history: Se deve salvar histórico de preços
+            save_affiliate_info: Se deve salvar informações de afiliação
+
+        Returns:
+            Tupla (ScrapeRun como dict, mapa external_id -> oferta salva)
+        """
+        if self._rpc_available and offers:
+            try:
+                rows = await self.scrape_runs.ingest(
+                    {
+                        "min_discount_pct": min_discount_pct,
+                        "max_scrolls": max_scrolls,
+                        "number_of_pages": number_of_pages,
+                        "config_snapshot": config_snapshot,
+                        "finish": True,
+                        "save_price_history": save_price_history,
+                        "save_affiliate_info": save_affiliate_info,
+                    },
+                    offers,
+                )
+                if rows:
+                    return {"id": rows[0]["scrape_run_id"]}, _saved_from_ingest(rows)
+            except Exception as e:
+                self._disable_rpc(e)
+
+        scrape_run = await self.start_scrape_run(
+            min_discount_pct=min_discount_pct,
+            max_scrolls=max_scrolls,
+            number_of_pages=number_of_pages,
+            config_snapshot=config_snapshot,
+        )
+
+        saved = await self.save_offers(
             scrape_run,
-            status="completed",
-            filtered_count=len(offers),
+            offers,
+            save_price_history=save_price_history,
+            save_affiliate_info=save_affiliate_info,
         )
 
+        # Atualiza contadores
+        await self.finish_scrape_run(scrape_run, len(offers))
+
+        return scrape_run, saved
+
+    async def save_scrape_run_with_offers(
+        self,
+        offers: list[ScrapedOffer],
+        min_discount_pct: int | None = None,
+        max_scrolls: int | None = None,
+        number_of_pages: int | None = None,
+        config_snapshot: dict[str, Any] | None = None,
+        save_price_history: bool = True,
+        save_affiliate_info: bool = True,
+    ) -> dict[str, Any]:
+        """
+        Salva uma execução de scraping com todas as ofertas coletadas.
+
+        Igual a ``ingest_scrape_run``, mas retorna apenas o ScrapeRun.
+
+        Returns:
+            ScrapeRun criado (como dict)
+        """
+        scrape_run, _saved = await self.ingest_scrape_run(
+            offers,
+            min_discount_pct=min_discount_pct,
+            max_scrolls=max_scrolls,
+            number_of_pages=number_of_pages,
+            config_snapshot=config_snapshot,
+            save_price_history=save_price_history,
+            save_affiliate_info=save_affiliate_info,
+        )
         return scrape_run
@@ -5,18 +5,10 @@ from __future__ import annotations
 import asyncio
 from typing import Optional
 
-from playwright.async_api import async_playwright  # type: ignore
-
 from shared.config.settings import AffiliateConfig
 from core.domain import ScrapedOffer
-from shared.constants import (
-    DEFAULT_ACCEPT_LANGUAGE,
-    DEFAULT_USER_AGENT,
-)
-from adapters.external.playwright_utils import (
-    resolve_storage_state_path,
-    route_block_heavy_resources,
-)
+from adapters.external.browser_service import browser_context
+from adapters.external.request_blocker import open_page
 from shared.utils.price import parse_commission_pct
 
 
@@ -131,25 +123,13 @@ async def enrich_offers_affiliate_details(
     concurrency = max(1, config.concurrency)
     delay_s = max(0.0, request_delay_s)
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context_kwargs = {
-            "locale": "pt-BR",
-            "user_agent": DEFAULT_USER_AGENT,
-            "extra_http_headers": {"Accept-Language": DEFAULT_ACCEPT_LANGUAGE},
-        }
-        storage_state_path = resolve_storage_state_path()
-        if storage_state_path:
-            context_kwargs["storage_state"] = storage_state_path
-        context = await browser.new_context(**context_kwargs)
-        await context.route("**/*", route_block_heavy_resources)
-
+    async with browser_context() as context:
         queue: asyncio.Queue[ScrapedOffer] = asyncio.Queue()
         for offer in offers:
             queue.put_nowait(offer)
 
         async def _worker() -> None:
-            page = await context.new_page()
+            page = await open_page(context)
             try:
                 while True:
                     try:
@@ -179,6 +159,3 @@ async def enrich_offers_affiliate_details(
                 await page.close()
 
         await asyncio.gather(*(_worker() for _ in range(concurrency)))
-
-        await context.close()
-        await browser.close()
@@ -0,0 +1,361 @@
+"""Captura de ofertas da Central de Afiliados a partir das respostas JSON da API."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+from shared.utils.logging import log
+from shared.utils.url import ML_BASE_URL, ML_DOMAIN, external_id_from_url
+
+if TYPE_CHECKING:
+    from adapters.external.affiliate_hub_scraper import AffiliateCardRow
+
+# Origem das linhas produzidas por este módulo (ver AffiliateCardRow.origin)
+ORIGIN_NETWORK = "network"
+
+# Hosts cujas respostas JSON podem conter cards da Central
+_API_HOST_SNIPPETS = ("mercadolivre", "mercadolibre")
+
+_URL_KEYS = ("permalink", "url", "link", "item_url", "href")
+_TITLE_KEYS = ("title", "name")
+_PRICE_KEYS = ("price", "current_price", "amount", "sale_price")
+_OLD_PRICE_KEYS = ("original_price", "previous_price", "regular_amount", "old_price")
+_DISCOUNT_KEYS = ("discount_pct", "discount_percentage", "discount_rate", "discount")
+_IMAGE_KEYS = ("thumbnail", "picture", "image", "image_url", "secure_thumbnail")
+_COMMISSION_RE = re.compile(r"(ganhos|comiss)", re.IGNORECASE)
+_ITEM_ID_RE = re.compile(r"^MLBU?-?\d+$", re.IGNORECASE)
+
+
+def _amount_value(value: Any) -> Optional[float]:
+    """Extrai um valor monetário de número, string ou dict ({"value"|"amount": ...})."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.replace(",", "."))
+        except ValueError:
+            return None
+    if isinstance(value, dict):
+        for key in ("value", "amount", "fraction"):
+            if key in value:
+                amount = _amount_value(value[key])
+                if amount is None:
+                    continue
+                cents = value.get("cents")
+                if key == "fraction" and cents not in (None, ""):
+                    try:
+                        amount += int(str(cents)[:2].ljust(2, "0")) / 100
+                    except ValueError:
+                        pass
+                return amount
+    return None
+
+
+def _amount_to_parts(value: Any) -> tuple[str, str]:
+    """Converte um valor monetário em (fração, centavos) como os cards do DOM."""
+    amount = _amount_value(value)
+    if amount is None or amount <= 0:
+        return ("", "")
+    total_cents = int(round(amount * 100))
+    return (str(total_cents // 100), f"{total_cents % 100:02d}")
+
+
+def _first(node: dict[str, Any], keys: Iterable[str]) -> Any:
+    """Retorna o primeiro valor não vazio entre as chaves informadas."""
+    for key in keys:
+        value = node.get(key)
+        if value not in (None, "", [], {}):
+            return value
+    return None
+
+
+def _text_of(value: Any) -> str:
+    """Extrai texto de uma string ou de um dict ({"text": ...})."""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        text = value.get("text") or value.get("value")
+        if isinstance(text, str):
+            return text.strip()
+    return ""
+
+
+def _iter_strings(value: Any) -> Iterable[str]:
+    """Percorre recursivamente todas as strings de uma estrutura JSON."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for child in value.values():
+            yield from _iter_strings(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from _iter_strings(child)
+
+
+def _canonical_href(url: str, item_id: str) -> str:
+    """Garante uma URL absoluta do ML para o item."""
+    url = (url or "").strip()
+    if url.startswith("//"):
+        url = "https:" + url
+    elif url.startswith("/"):
+        url = ML_BASE_URL + url
+    elif url and not url.startswith("http"):
+        url = "https://" + url
+    if url and external_id_from_url(url):
+        return url
+    if item_id and _ITEM_ID_RE.match(item_id):
+        return f"https://produto.{ML_DOMAIN}/{item_id}"
+    return url
+
+
+def _commission_text(node: Any) -> str:
+    """Procura textos de comissão ("GANHOS 16%") em qualquer parte do item."""
+    for text in _iter_strings(node):
+        if "%" in text and _COMMISSION_RE.search(text):
+            return text.strip()
+    return ""
+
+
+def _image_of(node: dict[str, Any]) -> str:
+    """Extrai a URL da imagem principal do item."""
+    image = _first(node, _IMAGE_KEYS)
+    if isinstance(image, dict):
+        image = image.get("url") or image.get("src") or ""
+    if not image:
+        pictures = node.get("pictures")
+        if isinstance(pictures, dict):
+            pictures = pictures.get("pictures")
+        if isinstance(pictures, list) and pictures and isinstance(pictures[0], dict):
+            image = pictures[0].get("url") or pictures[0].get("secure_url") or ""
+    return image if isinstance(image, str) else ""
+
+
+def _make_row(
+    href: str,
+    title: str,
+    image_url: str,
+    price: Any,
+    old_price: Any,
+    discount: Any,
+    commission_text: str,
+) -> AffiliateCardRow:
+    """Monta um AffiliateCardRow no mesmo formato produzido pelo DOM."""
+    price_fraction, price_cents = _amount_to_parts(price)
+    old_fraction, old_cents = _amount_to_parts(old_price)
+    discount_value = _amount_value(discount)
+    return {
+        "href": href,
+        "title": title,
+        "image_url": image_url,
+        "price_fraction": price_fraction,
+        "price_cents": price_cents,
+        "old_fraction": old_fraction,
+        "old_cents": old_cents,
+        "discount_pct": (
+            str(int(round(discount_value))) if discount_value is not None else ""
+        ),
+        "commission_text": commission_text,
+        "card_text": "",
+        "origin": ORIGIN_NETWORK,
+    }
+
+
+def _row_from_polycard(node: dict[str, Any]) -> Optional[AffiliateCardRow]:
+    """Converte um polycard ({"metadata": ..., "components": [...]}) em linha."""
+    metadata = node.get("metadata") or {}
+    href = _canonical_href(
+        str(metadata.get("url") or ""), str(metadata.get("id") or "")
+    )
+    if not href:
+        return None
+
+    title = ""
+    price = old_price = discount = None
+    for component in node.get("components") or []:
+        if not isinstance(component, dict):
+            continue
+        ctype = component.get("type")
+        body = component.get(ctype) if isinstance(ctype, str) else None
+        if ctype == "title":
+            title = _text_of(body)
+        elif ctype == "price" and isinstance(body, dict):
+            price = body.get("current_price")
+            old_price = body.get("previous_price")
+            discount = body.get("discount")
+
+    return _make_row(
+        href=href,
+        title=title,
+        image_url=_image_of(node),
+        price=price,
+        old_price=old_price,
+        discount=discount,
+        commission_text=_commission_text(node.get("components")),
+    )
+
+
+def _row_from_item(node: dict[str, Any]) -> Optional[AffiliateCardRow]:
+    """Converte um item "plano" ({"id", "permalink", "title", "price", ...}) em linha."""
+    url = _first(node, _URL_KEYS)
+    item_id = node.get("id")
+    href = _canonical_href(
+        url if isinstance(url, str) else "",
+        item_id if isinstance(item_id, str) else "",
+    )
+    title = _text_of(_first(node, _TITLE_KEYS))
+    if not href or not title or not external_id_from_url(href):
+        return None
+
+    price = _first(node, _PRICE_KEYS)
+    if _amount_value(price) is None:
+        return None
+
+    return _make_row(
+        href=href,
+        title=title,
+        image_url=_image_of(node),
+        price=price,
+        old_price=_first(node, _OLD_PRICE_KEYS),
+        discount=_first(node, _DISCOUNT_KEYS),
+        commission_text=_commission_text(node),
+    )
+
+
+def rows_from_payload(payload: Any) -> list[AffiliateCardRow]:
+    """
+    Extrai linhas de cards de um payload JSON da API da Central.
+
+    Percorre o JSON procurando polycards (``metadata`` + ``components``) ou itens
+    planos com URL de produto, título e preço. Itens reconhecidos não são
+    percorridos novamente.
+
+    Args:
+        payload: JSON decodificado da resposta
+
+    Returns:
+        Lista de AffiliateCardRow (com ``origin="network"``)
+    """
+    rows: list[AffiliateCardRow] = []
+    stack: list[Any] = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+
+        row = None
+        if isinstance(node.get("metadata"), dict) and isinstance(
+            node.get("components"), list
+        ):
+            row = _row_from_polycard(node)
+        elif _first(node, _URL_KEYS) or isinstance(node.get("id"), str):
+            row = _row_from_item(node)
+
+        if row is not None:
+            rows.append(row)
+            continue
+        stack.extend(reversed(list(node.values())))
+    return rows
+
+
+class HubNetworkCollector:
+    """
+    Escuta respostas XHR/fetch JSON da página e converte-as em AffiliateCardRow.
+
+    O parsing ocorre em tasks separadas para não bloquear o handler de eventos do
+    Playwright; ``wait_for_page`` permite ao loop de scroll aguardar a próxima
+    página da API em vez de inspecionar o DOM.
+    """
+
+    def __init__(self) -> None:
+        self.rows: list[AffiliateCardRow] = []
+        self.pages_captured = 0
+        self._page = None
+        self._tasks: set[asyncio.Task] = set()
+        self._new_page = asyncio.Event()
+
+    def attach(self, page) -> None:
+        """Registra o listener de respostas (chamar antes do ``goto``)."""
+        self._page = page
+        page.on("response", self._on_response)
+
+    def detach(self) -> None:
+        """Remove o listener de respostas."""
+        if self._page is not None:
+            try:
+                self._page.remove_listener("response", self._on_response)
+            except Exception:
+                pass
+            self._page = None
+
+    def _on_response(self, response) -> None:
+        """Filtra respostas relevantes e agenda o parsing."""
+        try:
+            if response.request.resource_type not in ("xhr", "fetch"):
+                return
+            if not any(host in response.url for host in _API_HOST_SNIPPETS):
+                return
+            content_type = response.headers.get("content-type", "")
+            if "json" not in content_type:
+                return
+        except Exception:
+            return
+
+        task = asyncio.ensure_future(self._consume(response))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _consume(self, response) -> None:
+        """Lê o JSON da resposta e acumula as linhas encontradas."""
+        try:
+            payload = await response.json()
+        except Exception:
+            return
+
+        rows = rows_from_payload(payload)
+        if not rows:
+            return
+
+        self.rows.extend(rows)
+        self.pages_captured += 1
+        self._new_page.set()
+        log(
+            f"[affiliate_hub] Página da API capturada: {len(rows)} cards "
+            f"({response.url[:120]})"
+        )
+
+    def pop_rows(self) -> list[AffiliateCardRow]:
+        """Retorna e limpa as linhas acumuladas até agora."""
+        rows, self.rows = self.rows, []
+        return rows
+
+    async def wait_for_page(self, pages_before: int, timeout_s: float) -> bool:
+        """
+        Aguarda uma nova página da API após ``pages_before``.
+
+        Returns:
+            True se uma nova página foi capturada dentro do timeout.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_s
+        while self.pages_captured <= pages_before:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            self._new_page.clear()
+            try:
+                await asyncio.wait_for(self._new_page.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return self.pages_captured > pages_before
+        return True
+
+    async def settle(self) -> None:
+        """Aguarda o parsing das respostas ainda em andamento."""
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
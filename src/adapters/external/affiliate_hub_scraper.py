@@ -2,33 +2,52 @@
 
 from __future__ import annotations
 
+import asyncio
 import pathlib
+import time
 from dataclasses import dataclass
-from typing import Optional, TypedDict
-
-from playwright.async_api import async_playwright  # type: ignore
+from contextlib import asynccontextmanager
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    NotRequired,
+    Optional,
+    TypedDict,
+)
 
 from shared.config.settings import AffiliateConfig, DatabaseConfig, MLConfig
 from core.domain import ScrapedOffer
 from shared.constants import (
-    DEFAULT_ACCEPT_LANGUAGE,
-    DEFAULT_USER_AGENT,
-    DELAY_AFTER_SCROLL,
-    DELAY_BETWEEN_ACTIONS,
-    DELAY_INITIAL_RENDER,
-    FINAL_WAIT_MULTIPLIER,
+    HUB_STREAM_BATCH_SIZE,
+    OBSERVER_DRAIN_BATCH_SIZE,
+    RATE_BUDGET_HUB,
     SCROLL_PIXELS,
-    TIMEOUT_NETWORK_IDLE,
+    SCROLL_WAIT_MIN_MS,
+    STREAM_PIPELINE_MAX_BATCHES,
     TIMEOUT_PAGE_LOAD,
     TIMEOUT_SELECTOR,
-    TIMEOUT_SHORT,
 )
+from adapters.external.affiliate_hub_network import (
+    ORIGIN_NETWORK,
+    HubNetworkCollector,
+)
+from adapters.external.browser_service import browser_context
+from adapters.external.request_blocker import open_page
 from adapters.external.playwright_utils import (
-    resolve_storage_state_path,
-    route_block_heavy_resources,
+    PageState,
+    probe_page_state,
     try_accept_cookies,
 )
+from adapters.external.scroll_scheduler import (
+    ScrollScheduler,
+    ScrollTimings,
+    resolve_scroll_timings_path,
+)
 from shared.utils.price import (
+    calc_discount,
+    digits_only,
     money_parts_to_cents,
     parse_commission_pct,
     price_to_cents,
@@ -37,21 +56,43 @@ from shared.utils.url import (
     ML_BASE_URL,
     ML_DOMAIN,
     external_id_from_url,
+    is_block_page_url,
     normalize_ml_url,
 )
 from shared.utils.logging import log
+from shared.utils.metrics import track_hub_extraction_path
+from shared.utils.rate_limiter import (
+    get_ml_circuit_breaker,
+    get_pacer,
+    get_rate_limiter,
+)
 
 DEBUG_DIR = pathlib.Path("debug")
 
+# Modos de coleta de cards
+COLLECTOR_MODE_OBSERVER = "observer"
+COLLECTOR_MODE_SNAPSHOT = "snapshot"
 
-def _build_card_extraction_js(selectors: AffiliateHubSelectors) -> str:
+# Modos de extração: DOM (cards renderizados) ou rede (respostas JSON da API)
+EXTRACTION_MODE_DOM = "dom"
+EXTRACTION_MODE_NETWORK = "network"
+ORIGIN_DOM = "dom"
+
+
+def _build_card_serializer_js(selectors: AffiliateHubSelectors) -> str:
     """
-    Constrói o código JavaScript para extração de dados dos cards.
+    Constrói a função JavaScript que serializa um único card.
 
+    Compartilhada entre a extração por snapshot e o coletor via MutationObserver,
+    garantindo que ambos os modos produzam o mesmo formato de AffiliateCardRow.
     Os seletores são inseridos via f-strings para evitar problemas de serialização.
+
+    ``card_text`` (``innerText``, que força layout) só é lido quando o preço ou a
+    comissão não foram encontrados pelos seletores estruturados, pois só é usado
+    como fallback para esses campos.
     """
     return f"""
-        (cards) => {{
+        (card) => {{
             const pick = (root, sel) => {{
                 if (!sel) return '';
                 const el = root.querySelector(sel);
@@ -105,31 +146,131 @@ def _build_card_extraction_js(selectors: AffiliateHubSelectors) -> str:
                 return match[1];
             }};
 
-            return cards.map(card => {{
-                const href = pickAttr(card, 'a[href]', 'href');
-                const title = pick(card, '{selectors.title}');
-                const image_url =
-                    pickAttr(card, '{selectors.picture}', 'src') ||
-                    pickAttr(card, '{selectors.picture}', 'data-src');
-                const price_fraction_str = pick(card, '{selectors.price_fraction}');
-                const price_cents_str = pickPriceCents(card);
-                const old_fraction_str = pick(card, '{selectors.old_fraction}');
-                const old_cents_str = pick(card, '{selectors.old_cents}');
-                const discount_text = pick(card, '{selectors.discount}');
-                const commission_text = pickCommission(card);
-                const card_text = (card.innerText || '').trim();
-
-                return {{
-                    href, title, image_url,
-                    price_fraction: price_fraction_str || '',
-                    price_cents: price_cents_str || '',
-                    old_fraction: old_fraction_str || '',
-                    old_cents: old_cents_str || '',
-                    discount_pct: parseDiscountPct(discount_text),
-                    commission_text,
-                    card_text
-                }};
+            const href = pickAttr(card, 'a[href]', 'href');
+            const title = pick(card, '{selectors.title}');
+            const image_url =
+                pickAttr(card, '{selectors.picture}', 'src') ||
+                pickAttr(card, '{selectors.picture}', 'data-src');
+            const price_fraction_str = pick(card, '{selectors.price_fraction}');
+            const price_cents_str = pickPriceCents(card);
+            const old_fraction_str = pick(card, '{selectors.old_fraction}');
+            const old_cents_str = pick(card, '{selectors.old_cents}');
+            const discount_text = pick(card, '{selectors.discount}');
+            const commission_text = pickCommission(card);
+            const card_text = (price_fraction_str && commission_text)
+                ? ''
+                : (card.innerText || '').trim();
+
+            return {{
+                href, title, image_url,
+                price_fraction: price_fraction_str || '',
+                price_cents: price_cents_str || '',
+                old_fraction: old_fraction_str || '',
+                old_cents: old_cents_str || '',
+                discount_pct: parseDiscountPct(discount_text),
+                commission_text,
+                card_text
+            }};
+        }}
+        """
+
+
+def _build_card_extraction_js(selectors: AffiliateHubSelectors) -> str:
+    """
+    Constrói o código JavaScript para extração de dados dos cards (snapshot).
+
+    Extração incremental: os hrefs já emitidos ficam em um Set da própria página
+    (``window.__dhEmittedHrefs``), então cada chamada serializa e devolve apenas
+    os cards ainda não vistos. Cards sem título (renderização parcial) não são
+    marcados e voltam a ser avaliados na chamada seguinte.
+    """
+    serializer = _build_card_serializer_js(selectors)
+    return f"""
+        (cards) => {{
+            const serialize = {serializer};
+            const emitted = window.__dhEmittedHrefs || (window.__dhEmittedHrefs = new Set());
+            const rows = [];
+            for (const card of cards) {{
+                const link = card.querySelector('a[href]');
+                const rawHref = link ? (link.getAttribute('href') || '').trim() : '';
+                if (!rawHref || emitted.has(rawHref)) continue;
+                const row = serialize(card);
+                if (!row.title) continue;
+                emitted.add(rawHref);
+                rows.push(row);
+            }}
+            return rows;
+        }}
+        """
+
+
+def _build_card_observer_js(selectors: AffiliateHubSelectors) -> str:
+    """
+    Constrói o código JavaScript que instala o coletor de cards no navegador.
+
+    O coletor serializa cada card uma única vez, no momento em que ele é anexado
+    ao DOM, e acumula as linhas em um buffer da página (``window.__dhCardCollector``).
+    Cards ainda sem href/título (renderização parcial) são reavaliados nas
+    mutações seguintes da sua subárvore. Retorna o tamanho atual do buffer.
+    """
+    serializer = _build_card_serializer_js(selectors)
+    return f"""
+        (cardSelector) => {{
+            if (window.__dhCardCollector) {{
+                return window.__dhCardCollector.buffer.length;
+            }}
+            const serialize = {serializer};
+            const buffer = [];
+            const seenHrefs = new Set();
+            const done = new WeakSet();
+
+            const capture = (card, force) => {{
+                if (done.has(card)) return;
+                const row = serialize(card);
+                if (!row.href) return;
+                if (!force && !(row.title && (row.price_fraction || row.card_text))) return;
+                done.add(card);
+                if (seenHrefs.has(row.href)) return;
+                seenHrefs.add(row.href);
+                buffer.push(row);
+            }};
+            const scan = (node) => {{
+                if (!node || node.nodeType !== 1) return;
+                if (node.matches(cardSelector)) {{
+                    capture(node, false);
+                }} else {{
+                    const owner = node.closest(cardSelector);
+                    if (owner) capture(owner, false);
+                }}
+                node.querySelectorAll(cardSelector).forEach((c) => capture(c, false));
+            }};
+
+            document.querySelectorAll(cardSelector).forEach((c) => capture(c, false));
+
+            const observer = new MutationObserver((mutations) => {{
+                for (const m of mutations) {{
+                    m.addedNodes.forEach(scan);
+                    const target = m.target && m.target.nodeType === 1
+                        ? m.target
+                        : (m.target ? m.target.parentElement : null);
+                    if (target) {{
+                        const owner = target.closest(cardSelector);
+                        if (owner) capture(owner, false);
+                    }}
+                }}
             }});
+            observer.observe(document.body, {{ childList: true, subtree: true }});
+
+            window.__dhCardCollector = {{
+                buffer,
+                observer,
+                // Serializa cards presentes que nunca ficaram "completos"
+                flush: () => {{
+                    document.querySelectorAll(cardSelector).forEach((c) => capture(c, true));
+                    return buffer.length;
+                }},
+            }};
+            return buffer.length;
         }}
         """
 
@@ -147,6 +288,7 @@ class AffiliateCardRow(TypedDict):
     discount_pct: str
     commission_text: str
     card_text: str
+    origin: NotRequired[str]  # "dom" (padrão) ou "network"
 
 
 @dataclass(frozen=True)
@@ -164,83 +306,14 @@ class AffiliateHubSelectors:
     commission: str
 
 
-async def _check_for_error_messages(page) -> bool:
-    """Verifica se há mensagens de erro na página."""
-    error_selectors = [
-        ".ui-snackbar--error",
-        '[class*="error"]',
-        '[class*="erro"]',
-    ]
-
-    # Verifica seletores CSS
-    for selector in error_selectors:
-        try:
-            error_elem = page.locator(selector).first
-            # Verifica se o elemento existe usando wait_for com timeout curto
-            try:
-                await error_elem.wait_for(state="visible", timeout=TIMEOUT_SHORT)
-                error_text = await error_elem.text_content()
-                if error_text and len(error_text.strip()) > 0:
-                    log(
-                        f"[affiliate_hub] Mensagem de erro detectada: {error_text[:100]}"
-                    )
-                    return True
-            except (TimeoutError, Exception) as e:
-                # Timeout ou elemento não encontrado - comportamento esperado quando não há erro
-                # Verifica se é realmente um timeout (comportamento normal) ou outro erro
-                error_str = str(e).lower()
-                if "timeout" in error_str:
-                    # Timeout esperado - não há erro na página, continua procurando
-                    continue
-                # Outro tipo de erro - loga mas continua
-                log(f"[affiliate_hub] Erro ao verificar seletor {selector}: {e}")
-                continue
-        except Exception as e:
-            # Erros inesperados - loga mas continua
-            error_str = str(e).lower()
-            if "timeout" not in error_str:
-                log(f"[affiliate_hub] Erro ao verificar seletor {selector}: {e}")
-            continue
-
-    # Verifica textos de erro comuns usando get_by_text
-    error_texts = [
-        "ocorreu um erro",
-        "não foi possível",
-        "tente novamente",
-        "erro ao carregar",
-        "sem resultados",
-    ]
+def _no_growth_limit(state: PageState) -> int:
+    """Scrolls sem crescimento tolerados: menos quando a página já chegou ao fim."""
+    return 2 if state["at_end"] else 3
 
-    for error_text in error_texts:
-        try:
-            error_elem = page.get_by_text(error_text, exact=False).first
-            # Verifica se o elemento existe usando wait_for com timeout curto
-            try:
-                await error_elem.wait_for(state="visible", timeout=TIMEOUT_SHORT)
-                visible_text = await error_elem.text_content()
-                if visible_text:
-                    log(
-                        f"[affiliate_hub] Mensagem de erro detectada: {visible_text[:100]}"
-                    )
-                    return True
-            except (TimeoutError, Exception) as e:
-                # Timeout ou elemento não encontrado - comportamento esperado quando não há erro
-                # Verifica se é realmente um timeout (comportamento normal) ou outro erro
-                error_str = str(e).lower()
-                if "timeout" in error_str:
-                    # Timeout esperado - não há erro na página, continua procurando
-                    continue
-                # Outro tipo de erro - loga mas continua
-                log(f"[affiliate_hub] Erro ao verificar texto '{error_text}': {e}")
-                continue
-        except Exception as e:
-            # Erros inesperados - loga mas continua
-            error_str = str(e).lower()
-            if "timeout" not in error_str:
-                log(f"[affiliate_hub] Erro ao verificar texto '{error_text}': {e}")
-            continue
 
-    return False
+def _log_page_error(state: PageState) -> None:
+    """Registra a mensagem de erro detectada pelo probe da página."""
+    log(f"[affiliate_hub] Mensagem de erro detectada: {state['error_text'][:100]}")
 
 
 async def _extract_card_data(
@@ -248,7 +321,7 @@ async def _extract_card_data(
     card_selector: str,
     selectors: AffiliateHubSelectors,
 ) -> list[AffiliateCardRow]:
-    """Extrai dados de todos os cards visíveis no momento."""
+    """Extrai dados dos cards visíveis ainda não extraídos nesta página."""
     try:
         js_code = _build_card_extraction_js(selectors)
         items = await page.eval_on_selector_all(card_selector, js_code)
@@ -258,44 +331,74 @@ async def _extract_card_data(
         return []
 
 
-def _collect_new_items(
-    items: list[AffiliateCardRow],
-    collected_items: list[AffiliateCardRow],
-    seen_hrefs: set[str],
-) -> int:
+class CardCollector:
     """
-    Coleta novos items de uma lista, evitando duplicatas.
-
-    Otimizado para processar apenas items com href válido e normalizado.
+    Acumula cards únicos, deduplicados pelo href normalizado.
 
-    Returns:
-        Número de novos items coletados.
+    Com ``on_row`` cada card novo é repassado ao callback em vez de acumulado,
+    permitindo processar os cards enquanto a página ainda está rolando. Com
+    ``on_hand_off`` os loops de scroll aguardam o consumidor a cada scroll
+    (``hand_off``), de modo que um consumidor lento pausa a rolagem em vez de
+    deixar os lotes acumularem em memória.
     """
-    new_count = 0
-    for item in items:
-        href = item.get("href", "").strip()
-        if not href:
-            continue
 
-        normalized_href = normalize_ml_url(href)
-        if normalized_href and normalized_href not in seen_hrefs:
-            seen_hrefs.add(normalized_href)
-            collected_items.append(item)
-            new_count += 1
-    return new_count
+    def __init__(
+        self,
+        on_row: Callable[[AffiliateCardRow], None] | None = None,
+        on_hand_off: Callable[[], Awaitable[None]] | None = None,
+    ) -> None:
+        self.rows: list[AffiliateCardRow] = []
+        self.seen_hrefs: set[str] = set()
+        self._on_row = on_row
+        self._on_hand_off = on_hand_off
+
+    def __len__(self) -> int:
+        return len(self.seen_hrefs)
+
+    def add(self, items: Iterable[AffiliateCardRow]) -> int:
+        """
+        Coleta novos items de uma lista, evitando duplicatas.
+
+        Otimizado para processar apenas items com href válido e normalizado.
+
+        Returns:
+            Número de novos items coletados.
+        """
+        new_count = 0
+        for item in items:
+            href = item.get("href", "").strip()
+            if not href:
+                continue
+
+            normalized_href = normalize_ml_url(href)
+            if normalized_href and normalized_href not in self.seen_hrefs:
+                self.seen_hrefs.add(normalized_href)
+                if self._on_row is not None:
+                    self._on_row(item)
+                else:
+                    self.rows.append(item)
+                new_count += 1
+        return new_count
+
+    async def hand_off(self) -> None:
+        """Aguarda o consumidor receber os lotes prontos (no-op sem ``on_hand_off``)."""
+        if self._on_hand_off is not None:
+            await self._on_hand_off()
 
 
 async def _perform_incremental_scroll(
     page,
     card_selector: str,
     selectors: AffiliateHubSelectors,
-    scroll_delay_ms: int,
-    collected_items: list[AffiliateCardRow],
-    seen_hrefs: set[str],
+    scheduler: ScrollScheduler,
+    collector: CardCollector,
+    dom_count: int,
 ) -> int:
     """
     Realiza scroll incremental coletando dados em cada incremento.
 
+    Cada etapa espera novos cards ou a rede esvaziar, até 1/4 do limite por scroll.
+
     Returns:
         Número de novos items coletados durante o scroll.
     """
@@ -304,10 +407,12 @@ async def _perform_incremental_scroll(
 
     for _ in range(4):
         await page.mouse.wheel(0, scroll_increment)
-        await page.wait_for_timeout(scroll_delay_ms // 4)
+        dom_count = await scheduler.wait_for_growth(
+            dom_count, max(SCROLL_WAIT_MIN_MS, scheduler.budget_ms // 4)
+        )
 
         mid_items = await _extract_card_data(page, card_selector, selectors)
-        total_new += _collect_new_items(mid_items, collected_items, seen_hrefs)
+        total_new += collector.add(mid_items)
 
     return total_new
 
@@ -316,15 +421,17 @@ async def _recover_cards_after_dom_drop(
     page,
     card_selector: str,
     selectors: AffiliateHubSelectors,
-    scroll_delay_ms: int,
-    collected_items: list[AffiliateCardRow],
-    seen_hrefs: set[str],
+    scheduler: ScrollScheduler,
+    collector: CardCollector,
     previous_count: int,
     current_count: int,
 ) -> int:
     """
     Tenta recuperar cards após queda significativa no DOM.
 
+    Entre as coletas espera novos cards ou a rede esvaziar, com limite
+    crescente a cada tentativa.
+
     Returns:
         Número de novos items coletados durante a recuperação.
     """
@@ -342,15 +449,17 @@ async def _recover_cards_after_dom_drop(
     )
 
     await page.mouse.wheel(0, SCROLL_PIXELS // 2)
-    await page.wait_for_timeout(scroll_delay_ms)
+    dom_count = await scheduler.wait_for_growth(current_count, scheduler.budget_ms)
 
     total_new = 0
     for retry_attempt in range(3):
         if retry_attempt > 0:
-            await page.wait_for_timeout(scroll_delay_ms * retry_attempt)
+            dom_count = await scheduler.wait_for_growth(
+                dom_count, scheduler.budget_ms * retry_attempt
+            )
 
         retry_items = await _extract_card_data(page, card_selector, selectors)
-        retry_new = _collect_new_items(retry_items, collected_items, seen_hrefs)
+        retry_new = collector.add(retry_items)
 
         if retry_new > 0:
             log(
@@ -366,46 +475,39 @@ async def _collect_final_items(
     page,
     card_selector: str,
     selectors: AffiliateHubSelectors,
-    scroll_delay_s: float,
-    collected_items: list[AffiliateCardRow],
-    seen_hrefs: set[str],
+    scheduler: ScrollScheduler,
+    collector: CardCollector,
 ) -> None:
     """Coleta dados finais após todos os scrolls."""
-    final_wait = max(
-        DELAY_INITIAL_RENDER, int(scroll_delay_s * 1000 * FINAL_WAIT_MULTIPLIER)
+    log(
+        f"[affiliate_hub] Aguardando {scheduler.pending_requests} requisições "
+        "pendentes após scrolls finais..."
     )
-    log(f"[affiliate_hub] Aguardando {final_wait}ms após scrolls finais...")
-    await page.wait_for_timeout(final_wait)
-
-    try:
-        await page.wait_for_load_state("networkidle", timeout=TIMEOUT_NETWORK_IDLE)
-    except Exception:
-        pass
+    await scheduler.settle()
 
     log("[affiliate_hub] Coletando dados finais dos cards...")
     final_items = await _extract_card_data(page, card_selector, selectors)
-    final_new = _collect_new_items(final_items, collected_items, seen_hrefs)
+    final_new = collector.add(final_items)
 
     if final_new > 0:
         log(
             f"[affiliate_hub] {final_new} novos cards coletados na coleta final "
-            f"(total: {len(collected_items)})"
+            f"(total: {len(collector)})"
         )
 
-    if await _check_for_error_messages(page):
+    state = await probe_page_state(page, card_selector)
+    if state["has_error"]:
+        _log_page_error(state)
         log("[affiliate_hub] Aviso: Mensagem de erro detectada após scrolls")
 
-    await page.wait_for_timeout(DELAY_AFTER_SCROLL)
-
 
 async def _scroll_until_no_growth(
     page,
     card_selector: str,
     max_scrolls: int,
-    scroll_delay_s: float,
     selectors: AffiliateHubSelectors,
-    collected_items: list[AffiliateCardRow],
-    seen_hrefs: set[str],
+    scheduler: ScrollScheduler,
+    collector: CardCollector,
 ) -> None:
     """
     Rola a página até não haver mais crescimento no número de cards.
@@ -413,47 +515,41 @@ async def _scroll_until_no_growth(
     """
     previous_dom_count = 0
     no_growth_count = 0
-    scroll_delay_ms = max(500, int(scroll_delay_s * 1000))
 
     # Coleta dados iniciais
     log("[affiliate_hub] Coletando dados iniciais dos cards...")
     initial_items = await _extract_card_data(page, card_selector, selectors)
-    initial_new = _collect_new_items(initial_items, collected_items, seen_hrefs)
+    initial_new = collector.add(initial_items)
     log(
         f"[affiliate_hub] {len(initial_items)} cards iniciais coletados "
-        f"({initial_new} novos, total acumulado: {len(collected_items)})"
+        f"({initial_new} novos, total acumulado: {len(collector)})"
     )
 
     for scroll_num in range(max_scrolls):
         # Coleta antes do scroll
         pre_scroll_items = await _extract_card_data(page, card_selector, selectors)
-        pre_scroll_new = _collect_new_items(
-            pre_scroll_items, collected_items, seen_hrefs
-        )
+        pre_scroll_new = collector.add(pre_scroll_items)
 
         # Scroll incremental com coleta durante
+        scroll_started = asyncio.get_running_loop().time()
         mid_scroll_new = await _perform_incremental_scroll(
-            page, card_selector, selectors, scroll_delay_ms, collected_items, seen_hrefs
+            page, card_selector, selectors, scheduler, collector, previous_dom_count
         )
 
-        await page.wait_for_timeout(scroll_delay_ms)
-
-        if await _check_for_error_messages(page):
-            log("[affiliate_hub] Erro detectado durante scroll. Parando...")
-            break
-
-        try:
-            await page.wait_for_load_state("networkidle", timeout=scroll_delay_ms * 2)
-        except Exception:
-            pass
+        await scheduler.wait_for_new_cards(previous_dom_count, scroll_started)
 
         # Coleta após o scroll
         post_scroll_items = await _extract_card_data(page, card_selector, selectors)
-        post_scroll_new = _collect_new_items(
-            post_scroll_items, collected_items, seen_hrefs
-        )
+        post_scroll_new = collector.add(post_scroll_items)
+
+        # Erro, contagem de cards e fim da lista em uma única ida ao navegador
+        state = await probe_page_state(page, card_selector)
+        if state["has_error"]:
+            _log_page_error(state)
+            log("[affiliate_hub] Erro detectado durante scroll. Parando...")
+            break
 
-        current_dom_count = await page.locator(card_selector).count()
+        current_dom_count = state["card_count"]
         total_new_this_scroll = pre_scroll_new + mid_scroll_new + post_scroll_new
 
         # Recupera cards após queda no DOM
@@ -461,9 +557,8 @@ async def _scroll_until_no_growth(
             page,
             card_selector,
             selectors,
-            scroll_delay_ms,
-            collected_items,
-            seen_hrefs,
+            scheduler,
+            collector,
             previous_dom_count,
             current_dom_count,
         )
@@ -472,7 +567,7 @@ async def _scroll_until_no_growth(
         log(
             f"[affiliate_hub] Scroll {scroll_num + 1}/{max_scrolls}: {current_dom_count} cards no DOM, "
             f"{total_new_this_scroll} novos coletados ({pre_scroll_new} antes + {mid_scroll_new} durante + "
-            f"{post_scroll_new} depois, total acumulado: {len(collected_items)})"
+            f"{post_scroll_new} depois, total acumulado: {len(collector)})"
         )
 
         # Verifica crescimento
@@ -481,21 +576,230 @@ async def _scroll_until_no_growth(
 
         if not dom_grew and not collected_new:
             no_growth_count += 1
-            if no_growth_count >= 3:
+            if no_growth_count >= _no_growth_limit(state):
                 log(
-                    "[affiliate_hub] Nenhum novo card detectado no DOM nem coletado após 3 scrolls. Parando..."
+                    f"[affiliate_hub] Nenhum novo card detectado no DOM nem coletado após "
+                    f"{no_growth_count} scrolls. Parando..."
                 )
                 break
         else:
             no_growth_count = 0
 
         previous_dom_count = current_dom_count
+        await collector.hand_off()
 
     # Coleta final
     await _collect_final_items(
-        page, card_selector, selectors, scroll_delay_s, collected_items, seen_hrefs
+        page, card_selector, selectors, scheduler, collector
+    )
+
+
+async def _install_card_observer(
+    page,
+    card_selector: str,
+    selectors: AffiliateHubSelectors,
+) -> bool:
+    """
+    Instala o coletor de cards via MutationObserver na página.
+
+    Returns:
+        True se o coletor foi instalado (ou já estava ativo), False caso contrário.
+    """
+    try:
+        js_code = _build_card_observer_js(selectors)
+        buffered = await page.evaluate(js_code, card_selector)
+        log(
+            f"[affiliate_hub] Coletor via MutationObserver instalado "
+            f"({buffered} cards no buffer inicial)"
+        )
+        return True
+    except Exception as e:
+        log(f"[affiliate_hub] Erro ao instalar coletor via MutationObserver: {e}")
+        return False
+
+
+async def _drain_card_buffer(
+    page,
+    collector: CardCollector,
+    flush: bool = False,
+) -> int:
+    """
+    Esvazia o buffer do coletor da página em lotes.
+
+    Cada card chega aqui uma única vez (o coletor deduplica pelo href bruto na
+    página), então apenas os cards novos são normalizados em Python.
+
+    Args:
+        page: Página do Playwright
+        collector: Coletor de cards únicos
+        flush: Se True, serializa antes os cards presentes que nunca ficaram completos
+
+    Returns:
+        Número de novos items coletados.
+    """
+    total_new = 0
+    try:
+        if flush:
+            await page.evaluate(
+                "() => window.__dhCardCollector ? window.__dhCardCollector.flush() : 0"
+            )
+        while True:
+            batch = await page.evaluate(
+                """(size) => {
+                    const c = window.__dhCardCollector;
+                    return c ? c.buffer.splice(0, size) : [];
+                }""",
+                OBSERVER_DRAIN_BATCH_SIZE,
+            )
+            if not batch:
+                break
+            total_new += collector.add(batch)
+            if len(batch) < OBSERVER_DRAIN_BATCH_SIZE:
+                break
+    except Exception as e:
+        log(f"[affiliate_hub] Erro ao esvaziar buffer do coletor: {e}")
+    return total_new
+
+
+async def _scroll_with_observer(
+    page,
+    card_selector: str,
+    max_scrolls: int,
+    scheduler: ScrollScheduler,
+    collector: CardCollector,
+) -> None:
+    """
+    Rola a página drenando o buffer do coletor via MutationObserver.
+
+    Como os cards são capturados no momento em que entram no DOM, não há coletas
+    intermediárias durante o scroll nem recuperação após quedas do DOM (cards
+    virtualizados já foram serializados antes de serem removidos).
+    """
+    no_growth_count = 0
+    previous_dom_count = 0
+
+    initial_new = await _drain_card_buffer(page, collector)
+    log(
+        f"[affiliate_hub] {initial_new} cards iniciais coletados pelo observer "
+        f"(total acumulado: {len(collector)})"
+    )
+
+    for scroll_num in range(max_scrolls):
+        await scheduler.scroll_and_wait(previous_dom_count)
+
+        new_this_scroll = await _drain_card_buffer(page, collector)
+
+        state = await probe_page_state(page, card_selector)
+        if state["has_error"]:
+            _log_page_error(state)
+            log("[affiliate_hub] Erro detectado durante scroll. Parando...")
+            break
+        current_dom_count = state["card_count"]
+
+        log(
+            f"[affiliate_hub] Scroll {scroll_num + 1}/{max_scrolls}: {current_dom_count} cards no DOM, "
+            f"{new_this_scroll} novos coletados (total acumulado: {len(collector)})"
+        )
+
+        if current_dom_count <= previous_dom_count and new_this_scroll == 0:
+            no_growth_count += 1
+            if no_growth_count >= _no_growth_limit(state):
+                log(
+                    f"[affiliate_hub] Nenhum novo card detectado no DOM nem coletado após "
+                    f"{no_growth_count} scrolls. Parando..."
+                )
+                break
+        else:
+            no_growth_count = 0
+
+        previous_dom_count = current_dom_count
+        await collector.hand_off()
+
+    log(
+        f"[affiliate_hub] Aguardando {scheduler.pending_requests} requisições "
+        "pendentes após scrolls finais..."
+    )
+    await scheduler.settle()
+
+    final_new = await _drain_card_buffer(page, collector, flush=True)
+    if final_new > 0:
+        log(
+            f"[affiliate_hub] {final_new} novos cards coletados na coleta final "
+            f"(total: {len(collector)})"
+        )
+
+
+async def _scroll_with_network_capture(
+    page,
+    card_selector: str,
+    max_scrolls: int,
+    selectors: AffiliateHubSelectors,
+    scheduler: ScrollScheduler,
+    network_collector: HubNetworkCollector,
+    collector: CardCollector,
+) -> int:
+    """
+    Rola a página apenas para disparar as próximas páginas da API.
+
+    Os cards já renderizados no carregamento (SSR) são lidos uma única vez do DOM;
+    os demais vêm das respostas JSON capturadas por ``network_collector``.
+
+    Returns:
+        Número de cards coletados a partir das respostas da API.
+    """
+    loop = asyncio.get_running_loop()
+    no_growth_count = 0
+    network_new = 0
+
+    initial_items = await _extract_card_data(page, card_selector, selectors)
+    initial_new = collector.add(initial_items)
+    network_new += collector.add(network_collector.pop_rows())
+    log(
+        f"[affiliate_hub] {initial_new} cards iniciais do DOM e {network_new} da API "
+        f"(total acumulado: {len(collector)})"
     )
 
+    for scroll_num in range(max_scrolls):
+        pages_before = network_collector.pages_captured
+        scroll_started = loop.time()
+        await page.mouse.wheel(0, SCROLL_PIXELS)
+        got_page = await network_collector.wait_for_page(
+            pages_before, scheduler.budget_ms / 1000
+        )
+        if got_page:
+            scheduler.timings.record((loop.time() - scroll_started) * 1000)
+
+        new_this_scroll = collector.add(network_collector.pop_rows())
+        network_new += new_this_scroll
+
+        log(
+            f"[affiliate_hub] Scroll {scroll_num + 1}/{max_scrolls}: "
+            f"{'nova página da API' if got_page else 'nenhuma página da API'}, "
+            f"{new_this_scroll} novos coletados (total acumulado: {len(collector)})"
+        )
+
+        state = await probe_page_state(page)
+        if state["has_error"]:
+            _log_page_error(state)
+            log("[affiliate_hub] Erro detectado durante scroll. Parando...")
+            break
+
+        if new_this_scroll == 0:
+            no_growth_count += 1
+            if no_growth_count >= _no_growth_limit(state):
+                log(
+                    f"[affiliate_hub] Nenhuma nova página da API após {no_growth_count} "
+                    "scrolls. Parando..."
+                )
+                break
+        else:
+            no_growth_count = 0
+        await collector.hand_off()
+
+    await network_collector.settle()
+    network_new += collector.add(network_collector.pop_rows())
+    return network_new
+
 
 def _row_text(row: AffiliateCardRow, key: str) -> str:
     """Extrai texto de uma chave do row."""
@@ -533,10 +837,24 @@ async def _collect_affiliate_hub_items(
     selectors: AffiliateHubSelectors,
     max_scrolls: int,
     scroll_delay_s: float,
+    collector_mode: str = COLLECTOR_MODE_OBSERVER,
+    network_collector: HubNetworkCollector | None = None,
+    timings: ScrollTimings | None = None,
+    collector: CardCollector | None = None,
 ) -> tuple[list[AffiliateCardRow], str | None]:
     """
     Coleta itens da Central de Afiliados.
 
+    Args:
+        collector_mode: "observer" (captura via MutationObserver, padrão) ou
+            "snapshot" (extração completa do DOM a cada scroll)
+        network_collector: Se informado, coleta a partir das respostas JSON da API
+            e só recorre ao DOM se nenhuma página da API for reconhecida
+        timings: Latências de scroll aprendidas em execuções anteriores; as novas
+            amostras desta execução são acumuladas nele
+        collector: Coletor de cards (ex.: com callback para streaming); por
+            padrão os cards são acumulados e retornados
+
     Returns:
         Tupla (lista de items, card_selector usado ou None se não encontrado)
     """
@@ -544,7 +862,6 @@ async def _collect_affiliate_hub_items(
 
     # Aguarda a página carregar
     await page.wait_for_load_state("domcontentloaded", timeout=TIMEOUT_PAGE_LOAD)
-    await page.wait_for_timeout(DELAY_INITIAL_RENDER)  # Aguarda renderização inicial
 
     # Aguarda os cards serem renderizados dinamicamente
     # Tenta esperar pelo container ou pelos próprios cards
@@ -554,8 +871,6 @@ async def _collect_affiliate_hub_items(
             ".polycards__container, .recommendations-polycards",
             timeout=TIMEOUT_SELECTOR,
         )
-        # Aguarda um pouco mais para os cards serem renderizados dentro do container
-        await page.wait_for_timeout(DELAY_BETWEEN_ACTIONS)
         # Tenta aguardar pelo menos um card aparecer
         await page.wait_for_selector(
             f"{selectors.card}, .andes-card.poly-card, article",
@@ -587,48 +902,97 @@ async def _collect_affiliate_hub_items(
     # Realiza todos os scrolls coletando dados incrementalmente durante o processo
     # Isso evita perder cards que são removidos do DOM durante lazy loading
     log("[affiliate_hub] Iniciando scrolls e coleta incremental de dados dos cards...")
-    collected_items: list[AffiliateCardRow] = []
-    seen_hrefs: set[str] = set()
+    if collector is None:
+        collector = CardCollector()
 
-    await _scroll_until_no_growth(
+    # Sem amostras aprendidas, espera no máximo o equivalente ao antigo
+    # delay + networkidle (3x o delay configurado) por scroll
+    scheduler = ScrollScheduler(
         page,
         card_selector,
-        max_scrolls,
-        scroll_delay_s,
-        selectors,
-        collected_items,
-        seen_hrefs,
+        timings if timings is not None else ScrollTimings(),
+        fallback_ms=max(500, int(scroll_delay_s * 1000)) * 3,
     )
+    scheduler.attach()
+    log(f"[affiliate_hub] Limite de espera por scroll: {scheduler.budget_ms}ms")
+
+    network_ok = False
+    if network_collector is not None:
+        network_new = await _scroll_with_network_capture(
+            page,
+            card_selector,
+            max_scrolls,
+            selectors,
+            scheduler,
+            network_collector,
+            collector,
+        )
+        network_ok = network_new > 0
+        if not network_ok:
+            log(
+                "[affiliate_hub] Nenhuma resposta da API reconhecida. "
+                "Usando extração pelo DOM como fallback..."
+            )
+
+    if not network_ok:
+        use_observer = collector_mode == COLLECTOR_MODE_OBSERVER and (
+            await _install_card_observer(page, card_selector, selectors)
+        )
+        if use_observer:
+            await _scroll_with_observer(
+                page,
+                card_selector,
+                max_scrolls,
+                scheduler,
+                collector,
+            )
+        else:
+            await _scroll_until_no_growth(
+                page,
+                card_selector,
+                max_scrolls,
+                selectors,
+                scheduler,
+                collector,
+            )
+
+    scheduler.detach()
+    scheduler.log_summary()
 
     log(
-        f"[affiliate_hub] Scrolls concluídos. Total de {len(collected_items)} cards coletados."
+        f"[affiliate_hub] Scrolls concluídos. Total de {len(collector)} cards coletados."
     )
 
-    # Verificação final de segurança: remove duplicatas usando URLs normalizadas
-    # (A coleta já evita duplicatas, mas esta verificação garante consistência)
-    final_unique_items: list[AffiliateCardRow] = []
-    final_seen_hrefs: set[str] = set()
-    duplicates_removed = 0
+    # CardCollector já deduplica pelo href normalizado; em modo streaming os
+    # cards foram repassados ao callback e a lista retornada fica vazia
+    return (collector.rows, card_selector)
 
-    for item in collected_items:
-        href = item.get("href", "").strip()
-        if not href:
-            continue
 
-        normalized_href = normalize_ml_url(href)
-        if normalized_href and normalized_href not in final_seen_hrefs:
-            final_seen_hrefs.add(normalized_href)
-            final_unique_items.append(item)
-        else:
-            duplicates_removed += 1
+def _card_old_price_and_discount(
+    row: AffiliateCardRow, price_cents: int
+) -> tuple[Optional[int], Optional[int]]:
+    """
+    Preço antigo e desconto exibidos no card (DOM ou rede).
 
-    if duplicates_removed > 0:
-        log(
-            f"[affiliate_hub] Aviso: {duplicates_removed} duplicatas removidas na verificação final. "
-            f"Total único: {len(final_unique_items)} cards."
-        )
+    O preço antigo só vale se for maior que o atual; sem desconto no card, ele
+    é calculado a partir do preço antigo. O que faltar fica None para o tier
+    de preço do enriquecimento completar.
+    """
+    old_price_cents = money_parts_to_cents(
+        _row_text(row, "old_fraction"),
+        _row_text(row, "old_cents") or None,
+    )
+    if old_price_cents is not None and old_price_cents <= price_cents:
+        old_price_cents = None
 
-    return (final_unique_items, card_selector)
+    # discount_pct chega só com os dígitos ("30"), nos dois caminhos
+    discount_digits = digits_only(_row_text(row, "discount_pct"))
+    discount_pct = int(discount_digits) if discount_digits else None
+    if discount_pct is not None and not 0 < discount_pct < 100:
+        discount_pct = None
+    if discount_pct is None and old_price_cents is not None:
+        discount_pct = calc_discount(old_price_cents, price_cents)
+    return old_price_cents, discount_pct
 
 
 def _build_offer_from_affiliate_row(
@@ -674,6 +1038,8 @@ def _build_offer_from_affiliate_row(
         # Procura por padrões como "GANHOS 16%", "16%", "GANHOS EXTRA 20%", etc.
         commission_pct = parse_commission_pct(card_text)
 
+    old_price_cents, discount_pct = _card_old_price_and_discount(row, price_cents)
+
     if url_type == "produto":
         canonical_url = f"https://produto.{ML_DOMAIN}/{ext_id}"
     else:
@@ -687,8 +1053,8 @@ def _build_offer_from_affiliate_row(
         url=canonical_url,
         image_url=image_url,
         price_cents=price_cents,
-        old_price_cents=None,  # Será preenchido na validação assíncrona
-        discount_pct=None,  # Será calculado na validação assíncrona
+        old_price_cents=old_price_cents,
+        discount_pct=discount_pct,
         commission_pct=commission_pct,
         affiliate_link=affiliate_link,
         affiliation_id=affiliation_id,
@@ -696,6 +1062,131 @@ def _build_offer_from_affiliate_row(
     )
 
 
+class _HubOfferBuilder:
+    """Converte cards em ofertas, contando as ofertas por caminho de extração."""
+
+    def __init__(self) -> None:
+        self.seen_ids: set[str] = set()
+        self.extraction_counts = {ORIGIN_DOM: 0, ORIGIN_NETWORK: 0}
+
+    def build(self, row: AffiliateCardRow) -> Optional[ScrapedOffer]:
+        """Cria a oferta sem dados de afiliado (coletados depois, de forma assíncrona)."""
+        offer = _build_offer_from_affiliate_row(row, self.seen_ids, None, None)
+        if offer:
+            self.extraction_counts[row.get("origin", ORIGIN_DOM)] += 1
+        return offer
+
+    def report(self) -> None:
+        """Registra as ofertas por caminho de extração (log e métricas)."""
+        for path, count in self.extraction_counts.items():
+            track_hub_extraction_path(path, count)
+        log(
+            f"[affiliate_hub] Ofertas por caminho de extração: "
+            f"rede={self.extraction_counts[ORIGIN_NETWORK]}, "
+            f"DOM={self.extraction_counts[ORIGIN_DOM]}"
+        )
+
+
+def _build_hub_selectors(
+    ml_config: MLConfig, affiliate_config: AffiliateConfig
+) -> AffiliateHubSelectors:
+    """Monta os seletores da Central a partir da configuração."""
+    return AffiliateHubSelectors(
+        card=ml_config.card_selector,
+        title=ml_config.title_selector,
+        picture=ml_config.picture_selector,
+        price_fraction=ml_config.price_fraction_selector,
+        price_cents=ml_config.price_cents_selector,
+        old_fraction=ml_config.old_fraction_selector,
+        old_cents=ml_config.old_cents_selector,
+        discount=ml_config.discount_selector,
+        commission=affiliate_config.commission_selector,
+    )
+
+
+@asynccontextmanager
+async def _open_hub_page(debug: bool) -> AsyncIterator:
+    """Abre um contexto (browser compartilhado ou dedicado) e uma página para a Central."""
+    launcher = None
+    if debug:
+        # Abre navegador dedicado em modo visível quando debug está ativo
+        from scripts.debug_utils import create_debug_browser
+
+        launcher = create_debug_browser
+
+    async with browser_context(launcher=launcher) as context:
+        yield await open_page(context)
+
+
+async def _collect_hub_rows(
+    page,
+    ml_config: MLConfig,
+    selectors: AffiliateHubSelectors,
+    max_scrolls: int,
+    scroll_delay_s: float,
+    collector_mode: str,
+    extraction_mode: str,
+    collector: CardCollector | None = None,
+) -> tuple[list[AffiliateCardRow], str | None]:
+    """Navega até a Central e coleta os cards (ver ``_collect_affiliate_hub_items``)."""
+    timings_path = resolve_scroll_timings_path()
+    scroll_timings = ScrollTimings.load(timings_path)
+
+    # No modo rede o listener precisa existir antes da navegação
+    network_collector: HubNetworkCollector | None = None
+    if extraction_mode == EXTRACTION_MODE_NETWORK:
+        network_collector = HubNetworkCollector()
+        network_collector.attach(page)
+
+    # Acessa a Central de Afiliados (orçamento próprio, somado entre processos)
+    hub_limiter = get_rate_limiter(RATE_BUDGET_HUB, ml_config.hub_rate_limit_per_min)
+    await hub_limiter.acquire()
+    pacer = get_pacer(hub_limiter)
+    log(f"[affiliate_hub] Acessando {ml_config.url}...")
+
+    async def _goto_hub():
+        started = time.monotonic()
+        try:
+            resp = await page.goto(ml_config.url, wait_until="commit", timeout=30000)
+        except Exception as e:
+            if pacer is not None and "Timeout" in type(e).__name__:
+                pacer.record_timeout()
+            raise
+        if pacer is not None:
+            pacer.record_response(
+                resp.status if resp else None,
+                time.monotonic() - started,
+                blocked=is_block_page_url(page.url),
+            )
+        return resp
+
+    # Mesmo circuit breaker dos workers: com o ML bloqueando, a coleta para junto
+    resp = await get_ml_circuit_breaker().call(_goto_hub)
+    log(
+        f"[affiliate_hub] Status: {resp.status if resp else None}, "
+        f"URL final: {page.url}"
+    )
+
+    # Coleta todos os cards
+    log("[affiliate_hub] Coletando produtos da Central de Afiliados...")
+    try:
+        return await _collect_affiliate_hub_items(
+            page,
+            selectors=selectors,
+            max_scrolls=max_scrolls,
+            scroll_delay_s=scroll_delay_s,
+            collector_mode=collector_mode,
+            network_collector=network_collector,
+            timings=scroll_timings,
+            collector=collector,
+        )
+    finally:
+        if network_collector is not None:
+            network_collector.detach()
+        if scroll_timings.run_samples_ms:
+            scroll_timings.save(timings_path)
+
+
 async def scrape_affiliate_hub(
     ml_config: MLConfig,
     affiliate_config: AffiliateConfig,
@@ -703,6 +1194,8 @@ async def scrape_affiliate_hub(
     scroll_delay_s: float,
     debug: bool = False,
     database_config: DatabaseConfig | None = None,
+    collector_mode: str = COLLECTOR_MODE_OBSERVER,
+    extraction_mode: str = EXTRACTION_MODE_DOM,
 ) -> list[ScrapedOffer]:
     """
     Raspa produtos da Central de Afiliados do Mercado Livre.
@@ -715,6 +1208,9 @@ async def scrape_affiliate_hub(
         debug: Se True, salva arquivos de debug (HTML e JSON)
         database_config: DEPRECATED - O salvamento no banco é feito em scrape_service.py.
                         Este parâmetro será removido em versões futuras.
+        collector_mode: "observer" (MutationObserver, padrão) ou "snapshot"
+        extraction_mode: "dom" (padrão) ou "network" (respostas JSON da API,
+            com o DOM como fallback)
 
     Returns:
         Lista de ofertas coletadas
@@ -727,63 +1223,21 @@ async def scrape_affiliate_hub(
 
         ensure_debug_dir(debug_dir)
 
-    selectors = AffiliateHubSelectors(
-        card=ml_config.card_selector,
-        title=ml_config.title_selector,
-        picture=ml_config.picture_selector,
-        price_fraction=ml_config.price_fraction_selector,
-        price_cents=ml_config.price_cents_selector,
-        old_fraction=ml_config.old_fraction_selector,
-        old_cents=ml_config.old_cents_selector,
-        discount=ml_config.discount_selector,
-        commission=affiliate_config.commission_selector,
-    )
-
-    async with async_playwright() as p:
-        # Abre navegador em modo visível quando debug está ativo
-        if debug:
-            from scripts.debug_utils import create_debug_browser
+    selectors = _build_hub_selectors(ml_config, affiliate_config)
 
-            browser = await create_debug_browser(p)
-        else:
-            browser = await p.chromium.launch(headless=True)
-        context_kwargs = {
-            "locale": "pt-BR",
-            "user_agent": DEFAULT_USER_AGENT,
-            "extra_http_headers": {"Accept-Language": DEFAULT_ACCEPT_LANGUAGE},
-            "ignore_https_errors": True,
-            "bypass_csp": True,
-        }
-        storage_state_path = resolve_storage_state_path()
-        if storage_state_path:
-            context_kwargs["storage_state"] = storage_state_path
-        context = await browser.new_context(**context_kwargs)
-
-        await context.route("**/*", route_block_heavy_resources)
-
-        page = await context.new_page()
-
-        # Acessa a Central de Afiliados
-        log(f"[affiliate_hub] Acessando {ml_config.url}...")
-        resp = await page.goto(ml_config.url, wait_until="commit", timeout=30000)
-        log(
-            f"[affiliate_hub] Status: {resp.status if resp else None}, "
-            f"URL final: {page.url}"
-        )
-
-        # Coleta todos os cards
-        log("[affiliate_hub] Coletando produtos da Central de Afiliados...")
-        items, card_selector_used = await _collect_affiliate_hub_items(
+    async with _open_hub_page(debug) as page:
+        items, card_selector_used = await _collect_hub_rows(
             page,
-            selectors=selectors,
-            max_scrolls=max_scrolls,
-            scroll_delay_s=scroll_delay_s,
+            ml_config,
+            selectors,
+            max_scrolls,
+            scroll_delay_s,
+            collector_mode,
+            extraction_mode,
         )
 
         if not card_selector_used:
             log("[affiliate_hub] Nenhum produto encontrado na página")
-            await context.close()
-            await browser.close()
             return []
 
         log(f"[affiliate_hub] {len(items)} produtos coletados")
@@ -795,12 +1249,12 @@ async def scrape_affiliate_hub(
             await save_affiliate_hub_debug_data(items, page, debug_dir)  # type: ignore[arg-type]
 
         # Processa items e cria ofertas
-        seen_ids: set[str] = set()
+        builder = _HubOfferBuilder()
         for row in items:
-            # Cria oferta sem dados de afiliado (serão coletados posteriormente de forma assíncrona)
-            offer = _build_offer_from_affiliate_row(row, seen_ids, None, None)
+            offer = builder.build(row)
             if offer:
                 offers.append(offer)
+        builder.report()
 
         # Aviso sobre database_config deprecado
         if database_config is not None:
@@ -809,8 +1263,103 @@ async def scrape_affiliate_hub(
                 "O salvamento no banco é feito automaticamente em scrape_service.py."
             )
 
-        await context.close()
-        await browser.close()
-
     log(f"[affiliate_hub] Total de {len(offers)} ofertas coletadas")
     return offers
+
+
+async def stream_affiliate_hub(
+    ml_config: MLConfig,
+    affiliate_config: AffiliateConfig,
+    max_scrolls: int,
+    scroll_delay_s: float,
+    batch_size: int = HUB_STREAM_BATCH_SIZE,
+    collector_mode: str = COLLECTOR_MODE_OBSERVER,
+    extraction_mode: str = EXTRACTION_MODE_DOM,
+) -> AsyncIterator[list[ScrapedOffer]]:
+    """
+    Raspa a Central de Afiliados entregando lotes de ofertas durante o scroll.
+
+    Cada card é convertido em ScrapedOffer assim que é coletado e descartado em
+    seguida (sem acumular ``card_text``); os lotes de até ``batch_size`` ofertas
+    ficam disponíveis enquanto a página ainda está rolando. A fila entre a coleta
+    e o iterador é limitada (STREAM_PIPELINE_MAX_BATCHES): se o consumidor não
+    acompanha, a rolagem pausa até ele liberar espaço. O último lote pode ser
+    menor. Exceções da coleta são propagadas ao final da iteração.
+
+    Args:
+        ml_config: Configuração do ML
+        affiliate_config: Configuração de afiliados
+        max_scrolls: Número máximo de scrolls
+        scroll_delay_s: Delay entre scrolls em segundos
+        batch_size: Número de ofertas por lote
+        collector_mode: "observer" (MutationObserver, padrão) ou "snapshot"
+        extraction_mode: "dom" (padrão) ou "network"
+
+    Yields:
+        Listas de ofertas na ordem de coleta
+    """
+    selectors = _build_hub_selectors(ml_config, affiliate_config)
+    builder = _HubOfferBuilder()
+    batches: asyncio.Queue[list[ScrapedOffer] | None] = asyncio.Queue(
+        maxsize=STREAM_PIPELINE_MAX_BATCHES
+    )
+    ready: list[list[ScrapedOffer] | None] = []
+    pending: list[ScrapedOffer] = []
+    total = 0
+
+    def on_row(row: AffiliateCardRow) -> None:
+        offer = builder.build(row)
+        if offer is None:
+            return
+        pending.append(offer)
+        if len(pending) >= batch_size:
+            ready.append(pending.copy())
+            pending.clear()
+
+    async def hand_off() -> None:
+        # Bloqueia o scroll enquanto a fila estiver cheia: só os lotes de um
+        # scroll ficam fora da fila limitada.
+        while ready:
+            await batches.put(ready.pop(0))
+
+    async def produce() -> None:
+        cancelled = False
+        try:
+            async with _open_hub_page(debug=False) as page:
+                _, card_selector_used = await _collect_hub_rows(
+                    page,
+                    ml_config,
+                    selectors,
+                    max_scrolls,
+                    scroll_delay_s,
+                    collector_mode,
+                    extraction_mode,
+                    collector=CardCollector(on_row, on_hand_off=hand_off),
+                )
+            if not card_selector_used:
+                log("[affiliate_hub] Nenhum produto encontrado na página")
+        except asyncio.CancelledError:
+            # Iteração abandonada pelo consumidor: ninguém mais lê a fila
+            cancelled = True
+            raise
+        finally:
+            if not cancelled:
+                if pending:
+                    ready.append(pending.copy())
+                    pending.clear()
+                ready.append(None)
+                await hand_off()
+
+    task = asyncio.create_task(produce())
+    try:
+        while (batch := await batches.get()) is not None:
+            total += len(batch)
+            yield batch
+        await task
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    builder.report()
+    log(f"[affiliate_hub] Total de {total} ofertas coletadas (streaming)")
@@ -0,0 +1,287 @@
+"""Browser compartilhado entre execuções e processos (Chromium via CDP)."""
+
+from __future__ import annotations
+
+# Standard library
+import asyncio
+import ipaddress
+import socket
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+# Third-party
+from playwright.async_api import Browser, BrowserContext, async_playwright  # type: ignore
+
+# Local
+from shared.config.settings import BrowserConfig
+from shared.constants import DEFAULT_ACCEPT_LANGUAGE, DEFAULT_USER_AGENT
+from adapters.external.playwright_utils import resolve_storage_state_path
+from adapters.external.request_blocker import RequestBlocker
+from shared.utils.logging import log
+
+
+def build_context_kwargs(**overrides: Any) -> dict[str, Any]:
+    """
+    Monta os argumentos padrão de ``browser.new_context`` (locale, user agent,
+    headers e storage state, se existir).
+
+    Args:
+        **overrides: Valores que substituem ou complementam os padrões
+
+    Returns:
+        Dicionário pronto para ``new_context``
+    """
+    context_kwargs: dict[str, Any] = {
+        "locale": "pt-BR",
+        "user_agent": DEFAULT_USER_AGENT,
+        "extra_http_headers": {"Accept-Language": DEFAULT_ACCEPT_LANGUAGE},
+        "ignore_https_errors": True,
+        "bypass_csp": True,
+    }
+    storage_state_path = resolve_storage_state_path()
+    if storage_state_path:
+        context_kwargs["storage_state"] = storage_state_path
+    context_kwargs.update(overrides)
+    return context_kwargs
+
+
+def _resolve_cdp_url(cdp_url: str) -> str:
+    """
+    Troca o hostname da URL CDP pelo IP.
+
+    O endpoint HTTP do DevTools recusa Host headers que não sejam IP ou
+    localhost (ex.: o nome do serviço no docker-compose).
+    """
+    parts = urlsplit(cdp_url)
+    host = parts.hostname or ""
+    if not host or host == "localhost":
+        return cdp_url
+    try:
+        ipaddress.ip_address(host)
+        return cdp_url
+    except ValueError:
+        pass
+    try:
+        ip = socket.gethostbyname(host)
+    except OSError:
+        return cdp_url
+    netloc = f"{ip}:{parts.port}" if parts.port else ip
+    return urlunsplit(parts._replace(netloc=netloc))
+
+
+class BrowserService:
+    """
+    Conexão gerenciada com um Chromium compartilhado.
+
+    Com ``BROWSER_CDP_URL`` definido, conecta-se via CDP ao browser do host
+    (ver ``adapters.workers.browser_server``) em vez de lançar um Chromium por
+    processo; reconecta automaticamente se a conexão cair. Sem URL, lança um
+    browser local que é reutilizado enquanto o serviço estiver aberto.
+
+    O número de contextos abertos simultaneamente por processo é limitado por
+    ``BROWSER_MAX_CONTEXTS``.
+    """
+
+    def __init__(self, config: BrowserConfig) -> None:
+        self.config = config
+        self.playwright = None
+        self.browser: Optional[Browser] = None
+        self._lock = asyncio.Lock()
+        self._budget = asyncio.Semaphore(config.max_contexts)
+        self.loop = asyncio.get_running_loop()
+
+    @property
+    def connected(self) -> bool:
+        """Indica se há um browser conectado."""
+        return self.browser is not None and self.browser.is_connected()
+
+    async def _open_browser(self) -> Browser:
+        """Conecta ao browser compartilhado (com retentativas) ou lança um local."""
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+
+        if not self.config.remote:
+            log("[browser_service] BROWSER_CDP_URL não definido. Lançando browser local...")
+            return await self.playwright.chromium.launch(headless=True)
+
+        endpoint = _resolve_cdp_url(self.config.cdp_url)
+        last_error: Exception | None = None
+        for attempt in range(1, self.config.reconnect_attempts + 1):
+            try:
+                browser = await self.playwright.chromium.connect_over_cdp(
+                    endpoint, timeout=self.config.connect_timeout_ms
+                )
+                log(f"[browser_service] Conectado ao browser compartilhado em {endpoint}")
+                return browser
+            except Exception as e:
+                last_error = e
+                log(
+                    f"[browser_service] Falha ao conectar em {endpoint} "
+                    f"(tentativa {attempt}/{self.config.reconnect_attempts}): {e}"
+                )
+                if attempt < self.config.reconnect_attempts:
+                    await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+        raise ConnectionError(
+            f"Não foi possível conectar ao browser em {endpoint}: {last_error}"
+        )
+
+    def _on_disconnected(self, browser: Browser) -> None:
+        if browser is self.browser:
+            log("[browser_service] Browser desconectado. Reconectando no próximo uso...")
+            self.browser = None
+
+    async def get_browser(self) -> Browser:
+        """Retorna o browser conectado, (re)conectando se necessário."""
+        if self.connected:
+            return self.browser  # type: ignore[return-value]
+        async with self._lock:
+            if not self.connected:
+                browser = await self._open_browser()
+                browser.on("disconnected", self._on_disconnected)
+                self.browser = browser
+            return self.browser  # type: ignore[return-value]
+
+    @asynccontextmanager
+    async def context(
+        self, block_resources: bool = True, **overrides: Any
+    ) -> AsyncIterator[BrowserContext]:
+        """
+        Abre um contexto isolado no browser compartilhado.
+
+        Aguarda uma vaga no orçamento de contextos; se a conexão tiver caído,
+        reconecta uma vez antes de desistir.
+
+        Args:
+            block_resources: Se True, bloqueia recursos pesados e trackers
+            **overrides: Argumentos extras para ``new_context``
+
+        Yields:
+            BrowserContext (fechado ao sair)
+        """
+        async with self._budget:
+            browser = await self.get_browser()
+            try:
+                ctx = await browser.new_context(**build_context_kwargs(**overrides))
+            except Exception:
+                if browser.is_connected():
+                    raise
+                browser = await self.get_browser()
+                ctx = await browser.new_context(**build_context_kwargs(**overrides))
+            blocker = RequestBlocker() if block_resources else None
+            try:
+                if blocker is not None:
+                    await blocker.install(ctx)
+                yield ctx
+            finally:
+                if blocker is not None:
+                    await blocker.close()
+                try:
+                    await ctx.close()
+                except Exception as e:
+                    log(f"[browser_service] Erro ao fechar contexto: {e}")
+
+    async def close(self) -> None:
+        """
+        Desconecta do browser compartilhado (ou fecha o browser local).
+
+        Em modo CDP, ``browser.close()`` apenas encerra a conexão e os contextos
+        criados por este processo; o Chromium do host continua rodando.
+        """
+        async with self._lock:
+            if self.browser is not None:
+                try:
+                    await self.browser.close()
+                except Exception as e:
+                    log(f"[browser_service] Erro ao fechar browser: {e}")
+                self.browser = None
+            if self.playwright is not None:
+                try:
+                    await self.playwright.stop()
+                except Exception as e:
+                    log(f"[browser_service] Erro ao fechar playwright: {e}")
+                self.playwright = None
+
+
+# Serviço global do processo (um por event loop)
+_global_service: Optional[BrowserService] = None
+
+
+async def get_browser_service(config: BrowserConfig | None = None) -> BrowserService:
+    """
+    Obtém ou cria o serviço de browser global.
+
+    Args:
+        config: Configuração (usada apenas na criação; padrão: variáveis de ambiente)
+
+    Returns:
+        BrowserService do event loop atual
+    """
+    global _global_service
+
+    loop = asyncio.get_running_loop()
+    if _global_service is not None and _global_service.loop is not loop:
+        # Objetos do Playwright ficam presos ao loop em que foram criados
+        log("[browser_service] Event loop mudou. Recriando serviço de browser...")
+        _global_service = None
+    if _global_service is None:
+        _global_service = BrowserService(config or BrowserConfig.from_env())
+    return _global_service
+
+
+async def close_browser_service() -> None:
+    """Fecha o serviço de browser global."""
+    global _global_service
+
+    if _global_service is not None:
+        service, _global_service = _global_service, None
+        await service.close()
+
+
+@asynccontextmanager
+async def browser_context(
+    launcher: Callable[[Any], Awaitable[Browser]] | None = None,
+    block_resources: bool = True,
+    **overrides: Any,
+) -> AsyncIterator[BrowserContext]:
+    """
+    Abre um contexto de browser para scraping.
+
+    Com ``BROWSER_CDP_URL`` definido, usa o browser compartilhado do host (sem
+    cold start). Caso contrário, mantém o comportamento anterior: lança um
+    Chromium dedicado e o fecha ao sair.
+
+    Args:
+        launcher: Força um browser local dedicado criado por esta função
+            (ex.: ``create_debug_browser`` para depuração visível)
+        block_resources: Se True, bloqueia recursos pesados e trackers
+        **overrides: Argumentos extras para ``new_context``
+
+    Yields:
+        BrowserContext (fechado ao sair)
+    """
+    config = BrowserConfig.from_env()
+    if config.remote and launcher is None:
+        service = await get_browser_service(config)
+        async with service.context(block_resources=block_resources, **overrides) as ctx:
+            yield ctx
+        return
+
+    async with async_playwright() as p:
+        if launcher is not None:
+            browser = await launcher(p)
+        else:
+            browser = await p.chromium.launch(headless=True)
+        try:
+            ctx = await browser.new_context(**build_context_kwargs(**overrides))
+            blocker = RequestBlocker() if block_resources else None
+            try:
+                if blocker is not None:
+                    await blocker.install(ctx)
+                yield ctx
+            finally:
+                if blocker is not None:
+                    await blocker.close()
+                await ctx.close()
+        finally:
+            await browser.close()
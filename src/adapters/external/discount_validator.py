@@ -5,24 +5,11 @@ from __future__ import annotations
 import asyncio
 from typing import Optional
 
-from playwright.async_api import async_playwright  # type: ignore
-
 from shared.config.settings import MLConfig
 from core.domain import ScrapedOffer
-from shared.constants import (
-    DEFAULT_ACCEPT_LANGUAGE,
-    DEFAULT_USER_AGENT,
-)
-from adapters.external.playwright_utils import (
-    resolve_storage_state_path,
-    route_block_heavy_resources,
-)
-from shared.utils.price import (
-    calc_discount,
-    discount_to_float,
-    infer_old_price_from_card_text,
-    money_parts_to_cents,
-)
+from adapters.external.browser_service import browser_context
+from adapters.external.product_page import extract_product_page, resolve_prices
+from adapters.external.request_blocker import open_page
 from shared.utils.logging import log
 from shared.utils.retry import retry_with_backoff
 
@@ -67,51 +54,9 @@ async def _validate_discount_for_offer(
     except Exception:
         pass
 
-    # Extrai preço atual (já temos, mas pode validar)
-    current_price_cents = offer.price_cents
-
-    # Extrai preço antigo
-    old_price_cents = None
-    try:
-        old_fraction_elem = page.locator(ml_config.old_fraction_selector).first
-        old_cents_elem = page.locator(ml_config.old_cents_selector).first
-
-        if await old_fraction_elem.count() > 0:
-            old_fraction_text = await old_fraction_elem.text_content() or ""
-            old_cents_text = ""
-            if await old_cents_elem.count() > 0:
-                old_cents_text = await old_cents_elem.text_content() or ""
-
-            old_price_cents = money_parts_to_cents(
-                old_fraction_text.strip(),
-                old_cents_text.strip() if old_cents_text else None,
-            )
-    except Exception:
-        pass
-
-    # Se não encontrou preço antigo pelos seletores, tenta inferir do texto da página
-    if old_price_cents is None:
-        try:
-            page_text = await page.locator("body").text_content() or ""
-            old_price_cents = infer_old_price_from_card_text(
-                page_text, current_price_cents
-            )
-        except Exception:
-            pass
-
-    # Extrai desconto do texto
-    discount_pct = None
-    try:
-        discount_elem = page.locator(ml_config.discount_selector).first
-        if await discount_elem.count() > 0:
-            discount_text = await discount_elem.text_content() or ""
-            discount_pct = discount_to_float(discount_text)
-    except Exception:
-        pass
-
-    # Se não encontrou desconto, calcula a partir dos preços
-    if discount_pct is None and old_price_cents:
-        discount_pct = calc_discount(old_price_cents, current_price_cents)
+    # Preço antigo e desconto em uma única ida ao navegador
+    page_data = await extract_product_page(page, ml_config)
+    old_price_cents, discount_pct = resolve_prices(page_data, offer.price_cents)
 
     return (old_price_cents, discount_pct)
 
@@ -140,27 +85,13 @@ async def validate_discounts_parallel(
     results: dict[str, tuple[Optional[int], Optional[int]]] = {}
     concurrency = max(1, concurrency)
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context_kwargs = {
-            "locale": "pt-BR",
-            "user_agent": DEFAULT_USER_AGENT,
-            "extra_http_headers": {"Accept-Language": DEFAULT_ACCEPT_LANGUAGE},
-            "ignore_https_errors": True,
-            "bypass_csp": True,
-        }
-        storage_state_path = resolve_storage_state_path()
-        if storage_state_path:
-            context_kwargs["storage_state"] = storage_state_path
-        context = await browser.new_context(**context_kwargs)
-        await context.route("**/*", route_block_heavy_resources)
-
+    async with browser_context() as context:
         queue: asyncio.Queue[ScrapedOffer] = asyncio.Queue()
         for offer in offers:
             queue.put_nowait(offer)
 
         async def _worker() -> None:
-            page = await context.new_page()
+            page = await open_page(context)
             try:
                 while True:
                     try:
@@ -189,9 +120,6 @@ async def validate_discounts_parallel(
         )
         await asyncio.gather(*(_worker() for _ in range(concurrency)))
 
-        await context.close()
-        await browser.close()
-
     success_count = sum(
         1 for v in results.values() if v[0] is not None or v[1] is not None
     )
@@ -7,13 +7,9 @@ import pathlib
 from dataclasses import dataclass
 from typing import Optional, TypedDict
 
-from playwright.async_api import async_playwright  # type: ignore
-
 from shared.config.settings import MLConfig, ScrapeConfig
 from core.domain import ScrapedOffer
 from shared.constants import (
-    DEFAULT_ACCEPT_LANGUAGE,
-    DEFAULT_USER_AGENT,
     MAX_CARDS_PER_PAGE,
     SCROLL_DELAY_MULTIPLIER,
     SCROLL_PIXELS,
@@ -22,9 +18,11 @@ from shared.constants import (
     TIMEOUT_SELECTOR,
     TIMEOUT_SHORT,
 )
+from adapters.external.browser_service import browser_context
+from adapters.external.request_blocker import open_page
 from adapters.external.playwright_utils import (
-    resolve_storage_state_path,
-    route_block_heavy_resources,
+    probe_page_state,
+    try_accept_cookies,
 )
 from shared.utils.price import (
     calc_discount,
@@ -97,11 +95,12 @@ async def _scroll_until_no_growth(
             # Se timeout, continua mesmo assim
             pass
 
-        cur = await page.locator(card_selector).count()
+        state = await probe_page_state(page, card_selector)
+        cur = state["card_count"]
         if cur <= prev:
             no_growth_count += 1
-            # Se não cresceu 2 vezes seguidas, pára
-            if no_growth_count >= 2:
+            # Se não cresceu 2 vezes seguidas (ou já está no fim da página), pára
+            if no_growth_count >= 2 or state["at_end"]:
                 break
         else:
             no_growth_count = 0
@@ -260,24 +259,8 @@ async def scrape_ml_offers_playwright(
         discount=ml_config.discount_selector,
     )
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context_kwargs = {
-            "locale": "pt-BR",
-            "user_agent": DEFAULT_USER_AGENT,
-            "extra_http_headers": {"Accept-Language": DEFAULT_ACCEPT_LANGUAGE},
-            # Desabilita imagens, fontes e CSS para acelerar carregamento
-            "ignore_https_errors": True,
-            "bypass_csp": True,
-        }
-        storage_state_path = resolve_storage_state_path()
-        if storage_state_path:
-            context_kwargs["storage_state"] = storage_state_path
-        context = await browser.new_context(**context_kwargs)
-
-        await context.route("**/*", route_block_heavy_resources)
-
-        page = await context.new_page()
+    async with browser_context() as context:
+        page = await open_page(context)
 
         for page_num in range(1, max(1, scrape_config.number_of_pages) + 1):
             page_url = url_with_page(ml_config.url, page_num)
@@ -328,7 +311,4 @@ async def scrape_ml_offers_playwright(
             # respiro entre páginas (evita estresse/anti-bot)
             await page.wait_for_timeout(int(scrape_config.page_delay_s * 1000))
 
-        await context.close()
-        await browser.close()
-
     return offers
@@ -3,21 +3,88 @@
 from __future__ import annotations
 
 # Standard library
+import asyncio
 import os
 import pathlib
-from typing import Optional
+from typing import Optional, TypedDict
 
 # Third-party
 from playwright.async_api import Route  # type: ignore
 
 # Local
 from shared.constants import (
+    ERROR_BANNER_SELECTORS,
+    ERROR_TEXT_SNIPPETS,
     RESOURCE_BLOCK_TYPES,
     TIMEOUT_SHORT,
     TRACKER_HOST_SNIPPETS,
 )
 
 
+class PageState(TypedDict):
+    """Estado da página obtido em uma única ida ao navegador."""
+
+    has_error: bool
+    error_text: str
+    card_count: int
+    scroll_height: int
+    at_end: bool
+
+
+# Executado inteiro no navegador: nenhuma espera, nenhum timeout.
+# Para cada seletor de erro só o primeiro elemento é considerado (como o
+# antigo locator(...).first); os textos de erro são procurados percorrendo
+# os nós de texto, sem forçar layout com innerText.
+_PAGE_STATE_JS = """
+({ cardSelector, errorSelectors, errorTexts }) => {
+    const visible = (el) =>
+        !!(el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length));
+
+    let errorText = '';
+    for (const sel of errorSelectors) {
+        const el = document.querySelector(sel);
+        if (el && visible(el)) {
+            const text = (el.textContent || '').trim();
+            if (text) {
+                errorText = text;
+                break;
+            }
+        }
+    }
+
+    if (!errorText && document.body) {
+        const skip = new Set(['SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE']);
+        const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+        let node;
+        while (!errorText && (node = walker.nextNode())) {
+            const value = node.nodeValue;
+            if (!value || value.length < 8) continue;
+            const parent = node.parentElement;
+            if (!parent || skip.has(parent.tagName)) continue;
+            const lower = value.toLowerCase();
+            for (const snippet of errorTexts) {
+                if (lower.includes(snippet) && visible(parent)) {
+                    errorText = value.trim();
+                    break;
+                }
+            }
+        }
+    }
+
+    const root = document.scrollingElement || document.documentElement;
+    const scrollHeight = root ? root.scrollHeight : 0;
+    const scrollBottom = window.scrollY + window.innerHeight;
+    return {
+        has_error: !!errorText,
+        error_text: errorText.slice(0, 200),
+        card_count: cardSelector ? document.querySelectorAll(cardSelector).length : 0,
+        scroll_height: scrollHeight,
+        at_end: scrollBottom >= scrollHeight - 8,
+    };
+}
+"""
+
+
 def resolve_storage_state_path() -> Optional[str]:
     """
     Resolve o caminho do arquivo de storage state do Playwright.
@@ -73,6 +140,80 @@ async def route_block_heavy_resources(route: Route, request) -> None:
     await route.continue_()
 
 
+async def probe_page_state(page, card_selector: str = "") -> PageState:
+    """
+    Lê o estado da página (erro, cards, altura, fim da lista) em um único evaluate.
+
+    Substitui as sondagens sequenciais com ``wait_for(state="visible")``: em uma
+    página saudável não há nenhum timeout a esperar.
+
+    Args:
+        page: Página do Playwright
+        card_selector: Seletor dos cards a contar (opcional)
+
+    Returns:
+        PageState com o estado atual. Em caso de erro na avaliação, retorna um
+        estado neutro (sem erro, sem cards).
+    """
+    try:
+        return await page.evaluate(
+            _PAGE_STATE_JS,
+            {
+                "cardSelector": card_selector,
+                "errorSelectors": list(ERROR_BANNER_SELECTORS),
+                "errorTexts": list(ERROR_TEXT_SNIPPETS),
+            },
+        )
+    except Exception:
+        return {
+            "has_error": False,
+            "error_text": "",
+            "card_count": 0,
+            "scroll_height": 0,
+            "at_end": False,
+        }
+
+
+async def wait_for_any_selector(
+    page, selectors: list[str], timeout_ms: int
+) -> Optional[str]:
+    """
+    Espera por vários seletores ao mesmo tempo; o primeiro que aparecer vence.
+
+    Substitui esperas em sequência (cada uma com seu timeout) por uma única
+    espera limitada por ``timeout_ms``. As esperas restantes são canceladas.
+
+    Args:
+        page: Página do Playwright
+        selectors: Seletores alternativos (vazios são ignorados)
+        timeout_ms: Tempo máximo de espera
+
+    Returns:
+        O seletor que apareceu primeiro, ou None se nenhum apareceu a tempo
+    """
+    selectors = [selector for selector in selectors if selector]
+    if not selectors:
+        return None
+
+    waits = {
+        asyncio.ensure_future(page.wait_for_selector(selector, timeout=timeout_ms)): selector
+        for selector in selectors
+    }
+    pending = set(waits)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is None:
+                    return waits[task]
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
 async def try_accept_cookies(page) -> None:
     """
     Tenta aceitar cookies na página com timeout curto.
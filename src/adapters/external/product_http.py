@@ -0,0 +1,359 @@
+"""Leitura da página de produto por HTTP, sem navegador."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import re
+import time
+from html.parser import HTMLParser
+from typing import Optional
+
+import httpx
+
+from adapters.external.product_page import ProductPageData
+from shared.config.settings import MLConfig
+from shared.constants import (
+    DEFAULT_ACCEPT_LANGUAGE,
+    DEFAULT_USER_AGENT,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE,
+)
+from shared.utils.logging import log
+from shared.utils.rate_limiter import AdaptivePacer
+from shared.utils.url import is_block_page_url
+
+# Elementos HTML sem tag de fechamento (nunca ficam na pilha de abertos)
+_VOID_TAGS = frozenset(
+    {
+        "area", "base", "br", "col", "embed", "hr", "img", "input",
+        "link", "meta", "param", "source", "track", "wbr",
+    }
+)
+
+_ORIGINAL_VALUE_RE = re.compile(r'"original_value"\s*:\s*"?([0-9]+(?:\.[0-9]+)?)')
+
+_COMPOUND_RE = re.compile(r'([a-zA-Z][\w-]*)|\.([\w-]+)|\[([\w-]+)="([^"]*)"\]')
+# Composto aceito por inteiro: tag opcional seguida de classes e [attr="valor"]
+_SUPPORTED_COMPOUND_RE = re.compile(r'(?:[a-zA-Z][\w-]*)?(?:\.[\w-]+|\[[\w-]+="[^"]*"\])*')
+_COMBINATOR_RE = re.compile(r"(\s*>\s*|\s+)")
+
+_Compound = tuple[Optional[str], frozenset[str], tuple[tuple[str, str], ...]]
+
+
+def _parse_compound(text: str) -> _Compound:
+    """Converte ``tag.classe[attr="v"]`` em (tag, classes, atributos)."""
+    tag = None
+    classes = set()
+    attrs = []
+    for match in _COMPOUND_RE.finditer(text):
+        if match.group(1):
+            tag = match.group(1).lower()
+        elif match.group(2):
+            classes.add(match.group(2))
+        else:
+            attrs.append((match.group(3), match.group(4)))
+    return tag, frozenset(classes), tuple(attrs)
+
+
+def _parse_complex(text: str) -> list[tuple[str, _Compound]]:
+    """
+    Converte ``a b > c`` em [(combinador, composto)], com o combinador que liga
+    cada composto ao anterior (" " ou ">"; o primeiro fica com " ").
+
+    Raises:
+        ValueError: Se algum trecho estiver fora do subconjunto suportado
+    """
+    tokens = _COMBINATOR_RE.split(text.strip())
+    parts = []
+    combinator = " "
+    for i, token in enumerate(tokens):
+        if i % 2:
+            combinator = ">" if ">" in token else " "
+            continue
+        if not token or not _SUPPORTED_COMPOUND_RE.fullmatch(token):
+            raise ValueError(f"trecho não suportado: {token!r}")
+        parts.append((combinator, _parse_compound(token)))
+    return parts
+
+
+class _Selector:
+    """
+    Subconjunto de CSS usado nos seletores de preço: compostos de tag,
+    classes e ``[attr="valor"]``, ligados por descendência (espaço) ou filho
+    direto (``>``), e listas de seletores separadas por vírgula.
+
+    Qualquer outra sintaxe (pseudo-classes, ``#id``, ``+``, ``~``...) é
+    recusada com ValueError em vez de casar com os elementos errados.
+    """
+
+    def __init__(self, selector: str) -> None:
+        self.alternatives = [_parse_complex(group) for group in selector.split(",")]
+
+    @staticmethod
+    def _matches(part: _Compound, element: tuple[str, dict[str, str]]) -> bool:
+        tag, classes, attrs = part
+        name, element_attrs = element
+        if tag and tag != name:
+            return False
+        if classes and not classes <= set(element_attrs.get("class", "").split()):
+            return False
+        return all(element_attrs.get(key) == value for key, value in attrs)
+
+    def _matches_at(
+        self,
+        parts: list[tuple[str, _Compound]],
+        index: int,
+        stack: list[tuple[str, dict[str, str]]],
+        position: int,
+    ) -> bool:
+        """Verifica se ``parts[:index + 1]`` casa terminando em ``stack[position]``."""
+        combinator, compound = parts[index]
+        if not self._matches(compound, stack[position]):
+            return False
+        if index == 0:
+            return True
+        if combinator == ">":
+            return position > 0 and self._matches_at(parts, index - 1, stack, position - 1)
+        return any(
+            self._matches_at(parts, index - 1, stack, ancestor)
+            for ancestor in range(position - 1, -1, -1)
+        )
+
+    def matches(self, stack: list[tuple[str, dict[str, str]]]) -> bool:
+        """Verifica se o último elemento da pilha casa com o seletor."""
+        if not stack:
+            return False
+        return any(
+            self._matches_at(parts, len(parts) - 1, stack, len(stack) - 1)
+            for parts in self.alternatives
+        )
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_selector(selector: str) -> Optional[_Selector]:
+    """Compila o seletor; None (com um aviso por seletor) se não for suportado."""
+    try:
+        return _Selector(selector)
+    except ValueError as e:
+        log(
+            f"[product_http] Seletor {selector!r} não suportado sem navegador ({e}). "
+            "Usando o navegador para os preços."
+        )
+        return None
+
+
+class _ProductHTMLParser(HTMLParser):
+    """Extrai, em uma passada, os textos dos seletores de preço e os scripts de dados."""
+
+    def __init__(self, selectors: dict[str, _Selector]) -> None:
+        super().__init__(convert_charrefs=True)
+        self.selectors = selectors
+        self.texts: dict[str, str] = {}
+        self.scripts: list[tuple[dict[str, str], str]] = []
+        self.body_parts: list[str] = []
+        self._stack: list[tuple[str, dict[str, str]]] = []
+        # Campos sendo capturados: nome -> profundidade do elemento na pilha
+        self._capturing: dict[str, int] = {}
+        self._buffers: dict[str, list[str]] = {}
+        self._script: Optional[tuple[dict[str, str], list[str]]] = None
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        element_attrs = {key: value or "" for key, value in attrs}
+        if tag == "script":
+            self._script = (element_attrs, [])
+            return
+        if tag in _VOID_TAGS:
+            return
+        self._stack.append((tag, element_attrs))
+        for name, selector in self.selectors.items():
+            if name not in self.texts and name not in self._capturing and selector.matches(self._stack):
+                self._capturing[name] = len(self._stack)
+                self._buffers[name] = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "script":
+            if self._script is not None:
+                attrs, parts = self._script
+                self.scripts.append((attrs, "".join(parts)))
+                self._script = None
+            return
+        # Fecha até a tag correspondente (tolera HTML com tags não fechadas)
+        for depth in range(len(self._stack), 0, -1):
+            if self._stack[depth - 1][0] == tag:
+                for name, start in list(self._capturing.items()):
+                    if start >= depth:
+                        self.texts[name] = "".join(self._buffers.pop(name)).strip()
+                        del self._capturing[name]
+                del self._stack[depth - 1 :]
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self._script is not None:
+            self._script[1].append(data)
+            return
+        if self._stack and self._stack[-1][0] == "style":
+            return
+        self.body_parts.append(data)
+        for name in self._capturing:
+            self._buffers[name].append(data)
+
+
+def _number(value) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+def _structured_prices(scripts: list[tuple[dict[str, str], str]]) -> tuple[Optional[float], Optional[float]]:
+    """Lê preço atual (JSON-LD) e preço original (estado embutido) dos scripts."""
+    price = None
+    original = None
+    for attrs, content in scripts:
+        if attrs.get("type") == "application/ld+json" and price is None:
+            try:
+                data = json.loads(content)
+            except ValueError:
+                continue
+            for item in data if isinstance(data, list) else [data]:
+                offers = item.get("offers") if isinstance(item, dict) else None
+                offer = offers[0] if isinstance(offers, list) and offers else offers
+                if isinstance(offer, dict) and price is None:
+                    price = _number(offer.get("price"))
+        elif original is None:
+            match = _ORIGINAL_VALUE_RE.search(content)
+            if match:
+                original = _number(match.group(1))
+    return price, original
+
+
+def parse_product_html(html: str, ml_config: MLConfig) -> Optional[ProductPageData]:
+    """
+    Extrai os dados de preço do HTML renderizado no servidor.
+
+    Retorna o mesmo formato de ``extract_product_page``, para ser
+    interpretado por ``resolve_prices``. Campos de comissão ficam vazios
+    (só existem para usuários logados, no navegador).
+
+    Args:
+        html: HTML da página de produto
+        ml_config: Configuração do ML com os seletores de preço
+
+    Returns:
+        ProductPageData com os textos encontrados, ou None se algum seletor
+        usa CSS fora do subconjunto suportado (o navegador lê os preços)
+    """
+    selectors = {}
+    for name, selector in (
+        ("old_fraction", ml_config.old_fraction_selector),
+        ("old_cents", ml_config.old_cents_selector),
+        ("discount_text", ml_config.discount_selector),
+    ):
+        if not selector:
+            continue
+        compiled = _compile_selector(selector)
+        if compiled is None:
+            return None
+        selectors[name] = compiled
+
+    parser = _ProductHTMLParser(selectors)
+    parser.feed(html)
+    parser.close()
+
+    price, original = _structured_prices(parser.scripts)
+    old_fraction = parser.texts.get("old_fraction", "")
+    return {
+        "old_fraction": old_fraction,
+        "old_cents": parser.texts.get("old_cents", ""),
+        "discount_text": parser.texts.get("discount_text", ""),
+        "commission_text": "",
+        "commission_alt_text": "",
+        "body_text": "" if old_fraction else " ".join(parser.body_parts),
+        "structured_price": price,
+        "structured_original_price": original,
+    }
+
+
+# Cliente HTTP do processo (recriado se o event loop mudar)
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Retorna o cliente HTTP compartilhado, com pool de conexões keep-alive.
+
+    O pool fica preso ao event loop em que foi criado; em outro loop (ex.:
+    ``asyncio.run`` por job), um novo cliente é criado.
+    """
+    global _client, _client_loop
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            headers={
+                "User-Agent": DEFAULT_USER_AGENT,
+                "Accept-Language": DEFAULT_ACCEPT_LANGUAGE,
+                "Accept": "text/html,application/xhtml+xml",
+            },
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            ),
+            follow_redirects=True,
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_http_client() -> None:
+    """Fecha o cliente HTTP compartilhado."""
+    global _client, _client_loop
+
+    if _client is not None:
+        client, _client, _client_loop = _client, None, None
+        await client.aclose()
+
+
+async def fetch_product_page(
+    url: str,
+    ml_config: MLConfig,
+    timeout_s: float = 10.0,
+    pacer: Optional[AdaptivePacer] = None,
+) -> Optional[ProductPageData]:
+    """
+    Baixa a página de produto por HTTP e extrai os dados de preço.
+
+    Args:
+        url: URL do produto
+        ml_config: Configuração do ML com os seletores de preço
+        timeout_s: Timeout da requisição
+        pacer: Ritmo adaptativo que recebe status e latência da resposta
+
+    Returns:
+        ProductPageData, ou None se a página não pôde ser obtida ou lida sem navegador
+    """
+    started = time.monotonic()
+    try:
+        response = await get_http_client().get(url, timeout=timeout_s)
+    except httpx.HTTPError as e:
+        if pacer is not None and isinstance(e, httpx.TimeoutException):
+            pacer.record_timeout()
+        log(f"[product_http] Erro ao buscar {url}: {type(e).__name__}: {e}")
+        return None
+
+    if pacer is not None:
+        pacer.record_response(
+            response.status_code,
+            time.monotonic() - started,
+            blocked=is_block_page_url(str(response.url)),
+        )
+
+    if response.status_code != 200:
+        log(f"[product_http] Status {response.status_code} ao buscar {url}")
+        return None
+
+    return parse_product_html(response.text, ml_config)
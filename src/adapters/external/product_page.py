@@ -0,0 +1,197 @@
+"""Extração dos dados da página de produto em uma única ida ao navegador."""
+
+from __future__ import annotations
+
+from typing import Optional, TypedDict
+
+from shared.config.settings import AffiliateConfig, MLConfig
+from shared.utils.price import (
+    calc_discount,
+    discount_to_float,
+    infer_old_price_from_card_text,
+    money_parts_to_cents,
+)
+
+
+class ProductPageData(TypedDict):
+    """Dados brutos da página de produto (textos e preços estruturados)."""
+
+    old_fraction: str
+    old_cents: str
+    discount_text: str
+    commission_text: str
+    commission_alt_text: str
+    # Só preenchido quando o preço antigo não foi achado pelos seletores
+    body_text: str
+    # Preços do estado embutido (JSON-LD / __PRELOADED_STATE__), em reais
+    structured_price: Optional[float]
+    structured_original_price: Optional[float]
+
+
+# Executado inteiro no navegador, sem esperas. Cada seletor considera só o
+# primeiro elemento (como locator(...).first). O estado embutido é varrido
+# com limite de nós para não custar caro em páginas grandes.
+_PRODUCT_PAGE_JS = """
+({ oldFraction, oldCents, discount, commission, commissionAlt }) => {
+    const text = (sel) => {
+        if (!sel) return '';
+        const el = document.querySelector(sel);
+        return el ? (el.textContent || '').trim() : '';
+    };
+    const innerText = (sel) => {
+        if (!sel) return '';
+        const el = document.querySelector(sel);
+        return el ? (el.innerText || el.textContent || '').trim() : '';
+    };
+    const num = (value) => {
+        const n = typeof value === 'string' ? parseFloat(value) : value;
+        return typeof n === 'number' && isFinite(n) ? n : null;
+    };
+
+    let price = null;
+    let originalPrice = null;
+
+    for (const script of document.querySelectorAll('script[type="application/ld+json"]')) {
+        try {
+            const data = JSON.parse(script.textContent || 'null');
+            for (const item of Array.isArray(data) ? data : [data]) {
+                const offers = item && item.offers;
+                const offer = Array.isArray(offers) ? offers[0] : offers;
+                if (offer && price === null) price = num(offer.price);
+            }
+        } catch (e) {}
+    }
+
+    const state = window.__PRELOADED_STATE__;
+    if (state && typeof state === 'object') {
+        const stack = [state];
+        let visited = 0;
+        while (stack.length && visited < 20000 && originalPrice === null) {
+            const node = stack.pop();
+            visited++;
+            if (!node || typeof node !== 'object') continue;
+            if ('original_value' in node) originalPrice = num(node.original_value);
+            for (const key in node) {
+                const value = node[key];
+                if (value && typeof value === 'object') stack.push(value);
+            }
+        }
+    }
+
+    const data = {
+        old_fraction: text(oldFraction),
+        old_cents: text(oldCents),
+        discount_text: text(discount),
+        commission_text: innerText(commission),
+        commission_alt_text: innerText(commissionAlt),
+        body_text: '',
+        structured_price: price,
+        structured_original_price: originalPrice,
+    };
+    if (!data.old_fraction && document.body) {
+        data.body_text = document.body.textContent || '';
+    }
+    return data;
+}
+"""
+
+
+def _empty_page_data() -> ProductPageData:
+    return {
+        "old_fraction": "",
+        "old_cents": "",
+        "discount_text": "",
+        "commission_text": "",
+        "commission_alt_text": "",
+        "body_text": "",
+        "structured_price": None,
+        "structured_original_price": None,
+    }
+
+
+async def extract_product_page(
+    page,
+    ml_config: MLConfig,
+    affiliate_config: Optional[AffiliateConfig] = None,
+) -> ProductPageData:
+    """
+    Lê preço antigo, desconto, comissão e preços estruturados em um único evaluate.
+
+    Substitui a sequência de ``count()``/``text_content()`` por campo (uma ida
+    ao navegador cada). Não espera por seletores: chame após o carregamento.
+
+    Args:
+        page: Página do Playwright já carregada
+        ml_config: Configuração do ML com os seletores de preço
+        affiliate_config: Configuração de afiliados (seletores de comissão)
+
+    Returns:
+        ProductPageData com os textos encontrados (vazios quando ausentes).
+        Em caso de erro na avaliação, retorna dados vazios.
+    """
+    try:
+        return await page.evaluate(
+            _PRODUCT_PAGE_JS,
+            {
+                "oldFraction": ml_config.old_fraction_selector,
+                "oldCents": ml_config.old_cents_selector,
+                "discount": ml_config.discount_selector,
+                "commission": (
+                    affiliate_config.commission_selector if affiliate_config else ""
+                ),
+                "commissionAlt": (
+                    affiliate_config.commission_selector_alternative
+                    if affiliate_config
+                    else ""
+                ),
+            },
+        )
+    except Exception:
+        return _empty_page_data()
+
+
+def _reais_to_cents(value: Optional[float]) -> Optional[int]:
+    """Converte um preço em reais (do estado embutido) para centavos."""
+    if value is None or value <= 0:
+        return None
+    return int(round(value * 100))
+
+
+def resolve_prices(
+    data: ProductPageData, current_price_cents: int
+) -> tuple[Optional[int], Optional[int]]:
+    """
+    Calcula preço antigo e desconto a partir dos dados extraídos.
+
+    Ordem do preço antigo: seletores (fração + centavos), estado embutido
+    da página e, por último, inferência pelo texto da página.
+
+    Args:
+        data: Resultado de ``extract_product_page``
+        current_price_cents: Preço atual em centavos
+
+    Returns:
+        Tupla (old_price_cents, discount_pct)
+    """
+    old_price_cents = None
+    if data["old_fraction"]:
+        old_price_cents = money_parts_to_cents(
+            data["old_fraction"], data["old_cents"] or None
+        )
+
+    if old_price_cents is None:
+        original = _reais_to_cents(data["structured_original_price"])
+        current = _reais_to_cents(data["structured_price"]) or current_price_cents
+        if original and original > current:
+            old_price_cents = original
+
+    if old_price_cents is None and data["body_text"]:
+        old_price_cents = infer_old_price_from_card_text(
+            data["body_text"], current_price_cents
+        )
+
+    discount_pct = discount_to_float(data["discount_text"])
+    if discount_pct is None and old_price_cents:
+        discount_pct = calc_discount(old_price_cents, current_price_cents)
+
+    return old_price_cents, discount_pct
@@ -0,0 +1,215 @@
+"""Bloqueio de recursos pesados e trackers feito pelo próprio navegador."""
+
+from __future__ import annotations
+
+# Standard library
+import asyncio
+import weakref
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+# Third-party
+from playwright.async_api import BrowserContext, Page  # type: ignore
+
+# Local
+from shared.constants import RESOURCE_BLOCK_URL_EXTENSIONS, TRACKER_HOST_SNIPPETS
+from adapters.external.playwright_utils import route_block_heavy_resources
+from shared.utils.logging import log
+from shared.utils.metrics import track_browser_requests
+
+# Motivo informado pelo Chromium para requisições barradas por Network.setBlockedURLs
+_BLOCKED_REASON = "inspector"
+
+# Bloqueador instalado em cada contexto (usado por open_page)
+_BLOCKERS: "weakref.WeakKeyDictionary[BrowserContext, RequestBlocker]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def compile_block_patterns() -> list[str]:
+    """
+    Converte as regras de bloqueio em padrões de URL do Chromium.
+
+    Cada padrão usa ``*`` como curinga (sintaxe de ``Network.setBlockedURLs``):
+    extensões de imagens, fontes, mídia e CSS, com e sem query string, e
+    qualquer URL que contenha um host de tracker.
+
+    Returns:
+        Lista de padrões de URL
+    """
+    patterns: list[str] = []
+    for ext in RESOURCE_BLOCK_URL_EXTENSIONS:
+        patterns.append(f"*.{ext}")
+        patterns.append(f"*.{ext}?*")
+    patterns.extend(f"*{snippet}*" for snippet in TRACKER_HOST_SNIPPETS)
+    return patterns
+
+
+@dataclass
+class RequestStats:
+    """Contadores de requisições de um contexto."""
+
+    blocked: int = 0
+    allowed: int = 0
+    routed: int = 0
+    allowed_bytes: int = 0
+    blocked_by_type: Counter = field(default_factory=Counter)
+
+    def merge(self, other: "RequestStats") -> None:
+        """Soma as contagens de ``other`` às deste objeto."""
+        self.blocked += other.blocked
+        self.allowed += other.allowed
+        self.routed += other.routed
+        self.allowed_bytes += other.allowed_bytes
+        self.blocked_by_type.update(other.blocked_by_type)
+
+
+def publish_request_stats(stats: RequestStats) -> None:
+    """Registra as contagens nas métricas e no log."""
+    track_browser_requests(
+        stats.blocked, stats.allowed, stats.routed, stats.allowed_bytes
+    )
+    if stats.routed:
+        log(f"[request_blocker] {stats.routed} requisições decididas em Python (route)")
+    if not (stats.blocked or stats.allowed):
+        return
+    by_type = ", ".join(
+        f"{kind}={count}" for kind, count in stats.blocked_by_type.most_common()
+    )
+    detail = f" ({by_type})" if by_type else ""
+    log(
+        f"[request_blocker] Bloqueadas no navegador: {stats.blocked}{detail} | "
+        f"Permitidas: {stats.allowed} ({stats.allowed_bytes / 1024:.0f} KiB)"
+    )
+
+
+class RequestBlocker:
+    """
+    Bloqueia imagens, fontes, mídia, CSS e trackers sem passar pelo Python.
+
+    As regras são compiladas em padrões de URL e entregues ao Chromium via CDP
+    (``Network.setBlockedURLs``) em cada página do contexto; as requisições
+    permitidas seguem direto, sem o ida-e-volta de um ``route("**/*")``. Sem
+    CDP (browser que não é Chromium), cai para o ``route`` em Python.
+
+    As contagens vêm dos eventos ``loadingFinished``/``loadingFailed`` do CDP,
+    que são só notificações (não seguram a requisição). O navegador não baixa
+    o que bloqueia, então bytes são medidos apenas para as permitidas.
+    """
+
+    def __init__(self) -> None:
+        self.patterns = compile_block_patterns()
+        self.stats = RequestStats()
+        self._context: BrowserContext | None = None
+        self._attached: "weakref.WeakKeyDictionary[Page, asyncio.Future]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._sessions: dict[Page, Any] = {}
+        self._routed_fallback = False
+
+    async def install(self, context: BrowserContext) -> None:
+        """Passa a bloquear em todas as páginas do contexto (inclusive popups)."""
+        self._context = context
+        _BLOCKERS[context] = self
+        context.on("page", self._on_page)
+        for page in context.pages:
+            await self.attach(page)
+
+    def _on_page(self, page: Page) -> None:
+        self._attach_future(page)
+
+    def _attach_future(self, page: Page) -> asyncio.Future:
+        future = self._attached.get(page)
+        if future is None:
+            future = asyncio.ensure_future(self._attach(page))
+            self._attached[page] = future
+        return future
+
+    async def attach(self, page: Page) -> None:
+        """Instala o bloqueio na página (idempotente)."""
+        await asyncio.shield(self._attach_future(page))
+
+    async def _attach(self, page: Page) -> None:
+        if self._routed_fallback or self._context is None:
+            return
+        try:
+            session = await self._context.new_cdp_session(page)
+            await session.send("Network.enable")
+            await session.send("Network.setBlockedURLs", {"urls": self.patterns})
+        except Exception as e:
+            log(
+                f"[request_blocker] CDP indisponível ({e}). "
+                "Usando bloqueio via route em Python..."
+            )
+            await self._install_route_fallback()
+            return
+        session.on("Network.loadingFinished", self._on_loading_finished)
+        session.on("Network.loadingFailed", self._on_loading_failed)
+        self._sessions[page] = session
+        page.once("close", lambda _: self._sessions.pop(page, None))
+
+    async def _install_route_fallback(self) -> None:
+        if self._routed_fallback or self._context is None:
+            return
+        self._routed_fallback = True
+        await self._context.route("**/*", self._route)
+
+    async def _route(self, route, request) -> None:
+        self.stats.routed += 1
+        await route_block_heavy_resources(route, request)
+
+    def _on_loading_finished(self, params: dict) -> None:
+        self.stats.allowed += 1
+        self.stats.allowed_bytes += int(params.get("encodedDataLength") or 0)
+
+    def _on_loading_failed(self, params: dict) -> None:
+        if params.get("blockedReason") != _BLOCKED_REASON:
+            return
+        self.stats.blocked += 1
+        self.stats.blocked_by_type[params.get("type") or "Other"] += 1
+
+    async def close(self) -> None:
+        """Encerra as sessões CDP e publica as contagens."""
+        for session in list(self._sessions.values()):
+            try:
+                await session.detach()
+            except Exception:
+                pass
+        self._sessions.clear()
+        for future in self._attached.values():
+            if not future.done():
+                future.cancel()
+        self._attached.clear()
+        if self._context is not None:
+            _BLOCKERS.pop(self._context, None)
+        self.log_summary()
+
+    def take_stats(self) -> RequestStats:
+        """Retorna as contagens acumuladas e recomeça do zero."""
+        stats, self.stats = self.stats, RequestStats()
+        return stats
+
+    def log_summary(self) -> None:
+        """Publica as contagens de requisições bloqueadas e permitidas e as zera."""
+        publish_request_stats(self.take_stats())
+
+
+async def open_page(context: BrowserContext) -> Page:
+    """
+    Abre uma página no contexto já com o bloqueio ativo.
+
+    Garante que ``Network.setBlockedURLs`` foi aplicado antes da primeira
+    navegação (o listener de ``page`` do contexto é assíncrono).
+
+    Args:
+        context: Contexto do browser
+
+    Returns:
+        Nova página
+    """
+    page = await context.new_page()
+    blocker = _BLOCKERS.get(context)
+    if blocker is not None:
+        await blocker.attach(page)
+    return page
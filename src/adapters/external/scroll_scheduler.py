@@ -0,0 +1,383 @@
+"""Agendador de scroll orientado a eventos, com tempos aprendidos entre execuções."""
+
+from __future__ import annotations
+
+# Standard library
+import asyncio
+import json
+import os
+import pathlib
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Local
+from shared.constants import (
+    SCROLL_BUDGET_HEADROOM,
+    SCROLL_PIXELS,
+    SCROLL_QUIET_MS,
+    SCROLL_TIMINGS_MAX_SAMPLES,
+    SCROLL_TIMINGS_MIN_SAMPLES,
+    SCROLL_WAIT_MIN_MS,
+)
+from shared.utils.logging import log
+
+# Resolve assim que o número de cards no DOM passa do valor anterior
+_CARD_GROWTH_JS = """
+({ selector, previous }) => document.querySelectorAll(selector).length > previous
+"""
+
+# Resolve com o número de cards no DOM assim que ele passa do valor anterior
+_CARD_COUNT_GROWTH_JS = """
+({ selector, previous }) => {
+    const count = document.querySelectorAll(selector).length;
+    return count > previous ? count : 0;
+}
+"""
+
+# Sentinela do fim da lista: a viewport alcançou o rodapé do documento
+_AT_END_JS = """
+() => {
+    const root = document.scrollingElement || document.documentElement;
+    return !!root && window.scrollY + window.innerHeight >= root.scrollHeight - 8;
+}
+"""
+
+_TRACKED_RESOURCE_TYPES = ("xhr", "fetch")
+
+
+def percentile(values: list[float], pct: float) -> Optional[float]:
+    """
+    Calcula o percentil ``pct`` (0-100) com interpolação linear.
+
+    Returns:
+        Valor do percentil ou None se a lista estiver vazia.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return float(ordered[0])
+    rank = (len(ordered) - 1) * max(0.0, min(100.0, pct)) / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def resolve_scroll_timings_path() -> pathlib.Path:
+    """
+    Resolve o caminho do arquivo de tempos de scroll aprendidos.
+
+    Usa a variável de ambiente SCROLL_TIMINGS_PATH ou, por padrão,
+    scroll_timings.json no diretório raiz do projeto.
+    """
+    env_path = os.getenv("SCROLL_TIMINGS_PATH", "").strip()
+    if env_path:
+        return pathlib.Path(env_path).expanduser()
+
+    # Vai até o diretório raiz do projeto (4 níveis acima: external -> adapters -> src -> raiz)
+    parent_dir = pathlib.Path(__file__).resolve().parent.parent.parent.parent
+    return parent_dir / "scroll_timings.json"
+
+
+@dataclass
+class ScrollTimings:
+    """
+    Latências "scroll até novos cards visíveis" (em ms), persistidas entre execuções.
+
+    ``samples_ms`` é uma janela deslizante que mistura execuções anteriores e a
+    atual; ``run_samples_ms`` guarda apenas as amostras desta execução.
+    """
+
+    samples_ms: list[float] = field(default_factory=list)
+    run_samples_ms: list[float] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> ScrollTimings:
+        """Carrega os tempos salvos; arquivo ausente ou inválido resulta em vazio."""
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            samples = [float(v) for v in data.get("samples_ms", []) if v is not None]
+        except FileNotFoundError:
+            return cls()
+        except Exception as e:
+            log(f"[scroll_scheduler] Ignorando tempos de scroll inválidos em {path}: {e}")
+            return cls()
+        return cls(samples_ms=samples[-SCROLL_TIMINGS_MAX_SAMPLES:])
+
+    def record(self, elapsed_ms: float) -> None:
+        """Registra uma amostra de latência."""
+        self.samples_ms.append(elapsed_ms)
+        self.run_samples_ms.append(elapsed_ms)
+        if len(self.samples_ms) > SCROLL_TIMINGS_MAX_SAMPLES:
+            del self.samples_ms[: len(self.samples_ms) - SCROLL_TIMINGS_MAX_SAMPLES]
+
+    def budget_ms(self, fallback_ms: int) -> int:
+        """
+        Tempo máximo de espera por novos cards após um scroll.
+
+        Usa o p95 aprendido com folga de SCROLL_BUDGET_HEADROOM, limitado a
+        [SCROLL_WAIT_MIN_MS, fallback_ms]. Sem amostras suficientes, usa o fallback.
+        """
+        if len(self.samples_ms) < SCROLL_TIMINGS_MIN_SAMPLES:
+            return fallback_ms
+        p95 = percentile(self.samples_ms, 95) or 0.0
+        learned = int(p95 * SCROLL_BUDGET_HEADROOM)
+        return max(SCROLL_WAIT_MIN_MS, min(fallback_ms, learned))
+
+    def summary(self) -> dict[str, Optional[float]]:
+        """Percentis das amostras desta execução."""
+        return {
+            "count": float(len(self.run_samples_ms)),
+            "p50": percentile(self.run_samples_ms, 50),
+            "p95": percentile(self.run_samples_ms, 95),
+            "p99": percentile(self.run_samples_ms, 99),
+        }
+
+    def save(self, path: pathlib.Path) -> None:
+        """Persiste a janela de amostras e o resumo da execução."""
+        payload = {
+            "samples_ms": [round(v, 1) for v in self.samples_ms],
+            "last_run": self.summary(),
+            "updated_at": int(time.time()),
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+            tmp_path.replace(path)
+        except Exception as e:
+            log(f"[scroll_scheduler] Não foi possível salvar tempos de scroll: {e}")
+
+
+@dataclass
+class ScrollWaitResult:
+    """Resultado da espera após um scroll."""
+
+    grew: bool
+    at_end: bool
+    elapsed_ms: float
+
+
+class ScrollScheduler:
+    """
+    Espera por condições reais da página em vez de delays fixos.
+
+    Após cada scroll aguarda (o que ocorrer primeiro):
+    - crescimento do número de cards (``wait_for_function``);
+    - nenhuma requisição XHR/fetch pendente e a sentinela de fim da lista visível.
+
+    O tempo até os novos cards aparecerem é registrado em ``timings``; o limite
+    de espera vem do p95 aprendido nas execuções anteriores.
+    """
+
+    def __init__(
+        self, page, card_selector: str, timings: ScrollTimings, fallback_ms: int
+    ) -> None:
+        self.page = page
+        self.card_selector = card_selector
+        self.timings = timings
+        self.fallback_ms = fallback_ms
+        self._pending: set = set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def budget_ms(self) -> int:
+        """Limite de espera atual por novos cards."""
+        return self.timings.budget_ms(self.fallback_ms)
+
+    @property
+    def pending_requests(self) -> int:
+        """Número de requisições XHR/fetch em andamento."""
+        return len(self._pending)
+
+    def attach(self) -> None:
+        """Começa a acompanhar as requisições XHR/fetch da página."""
+        self.page.on("request", self._on_request)
+        self.page.on("requestfinished", self._on_request_done)
+        self.page.on("requestfailed", self._on_request_done)
+
+    def detach(self) -> None:
+        """Remove os listeners de requisições."""
+        for event, handler in (
+            ("request", self._on_request),
+            ("requestfinished", self._on_request_done),
+            ("requestfailed", self._on_request_done),
+        ):
+            try:
+                self.page.remove_listener(event, handler)
+            except Exception:
+                pass
+        self._pending.clear()
+        self._idle.set()
+
+    def _on_request(self, request) -> None:
+        try:
+            if request.resource_type not in _TRACKED_RESOURCE_TYPES:
+                return
+        except Exception:
+            return
+        self._pending.add(request)
+        self._idle.clear()
+
+    def _on_request_done(self, request) -> None:
+        self._pending.discard(request)
+        if not self._pending:
+            self._idle.set()
+
+    async def wait_for_idle(self, timeout_ms: int) -> bool:
+        """
+        Aguarda não haver requisições pendentes por SCROLL_QUIET_MS.
+
+        Returns:
+            True se a rede ficou ociosa dentro do timeout.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_ms / 1000
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return False
+            await asyncio.sleep(min(SCROLL_QUIET_MS / 1000, remaining))
+            if not self._pending:
+                return True
+
+    async def _is_at_end(self) -> bool:
+        try:
+            return bool(await self.page.evaluate(_AT_END_JS))
+        except Exception:
+            return False
+
+    async def _wait_for_growth(self, previous_count: int, timeout_ms: int) -> bool:
+        try:
+            await self.page.wait_for_function(
+                _CARD_GROWTH_JS,
+                arg={"selector": self.card_selector, "previous": previous_count},
+                timeout=timeout_ms,
+            )
+            return True
+        except Exception:
+            return False
+
+    async def wait_for_growth(self, previous_count: int, timeout_ms: int) -> int:
+        """
+        Aguarda o número de cards passar de ``previous_count`` ou a rede esvaziar.
+
+        Espera intermediária (etapas de um scroll, recuperação após queda do
+        DOM): não registra amostra de latência em ``timings``.
+
+        Returns:
+            Número de cards no DOM se ele cresceu; senão ``previous_count``.
+        """
+
+        async def grown_count() -> int:
+            try:
+                handle = await self.page.wait_for_function(
+                    _CARD_COUNT_GROWTH_JS,
+                    arg={"selector": self.card_selector, "previous": previous_count},
+                    timeout=timeout_ms,
+                )
+                return int(await handle.json_value())
+            except Exception:
+                return previous_count
+
+        growth = asyncio.ensure_future(grown_count())
+        idle = asyncio.ensure_future(self.wait_for_idle(timeout_ms))
+        try:
+            done, _ = await asyncio.wait(
+                {growth, idle}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if growth in done:
+                return growth.result()
+            # Rede ociosa: o que tinha de carregar já carregou
+            return previous_count
+        finally:
+            for task in (growth, idle):
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(growth, idle, return_exceptions=True)
+
+    async def _wait_for_idle_end(self, timeout_ms: int) -> bool:
+        """Resolve True se a rede ficar ociosa com a sentinela de fim visível."""
+        if not await self.wait_for_idle(timeout_ms):
+            return False
+        return await self._is_at_end()
+
+    async def wait_for_new_cards(
+        self, previous_count: int, scroll_started: Optional[float] = None
+    ) -> ScrollWaitResult:
+        """
+        Aguarda novos cards após um scroll já realizado.
+
+        Se o limite aprendido estourar com requisições ainda em andamento, espera
+        a rede esvaziar (até o fallback) antes de concluir que não houve
+        crescimento, para não enviesar as amostras nem parar cedo demais.
+
+        Args:
+            previous_count: Número de cards no DOM antes do scroll
+            scroll_started: ``loop.time()`` do início do scroll, quando ele foi
+                feito em etapas antes desta chamada (a latência é medida a partir dele)
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        budget = self.budget_ms
+
+        growth = asyncio.ensure_future(self._wait_for_growth(previous_count, budget))
+        idle_end = asyncio.ensure_future(self._wait_for_idle_end(budget))
+        grew = at_end = False
+        try:
+            pending = {growth, idle_end}
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                if growth in done and growth.result():
+                    grew = True
+                    break
+                if idle_end in done and idle_end.result():
+                    at_end = True
+                    break
+        finally:
+            for task in (growth, idle_end):
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(growth, idle_end, return_exceptions=True)
+
+        if not grew and not at_end and self._pending:
+            remaining = max(0, self.fallback_ms - int((loop.time() - started) * 1000))
+            if remaining and await self.wait_for_idle(remaining):
+                grew = await self._wait_for_growth(previous_count, SCROLL_WAIT_MIN_MS)
+
+        elapsed_ms = (loop.time() - (scroll_started or started)) * 1000
+        if grew:
+            self.timings.record(elapsed_ms)
+        return ScrollWaitResult(grew=grew, at_end=at_end, elapsed_ms=elapsed_ms)
+
+    async def scroll_and_wait(
+        self, previous_count: int, pixels: int = SCROLL_PIXELS
+    ) -> ScrollWaitResult:
+        """Rola a página e aguarda novos cards (ver ``wait_for_new_cards``)."""
+        scroll_started = asyncio.get_running_loop().time()
+        await self.page.mouse.wheel(0, pixels)
+        return await self.wait_for_new_cards(previous_count, scroll_started)
+
+    async def settle(self) -> None:
+        """Aguarda as requisições pendentes terminarem (substitui a espera final fixa)."""
+        await self.wait_for_idle(self.budget_ms)
+
+    def log_summary(self) -> None:
+        """Registra os percentis de latência desta execução."""
+        summary = self.timings.summary()
+        if not summary["count"]:
+            return
+        log(
+            f"[scroll_scheduler] Latência scroll→novos cards: "
+            f"p50={summary['p50']:.0f}ms p95={summary['p95']:.0f}ms "
+            f"p99={summary['p99']:.0f}ms ({int(summary['count'])} amostras, "
+            f"limite atual {self.budget_ms}ms)"
+        )
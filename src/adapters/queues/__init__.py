@@ -1,13 +1,27 @@
 """Módulo de filas para processamento assíncrono."""
 
+from adapters.queues.enrichment_cache import (
+    CachedEnrichment,
+    EnrichmentCache,
+    get_enrichment_cache,
+)
 from adapters.queues.enrichment_queue import (
+    configure_rate_limits,
     enqueue_enrichment_job,
+    enqueue_unique_batches,
+    enrichment_job_id,
     get_queue,
     get_redis_connection,
 )
 
 __all__ = [
+    "CachedEnrichment",
+    "EnrichmentCache",
+    "configure_rate_limits",
     "enqueue_enrichment_job",
+    "enqueue_unique_batches",
+    "enrichment_job_id",
+    "get_enrichment_cache",
     "get_queue",
     "get_redis_connection",
 ]
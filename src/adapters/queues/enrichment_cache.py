@@ -0,0 +1,197 @@
+"""Cache dos resultados de enriquecimento no Redis."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import redis
+
+from adapters.queues.enrichment_queue import get_redis_connection
+from shared.config.settings import EnrichmentConfig
+from shared.constants import (
+    ENRICHMENT_CACHE_KEY_PREFIX,
+    ENRICHMENT_CACHE_MGET_CHUNK,
+    ENRICHMENT_TIER_AFFILIATE,
+    ENRICHMENT_TIER_PRICE,
+)
+from shared.utils.logging import log
+
+
+@dataclass(frozen=True)
+class CachedEnrichment:
+    """Campos enriquecidos de uma oferta (None quando ausentes no cache)."""
+
+    old_price_cents: Optional[int] = None
+    discount_pct: Optional[int] = None
+    affiliate_link: Optional[str] = None
+    affiliation_id: Optional[str] = None
+
+
+def _load(value: Optional[bytes]) -> Optional[dict[str, Any]]:
+    if value is None:
+        return None
+    try:
+        data = json.loads(value)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+class EnrichmentCache:
+    """
+    Resultados de enriquecimento por (marketplace, external_id).
+
+    Cada oferta usa duas chaves, uma por tier, com TTLs próprios: preço
+    antigo/desconto mudam em horas, link e ID de afiliado valem por dias.
+    A entrada de preço guarda o ``price_cents`` de quando foi lida e é
+    descartada quando o preço coletado muda.
+    """
+
+    def __init__(
+        self, redis_conn: redis.Redis, price_ttl_s: int, affiliate_ttl_s: int
+    ) -> None:
+        """
+        Args:
+            redis_conn: Conexão Redis
+            price_ttl_s: TTL da entrada de preço (0: não grava)
+            affiliate_ttl_s: TTL da entrada de afiliado (0: não grava)
+        """
+        self.redis = redis_conn
+        self.ttls = {
+            ENRICHMENT_TIER_PRICE: price_ttl_s,
+            ENRICHMENT_TIER_AFFILIATE: affiliate_ttl_s,
+        }
+
+    @staticmethod
+    def key(marketplace: str, external_id: str, tier: str) -> str:
+        """Chave Redis da entrada de um tier."""
+        return f"{ENRICHMENT_CACHE_KEY_PREFIX}:{marketplace}:{external_id}:{tier}"
+
+    def get_many(
+        self, offers: list[tuple[str, str, int]]
+    ) -> dict[tuple[str, str], CachedEnrichment]:
+        """
+        Busca as entradas de várias ofertas de uma vez.
+
+        As chaves são lidas com MGETs em blocos, enviados juntos em um
+        pipeline (uma ida ao Redis). Entradas de preço com ``price_cents``
+        diferente do atual são removidas.
+
+        Args:
+            offers: Tuplas (marketplace, external_id, price_cents atual)
+
+        Returns:
+            Mapa (marketplace, external_id) -> CachedEnrichment, só com as
+            ofertas que tinham alguma entrada válida
+        """
+        keys = [
+            self.key(marketplace, external_id, tier)
+            for marketplace, external_id, _price in offers
+            for tier in (ENRICHMENT_TIER_PRICE, ENRICHMENT_TIER_AFFILIATE)
+        ]
+        if not keys:
+            return {}
+
+        with self.redis.pipeline(transaction=False) as pipe:
+            for i in range(0, len(keys), ENRICHMENT_CACHE_MGET_CHUNK):
+                pipe.mget(keys[i : i + ENRICHMENT_CACHE_MGET_CHUNK])
+            values = [value for chunk in pipe.execute() for value in chunk]
+
+        cached: dict[tuple[str, str], CachedEnrichment] = {}
+        stale: list[str] = []
+        for index, (marketplace, external_id, price_cents) in enumerate(offers):
+            price = _load(values[2 * index])
+            affiliate = _load(values[2 * index + 1]) or {}
+            if price is not None and price.get("price_cents") != price_cents:
+                stale.append(keys[2 * index])
+                price = None
+            price = price or {}
+            entry = CachedEnrichment(
+                old_price_cents=price.get("old_price_cents"),
+                discount_pct=price.get("discount_pct"),
+                affiliate_link=affiliate.get("affiliate_link"),
+                affiliation_id=affiliate.get("affiliation_id"),
+            )
+            if entry != CachedEnrichment():
+                cached[(marketplace, external_id)] = entry
+
+        if stale:
+            self.redis.delete(*stale)
+        return cached
+
+    def set_many(
+        self, entries: list[tuple[str, str, int, CachedEnrichment]]
+    ) -> None:
+        """
+        Grava os resultados de várias ofertas em um pipeline.
+
+        Só grava a entrada de um tier quando ele trouxe algum campo.
+
+        Args:
+            entries: Tuplas (marketplace, external_id, price_cents, resultado)
+        """
+        with self.redis.pipeline(transaction=False) as pipe:
+            for marketplace, external_id, price_cents, entry in entries:
+                price_ttl = self.ttls[ENRICHMENT_TIER_PRICE]
+                if price_ttl and (
+                    entry.old_price_cents is not None or entry.discount_pct is not None
+                ):
+                    pipe.set(
+                        self.key(marketplace, external_id, ENRICHMENT_TIER_PRICE),
+                        json.dumps(
+                            {
+                                "price_cents": price_cents,
+                                "old_price_cents": entry.old_price_cents,
+                                "discount_pct": entry.discount_pct,
+                            }
+                        ),
+                        ex=price_ttl,
+                    )
+                affiliate_ttl = self.ttls[ENRICHMENT_TIER_AFFILIATE]
+                if affiliate_ttl and (entry.affiliate_link or entry.affiliation_id):
+                    pipe.set(
+                        self.key(marketplace, external_id, ENRICHMENT_TIER_AFFILIATE),
+                        json.dumps(
+                            {
+                                "affiliate_link": entry.affiliate_link,
+                                "affiliation_id": entry.affiliation_id,
+                            }
+                        ),
+                        ex=affiliate_ttl,
+                    )
+            pipe.execute()
+
+
+# Cache do processo (conexão Redis reaproveitada entre jobs)
+_cache: Optional[EnrichmentCache] = None
+
+
+def get_enrichment_cache(config: EnrichmentConfig) -> Optional[EnrichmentCache]:
+    """
+    Retorna o cache de enriquecimento do processo.
+
+    Args:
+        config: Configuração de enriquecimento
+
+    Returns:
+        EnrichmentCache, ou None se o cache estiver desativado (REDIS_URL
+        vazio ou os dois TTLs em 0) ou o Redis estiver indisponível
+    """
+    global _cache
+
+    if not config.redis_url or not (
+        config.cache_price_ttl_s or config.cache_affiliate_ttl_s
+    ):
+        return None
+    if _cache is None:
+        try:
+            redis_conn = get_redis_connection(config)
+        except Exception as e:
+            log(f"[enrichment_cache] Cache indisponível: {e}")
+            return None
+        _cache = EnrichmentCache(
+            redis_conn, config.cache_price_ttl_s, config.cache_affiliate_ttl_s
+        )
+    return _cache
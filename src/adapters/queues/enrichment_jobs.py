@@ -3,15 +3,23 @@
 from __future__ import annotations
 
 import asyncio
+from typing import Any, Callable, Coroutine
 
-from shared.config.settings import get_config
-from adapters.database import DatabaseService, get_session, init_db
+from rq import get_current_job
+
+from shared.config.settings import Config, get_config
+from adapters.database import DatabaseService, get_client
+from adapters.queues.enrichment_cache import CachedEnrichment, get_enrichment_cache
+from adapters.workers.browser_pool import flush_browser_pool_request_stats
+from adapters.workers.worker_runtime import get_worker_runtime
 from core.use_cases.enrichment_service import enrich_offer
+from shared.constants import ENRICHMENT_TIER_AFFILIATE, ENRICHMENT_TIER_PRICE
 from shared.utils.logging import log
+from shared.utils.rate_limiter import get_rate_limiter
 
 
 async def _async_enrich_offer_job(
-    offer_id: str, url: str, current_price_cents: int
+    offer_id: str, url: str, current_price_cents: int, config: Config
 ) -> dict:
     """
     Job assíncrono para enriquecer uma oferta.
@@ -20,11 +28,11 @@ async def _async_enrich_offer_job(
         offer_id: ID da oferta no banco de dados
         url: URL da oferta para scraping
         current_price_cents: Preço atual em centavos
+        config: Configuração (a do runtime do worker, carregada no boot)
 
     Returns:
         Dicionário com resultado do enriquecimento
     """
-    config = get_config()
 
     log(f"[enrichment_job] Iniciando enriquecimento de oferta {offer_id} ({url})")
 
@@ -38,32 +46,33 @@ async def _async_enrich_offer_job(
             timeout_ms=60000,
             request_delay_s=config.enrichment.request_delay_s,
             use_browser_pool=True,  # Usa browser pool para melhor performance
+            budget_s=config.enrichment.offer_budget_s,
+            http_first=config.enrichment.http_first,
         )
+        if result.navigation_failed:
+            # Campos vazios de uma página que não abriu não vão para o banco
+            raise RuntimeError(f"página da oferta não abriu: {url}")
 
-        # Atualiza o banco de dados
-        init_db(config.database)
-
-        async for client in get_session():
-            try:
-                db_service = DatabaseService(client)
-                await db_service.offers.update_offer_enrichment(
-                    offer_id=offer_id,
-                    old_price_cents=result.old_price_cents,
-                    discount_pct=result.discount_pct,
-                    affiliate_link=result.affiliate_link,
-                    affiliation_id=result.affiliation_id,
-                )
-                log(
-                    f"[enrichment_job] Oferta {offer_id} atualizada com sucesso: "
-                    f"old_price={result.old_price_cents}, "
-                    f"discount={result.discount_pct}%, "
-                    f"affiliate_link={'sim' if result.affiliate_link else 'não'}, "
-                    f"affiliation_id={'sim' if result.affiliation_id else 'não'}"
-                )
-                break  # Sai do loop após sucesso
-            except Exception as e:
-                log(f"[enrichment_job] Erro ao atualizar oferta {offer_id}: {e}")
-                raise
+        # Atualiza o banco de dados (cliente criado uma vez por thread)
+        try:
+            db_service = DatabaseService(get_client(), config.database)
+            await db_service.offers.update_offer_enrichment(
+                offer_id=offer_id,
+                old_price_cents=result.old_price_cents,
+                discount_pct=result.discount_pct,
+                affiliate_link=result.affiliate_link,
+                affiliation_id=result.affiliation_id,
+            )
+            log(
+                f"[enrichment_job] Oferta {offer_id} atualizada com sucesso: "
+                f"old_price={result.old_price_cents}, "
+                f"discount={result.discount_pct}%, "
+                f"affiliate_link={'sim' if result.affiliate_link else 'não'}, "
+                f"affiliation_id={'sim' if result.affiliation_id else 'não'}"
+            )
+        except Exception as e:
+            log(f"[enrichment_job] Erro ao atualizar oferta {offer_id}: {e}")
+            raise
 
         return {
             "success": True,
@@ -72,6 +81,8 @@ async def _async_enrich_offer_job(
             "discount_pct": result.discount_pct,
             "affiliate_link": result.affiliate_link is not None,
             "affiliation_id": result.affiliation_id is not None,
+            "budget_exhausted": result.budget_exhausted,
+            "step_timings_ms": result.step_timings_ms,
         }
 
     except Exception as e:
@@ -86,6 +97,142 @@ async def _async_enrich_offer_job(
         }
 
 
+async def _async_enrich_offers_batch_job(
+    items: list[tuple], config: Config, tier: str | None = None
+) -> dict:
+    """
+    Job assíncrono para enriquecer um lote de ofertas.
+
+    As ofertas são processadas em paralelo (limitadas pelo browser pool) e
+    os resultados são gravados de uma vez com ``update_offer_enrichment_many``.
+
+    Args:
+        items: Tuplas (offer_id, url, current_price_cents[, marketplace,
+            external_id]); com marketplace e external_id, o resultado vai
+            para o cache de enriquecimento
+        config: Configuração (a do runtime do worker, carregada no boot)
+        tier: Tier a enriquecer (preço ou afiliado); None faz os dois
+
+    Returns:
+        Dicionário com o resumo do lote
+    """
+    log(
+        f"[enrichment_job] Iniciando enriquecimento em lote de {len(items)} ofertas "
+        f"(tier: {tier or 'completo'})"
+    )
+    rate_limiter = None
+    if tier is not None:
+        tier_config = config.enrichment.tiers[tier]
+        rate_limiter = get_rate_limiter(
+            tier_config.rate_budget, tier_config.rate_limit_per_min
+        )
+
+    async def enrich_one(item: tuple):
+        offer_id, url, current_price_cents = item[:3]
+        try:
+            return await enrich_offer(
+                url=url,
+                current_price_cents=current_price_cents,
+                ml_config=config.ml,
+                affiliate_config=config.affiliate,
+                timeout_ms=60000,
+                request_delay_s=config.enrichment.request_delay_s,
+                use_browser_pool=True,
+                budget_s=config.enrichment.offer_budget_s,
+                http_first=config.enrichment.http_first,
+                prices=tier != ENRICHMENT_TIER_AFFILIATE,
+                affiliate=tier != ENRICHMENT_TIER_PRICE,
+                rate_limiter=rate_limiter,
+            )
+        except Exception as e:
+            log(f"[enrichment_job] Erro ao enriquecer oferta {offer_id} ({url}): {e}")
+            return None
+
+    results = await asyncio.gather(*(enrich_one(item) for item in items))
+
+    updates = []
+    failed = []
+    step_timings_ms = {}
+    cache_entries = []
+    for item, result in zip(items, results):
+        offer_id, _url, current_price_cents = item[:3]
+        if result is None or result.navigation_failed:
+            # Sem gravar nulos nem cachear: o retry do tier refaz a oferta
+            failed.append(offer_id)
+            continue
+        step_timings_ms[offer_id] = result.step_timings_ms
+        if len(item) == 5:
+            marketplace, external_id = item[3:]
+            cache_entries.append(
+                (
+                    marketplace,
+                    external_id,
+                    current_price_cents,
+                    CachedEnrichment(
+                        old_price_cents=result.old_price_cents,
+                        discount_pct=result.discount_pct,
+                        affiliate_link=result.affiliate_link,
+                        affiliation_id=result.affiliation_id,
+                    ),
+                )
+            )
+        updates.append(
+            {
+                "offer_id": offer_id,
+                "old_price_cents": result.old_price_cents,
+                "discount_pct": result.discount_pct,
+                "affiliate_link": result.affiliate_link,
+                "affiliation_id": result.affiliation_id,
+            }
+        )
+
+    # Uma gravação em lote para todo o job; erro aqui falha o job (retry do RQ)
+    db_service = DatabaseService(get_client(), config.database)
+    updated = await db_service.offers.update_offer_enrichment_many(
+        updates, chunk_size=config.database.ingest_chunk_size
+    )
+    log(
+        f"[enrichment_job] Lote concluído: {updated} ofertas atualizadas, "
+        f"{len(failed)} falhas"
+    )
+
+    # Próximas coletas reaproveitam o resultado sem novo job
+    cache = get_enrichment_cache(config.enrichment) if cache_entries else None
+    if cache is not None:
+        try:
+            cache.set_many(cache_entries)
+        except Exception as e:
+            log(f"[enrichment_job] Erro ao gravar cache de enriquecimento: {e}")
+
+    return {
+        "success": not failed,
+        "tier": tier,
+        "updated": updated,
+        "failed_offer_ids": failed,
+        "step_timings_ms": step_timings_ms,
+    }
+
+
+async def _publishing_request_stats(job: Coroutine[Any, Any, dict]) -> dict:
+    """Roda o job e publica as contagens de requisições do browser pool ao final."""
+    try:
+        return await job
+    finally:
+        # No loop do pool, onde os eventos do CDP atualizam as contagens
+        flush_browser_pool_request_stats()
+
+
+def _run_job(job: Callable[[Config], Coroutine[Any, Any, dict]]) -> dict:
+    """Executa a corrotina do job no runtime do worker (ou em um loop próprio)."""
+    runtime = get_worker_runtime()
+    if runtime is not None:
+        # Loop persistente do worker: pool, banco e config já aquecidos
+        return runtime.run(_publishing_request_stats(job(runtime.config)))
+
+    # Fora do worker (ex.: execução direta): um event loop só para este job
+    return asyncio.run(_publishing_request_stats(job(get_config())))
+
+
 def enrich_offer_job(offer_id: str, url: str, current_price_cents: int) -> dict:
     """
     Job RQ para enriquecer uma oferta.
@@ -101,5 +248,93 @@ def enrich_offer_job(offer_id: str, url: str, current_price_cents: int) -> dict:
     Returns:
         Dicionário com resultado do enriquecimento
     """
-    # Executa a função async com um único event loop
-    return asyncio.run(_async_enrich_offer_job(offer_id, url, current_price_cents))
+    return _run_job(
+        lambda config: _async_enrich_offer_job(
+            offer_id, url, current_price_cents, config
+        )
+    )
+
+
+class EnrichmentBatchError(Exception):
+    """Ofertas de um lote falharam; o retry do RQ refaz só essas ofertas."""
+
+
+def _run_batch_job(items: list[tuple], tier: str | None = None) -> dict:
+    """
+    Executa um job em lote e falha o job se alguma oferta falhou.
+
+    As ofertas bem-sucedidas já foram gravadas: os argumentos do job são
+    reduzidos às que falharam antes da exceção, e o RQ salva o job com
+    eles ao agendar o retry da política do tier.
+    """
+    summary = _run_job(
+        lambda config: _async_enrich_offers_batch_job(items, config, tier=tier)
+    )
+    failed = set(summary["failed_offer_ids"])
+    if failed:
+        job = get_current_job()
+        if job is not None:
+            job.args = ([item for item in items if item[0] in failed],)
+        raise EnrichmentBatchError(
+            f"{len(failed)} de {len(items)} ofertas falharam "
+            f"(tier: {tier or 'completo'})"
+        )
+    return summary
+
+
+def enrich_offers_batch_job(items: list[tuple]) -> dict:
+    """
+    Job RQ para enriquecer um lote de ofertas.
+
+    Dilui o custo fixo por job (serialização, ida ao Redis, gravação no
+    banco) entre as ofertas do lote. Enfileirado pelo scraper em blocos de
+    ``ENRICHMENT_BATCH_SIZE``.
+
+    Args:
+        items: Tuplas (offer_id, url, current_price_cents[, marketplace, external_id])
+
+    Returns:
+        Dicionário com o resumo do lote
+
+    Raises:
+        EnrichmentBatchError: Se alguma oferta falhou (o retry refaz só elas)
+    """
+    return _run_batch_job(items)
+
+
+def enrich_prices_job(items: list[tuple]) -> dict:
+    """
+    Job RQ do tier de preço: preço antigo e desconto de um lote de ofertas.
+
+    Leitura por HTTP (navegador só como fallback), sem o fluxo de
+    compartilhamento; usa o rate limiter do tier de preço.
+
+    Args:
+        items: Tuplas (offer_id, url, current_price_cents[, marketplace, external_id])
+
+    Returns:
+        Dicionário com o resumo do lote
+
+    Raises:
+        EnrichmentBatchError: Se alguma oferta falhou (o retry refaz só elas)
+    """
+    return _run_batch_job(items, tier=ENRICHMENT_TIER_PRICE)
+
+
+def capture_affiliate_links_job(items: list[tuple]) -> dict:
+    """
+    Job RQ do tier de afiliado: link e ID de afiliado de um lote de ofertas.
+
+    Abre a página no navegador e faz o fluxo "Compartilhar"; usa o rate
+    limiter do tier de afiliado.
+
+    Args:
+        items: Tuplas (offer_id, url, current_price_cents[, marketplace, external_id])
+
+    Returns:
+        Dicionário com o resumo do lote
+
+    Raises:
+        EnrichmentBatchError: Se alguma oferta falhou (o retry refaz só elas)
+    """
+    return _run_batch_job(items, tier=ENRICHMENT_TIER_AFFILIATE)
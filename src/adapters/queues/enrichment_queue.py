@@ -2,13 +2,33 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Callable, Optional
 
 import redis
-from rq import Queue
+from rq import Queue, Retry
+from rq.job import Job, JobStatus
+from rq.utils import as_text
 
 from shared.config.settings import EnrichmentConfig
+from shared.constants import (
+    ENRICHMENT_ENQUEUE_WATCH_RETRIES,
+    ENRICHMENT_PENDING_KEY_PREFIX,
+    ENRICHMENT_PENDING_TTL_S,
+)
 from shared.utils.logging import log
+from shared.utils.rate_limiter import (
+    AdaptivePacingConfig,
+    configure_adaptive_pacing,
+    configure_shared_rate_limits,
+)
+
+# Jobs que ainda vão rodar (retry com intervalo fica em SCHEDULED)
+_ACTIVE_STATUSES = {
+    JobStatus.QUEUED.value,
+    JobStatus.STARTED.value,
+    JobStatus.SCHEDULED.value,
+    JobStatus.DEFERRED.value,
+}
 
 
 def get_redis_connection(config: EnrichmentConfig) -> redis.Redis:
@@ -39,9 +59,41 @@ def get_redis_connection(config: EnrichmentConfig) -> redis.Redis:
         raise
 
 
+def configure_rate_limits(config: EnrichmentConfig) -> bool:
+    """
+    Configura os rate limits do processo: orçamentos compartilhados e ritmo adaptativo.
+
+    Com RATE_LIMIT_SHARED=false, ou se o Redis não responder, cada
+    processo fica com seus próprios limiters e circuit breaker. Com RATE_LIMIT_ADAPTIVE=true,
+    cada processo ajusta o próprio ritmo pelas respostas do ML, mesmo
+    dentro de um orçamento compartilhado.
+
+    Args:
+        config: Configuração de enriquecimento (REDIS_URL, RATE_LIMIT_*)
+
+    Returns:
+        True se os orçamentos compartilhados estão ativos
+    """
+    configure_adaptive_pacing(
+        AdaptivePacingConfig(max_factor=config.adaptive_max_factor)
+        if config.adaptive_rate_limits
+        else None
+    )
+    if not config.shared_rate_limits or not config.redis_url:
+        return False
+    try:
+        configure_shared_rate_limits(get_redis_connection(config))
+    except Exception as e:
+        log(f"[queue] Rate limit compartilhado indisponível, usando limites locais: {e}")
+        return False
+    log("[queue] Rate limit e circuit breaker compartilhados entre processos (Redis)")
+    return True
+
+
 def get_queue(
     config: Optional[EnrichmentConfig] = None,
     redis_conn: Optional[redis.Redis] = None,
+    queue_name: Optional[str] = None,
 ) -> Queue:
     """
     Obtém ou cria uma fila RQ.
@@ -49,6 +101,8 @@ def get_queue(
     Args:
         config: Configuração de enriquecimento (opcional se redis_conn for fornecido)
         redis_conn: Conexão Redis (opcional, será criada se não fornecida)
+        queue_name: Nome da fila (padrão: fila principal da configuração),
+            ex.: a fila de um tier
 
     Returns:
         Fila RQ configurada
@@ -63,20 +117,145 @@ def get_queue(
     if redis_conn is None:
         raise ValueError("Não foi possível criar conexão Redis")
 
-    queue_name = config.queue_name if config else "enrichment"
+    if queue_name is None:
+        queue_name = config.queue_name if config else "enrichment"
     return Queue(queue_name, connection=redis_conn)
 
 
+def enrichment_job_id(tier: Optional[str], offer_id: str) -> str:
+    """
+    ID determinístico do job de enriquecimento de uma oferta.
+
+    Jobs em lote recebem o ID da primeira oferta do lote.
+
+    Args:
+        tier: Tier do job (None: enriquecimento completo)
+        offer_id: ID da oferta no banco de dados
+
+    Returns:
+        ID do job RQ (só letras, números, "_" e "-")
+    """
+    return f"enrich-{tier}-{offer_id}" if tier else f"enrich-{offer_id}"
+
+
+def _pending_key(tier: Optional[str], offer_id: str) -> str:
+    return f"{ENRICHMENT_PENDING_KEY_PREFIX}:{tier or 'full'}:{offer_id}"
+
+
+def _active_job_ids(redis_conn: redis.Redis, job_ids: set[str]) -> set[str]:
+    """Filtra os jobs ainda na fila, em execução ou aguardando retry."""
+    if not job_ids:
+        return set()
+    ordered = sorted(job_ids)
+    with redis_conn.pipeline(transaction=False) as pipe:
+        for job_id in ordered:
+            pipe.hget(Job.key_for(job_id), "status")
+        statuses = pipe.execute()
+    return {
+        job_id
+        for job_id, status in zip(ordered, statuses)
+        if status is not None and as_text(status) in _ACTIVE_STATUSES
+    }
+
+
+def enqueue_unique_batches(
+    queue: Queue,
+    func: Callable[..., Any],
+    tier: Optional[str],
+    items: list[tuple],
+    batch_size: int,
+    job_timeout: str,
+    retry: Optional[Retry] = None,
+) -> tuple[list[str], int]:
+    """
+    Enfileira lotes de ofertas pulando as que já têm job pendente.
+
+    Cada oferta tem uma marca ``<prefixo>:<tier>:<offer_id>`` com o ID do
+    job dono. A oferta é pulada quando esse job, ou o job com o ID que ela
+    daria ao próprio lote, ainda está na fila, em execução ou aguardando
+    retry. A leitura das marcas (sob WATCH), a
+    gravação das novas marcas e os enqueues vão na mesma transação do
+    pipeline: se outra execução mexer nas marcas no meio, tudo é refeito.
+
+    Args:
+        queue: Fila de destino
+        func: Função do job, chamada com a lista de itens do lote
+        tier: Tier do job (None: enriquecimento completo)
+        items: Tuplas cujo primeiro elemento é o offer_id
+        batch_size: Ofertas por job
+        job_timeout: Timeout de cada job
+        retry: Política de retry dos jobs
+
+    Returns:
+        Tupla (IDs dos jobs enfileirados, ofertas puladas)
+    """
+    # Uma entrada por oferta (a coleta pode repetir um anúncio)
+    items = list({item[0]: item for item in items}.values())
+    if not items:
+        return [], 0
+    keys = [_pending_key(tier, item[0]) for item in items]
+
+    with queue.connection.pipeline() as pipe:
+        for _attempt in range(ENRICHMENT_ENQUEUE_WATCH_RETRIES):
+            try:
+                pipe.watch(*keys)
+                owners = [as_text(owner) if owner else None for owner in pipe.mget(keys)]
+                # A marca pode ter expirado com o job da oferta ainda ativo (ex.:
+                # retry tardio): o ID que a oferta daria ao próprio lote também
+                # é consultado, para não pular a checagem nem colidir com ele
+                candidates = [enrichment_job_id(tier, item[0]) for item in items]
+                active = _active_job_ids(
+                    queue.connection,
+                    {owner for owner in owners if owner} | set(candidates),
+                )
+                fresh = [
+                    item
+                    for item, owner, candidate in zip(items, owners, candidates)
+                    if owner not in active and candidate not in active
+                ]
+
+                pipe.multi()
+                job_ids = []
+                for i in range(0, len(fresh), batch_size):
+                    batch = fresh[i : i + batch_size]
+                    job_id = enrichment_job_id(tier, batch[0][0])
+                    for item in batch:
+                        pipe.set(
+                            _pending_key(tier, item[0]),
+                            job_id,
+                            ex=ENRICHMENT_PENDING_TTL_S,
+                        )
+                    queue.enqueue(
+                        func,
+                        batch,
+                        job_id=job_id,
+                        job_timeout=job_timeout,
+                        retry=retry,
+                        pipeline=pipe,
+                    )
+                    job_ids.append(job_id)
+                pipe.execute()
+                return job_ids, len(items) - len(fresh)
+            except redis.WatchError:
+                log(f"[queue] Marcas de {queue.name} alteradas durante o enqueue; repetindo")
+
+    raise redis.WatchError(
+        f"Enqueue em {queue.name} disputado por {ENRICHMENT_ENQUEUE_WATCH_RETRIES} tentativas"
+    )
+
+
 def enqueue_enrichment_job(
     offer_id: str,
     url: str,
     current_price_cents: int,
     config: Optional[EnrichmentConfig] = None,
     redis_conn: Optional[redis.Redis] = None,
-) -> str:
+) -> Optional[str]:
     """
     Enfileira um job de enriquecimento para uma oferta.
 
+    Idempotente: se a oferta já tem job pendente, nada é enfileirado.
+
     Args:
         offer_id: ID da oferta no banco de dados
         url: URL da oferta para scraping
@@ -85,21 +264,25 @@ def enqueue_enrichment_job(
         redis_conn: Conexão Redis (opcional)
 
     Returns:
-        ID do job enfileirado
+        ID do job enfileirado, ou None se já havia job pendente
     """
     # Import local para evitar circular
-    import queues.enrichment_jobs as enrichment_jobs_module
+    import adapters.queues.enrichment_jobs as enrichment_jobs_module
 
     queue = get_queue(config=config, redis_conn=redis_conn)
     job_timeout = config.job_timeout if config else "10m"
 
-    job = queue.enqueue(
-        enrichment_jobs_module.enrich_offer_job,
-        offer_id,
-        url,
-        current_price_cents,
+    job_ids, _skipped = enqueue_unique_batches(
+        queue,
+        enrichment_jobs_module.enrich_offers_batch_job,
+        None,
+        [(offer_id, url, current_price_cents)],
+        batch_size=1,
         job_timeout=job_timeout,
     )
 
-    log(f"[queue] Job {job.id} enfileirado para oferta {offer_id} ({url})")
-    return job.id
+    if not job_ids:
+        log(f"[queue] Oferta {offer_id} já tem job pendente; nada enfileirado")
+        return None
+    log(f"[queue] Job {job_ids[0]} enfileirado para oferta {offer_id} ({url})")
+    return job_ids[0]
@@ -3,21 +3,31 @@
 from __future__ import annotations
 
 import asyncio
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import Optional
 
 from playwright.async_api import Browser, BrowserContext, Page, async_playwright
 
-from shared.constants import DEFAULT_ACCEPT_LANGUAGE, DEFAULT_USER_AGENT
-from adapters.external.playwright_utils import (
-    resolve_storage_state_path,
-    route_block_heavy_resources,
+from shared.config.settings import BrowserConfig
+from adapters.external.browser_service import build_context_kwargs, get_browser_service
+from adapters.external.request_blocker import (
+    RequestBlocker,
+    RequestStats,
+    open_page,
+    publish_request_stats,
 )
 from shared.utils.logging import log
 
 
 class BrowserPool:
-    """Pool de contextos de browser reutilizáveis."""
+    """
+    Pool de contextos de browser reutilizáveis.
+
+    Com ``BROWSER_CDP_URL`` definido, os contextos são abertos pelo
+    ``BrowserService.context()`` do browser compartilhado do host em vez de um
+    Chromium próprio: cada um ocupa uma vaga de ``BROWSER_MAX_CONTEXTS``
+    enquanto o pool estiver aberto.
+    """
 
     def __init__(self, size: int = 3) -> None:
         """
@@ -30,7 +40,11 @@ class BrowserPool:
         self.playwright = None  # Mantém playwright vivo
         self.browser: Optional[Browser] = None
         self.contexts: list[BrowserContext] = []
+        self._blockers: list[RequestBlocker] = []
         self._semaphore = asyncio.Semaphore(size)
+        self._shared_browser = False
+        # Contextos abertos pelo BrowserService (modo compartilhado)
+        self._service_contexts: Optional[AsyncExitStack] = None
         self._initialized = False
         self._lock = asyncio.Lock()
 
@@ -42,31 +56,57 @@ class BrowserPool:
 
             log(f"[browser_pool] Inicializando pool com {self.size} contextos...")
 
-            # Mantém playwright vivo (não usa context manager)
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(headless=True)
-
-            storage_state_path = resolve_storage_state_path()
-            context_kwargs = {
-                "locale": "pt-BR",
-                "user_agent": DEFAULT_USER_AGENT,
-                "extra_http_headers": {"Accept-Language": DEFAULT_ACCEPT_LANGUAGE},
-                "ignore_https_errors": True,
-                "bypass_csp": True,
-            }
-
-            if storage_state_path:
-                context_kwargs["storage_state"] = storage_state_path
+            browser_config = BrowserConfig.from_env()
+            if browser_config.remote:
+                # Browser do host: conexão e vagas gerenciadas pelo BrowserService
+                service = await get_browser_service(browser_config)
+                self.browser = await service.get_browser()
+                self._shared_browser = True
+                if self.size > browser_config.max_contexts:
+                    log(
+                        f"[browser_pool] Pool limitado a {browser_config.max_contexts} "
+                        "contextos (BROWSER_MAX_CONTEXTS)"
+                    )
+                    self.size = browser_config.max_contexts
+                    self._semaphore = asyncio.Semaphore(self.size)
+                self._service_contexts = AsyncExitStack()
+            else:
+                # Mantém playwright vivo (não usa context manager)
+                self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(headless=True)
+                self._shared_browser = False
+
+            context_kwargs = build_context_kwargs()
 
             for i in range(self.size):
-                ctx = await self.browser.new_context(**context_kwargs)
-                await ctx.route("**/*", route_block_heavy_resources)
+                if self._service_contexts is not None:
+                    # O bloqueio é instalado abaixo, para o pool publicar as contagens
+                    ctx = await self._service_contexts.enter_async_context(
+                        service.context(block_resources=False)
+                    )
+                else:
+                    ctx = await self.browser.new_context(**context_kwargs)
+                blocker = RequestBlocker()
+                await blocker.install(ctx)
+                self._blockers.append(blocker)
                 self.contexts.append(ctx)
                 log(f"[browser_pool] Contexto {i+1}/{self.size} criado")
 
             self._initialized = True
             log("[browser_pool] Pool inicializado com sucesso")
 
+    def flush_request_stats(self) -> None:
+        """
+        Publica as contagens dos bloqueadores de todos os contextos e as zera.
+
+        Os contextos vivem enquanto o worker roda: sem isso, as métricas só
+        apareceriam no ``close`` do pool.
+        """
+        total = RequestStats()
+        for blocker in self._blockers:
+            total.merge(blocker.take_stats())
+        publish_request_stats(total)
+
     async def close(self) -> None:
         """Fecha todos os contextos e o browser."""
         async with self._lock:
@@ -75,13 +115,26 @@ class BrowserPool:
 
             log("[browser_pool] Fechando pool...")
 
-            for ctx in self.contexts:
+            self.flush_request_stats()
+            for blocker in self._blockers:
+                await blocker.close()
+
+            if self._service_contexts is not None:
+                # Fecha os contextos e devolve as vagas ao BrowserService
                 try:
-                    await ctx.close()
+                    await self._service_contexts.aclose()
                 except Exception as e:
-                    log(f"[browser_pool] Erro ao fechar contexto: {e}")
-
-            if self.browser:
+                    log(f"[browser_pool] Erro ao fechar contextos: {e}")
+                self._service_contexts = None
+            else:
+                for ctx in self.contexts:
+                    try:
+                        await ctx.close()
+                    except Exception as e:
+                        log(f"[browser_pool] Erro ao fechar contexto: {e}")
+
+            # O browser compartilhado pertence ao BrowserService
+            if self.browser and not self._shared_browser:
                 try:
                     await self.browser.close()
                 except Exception as e:
@@ -94,6 +147,7 @@ class BrowserPool:
                     log(f"[browser_pool] Erro ao fechar playwright: {e}")
 
             self.contexts = []
+            self._blockers = []
             self.browser = None
             self.playwright = None
             self._initialized = False
@@ -108,6 +162,9 @@ class BrowserPool:
         Yields:
             Page: Página do Playwright pronta para uso
         """
+        if self._initialized and self.browser and not self.browser.is_connected():
+            log("[browser_pool] Browser desconectado. Recriando pool...")
+            await self.close()
         if not self._initialized:
             await self.initialize()
 
@@ -116,7 +173,7 @@ class BrowserPool:
             ctx_index = id(asyncio.current_task()) % self.size
             ctx = self.contexts[ctx_index]
 
-            page = await ctx.new_page()
+            page = await open_page(ctx)
             try:
                 yield page
             finally:
@@ -126,9 +183,30 @@ class BrowserPool:
                     log(f"[browser_pool] Erro ao fechar página: {e}")
 
 
-# Pool global singleton
+# Pool global singleton (preso ao event loop em que foi criado)
 _global_pool: Optional[BrowserPool] = None
-_global_pool_lock = asyncio.Lock()
+_global_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+_global_pool_lock: Optional[asyncio.Lock] = None
+
+
+def _pool_lock() -> asyncio.Lock:
+    """
+    Lock do pool global para o event loop atual.
+
+    Se o loop mudou (ex.: ``asyncio.run`` por job fora do WorkerRuntime), o
+    pool antigo é descartado: seus objetos do Playwright pertencem ao loop
+    anterior e não podem ser usados neste.
+    """
+    global _global_pool, _global_pool_loop, _global_pool_lock
+
+    loop = asyncio.get_running_loop()
+    if _global_pool_loop is not loop:
+        if _global_pool is not None:
+            log("[browser_pool] Event loop mudou. Recriando pool...")
+        _global_pool = None
+        _global_pool_loop = loop
+        _global_pool_lock = asyncio.Lock()
+    return _global_pool_lock  # type: ignore[return-value]
 
 
 async def get_browser_pool(size: int = 3) -> BrowserPool:
@@ -143,7 +221,7 @@ async def get_browser_pool(size: int = 3) -> BrowserPool:
     """
     global _global_pool
 
-    async with _global_pool_lock:
+    async with _pool_lock():
         if _global_pool is None:
             _global_pool = BrowserPool(size=size)
             await _global_pool.initialize()
@@ -151,11 +229,17 @@ async def get_browser_pool(size: int = 3) -> BrowserPool:
         return _global_pool
 
 
+def flush_browser_pool_request_stats() -> None:
+    """Publica e zera as contagens de requisições do pool global, se existir."""
+    if _global_pool is not None:
+        _global_pool.flush_request_stats()
+
+
 async def close_browser_pool() -> None:
     """Fecha o pool global de browsers."""
     global _global_pool
 
-    async with _global_pool_lock:
+    async with _pool_lock():
         if _global_pool is not None:
             await _global_pool.close()
             _global_pool = None
@@ -0,0 +1,129 @@
+"""Servidor de browser compartilhado: um Chromium por host exposto via CDP."""
+
+from __future__ import annotations
+
+import asyncio
+import signal
+import socket
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path para imports
+root_dir = Path(__file__).parent.parent.parent
+src_dir = root_dir / "src"
+if str(src_dir) not in sys.path:
+    sys.path.insert(0, str(src_dir))
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from playwright.async_api import async_playwright  # type: ignore
+
+from shared.config.settings import get_config
+from shared.utils.logging import log
+
+# O Playwright para Python não expõe launch_server; o Chromium é lançado com a
+# porta de depuração remota aberta e os componentes usam connect_over_cdp.
+# O CDP não tem autenticação: quem alcança a porta controla o browser (e a
+# sessão logada do storage state), por isso ela nunca escuta em 0.0.0.0
+# sem BROWSER_SERVER_HOST explícito.
+_CHROMIUM_SERVER_ARGS = ("--disable-dev-shm-usage",)
+
+
+def resolve_server_host(configured: str) -> str:
+    """
+    Endereço em que o endpoint CDP escuta.
+
+    Sem BROWSER_SERVER_HOST, usa o IP do hostname do host: no docker-compose, a
+    interface do serviço na rede interna (alcançável como ``browser``, não
+    publicada fora dela); fora de um container, em geral o loopback.
+
+    Args:
+        configured: Valor de BROWSER_SERVER_HOST ("" para detectar)
+
+    Returns:
+        Endereço IP para ``--remote-debugging-address``
+    """
+    if configured:
+        return configured
+    try:
+        return socket.gethostbyname(socket.gethostname())
+    except OSError:
+        return "127.0.0.1"
+
+
+async def serve(port: int, host: str = "127.0.0.1") -> None:
+    """
+    Mantém um Chromium headless escutando CDP no endereço e porta informados.
+
+    Se o browser cair, é relançado; termina com SIGTERM/SIGINT.
+
+    Args:
+        port: Porta do endpoint CDP (BROWSER_SERVER_PORT)
+        host: Endereço do endpoint CDP (ver ``resolve_server_host``)
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass
+
+    async with async_playwright() as p:
+        while not stop.is_set():
+            browser = await p.chromium.launch(
+                headless=True,
+                args=[
+                    f"--remote-debugging-address={host}",
+                    f"--remote-debugging-port={port}",
+                    *_CHROMIUM_SERVER_ARGS,
+                ],
+            )
+            disconnected = asyncio.Event()
+            browser.on("disconnected", lambda _: disconnected.set())
+            log(
+                f"[browser_server] ✅ Chromium {browser.version} escutando CDP em "
+                f"http://{host}:{port}"
+            )
+
+            stop_task = asyncio.ensure_future(stop.wait())
+            down_task = asyncio.ensure_future(disconnected.wait())
+            await asyncio.wait(
+                {stop_task, down_task}, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in (stop_task, down_task):
+                task.cancel()
+
+            if stop.is_set():
+                log("[browser_server] Encerrando Chromium...")
+                try:
+                    await browser.close()
+                except Exception as e:
+                    log(f"[browser_server] Erro ao fechar browser: {e}")
+            else:
+                log("[browser_server] ❌ Chromium caiu. Relançando em 1s...")
+                await asyncio.sleep(1)
+
+
+def main() -> None:
+    """Inicia o servidor de browser compartilhado."""
+    config = get_config()
+    host = resolve_server_host(config.browser.server_host)
+    if host == "0.0.0.0":
+        log(
+            "[browser_server] ⚠️ BROWSER_SERVER_HOST=0.0.0.0: o CDP não tem "
+            "autenticação e fica acessível em todas as interfaces"
+        )
+    log(
+        f"[browser_server] Iniciando browser compartilhado em "
+        f"{host}:{config.browser.server_port}"
+    )
+    try:
+        asyncio.run(serve(config.browser.server_port, host))
+    except KeyboardInterrupt:
+        pass
+    log("[browser_server] Shutdown completo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Execução concorrente de jobs RQ em um único processo, sobre o runtime compartilhado."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from rq import SimpleWorker
+from rq.scheduler import RQScheduler
+from rq.timeouts import TimerDeathPenalty
+
+from shared.constants import THREADED_WORKER_DEQUEUE_TIMEOUT_S
+from shared.utils.logging import log
+
+
+class ThreadedWorker(SimpleWorker):
+    """
+    SimpleWorker que pode rodar fora da thread principal.
+
+    - Timeout de job por timer + exceção assíncrona (``TimerDeathPenalty``),
+      já que SIGALRM só é entregue à thread principal;
+    - não instala handlers de sinal (o processo os trata e chama ``stop``);
+    - espera por jobs em janelas curtas, para notar o pedido de parada.
+
+    Cada instância é um worker RQ completo (nome, registro, heartbeat e
+    execução próprios), então status, retries e registries de falha seguem
+    o fluxo normal do RQ.
+    """
+
+    death_penalty_class = TimerDeathPenalty
+
+    @property
+    def dequeue_timeout(self) -> int:
+        return THREADED_WORKER_DEQUEUE_TIMEOUT_S
+
+    def _install_signal_handlers(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        """Para após o job atual (ou na próxima espera por jobs)."""
+        self._stop_requested = True
+
+
+class ConcurrentWorker:
+    """
+    Executa até ``concurrency`` jobs ao mesmo tempo no mesmo processo.
+
+    Cada slot é um ``ThreadedWorker`` em sua própria thread; os jobs
+    despacham suas corrotinas para o event loop do WorkerRuntime, onde
+    compartilham o BrowserPool aquecido. Grupos de slots com filas e
+    concorrência próprias podem ser somados com ``add_slots``.
+    """
+
+    def __init__(
+        self,
+        queues: list[Any],
+        connection: Any,
+        name: str,
+        concurrency: int,
+    ) -> None:
+        self.connection = connection
+        self.workers: list[ThreadedWorker] = []
+        self._threads: list[threading.Thread] = []
+        self._scheduler_thread: threading.Thread | None = None
+        self._scheduler_stop = threading.Event()
+        self.add_slots(queues, name, concurrency)
+
+    def add_slots(self, queues: list[Any], name: str, concurrency: int) -> None:
+        """Adiciona ``concurrency`` slots consumindo ``queues`` (em ordem de prioridade)."""
+        self.workers.extend(
+            ThreadedWorker(queues, connection=self.connection, name=f"{name}-{slot}")
+            for slot in range(1, concurrency + 1)
+        )
+
+    @property
+    def state(self) -> str:
+        """"stopped" quando nenhum slot está mais rodando."""
+        if self._threads and not any(t.is_alive() for t in self._threads):
+            return "stopped"
+        return "started"
+
+    def _run_slot(self, worker: ThreadedWorker) -> None:
+        try:
+            worker.work(with_scheduler=False)
+        except Exception as e:
+            log(f"[worker] ❌ Slot {worker.name} encerrado com erro: {type(e).__name__}: {e}")
+
+    def _run_scheduler(self) -> None:
+        """
+        Move jobs agendados (retries com intervalo) de volta para as filas.
+
+        Mesmo laço do ``RQScheduler.work``, mas em uma thread: o scheduler
+        do ``Worker.work(with_scheduler=True)`` faz fork, o que não é seguro
+        com as threads do runtime e dos slots. Os locks por fila do RQ
+        garantem um único scheduler ativo entre réplicas.
+        """
+        queue_names = sorted({queue.name for worker in self.workers for queue in worker.queues})
+        scheduler = RQScheduler(queue_names, connection=self.connection)
+        log(f"[worker] Scheduler de retries ativo para {', '.join(queue_names)}")
+        try:
+            scheduler.register_birth()
+        except Exception as e:
+            log(f"[worker] Erro ao registrar scheduler de retries: {e}")
+        try:
+            while not self._scheduler_stop.is_set():
+                try:
+                    if scheduler.should_reacquire_locks:
+                        scheduler.acquire_locks()
+                    scheduler.heartbeat()
+                    scheduler.enqueue_scheduled_jobs()
+                except Exception as e:
+                    log(f"[worker] Erro no scheduler de retries: {type(e).__name__}: {e}")
+                self._scheduler_stop.wait(scheduler.interval)
+        finally:
+            try:
+                scheduler.stop()
+            except Exception as e:
+                log(f"[worker] Erro ao encerrar scheduler de retries: {e}")
+
+    def work(self, with_scheduler: bool = False) -> None:
+        """
+        Inicia os slots e bloqueia até todos terminarem.
+
+        Args:
+            with_scheduler: Roda o scheduler do RQ (em uma thread) para as
+                filas de todos os slots; sem ele, jobs com retry agendado
+                (``Retry(interval=...)``) nunca voltam para a fila
+        """
+        self._threads = [
+            threading.Thread(target=self._run_slot, args=(worker,), name=worker.name, daemon=True)
+            for worker in self.workers
+        ]
+        if with_scheduler:
+            self._scheduler_stop.clear()
+            self._scheduler_thread = threading.Thread(
+                target=self._run_scheduler, name="rq-scheduler", daemon=True
+            )
+            self._scheduler_thread.start()
+        for thread in self._threads:
+            thread.start()
+        # join com timeout mantém a thread principal livre para tratar sinais
+        while any(thread.is_alive() for thread in self._threads):
+            for thread in self._threads:
+                thread.join(timeout=1)
+        if self._scheduler_thread is not None:
+            self._scheduler_stop.set()
+            self._scheduler_thread.join(timeout=10)
+
+    def request_stop(self, signum: int | None = None, frame: Any = None) -> None:
+        """Pede a todos os slots que parem após o job atual."""
+        self._scheduler_stop.set()
+        for worker in self.workers:
+            worker.stop()
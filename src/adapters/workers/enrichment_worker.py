@@ -16,12 +16,13 @@ if str(root_dir) not in sys.path:
 
 from shared.config.settings import get_config
 from adapters.queues import get_queue
-from rq import Worker
+from adapters.workers.concurrent_worker import ConcurrentWorker
+from adapters.workers.worker_runtime import start_worker_runtime, stop_worker_runtime
 from shared.utils.logging import log
 
 # Variável global para controlar shutdown
 _shutdown_requested = False
-_worker: Worker | None = None
+_worker: ConcurrentWorker | None = None
 
 
 def graceful_shutdown(signum: int, frame) -> None:
@@ -98,20 +99,49 @@ def main() -> None:
             f"[worker] Iniciando worker RQ para fila '{config.enrichment.queue_name}' "
             f"(Redis: {config.enrichment.redis_url})"
         )
-        log(f"[worker] Concorrência: {config.enrichment.worker_concurrency} workers")
-
-        # Cria worker com a conexão Redis
-        _worker = Worker(
-            [queue],
-            connection=redis_conn,
-            name=f"enrichment-worker-{config.enrichment.queue_name}",
-        )
+        log(f"[worker] Browser pool: {config.enrichment.worker_concurrency} contextos")
+
+        # Event loop persistente com banco e browser pool aquecidos: os jobs
+        # rodam nele em vez de criar um loop (e um Chromium) por oferta
+        start_worker_runtime(config)
+
+        # Cada tier (ENRICHMENT_WORKER_TIERS) tem sua fila e seus slots; cada
+        # slot é um worker RQ em sua thread, e os jobs dividem o browser pool.
+        # A fila principal (jobs completos de versões anteriores) fica como
+        # prioridade mais baixa do último tier.
+        enrichment = config.enrichment
+        tiers = [enrichment.tiers[name] for name in enrichment.worker_tiers]
+        if not tiers:
+            raise ValueError("ENRICHMENT_WORKER_TIERS não contém nenhum tier válido")
+        for index, tier in enumerate(tiers):
+            # Faixas de prioridade do tier: RQ consome as filas na ordem da lista
+            queues = [
+                get_queue(redis_conn=redis_conn, queue_name=queue_name)
+                for queue_name in tier.queue_names
+            ]
+            if index == len(tiers) - 1:
+                queues.append(queue)
+            worker_name = f"enrichment-worker-{tier.queue_name}"
+            if _worker is None:
+                _worker = ConcurrentWorker(
+                    queues,
+                    connection=redis_conn,
+                    name=worker_name,
+                    concurrency=tier.concurrency,
+                )
+            else:
+                _worker.add_slots(queues, worker_name, tier.concurrency)
+            log(
+                f"[worker] Tier '{tier.name}': filas {', '.join(tier.queue_names)}, "
+                f"{tier.concurrency} jobs simultâneos, {tier.rate_limit_per_min} req/min"
+            )
 
         log("[worker] ✅ Worker iniciado. Aguardando jobs...")
         log("[worker] Pressione Ctrl+C para parar graciosamente")
 
-        # Inicia o worker (bloqueia até receber sinal de parada)
-        _worker.work(with_scheduler=False)
+        # Inicia o worker (bloqueia até receber sinal de parada); o scheduler
+        # devolve às filas os retries agendados das políticas dos tiers
+        _worker.work(with_scheduler=True)
 
         log("[worker] Worker finalizado normalmente")
 
@@ -126,17 +156,13 @@ def main() -> None:
         sys.exit(1)
     finally:
         # Cleanup
-        if _worker:
-            log("[worker] Limpando recursos...")
-            try:
-                # Fecha browser pool se estiver aberto
-                import asyncio
-                from adapters.workers.browser_pool import close_browser_pool
-
-                asyncio.run(close_browser_pool())
-                log("[worker] Browser pool fechado")
-            except Exception as e:
-                log(f"[worker] Erro ao fechar browser pool: {e}")
+        log("[worker] Limpando recursos...")
+        try:
+            # Fecha browser pool e encerra o event loop do runtime
+            stop_worker_runtime()
+            log("[worker] Browser pool fechado")
+        except Exception as e:
+            log(f"[worker] Erro ao fechar browser pool: {e}")
 
         log("[worker] Shutdown completo")
 
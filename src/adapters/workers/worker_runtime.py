@@ -0,0 +1,153 @@
+"""Runtime do worker: um event loop persistente por processo, com recursos aquecidos."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Coroutine, Optional, TypeVar
+
+from shared.config.settings import Config
+from adapters.database import init_db
+from adapters.external.browser_service import close_browser_service
+from adapters.external.product_http import close_http_client
+from adapters.queues.enrichment_queue import configure_rate_limits
+from adapters.workers.browser_pool import close_browser_pool, get_browser_pool
+from shared.utils.logging import log
+
+T = TypeVar("T")
+
+
+class WorkerRuntime:
+    """
+    Event loop de longa duração em uma thread dedicada.
+
+    Os jobs RQ (síncronos) despacham suas corrotinas para este loop com
+    ``run``, então o BrowserPool, o cliente do banco e a configuração são
+    criados uma única vez por worker, no ``start``, em vez de a cada job
+    (``asyncio.run`` por job recriava o loop e deixava o pool preso ao
+    primeiro loop).
+
+    Requer um worker que não faça fork por job (``rq.SimpleWorker``): a thread
+    do loop não sobrevive ao fork do work horse.
+    """
+
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="worker-runtime", daemon=True
+        )
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @property
+    def running(self) -> bool:
+        """Indica se o loop está ativo."""
+        return self._thread.is_alive() and self.loop.is_running()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> Future[T]:
+        """Agenda uma corrotina no loop do runtime."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        Executa uma corrotina no loop do runtime e aguarda o resultado.
+
+        Se a espera for interrompida (ex.: timeout do job via sinal), a
+        corrotina é cancelada no loop antes de propagar a exceção.
+
+        A espera é feita em fatias curtas: a exceção assíncrona do
+        ``TimerDeathPenalty`` (workers em threads) só é entregue quando a
+        thread volta a executar bytecode Python.
+        """
+        future = self.submit(coro)
+        try:
+            while True:
+                try:
+                    return future.result(timeout=1)
+                except FutureTimeoutError:
+                    continue
+        except BaseException:
+            future.cancel()
+            raise
+
+    async def _warm_up(self) -> None:
+        # Cliente do banco fica no thread-local da thread do loop, onde os jobs rodam
+        init_db(self.config.database)
+        configure_rate_limits(self.config.enrichment)
+        await get_browser_pool(size=self.config.enrichment.worker_concurrency)
+
+    def start(self) -> None:
+        """Inicia o loop e aquece banco e BrowserPool."""
+        self._thread.start()
+        log("[worker_runtime] Aquecendo banco e browser pool...")
+        try:
+            self.run(self._warm_up())
+        except BaseException:
+            self.stop()
+            raise
+        log(
+            f"[worker_runtime] ✅ Runtime pronto "
+            f"(browser pool com {self.config.enrichment.worker_concurrency} contextos)"
+        )
+
+    async def _shutdown(self) -> None:
+        await close_browser_pool()
+        await close_browser_service()
+        await close_http_client()
+
+    def stop(self) -> None:
+        """Fecha o BrowserPool e encerra o loop."""
+        if not self.running:
+            return
+        try:
+            self.run(self._shutdown())
+        except Exception as e:
+            log(f"[worker_runtime] Erro ao liberar recursos: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=10)
+        self.loop.close()
+        log("[worker_runtime] Runtime encerrado")
+
+
+# Runtime do processo (definido pelo worker no boot)
+_runtime: Optional[WorkerRuntime] = None
+
+
+def start_worker_runtime(config: Config) -> WorkerRuntime:
+    """
+    Cria e inicia o runtime do processo.
+
+    Args:
+        config: Configuração carregada uma vez no boot do worker
+
+    Returns:
+        WorkerRuntime iniciado
+    """
+    global _runtime
+
+    if _runtime is None or not _runtime.running:
+        runtime = WorkerRuntime(config)
+        runtime.start()
+        _runtime = runtime
+    return _runtime
+
+
+def get_worker_runtime() -> Optional[WorkerRuntime]:
+    """Retorna o runtime ativo do processo, se houver."""
+    if _runtime is not None and _runtime.running:
+        return _runtime
+    return None
+
+
+def stop_worker_runtime() -> None:
+    """Encerra o runtime do processo."""
+    global _runtime
+
+    if _runtime is not None:
+        runtime, _runtime = _runtime, None
+        runtime.stop()
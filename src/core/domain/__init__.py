@@ -1,6 +1,12 @@
 """Modelos de dados do projeto."""
 
+from core.domain.enrichment import needed_enrichment_tiers
 from core.domain.offer import ScrapedOffer
+from core.domain.priority import offer_priority_score, priority_band
 
-__all__ = ["ScrapedOffer"]
-
+__all__ = [
+    "ScrapedOffer",
+    "needed_enrichment_tiers",
+    "offer_priority_score",
+    "priority_band",
+]
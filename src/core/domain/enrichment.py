@@ -0,0 +1,47 @@
+"""Campos de enriquecimento que ainda faltam a uma oferta."""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from core.domain.offer import ScrapedOffer
+from shared.constants import ENRICHMENT_TIER_AFFILIATE, ENRICHMENT_TIER_PRICE
+
+
+def needed_enrichment_tiers(
+    offer: ScrapedOffer, saved_offer: Optional[dict[str, Any]] = None
+) -> tuple[str, ...]:
+    """
+    Tiers de enriquecimento de que a oferta precisa, pelos campos que faltam.
+
+    O card da Central nunca traz link nem ID de afiliado: o que já foi
+    enriquecido vem da linha salva no banco (``old_price_cents``,
+    ``discount_pct`` e o ``affiliate_info`` ligado por ``affiliate_info_id``),
+    além do que o cache preencheu na oferta.
+
+    Args:
+        offer: Oferta coletada
+        saved_offer: Linha da oferta no banco, com ``affiliate_info``
+            embutido (link e ID de afiliado), quando existir
+
+    Returns:
+        Nomes dos tiers (preço e/ou afiliado); vazio se nada falta
+    """
+    saved_offer = saved_offer or {}
+    affiliate_info = saved_offer.get("affiliate_info") or {}
+
+    old_price_cents = offer.old_price_cents
+    if old_price_cents is None:
+        old_price_cents = saved_offer.get("old_price_cents")
+    discount_pct = offer.discount_pct
+    if discount_pct is None:
+        discount_pct = saved_offer.get("discount_pct")
+    affiliate_link = offer.affiliate_link or affiliate_info.get("affiliate_link")
+    affiliation_id = offer.affiliation_id or affiliate_info.get("affiliation_id")
+
+    tiers = []
+    if old_price_cents is None or discount_pct is None:
+        tiers.append(ENRICHMENT_TIER_PRICE)
+    if not affiliate_link or not affiliation_id:
+        tiers.append(ENRICHMENT_TIER_AFFILIATE)
+    return tuple(tiers)
@@ -0,0 +1,68 @@
+"""Prioridade de enriquecimento de uma oferta (valor do negócio)."""
+
+from __future__ import annotations
+
+import math
+
+from core.domain.offer import ScrapedOffer
+from shared.constants import (
+    ENRICHMENT_PRIORITY_DEFAULT,
+    ENRICHMENT_PRIORITY_HIGH,
+    ENRICHMENT_PRIORITY_LOW,
+)
+
+# Peso de cada ponto de comissão frente a um ponto de desconto
+COMMISSION_WEIGHT = 2.0
+# Pontos por década da comissão esperada em reais (R$ 1 → 3, R$ 10 → 10, R$ 100 → 20)
+EARNINGS_WEIGHT = 10.0
+
+
+def offer_priority_score(offer: ScrapedOffer) -> float:
+    """
+    Pontua uma oferta com os dados da coleta, para enriquecer as melhores antes.
+
+    Soma o desconto (em pontos percentuais), a comissão com peso
+    ``COMMISSION_WEIGHT`` e a comissão esperada em reais em escala log, para
+    que itens caros com boa comissão subam mesmo com desconto modesto.
+    Campos ausentes contam como zero; sem ``discount_pct``, o desconto vem
+    do preço antigo, quando houver.
+
+    Args:
+        offer: Oferta coletada
+
+    Returns:
+        Score (maior = mais valioso); ex.: 70% off com 16% de comissão em
+        um item de R$ 100 fica em ~114, 5% off sem comissão fica em 5
+    """
+    discount = offer.discount_pct
+    if discount is None and offer.old_price_cents and offer.old_price_cents > offer.price_cents:
+        discount = round(
+            (offer.old_price_cents - offer.price_cents) * 100 / offer.old_price_cents
+        )
+    commission = offer.commission_pct or 0
+    earnings_reais = max(0, offer.price_cents) * commission / 10000
+
+    return (
+        (discount or 0)
+        + COMMISSION_WEIGHT * commission
+        + EARNINGS_WEIGHT * math.log10(1 + earnings_reais)
+    )
+
+
+def priority_band(score: float, high_score: float, low_score: float) -> str:
+    """
+    Faixa de prioridade de um score.
+
+    Args:
+        score: Resultado de ``offer_priority_score``
+        high_score: Score mínimo da faixa alta
+        low_score: Scores abaixo deste vão para a faixa baixa
+
+    Returns:
+        ENRICHMENT_PRIORITY_HIGH, ENRICHMENT_PRIORITY_DEFAULT ou ENRICHMENT_PRIORITY_LOW
+    """
+    if score >= high_score:
+        return ENRICHMENT_PRIORITY_HIGH
+    if score < low_score:
+        return ENRICHMENT_PRIORITY_LOW
+    return ENRICHMENT_PRIORITY_DEFAULT
@@ -2,30 +2,34 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
-
-from playwright.async_api import async_playwright  # type: ignore
+import asyncio
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
 
 from shared.config.settings import AffiliateConfig, MLConfig
-from shared.constants import (
-    DEFAULT_ACCEPT_LANGUAGE,
-    DEFAULT_USER_AGENT,
-)
-from adapters.external.playwright_utils import (
-    resolve_storage_state_path,
-    route_block_heavy_resources,
-)
-from shared.utils.price import (
-    calc_discount,
-    discount_to_float,
-    infer_old_price_from_card_text,
-    money_parts_to_cents,
-    parse_commission_pct,
+from adapters.external.browser_service import browser_context
+from adapters.external.playwright_utils import wait_for_any_selector
+from adapters.external.product_http import fetch_product_page
+from adapters.external.product_page import (
+    ProductPageData,
+    extract_product_page,
+    resolve_prices,
 )
+from adapters.external.request_blocker import open_page
+from shared.utils.price import parse_commission_pct
+from shared.utils.deadline import Deadline, DeadlineExceeded
 from shared.utils.logging import log
-from shared.utils.rate_limiter import get_ml_circuit_breaker, get_ml_rate_limiter
+from shared.utils.rate_limiter import (
+    AdaptivePacer,
+    RateLimiter,
+    get_ml_circuit_breaker,
+    get_ml_rate_limiter,
+    get_pacer,
+)
 from shared.utils.retry import retry_with_backoff
+from shared.utils.url import is_block_page_url
 
 
 @dataclass
@@ -36,8 +40,96 @@ class EnrichmentResult:
     old_cents: Optional[str] = None
     old_price_cents: Optional[int] = None
     discount_pct: Optional[int] = None
+    commission_pct: Optional[int] = None
     affiliate_link: Optional[str] = None
     affiliation_id: Optional[str] = None
+    # Tempo gasto em cada etapa (ms) e se o orçamento da oferta acabou
+    step_timings_ms: dict[str, int] = field(default_factory=dict)
+    budget_exhausted: bool = False
+    # A página do produto não abriu (goto, retries, circuito aberto): os
+    # campos vazios não são resultado e a oferta deve ser refeita
+    navigation_failed: bool = False
+
+
+@contextmanager
+def _timed_step(result: EnrichmentResult, step: str) -> Iterator[None]:
+    """Acumula o tempo da etapa em ``result.step_timings_ms``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+        result.step_timings_ms[step] = result.step_timings_ms.get(step, 0) + elapsed_ms
+
+
+def _budget_exhausted(result: EnrichmentResult, deadline: Deadline, url: str, step: str) -> bool:
+    """Marca o resultado como parcial se o orçamento acabou antes da etapa."""
+    if not deadline.expired:
+        return False
+    result.budget_exhausted = True
+    log(
+        f"[enrichment] Orçamento de {deadline.budget_s:.0f}s esgotado antes de "
+        f"'{step}' em {url}; retornando resultado parcial"
+    )
+    return True
+
+
+def _apply_prices(
+    result: EnrichmentResult, page_data: ProductPageData, current_price_cents: int
+) -> None:
+    """Preenche preço antigo e desconto a partir dos dados da página."""
+    result.old_fraction = page_data["old_fraction"] or None
+    result.old_cents = page_data["old_cents"] or None
+    result.old_price_cents, result.discount_pct = resolve_prices(
+        page_data, current_price_cents
+    )
+
+
+def _has_prices(result: EnrichmentResult) -> bool:
+    return result.old_price_cents is not None or result.discount_pct is not None
+
+
+def _needs_share_flow(affiliate_config: AffiliateConfig) -> bool:
+    """Indica se o link de afiliado precisa ser lido no navegador."""
+    return bool(
+        affiliate_config.affiliate_link_selector
+        or affiliate_config.affiliation_id_selector
+    )
+
+
+async def _paced_goto(
+    page,
+    url: str,
+    timeout_ms: int,
+    pacer: Optional[AdaptivePacer],
+    deadline: Optional[Deadline] = None,
+):
+    """
+    Navega para a URL e registra status, latência e bloqueios no pacer.
+
+    Raises:
+        DeadlineExceeded: Se a navegação falhou porque o orçamento acabou
+            (não conta no pacer nem no circuit breaker)
+    """
+    started = time.monotonic()
+    try:
+        response = await page.goto(
+            url, wait_until="domcontentloaded", timeout=timeout_ms
+        )
+    except Exception as e:
+        if deadline is not None and deadline.expired:
+            # Timeout encurtado pelo orçamento, não lentidão do ML
+            raise DeadlineExceeded(f"orçamento esgotado navegando para {url}") from e
+        if pacer is not None and "Timeout" in type(e).__name__:
+            pacer.record_timeout()
+        raise
+    if pacer is not None:
+        pacer.record_response(
+            response.status if response else None,
+            time.monotonic() - started,
+            blocked=is_block_page_url(page.url),
+        )
+    return response
 
 
 async def _enrich_with_page(
@@ -49,173 +141,157 @@ async def _enrich_with_page(
     timeout_ms: int,
     request_delay_s: float,
     result: EnrichmentResult,
+    budget_s: Optional[float] = None,
+    read_prices: bool = True,
+    share_flow: bool = True,
+    rate_limiter: Optional[RateLimiter] = None,
 ) -> EnrichmentResult:
     """
     Executa o enriquecimento usando uma página já criada.
 
+    Todas as esperas consomem o mesmo orçamento (``budget_s``), contado a
+    partir do momento em que a página está disponível e o rate limiter
+    liberou a navegação: quando ele acaba, o que já foi extraído é retornado
+    (``budget_exhausted=True``). Navegações cortadas pelo orçamento não
+    contam como timeout no pacer nem como falha no circuit breaker.
+
+    Se ``result`` já traz os preços (leitura por HTTP) ou ``read_prices`` é
+    False, a página só é usada para comissão e para o fluxo de
+    compartilhamento do link de afiliado (``share_flow``).
+
     Args:
         page: Página do Playwright
         url: URL para acessar
         current_price_cents: Preço atual
         ml_config: Configuração ML
         affiliate_config: Configuração de afiliados
-        timeout_ms: Timeout
+        timeout_ms: Timeout máximo de carregamento da página
         request_delay_s: Delay após processar
         result: Objeto de resultado para preencher
+        budget_s: Orçamento total da oferta em segundos (None: sem limite)
+        read_prices: Extrair preço antigo e desconto da página
+        share_flow: Clicar em compartilhar e ler link/ID de afiliado
+        rate_limiter: Limiter do tier (padrão: limiter global do ML)
 
     Returns:
-        EnrichmentResult preenchido
+        EnrichmentResult preenchido (``navigation_failed=True`` se a página
+        não abriu)
     """
+    read_prices = read_prices and not _has_prices(result)
+
     # Aplica rate limiting para não sobrecarregar o ML
-    rate_limiter = get_ml_rate_limiter()
-    await rate_limiter.acquire()
+    rate_limiter = rate_limiter or get_ml_rate_limiter()
+    with _timed_step(result, "rate_limit"):
+        await rate_limiter.acquire()
+
+    # A espera no limiter não consome o orçamento da oferta
+    deadline = Deadline(budget_s)
+
+    # Respostas da navegação ajustam o ritmo do limiter (AIMD)
+    pacer = get_pacer(rate_limiter)
 
     # Usa circuit breaker para proteção contra falhas em cascata
     circuit_breaker = get_ml_circuit_breaker()
 
     try:
-        # Tenta acessar a página com retry e proteção de circuit breaker
+        # Tenta acessar a página com retry e proteção de circuit breaker;
+        # cada tentativa usa só o que resta do orçamento. O orçamento é
+        # respeitado dentro da chamada protegida (sem cancelá-la de fora),
+        # para que o breaker sempre registre o resultado
         async def _fetch_with_protection():
             await retry_with_backoff(
-                lambda: page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms),
+                lambda: _paced_goto(
+                    page, url, deadline.timeout_ms(timeout_ms), pacer, deadline
+                ),
                 max_retries=3,
                 initial_delay=1.0,
                 max_delay=10.0,
                 retryable_exceptions=(Exception,),
+                deadline=deadline,
             )
 
-        await circuit_breaker.call(_fetch_with_protection)
+        with _timed_step(result, "goto"):
+            await circuit_breaker.call(_fetch_with_protection)
 
     except Exception as e:
-        log(f"[enrichment] Erro ao acessar {url}: {e}")
+        if deadline.expired:
+            result.budget_exhausted = True
+        result.navigation_failed = True
+        log(f"[enrichment] Erro ao acessar {url}: {type(e).__name__}: {e}")
         return result
 
-    try:
-        # Aguarda carregamento dos elementos
-        await page.wait_for_load_state("networkidle", timeout=10000)
-    except Exception:
-        pass
-
-    # Extrai old_fraction e old_cents
-    try:
-        old_fraction_elem = page.locator(ml_config.old_fraction_selector).first
-        old_cents_elem = page.locator(ml_config.old_cents_selector).first
-
-        if await old_fraction_elem.count() > 0:
-            old_fraction_text = await old_fraction_elem.text_content() or ""
-            old_cents_text = ""
-            if await old_cents_elem.count() > 0:
-                old_cents_text = await old_cents_elem.text_content() or ""
-
-            result.old_fraction = old_fraction_text.strip()
-            result.old_cents = old_cents_text.strip() if old_cents_text else None
-
-            # Calcula old_price_cents
-            result.old_price_cents = money_parts_to_cents(
-                result.old_fraction,
-                result.old_cents,
-            )
-    except Exception as e:
-        log(f"[enrichment] Erro ao extrair old_price de {url}: {e}")
-
-    # Se não encontrou preço antigo pelos seletores, tenta inferir do texto
-    if result.old_price_cents is None:
-        try:
-            page_text = await page.locator("body").text_content() or ""
-            result.old_price_cents = infer_old_price_from_card_text(
-                page_text, current_price_cents
-            )
-        except Exception:
-            pass
-
-    # Extrai discount_pct
-    try:
-        discount_elem = page.locator(ml_config.discount_selector).first
-        if await discount_elem.count() > 0:
-            discount_text = await discount_elem.text_content() or ""
-            result.discount_pct = discount_to_float(discount_text)
-    except Exception:
-        pass
-
-    # Se não encontrou desconto, calcula a partir dos preços
-    if result.discount_pct is None and result.old_price_cents:
-        result.discount_pct = calc_discount(
-            result.old_price_cents, current_price_cents
-        )
-
-    # Extrai dados de afiliado (commission_pct, affiliate_link, affiliation_id)
-    # Primeiro tenta extrair commission_pct
-    commission_pct = None
-    if affiliate_config.commission_selector:
-        try:
-            await page.wait_for_selector(
-                affiliate_config.commission_selector, timeout=15000
-            )
-            commission_text = await page.locator(
-                affiliate_config.commission_selector
-            ).first.inner_text()
-            commission_pct = parse_commission_pct(commission_text)
-        except Exception:
-            pass
-
-    if commission_pct is None and affiliate_config.commission_selector_alternative:
-        try:
-            await page.wait_for_selector(
-                affiliate_config.commission_selector_alternative, timeout=8000
-            )
-            info_text = await page.locator(
-                affiliate_config.commission_selector_alternative
-            ).first.inner_text()
-            commission_pct = parse_commission_pct(info_text)
-        except Exception:
-            pass
+    if not read_prices:
+        # Sem preços a ler: basta o botão de compartilhar estar na página
+        if share_flow and affiliate_config.button_selector and not _budget_exhausted(
+            result, deadline, url, "share_ready"
+        ):
+            with _timed_step(result, "share_ready"):
+                await wait_for_any_selector(
+                    page, [affiliate_config.button_selector], deadline.timeout_ms(10000)
+                )
+    elif not _budget_exhausted(result, deadline, url, "networkidle"):
+        with _timed_step(result, "networkidle"):
+            try:
+                # Aguarda carregamento dos elementos
+                await page.wait_for_load_state(
+                    "networkidle", timeout=deadline.timeout_ms(10000)
+                )
+            except Exception:
+                pass
+
+    # Preço antigo, desconto e comissão em uma única ida ao navegador (feita
+    # mesmo com o orçamento esgotado: a página já está carregada)
+    with _timed_step(result, "extract"):
+        page_data = await extract_product_page(page, ml_config, affiliate_config)
+    if read_prices:
+        _apply_prices(result, page_data, current_price_cents)
+    result.commission_pct = parse_commission_pct(
+        page_data["commission_text"]
+    ) or parse_commission_pct(page_data["commission_alt_text"])
 
     # Clica no botão de compartilhar se necessário
-    if affiliate_config.button_selector and affiliate_config.affiliate_share_text:
-        try:
-            share_button = page.locator(
-                affiliate_config.button_selector,
-                has_text=affiliate_config.affiliate_share_text,
-            )
-            if await share_button.count():
-                await share_button.first.click(timeout=5000)
-        except Exception:
-            pass
-
-    # Extrai affiliate_link
-    if affiliate_config.affiliate_link_selector:
-        try:
-            await page.wait_for_selector(
-                affiliate_config.affiliate_link_selector, timeout=10000
-            )
-        except Exception:
-            pass
-        try:
-            link_locator = page.locator(affiliate_config.affiliate_link_selector)
-            if await link_locator.count():
-                result.affiliate_link = await _read_input_value(link_locator.first)
-        except Exception as e:
-            log(f"[enrichment] Erro ao extrair affiliate_link de {url}: {e}")
-
-    # Extrai affiliation_id
-    if affiliate_config.affiliation_id_selector:
-        try:
-            await page.wait_for_selector(
-                affiliate_config.affiliation_id_selector, timeout=10000
+    if (
+        share_flow
+        and affiliate_config.button_selector
+        and affiliate_config.affiliate_share_text
+        and not _budget_exhausted(result, deadline, url, "share_click")
+    ):
+        with _timed_step(result, "share_click"):
+            try:
+                share_button = page.locator(
+                    affiliate_config.button_selector,
+                    has_text=affiliate_config.affiliate_share_text,
+                )
+                if await share_button.count():
+                    await share_button.first.click(timeout=deadline.timeout_ms(5000))
+            except Exception:
+                pass
+
+    # Link e ID de afiliação: uma única espera em que o primeiro campo a
+    # aparecer vence, em vez de duas esperas de 10s em sequência
+    share_fields = {
+        "affiliate_link": affiliate_config.affiliate_link_selector,
+        "affiliation_id": affiliate_config.affiliation_id_selector,
+    }
+    if share_flow and any(share_fields.values()) and not _budget_exhausted(
+        result, deadline, url, "share_fields"
+    ):
+        with _timed_step(result, "share_fields"):
+            await wait_for_any_selector(
+                page, list(share_fields.values()), deadline.timeout_ms(10000)
             )
-        except Exception:
-            pass
-        try:
-            id_locator = page.locator(affiliate_config.affiliation_id_selector)
-            if await id_locator.count():
-                result.affiliation_id = await _read_input_value(id_locator.first)
-        except Exception as e:
-            log(f"[enrichment] Erro ao extrair affiliation_id de {url}: {e}")
+            for field_name, selector in share_fields.items():
+                if not selector:
+                    continue
+                try:
+                    locator = page.locator(selector)
+                    if await locator.count():
+                        setattr(result, field_name, await _read_input_value(locator.first))
+                except Exception as e:
+                    log(f"[enrichment] Erro ao extrair {field_name} de {url}: {e}")
 
     # Delay opcional para rate limiting
     if request_delay_s > 0:
-        import asyncio
-
         await asyncio.sleep(request_delay_s)
 
     return result
@@ -255,6 +331,11 @@ async def enrich_offer(
     timeout_ms: int = 60000,
     request_delay_s: float = 0.0,
     use_browser_pool: bool = True,
+    budget_s: Optional[float] = None,
+    http_first: bool = False,
+    prices: bool = True,
+    affiliate: bool = True,
+    rate_limiter: Optional[RateLimiter] = None,
 ) -> EnrichmentResult:
     """
     Enriquece uma oferta individual acessando a página do produto.
@@ -267,14 +348,37 @@ async def enrich_offer(
         timeout_ms: Timeout para carregar a página
         request_delay_s: Delay após processar (para rate limiting)
         use_browser_pool: Se True, usa o browser pool (mais rápido). Se False, cria browser dedicado.
+        budget_s: Orçamento total da oferta em segundos, contado com a página
+            já disponível (None: sem limite)
+        http_first: Se True, lê preço antigo e desconto por HTTP (sem
+            navegador); o navegador fica só para o link de afiliado
+        prices: Enriquecer preço antigo e desconto (tier de preço)
+        affiliate: Capturar link e ID de afiliado (tier de afiliado)
+        rate_limiter: Limiter do tier (padrão: limiter global do ML)
 
     Returns:
         EnrichmentResult com dados extraídos
     """
     result = EnrichmentResult()
 
-    async def _fetch_page(page) -> None:
-        await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+    rate_limiter = rate_limiter or get_ml_rate_limiter()
+
+    if prices and http_first:
+        with _timed_step(result, "http_fetch"):
+            await rate_limiter.acquire()
+            page_data = await fetch_product_page(
+                url,
+                ml_config,
+                timeout_s=min(timeout_ms / 1000, 10.0),
+                pacer=get_pacer(rate_limiter),
+            )
+        if page_data is not None:
+            _apply_prices(result, page_data, current_price_cents)
+
+    read_prices = prices and not _has_prices(result)
+    share_flow = affiliate and _needs_share_flow(affiliate_config)
+    if not read_prices and not share_flow:
+        return result
 
     # Usa browser pool se disponível (mais rápido e eficiente)
     if use_browser_pool:
@@ -292,28 +396,19 @@ async def enrich_offer(
                     timeout_ms=timeout_ms,
                     request_delay_s=request_delay_s,
                     result=result,
+                    budget_s=budget_s,
+                    read_prices=read_prices,
+                    share_flow=share_flow,
+                    rate_limiter=rate_limiter,
                 )
         except Exception as e:
             log(f"[enrichment] Erro ao usar browser pool, fallback para browser dedicado: {e}")
             # Fallback para browser dedicado
 
-    # Modo legacy: cria browser dedicado (mais lento mas mais seguro)
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context_kwargs = {
-            "locale": "pt-BR",
-            "user_agent": DEFAULT_USER_AGENT,
-            "extra_http_headers": {"Accept-Language": DEFAULT_ACCEPT_LANGUAGE},
-            "ignore_https_errors": True,
-            "bypass_csp": True,
-        }
-        storage_state_path = resolve_storage_state_path()
-        if storage_state_path:
-            context_kwargs["storage_state"] = storage_state_path
-        context = await browser.new_context(**context_kwargs)
-        await context.route("**/*", route_block_heavy_resources)
-
-        page = await context.new_page()
+    # Modo legacy: contexto dedicado (browser compartilhado se BROWSER_CDP_URL
+    # estiver definido; senão um browser lançado só para esta oferta)
+    async with browser_context() as context:
+        page = await open_page(context)
 
         try:
             result = await _enrich_with_page(
@@ -325,10 +420,12 @@ async def enrich_offer(
                 timeout_ms=timeout_ms,
                 request_delay_s=request_delay_s,
                 result=result,
+                budget_s=budget_s,
+                read_prices=read_prices,
+                share_flow=share_flow,
+                rate_limiter=rate_limiter,
             )
         finally:
             await page.close()
-            await context.close()
-            await browser.close()
 
     return result
@@ -2,19 +2,38 @@
 
 from __future__ import annotations
 
+import asyncio
 import traceback
 import time
 from dataclasses import asdict
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from shared.config.settings import Config
 from adapters.database import DatabaseService, get_session, init_db
-from core.domain import ScrapedOffer
-from adapters.external import scrape_affiliate_hub
+from adapters.queues.enrichment_cache import get_enrichment_cache
+from adapters.queues.enrichment_queue import configure_rate_limits
+from core.domain import (
+    ScrapedOffer,
+    needed_enrichment_tiers,
+    offer_priority_score,
+    priority_band,
+)
+from adapters.external import scrape_affiliate_hub, stream_affiliate_hub
 from core.use_cases.offer_filter import OfferFilter
+from shared.constants import (
+    ENRICHMENT_PRIORITY_DEFAULT,
+    ENRICHMENT_PRIORITY_HIGH,
+    ENRICHMENT_PRIORITY_LOW,
+    ENRICHMENT_TIER_AFFILIATE,
+    ENRICHMENT_TIER_PRICE,
+    STREAM_PIPELINE_MAX_BATCHES,
+)
 from shared.utils.format import format_brl, format_pct
 from shared.utils.logging import log
 
+if TYPE_CHECKING:
+    from rq import Queue
+
 
 class ScrapeService:
     """Serviço principal para execução de scraping."""
@@ -30,11 +49,18 @@ class ScrapeService:
         1. Coleta produtos da Central de Afiliados
         2. Filtra por desconto mínimo (se aplicável)
 
+        Com SCRAPE_STREAMING=true (e sem DEBUG_DUMP), os lotes de ofertas são
+        salvos e enfileirados para enriquecimento enquanto a coleta continua.
+
         Returns:
             Dicionário com métricas da execução
         """
         t0 = time.perf_counter()
 
+        # Orçamentos de requisições ao ML somados com os workers (Redis)
+        # e ritmo adaptativo pelas respostas do ML
+        configure_rate_limits(self.config.enrichment)
+
         log(
             f"[scrape] Iniciando coleta da Central de Afiliados "
             f"({self.config.ml.url})..."
@@ -47,14 +73,21 @@ class ScrapeService:
         )
 
         # Etapa 1: Coleta produtos da Central de Afiliados
+        streaming = self.config.scrape.streaming and not self.config.scrape.debug_dump
+        scrape_run_id: str | None = None
         try:
-            offers = await scrape_affiliate_hub(
-                ml_config=self.config.ml,
-                affiliate_config=self.config.affiliate,
-                max_scrolls=self.config.scrape.max_scrolls,
-                scroll_delay_s=self.config.scrape.scroll_delay_s,
-                debug=self.config.scrape.debug_dump,
-            )
+            if streaming:
+                offers, scrape_run_id = await self._run_streaming_scrape()
+            else:
+                offers = await scrape_affiliate_hub(
+                    ml_config=self.config.ml,
+                    affiliate_config=self.config.affiliate,
+                    max_scrolls=self.config.scrape.max_scrolls,
+                    scroll_delay_s=self.config.scrape.scroll_delay_s,
+                    debug=self.config.scrape.debug_dump,
+                    collector_mode=self.config.scrape.hub_collector_mode,
+                    extraction_mode=self.config.scrape.hub_extraction_mode,
+                )
         except Exception as e:
             log(
                 f"[scrape] ERRO: coleta da Central de Afiliados falhou: {type(e).__name__}: {e}"
@@ -79,7 +112,9 @@ class ScrapeService:
         t2 = time.perf_counter()
 
         # Salva no banco de dados se configurado (salva TODAS as ofertas coletadas)
-        scrape_run_id = await self._save_to_database(offers)
+        # No modo streaming os lotes já foram salvos durante a coleta
+        if not streaming:
+            scrape_run_id = await self._save_to_database(offers)
 
         metrics = {
             "collected_count": len(offers),
@@ -91,11 +126,142 @@ class ScrapeService:
             "seconds_collect": round(t1 - t0, 2),
             "seconds_filter_save": round(t2 - t1, 2),
             "scrape_run_id": scrape_run_id,
+            "streaming": streaming,
         }
         log(f"[scrape] Métricas: {metrics}")
 
         return {"metrics": metrics, "filtered_offers": filtered, "shown_offers": show}
 
+    def _database_configured(self) -> bool:
+        """Indica se há configuração do Supabase para salvar as ofertas."""
+        return bool(
+            self.config.database.supabase_url and self.config.database.supabase_key
+        )
+
+    def _config_snapshot(self) -> dict[str, Any]:
+        """Snapshot da configuração salvo junto à execução de scraping."""
+        return {
+            "min_discount_pct": self.config.scrape.min_discount_pct,
+            "max_scrolls": self.config.scrape.max_scrolls,
+            "number_of_pages": self.config.scrape.number_of_pages,
+            "only_with_old_price": self.config.scrape.only_with_old_price,
+        }
+
+    async def _run_streaming_scrape(self) -> tuple[list[ScrapedOffer], str | None]:
+        """
+        Coleta a Central em streaming, salvando e enfileirando cada lote.
+
+        Os lotes passam por uma fila limitada (STREAM_PIPELINE_MAX_BATCHES) até um
+        consumidor que salva no banco e enfileira o enriquecimento, de modo que os
+        workers começam pelos primeiros cards enquanto a página ainda rola. Sem
+        banco configurado, apenas acumula as ofertas.
+
+        Returns:
+            Tupla (ofertas coletadas, ID do ScrapeRun ou None)
+        """
+        offers: list[ScrapedOffer] = []
+        db_service: DatabaseService | None = None
+        scrape_run: dict[str, Any] | None = None
+
+        if self._database_configured():
+            try:
+                init_db(self.config.database)
+                async for client in get_session():
+                    db_service = DatabaseService(client)
+                    break
+                scrape_run = await db_service.start_scrape_run(
+                    min_discount_pct=self.config.scrape.min_discount_pct,
+                    max_scrolls=self.config.scrape.max_scrolls,
+                    number_of_pages=self.config.scrape.number_of_pages,
+                    config_snapshot=self._config_snapshot(),
+                )
+                log(f"[scrape] ScrapeRun {scrape_run['id']} iniciado (streaming)")
+            except Exception as e:
+                log(
+                    f"[scrape] ❌ ERRO ao iniciar ScrapeRun: {type(e).__name__}: {e}. "
+                    "Coletando sem salvar no banco."
+                )
+                db_service = scrape_run = None
+        else:
+            log(
+                "[scrape] SUPABASE_URL ou chave de API não configuradas. "
+                "Pulando salvamento no banco."
+            )
+
+        batches: asyncio.Queue[list[ScrapedOffer] | None] = asyncio.Queue(
+            maxsize=STREAM_PIPELINE_MAX_BATCHES
+        )
+        saved_count = 0
+
+        async def persist_batches() -> None:
+            nonlocal saved_count
+            # Uma fila/conexão RQ para a execução inteira, não uma por lote
+            enrichment_queue = (
+                await self._open_enrichment_queue()
+                if db_service is not None and scrape_run is not None
+                else None
+            )
+            while (batch := await batches.get()) is not None:
+                if db_service is None or scrape_run is None:
+                    continue
+                try:
+                    await self._apply_enrichment_cache(batch)
+                    saved = await db_service.save_offers(scrape_run, batch)
+                    saved_count += len(saved)
+                    await self._enqueue_enrichment_jobs(
+                        batch, db_service, saved, queue=enrichment_queue
+                    )
+                except Exception as e:
+                    log(
+                        f"[scrape] ❌ ERRO ao salvar lote de {len(batch)} ofertas: "
+                        f"{type(e).__name__}: {e}"
+                    )
+
+        consumer = asyncio.create_task(persist_batches())
+        error: Exception | None = None
+        try:
+            async for batch in stream_affiliate_hub(
+                ml_config=self.config.ml,
+                affiliate_config=self.config.affiliate,
+                max_scrolls=self.config.scrape.max_scrolls,
+                scroll_delay_s=self.config.scrape.scroll_delay_s,
+                batch_size=self.config.scrape.stream_batch_size,
+                collector_mode=self.config.scrape.hub_collector_mode,
+                extraction_mode=self.config.scrape.hub_extraction_mode,
+            ):
+                offers.extend(batch)
+                log(
+                    f"[scrape] Lote de {len(batch)} ofertas recebido "
+                    f"(total: {len(offers)})"
+                )
+                await batches.put(batch)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            await batches.put(None)
+            await consumer
+            if db_service is not None and scrape_run is not None:
+                try:
+                    await db_service.finish_scrape_run(
+                        scrape_run,
+                        saved_count,
+                        error_message=(
+                            f"{type(error).__name__}: {error}" if error else None
+                        ),
+                    )
+                    log(
+                        f"[scrape] ✅ ScrapeRun {scrape_run['id']} encerrado: "
+                        f"{saved_count} ofertas salvas em streaming"
+                    )
+                except Exception as e:
+                    log(
+                        f"[scrape] ❌ ERRO ao encerrar ScrapeRun: "
+                        f"{type(e).__name__}: {e}"
+                    )
+
+        return offers, scrape_run["id"] if scrape_run else None
+
     async def _save_to_database(self, offers: list[ScrapedOffer]) -> str | None:
         """
         Salva ofertas no banco de dados se configurado.
@@ -107,10 +273,7 @@ class ScrapeService:
             ID do ScrapeRun criado ou None
         """
         # Verifica se há configuração do Supabase
-        if (
-            not self.config.database.supabase_url
-            or not self.config.database.supabase_key
-        ):
+        if not self._database_configured():
             log(
                 "[scrape] SUPABASE_URL ou chave de API não configuradas. "
                 "Pulando salvamento no banco."
@@ -131,15 +294,11 @@ class ScrapeService:
             async for client in get_session():
                 try:
                     db_service = DatabaseService(client)
-                    config_snapshot = {
-                        "min_discount_pct": self.config.scrape.min_discount_pct,
-                        "max_scrolls": self.config.scrape.max_scrolls,
-                        "number_of_pages": self.config.scrape.number_of_pages,
-                        "only_with_old_price": self.config.scrape.only_with_old_price,
-                    }
+                    config_snapshot = self._config_snapshot()
 
+                    await self._apply_enrichment_cache(offers)
                     log(f"[scrape] Salvando {len(offers)} ofertas no banco...")
-                    scrape_run = await db_service.save_scrape_run_with_offers(
+                    scrape_run, saved = await db_service.ingest_scrape_run(
                         offers=offers,
                         min_discount_pct=self.config.scrape.min_discount_pct,
                         max_scrolls=self.config.scrape.max_scrolls,
@@ -156,8 +315,8 @@ class ScrapeService:
                         f"Ofertas salvas: {len(offers)}"
                     )
 
-                    # Enfileira jobs de enriquecimento
-                    await self._enqueue_enrichment_jobs(offers, db_service)
+                    # Enfileira jobs de enriquecimento com os IDs já retornados
+                    await self._enqueue_enrichment_jobs(offers, db_service, saved)
 
                     break  # Sair do loop após salvar com sucesso
                 except Exception as e:
@@ -177,15 +336,88 @@ class ScrapeService:
             log(f"[scrape] Traceback completo: {traceback.format_exc()}")
             return None
 
+    async def _open_enrichment_queue(self) -> Queue | None:
+        """
+        Abre a fila RQ de enriquecimento (conexão Redis) fora do event loop.
+
+        Returns:
+            Fila RQ, ou None sem REDIS_URL ou com o Redis indisponível
+        """
+        if not self.config.enrichment.redis_url:
+            return None
+        from adapters.queues.enrichment_queue import get_queue
+
+        try:
+            return await asyncio.to_thread(get_queue, config=self.config.enrichment)
+        except Exception as e:
+            log(f"[scrape] Erro ao abrir fila de enriquecimento: {e}")
+            return None
+
+    async def _apply_enrichment_cache(self, offers: list[ScrapedOffer]) -> None:
+        """
+        Preenche as ofertas com os resultados de enriquecimento em cache.
+
+        Chamado antes de salvar: o upsert não apaga campos já enriquecidos e
+        ``needed_enrichment_tiers`` deixa de enfileirar o que o cache cobre
+        (o que já está no banco também conta, mesmo sem cache).
+        Só campos vazios são preenchidos; preço antigo/desconto em cache são
+        ignorados quando o preço coletado mudou. As chamadas ao Redis rodam em
+        thread para não travar o event loop (a coleta em streaming segue rolando).
+
+        Args:
+            offers: Ofertas coletadas (alteradas no lugar)
+        """
+        if not offers:
+            return
+        cache = await asyncio.to_thread(get_enrichment_cache, self.config.enrichment)
+        if cache is None:
+            return
+
+        try:
+            cached = await asyncio.to_thread(
+                cache.get_many,
+                [(offer.marketplace, offer.external_id, offer.price_cents) for offer in offers],
+            )
+        except Exception as e:
+            log(f"[scrape] Erro ao consultar cache de enriquecimento: {e}")
+            return
+
+        for offer in offers:
+            entry = cached.get((offer.marketplace, offer.external_id))
+            if entry is None:
+                continue
+            for field in (
+                "old_price_cents",
+                "discount_pct",
+                "affiliate_link",
+                "affiliation_id",
+            ):
+                if getattr(offer, field) is None and getattr(entry, field) is not None:
+                    setattr(offer, field, getattr(entry, field))
+
+        log(
+            f"[scrape] Cache de enriquecimento: {len(cached)}/{len(offers)} ofertas "
+            "com resultados reaproveitados"
+        )
+
     async def _enqueue_enrichment_jobs(
-        self, offers: list[ScrapedOffer], db_service: DatabaseService
+        self,
+        offers: list[ScrapedOffer],
+        db_service: DatabaseService,
+        saved_offers_map: dict[str, dict[str, Any]] | None = None,
+        queue: Queue | None = None,
     ) -> None:
         """
         Enfileira jobs de enriquecimento para as ofertas salvas usando batch operations.
 
+        O enqueue (pipelines com WATCH no Redis) roda em thread, fora do event loop.
+
         Args:
             offers: Lista de ofertas coletadas
             db_service: Serviço de banco de dados
+            saved_offers_map: Mapa external_id -> oferta salva, quando já conhecido
+                (evita consultar o banco novamente)
+            queue: Fila RQ já aberta nesta execução (sem ela, abre uma conexão)
         """
         try:
             # Verifica se Redis está configurado
@@ -203,65 +435,151 @@ class ScrapeService:
             log(f"[scrape] Enfileirando jobs de enriquecimento para {len(offers)} ofertas...")
 
             # Batch operation: busca todas as ofertas de uma vez
-            marketplace_id = await db_service.offers._get_marketplace_id(
-                offers[0].marketplace
-            )
-            external_ids = [offer.external_id for offer in offers]
+            if saved_offers_map is None:
+                marketplace_id = await db_service.offers._get_marketplace_id(
+                    offers[0].marketplace
+                )
+                external_ids = [offer.external_id for offer in offers]
 
-            saved_offers_map = await db_service.offers.get_many_by_external_ids(
-                external_ids, marketplace_id
+                saved_offers_map = await db_service.offers.get_many_by_external_ids(
+                    external_ids, marketplace_id
+                )
+
+            from adapters.queues.enrichment_queue import (
+                enqueue_unique_batches,
+                get_queue,
             )
 
-            # Importa get_queue para usar pipeline do Redis
-            from adapters.queues.enrichment_queue import get_queue
+            from rq import Retry
+            import adapters.queues.enrichment_jobs as enrichment_jobs_module
 
-            queue = get_queue(config=self.config.enrichment)
+            enrichment = self.config.enrichment
+            tier_jobs = {
+                ENRICHMENT_TIER_PRICE: enrichment_jobs_module.enrich_prices_job,
+                ENRICHMENT_TIER_AFFILIATE: enrichment_jobs_module.capture_affiliate_links_job,
+            }
 
             jobs_enqueued = 0
             jobs_failed = 0
+            offers_skipped = 0
+
+            # O que já está no banco decide os tiers (o card não traz afiliado);
+            # sem essa leitura, vale só o que a oferta coletada traz
+            try:
+                enrichment_state = await db_service.offers.get_enrichment_state_many(
+                    [offer["id"] for offer in saved_offers_map.values()],
+                    chunk_size=self.config.database.ingest_chunk_size,
+                )
+            except Exception as e:
+                log(f"[scrape] Erro ao ler enriquecimento salvo: {e}")
+                enrichment_state = {}
+
+            # Cada oferta vai só para os tiers dos campos que ainda faltam,
+            # com o score de valor do negócio (desconto, comissão, preço)
+            scored_by_tier: dict[str, list[tuple[float, tuple[str, str, int, str, str]]]] = {
+                tier: [] for tier in tier_jobs
+            }
+            for offer in offers:
+                saved_offer = saved_offers_map.get(offer.external_id)
+                if not saved_offer:
+                    log(
+                        f"[scrape] Aviso: Oferta {offer.external_id} não encontrada "
+                        "no banco. Pulando enfileiramento."
+                    )
+                    jobs_failed += 1
+                    continue
+                score = offer_priority_score(offer)
+                for tier in needed_enrichment_tiers(
+                    offer, enrichment_state.get(saved_offer["id"])
+                ):
+                    scored_by_tier[tier].append(
+                        (
+                            score,
+                            (
+                                saved_offer["id"],
+                                offer.url,
+                                offer.price_cents,
+                                offer.marketplace,
+                                offer.external_id,
+                            ),
+                        )
+                    )
 
-            # Usa pipeline do Redis para enfileirar todos os jobs de uma vez
-            # Isso é muito mais rápido do que enfileirar um por um
-            from rq import Retry
-            import adapters.queues.enrichment_jobs as enrichment_jobs_module
+            # Cada job enriquece um bloco de até ENRICHMENT_BATCH_SIZE ofertas
+            # (menos jobs no Redis e uma gravação por bloco)
+            batch_size = enrichment.batch_size
+            if queue is None:
+                queue = await asyncio.to_thread(get_queue, config=enrichment)
+            band_counts = {
+                ENRICHMENT_PRIORITY_HIGH: 0,
+                ENRICHMENT_PRIORITY_DEFAULT: 0,
+                ENRICHMENT_PRIORITY_LOW: 0,
+            }
+
+            for tier, scored_items in scored_by_tier.items():
+                tier_config = enrichment.tiers[tier]
+                retry = (
+                    Retry(
+                        max=tier_config.max_retries,
+                        interval=list(tier_config.retry_intervals_s),
+                    )
+                    if tier_config.max_retries
+                    else None
+                )
 
-            with queue.connection.pipeline() as pipe:
-                for offer in offers:
+                # Faixas de prioridade: os workers drenam <tier>-high, depois a
+                # fila do tier e por último <tier>-low. Dentro de cada faixa
+                # (FIFO) os maiores scores entram primeiro
+                scored_items.sort(key=lambda scored_item: scored_item[0], reverse=True)
+                items_by_band: dict[str, list[tuple[str, str, int, str, str]]] = {}
+                for score, item in scored_items:
+                    band = priority_band(
+                        score,
+                        enrichment.priority_high_score,
+                        enrichment.priority_low_score,
+                    )
+                    items_by_band.setdefault(band, []).append(item)
+
+                # Enqueue idempotente: ofertas com job ainda pendente (de uma
+                # execução anterior) são puladas, na mesma transação do enqueue
+                for band, items in items_by_band.items():
+                    band_counts[band] += len(items)
+                    tier_queue = get_queue(
+                        config=enrichment,
+                        redis_conn=queue.connection,
+                        queue_name=tier_config.band_queue_name(band),
+                    )
                     try:
-                        saved_offer = saved_offers_map.get(offer.external_id)
-
-                        if not saved_offer:
-                            log(
-                                f"[scrape] Aviso: Oferta {offer.external_id} não encontrada "
-                                "no banco. Pulando enfileiramento."
-                            )
-                            jobs_failed += 1
-                            continue
-
-                        # Enfileira job usando o pipeline (mais rápido)
-                        queue.enqueue(
-                            enrichment_jobs_module.enrich_offer_job,
-                            saved_offer["id"],
-                            offer.url,
-                            offer.price_cents,
-                            job_timeout=self.config.enrichment.job_timeout,
-                            retry=Retry(max=3, interval=[60, 300, 900]),  # 1min, 5min, 15min
-                            pipeline=pipe,
+                        job_ids, skipped = await asyncio.to_thread(
+                            enqueue_unique_batches,
+                            tier_queue,
+                            tier_jobs[tier],
+                            tier,
+                            items,
+                            batch_size=batch_size,
+                            job_timeout=enrichment.job_timeout,
+                            retry=retry,
                         )
-                        jobs_enqueued += 1
-
+                        jobs_enqueued += len(job_ids)
+                        offers_skipped += skipped
                     except Exception as e:
                         log(
-                            f"[scrape] Erro ao enfileirar job para oferta {offer.external_id}: {e}"
+                            f"[scrape] Erro ao enfileirar jobs de enriquecimento "
+                            f"({tier}/{band}): {e}"
                         )
                         jobs_failed += 1
 
-                # Executa todos os enqueues de uma vez
-                pipe.execute()
-
             log(
                 f"[scrape] ✅ Jobs de enriquecimento enfileirados em batch: "
-                f"{jobs_enqueued} sucesso, {jobs_failed} falhas"
+                f"{jobs_enqueued} sucesso, {jobs_failed} falhas "
+                f"(preço: {len(scored_by_tier[ENRICHMENT_TIER_PRICE])} ofertas, "
+                f"afiliado: {len(scored_by_tier[ENRICHMENT_TIER_AFFILIATE])} ofertas, "
+                f"{offers_skipped} já pendentes, até {batch_size} por job)"
+            )
+            log(
+                f"[scrape] Prioridade: {band_counts[ENRICHMENT_PRIORITY_HIGH]} alta, "
+                f"{band_counts[ENRICHMENT_PRIORITY_DEFAULT]} normal, "
+                f"{band_counts[ENRICHMENT_PRIORITY_LOW]} baixa"
             )
 
         except Exception as e:
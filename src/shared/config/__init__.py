@@ -7,6 +7,7 @@ from shared.config.settings import (
     AffiliateConfig,
     DatabaseConfig,
     EnrichmentConfig,
+    BrowserConfig,
     get_config,
 )
 
@@ -17,5 +18,6 @@ __all__ = [
     "AffiliateConfig",
     "DatabaseConfig",
     "EnrichmentConfig",
+    "BrowserConfig",
     "get_config",
 ]
@@ -6,6 +6,16 @@ from dataclasses import dataclass
 
 from dotenv import load_dotenv
 
+from shared.constants import (
+    DEFAULT_DB_MAX_CONCURRENCY,
+    ENRICHMENT_PRIORITY_DEFAULT,
+    ENRICHMENT_PRIORITY_HIGH,
+    ENRICHMENT_PRIORITY_LOW,
+    ENRICHMENT_TIER_AFFILIATE,
+    ENRICHMENT_TIER_PRICE,
+    RATE_BUDGET_PRODUCT_PAGE,
+    RATE_BUDGET_SHARE_FLOW,
+)
 from shared.utils.env import env_bool, env_float, env_int, env_string
 
 
@@ -22,6 +32,8 @@ class MLConfig:
     old_fraction_selector: str
     old_cents_selector: str
     discount_selector: str
+    # Acessos à Central por minuto (orçamento compartilhado entre processos)
+    hub_rate_limit_per_min: int
 
     @classmethod
     def from_env(cls) -> MLConfig:
@@ -56,6 +68,7 @@ class MLConfig:
                 "DISCOUNT_SELECTOR",
                 "span.andes-money-amount__discount.poly-price__disc--pill",
             ),
+            hub_rate_limit_per_min=max(1, env_int("ML_HUB_RATE_PER_MIN", 6)),
         )
 
 
@@ -70,6 +83,10 @@ class ScrapeConfig:
     min_discount_pct: int
     only_with_old_price: bool
     debug_dump: bool
+    hub_collector_mode: str
+    hub_extraction_mode: str
+    streaming: bool
+    stream_batch_size: int
 
     @classmethod
     def from_env(cls) -> ScrapeConfig:
@@ -82,6 +99,10 @@ class ScrapeConfig:
             min_discount_pct=env_int("MIN_DISCOUNT_PCT", 50),
             only_with_old_price=env_bool("ONLY_WITH_OLD_PRICE", default=False),
             debug_dump=env_bool("DEBUG_DUMP", default=False),
+            hub_collector_mode=env_string("HUB_COLLECTOR_MODE", "observer"),
+            hub_extraction_mode=env_string("HUB_EXTRACTION_MODE", "dom"),
+            streaming=env_bool("SCRAPE_STREAMING", default=False),
+            stream_batch_size=max(1, env_int("SCRAPE_STREAM_BATCH_SIZE", 50)),
         )
 
 
@@ -128,6 +149,9 @@ class DatabaseConfig:
 
     supabase_url: str
     supabase_key: str
+    ingest_mode: str  # rpc, bulk ou per_offer
+    ingest_chunk_size: int
+    max_concurrency: int
 
     @classmethod
     def from_env(cls) -> DatabaseConfig:
@@ -146,6 +170,79 @@ class DatabaseConfig:
         return cls(
             supabase_url=supabase_url,
             supabase_key=supabase_key,
+            ingest_mode=env_string("DB_INGEST_MODE", "bulk").lower(),
+            ingest_chunk_size=max(1, env_int("DB_INGEST_CHUNK_SIZE", 500)),
+            max_concurrency=max(
+                1, env_int("DB_MAX_CONCURRENCY", DEFAULT_DB_MAX_CONCURRENCY)
+            ),
+        )
+
+
+def _env_intervals(name: str, default: tuple[int, ...]) -> tuple[int, ...]:
+    """Lê intervalos de retry (segundos) separados por vírgula."""
+    raw = env_string(name, "")
+    try:
+        values = tuple(int(part) for part in raw.split(",") if part.strip())
+    except ValueError:
+        return default
+    return values or default
+
+
+@dataclass(frozen=True)
+class EnrichmentTierConfig:
+    """Configuração de um tier de enriquecimento (fila, ritmo e retries próprios)."""
+
+    name: str
+    queue_name: str
+    concurrency: int
+    # Orçamento de requisições (limiter nomeado) e seu ritmo
+    rate_budget: str
+    rate_limit_per_min: int
+    max_retries: int
+    retry_intervals_s: tuple[int, ...]
+
+    @property
+    def queue_names(self) -> tuple[str, ...]:
+        """Filas do tier por faixa de prioridade, na ordem de consumo."""
+        return tuple(
+            self.band_queue_name(band)
+            for band in (
+                ENRICHMENT_PRIORITY_HIGH,
+                ENRICHMENT_PRIORITY_DEFAULT,
+                ENRICHMENT_PRIORITY_LOW,
+            )
+        )
+
+    def band_queue_name(self, band: str) -> str:
+        """Fila do tier para uma faixa de prioridade."""
+        if band == ENRICHMENT_PRIORITY_DEFAULT:
+            return self.queue_name
+        return f"{self.queue_name}-{band}"
+
+    @classmethod
+    def from_env(
+        cls,
+        name: str,
+        base_queue_name: str,
+        concurrency: int,
+        rate_budget: str,
+        rate_limit_per_min: int,
+        retry_intervals_s: tuple[int, ...],
+    ) -> EnrichmentTierConfig:
+        """Cria a configuração do tier a partir de ENRICHMENT_<TIER>_*."""
+        prefix = f"ENRICHMENT_{name.upper()}"
+        return cls(
+            name=name,
+            queue_name=env_string(f"{prefix}_QUEUE", f"{base_queue_name}-{name}"),
+            concurrency=max(1, env_int(f"{prefix}_CONCURRENCY", concurrency)),
+            rate_budget=rate_budget,
+            rate_limit_per_min=max(
+                1, env_int(f"{prefix}_RATE_PER_MIN", rate_limit_per_min)
+            ),
+            max_retries=max(0, env_int(f"{prefix}_MAX_RETRIES", len(retry_intervals_s))),
+            retry_intervals_s=_env_intervals(
+                f"{prefix}_RETRY_INTERVALS", retry_intervals_s
+            ),
         )
 
 
@@ -158,16 +255,113 @@ class EnrichmentConfig:
     worker_concurrency: int
     request_delay_s: float
     job_timeout: str
+    batch_size: int
+    offer_budget_s: float
+    http_first: bool
+    # Preço/desconto (HTTP, barato) e link de afiliado (navegador, caro)
+    price_tier: EnrichmentTierConfig
+    affiliate_tier: EnrichmentTierConfig
+    # Tiers consumidos por este processo de worker
+    worker_tiers: tuple[str, ...]
+    # TTLs do cache de resultados (0 desativa a parte correspondente)
+    cache_price_ttl_s: int
+    cache_affiliate_ttl_s: int
+    # Score mínimo da faixa alta e score abaixo do qual a oferta vai para a baixa
+    priority_high_score: float
+    priority_low_score: float
+    # Limiters e circuit breaker no Redis, valendo para todas as réplicas
+    # (False: por processo)
+    shared_rate_limits: bool
+    # Ritmo adaptativo (AIMD) pelas respostas do ML, até N × o nominal
+    # (limiters compartilhados: só abaixo do nominal)
+    adaptive_rate_limits: bool
+    adaptive_max_factor: float
+
+    @property
+    def tiers(self) -> dict[str, EnrichmentTierConfig]:
+        """Tiers por nome."""
+        return {
+            ENRICHMENT_TIER_PRICE: self.price_tier,
+            ENRICHMENT_TIER_AFFILIATE: self.affiliate_tier,
+        }
 
     @classmethod
     def from_env(cls) -> EnrichmentConfig:
         """Cria configuração a partir de variáveis de ambiente."""
+        queue_name = env_string("ENRICHMENT_QUEUE_NAME", "enrichment")
+        worker_concurrency = env_int("ENRICHMENT_WORKER_CONCURRENCY", 3)
+        worker_tiers = tuple(
+            tier.strip()
+            for tier in env_string(
+                "ENRICHMENT_WORKER_TIERS",
+                f"{ENRICHMENT_TIER_PRICE},{ENRICHMENT_TIER_AFFILIATE}",
+            ).split(",")
+            if tier.strip() in (ENRICHMENT_TIER_PRICE, ENRICHMENT_TIER_AFFILIATE)
+        )
         return cls(
             redis_url=env_string("REDIS_URL", "redis://localhost:6379/0"),
-            queue_name=env_string("ENRICHMENT_QUEUE_NAME", "enrichment"),
-            worker_concurrency=env_int("ENRICHMENT_WORKER_CONCURRENCY", 3),
+            queue_name=queue_name,
+            worker_concurrency=worker_concurrency,
             request_delay_s=env_float("ENRICHMENT_REQUEST_DELAY_S", 0.5),
             job_timeout=env_string("ENRICHMENT_JOB_TIMEOUT", "10m"),
+            batch_size=max(1, env_int("ENRICHMENT_BATCH_SIZE", 10)),
+            offer_budget_s=env_float("ENRICHMENT_OFFER_BUDGET_S", 30.0),
+            http_first=env_bool("ENRICHMENT_HTTP_FIRST", True),
+            price_tier=EnrichmentTierConfig.from_env(
+                ENRICHMENT_TIER_PRICE,
+                queue_name,
+                concurrency=8,
+                rate_budget=RATE_BUDGET_PRODUCT_PAGE,
+                rate_limit_per_min=60,
+                retry_intervals_s=(30, 120, 600),
+            ),
+            affiliate_tier=EnrichmentTierConfig.from_env(
+                ENRICHMENT_TIER_AFFILIATE,
+                queue_name,
+                concurrency=worker_concurrency,
+                rate_budget=RATE_BUDGET_SHARE_FLOW,
+                rate_limit_per_min=10,
+                retry_intervals_s=(60, 300, 900),
+            ),
+            worker_tiers=worker_tiers,
+            cache_price_ttl_s=max(0, env_int("ENRICHMENT_CACHE_PRICE_TTL_S", 6 * 3600)),
+            cache_affiliate_ttl_s=max(
+                0, env_int("ENRICHMENT_CACHE_AFFILIATE_TTL_S", 7 * 86400)
+            ),
+            priority_high_score=env_float("ENRICHMENT_PRIORITY_HIGH_SCORE", 60.0),
+            priority_low_score=env_float("ENRICHMENT_PRIORITY_LOW_SCORE", 20.0),
+            shared_rate_limits=env_bool("RATE_LIMIT_SHARED", True),
+            adaptive_rate_limits=env_bool("RATE_LIMIT_ADAPTIVE", True),
+            adaptive_max_factor=env_float("RATE_LIMIT_ADAPTIVE_MAX_FACTOR", 3.0),
+        )
+
+
+@dataclass(frozen=True)
+class BrowserConfig:
+    """Configurações do browser compartilhado (serviço via CDP)."""
+
+    cdp_url: str
+    max_contexts: int
+    connect_timeout_ms: int
+    reconnect_attempts: int
+    server_port: int
+    server_host: str
+
+    @property
+    def remote(self) -> bool:
+        """Indica se os componentes devem se conectar a um browser compartilhado."""
+        return bool(self.cdp_url)
+
+    @classmethod
+    def from_env(cls) -> BrowserConfig:
+        """Cria configuração a partir de variáveis de ambiente."""
+        return cls(
+            cdp_url=env_string("BROWSER_CDP_URL", ""),
+            max_contexts=max(1, env_int("BROWSER_MAX_CONTEXTS", 8)),
+            connect_timeout_ms=env_int("BROWSER_CONNECT_TIMEOUT_MS", 10000),
+            reconnect_attempts=max(1, env_int("BROWSER_RECONNECT_ATTEMPTS", 3)),
+            server_port=env_int("BROWSER_SERVER_PORT", 9222),
+            server_host=env_string("BROWSER_SERVER_HOST", ""),
         )
 
 
@@ -180,6 +374,7 @@ class Config:
     affiliate: AffiliateConfig
     database: DatabaseConfig
     enrichment: EnrichmentConfig
+    browser: BrowserConfig
     max_items_print: int
 
     @classmethod
@@ -191,6 +386,7 @@ class Config:
             affiliate=AffiliateConfig.from_env(),
             database=DatabaseConfig.from_env(),
             enrichment=EnrichmentConfig.from_env(),
+            browser=BrowserConfig.from_env(),
             max_items_print=env_int("MAX_ITEMS_PRINT", 20),
         )
 
@@ -1,17 +1,51 @@
 """Constantes compartilhadas do projeto."""
 
 from shared.constants.constants import (
+    BLOCK_URL_SNIPPETS,
+    CIRCUIT_BREAKER_KEY_PREFIX,
     DEFAULT_ACCEPT_LANGUAGE,
     DEFAULT_USER_AGENT,
     DELAY_AFTER_SCROLL,
     DELAY_BETWEEN_ACTIONS,
     DELAY_INITIAL_RENDER,
+    ENRICHMENT_CACHE_KEY_PREFIX,
+    ENRICHMENT_CACHE_MGET_CHUNK,
+    ENRICHMENT_ENQUEUE_WATCH_RETRIES,
+    ENRICHMENT_PENDING_KEY_PREFIX,
+    ENRICHMENT_PENDING_TTL_S,
+    ENRICHMENT_PRIORITY_DEFAULT,
+    ENRICHMENT_PRIORITY_HIGH,
+    ENRICHMENT_PRIORITY_LOW,
+    ENRICHMENT_TIER_AFFILIATE,
+    ENRICHMENT_TIER_PRICE,
+    ERROR_BANNER_SELECTORS,
+    ERROR_TEXT_SNIPPETS,
     FINAL_WAIT_MULTIPLIER,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE,
+    HUB_STREAM_BATCH_SIZE,
     MAX_CARDS_PER_PAGE,
+    OBSERVER_DRAIN_BATCH_SIZE,
+    PACER_LATENCY_EWMA_ALPHA,
+    PACER_LATENCY_MIN_SAMPLES,
+    RATE_BUDGET_DEFAULT,
+    RATE_BUDGET_HUB,
+    RATE_BUDGET_PRODUCT_PAGE,
+    RATE_BUDGET_SHARE_FLOW,
+    RATE_LIMIT_KEY_PREFIX,
     RESOURCE_BLOCK_TYPES,
+    RESOURCE_BLOCK_URL_EXTENSIONS,
     SCROLL_DELAY_MULTIPLIER,
     SCROLL_DROP_THRESHOLD_PCT,
     SCROLL_PIXELS,
+    SCROLL_BUDGET_HEADROOM,
+    SCROLL_QUIET_MS,
+    SCROLL_TIMINGS_MAX_SAMPLES,
+    SCROLL_TIMINGS_MIN_SAMPLES,
+    SCROLL_WAIT_MIN_MS,
+    STREAM_PIPELINE_MAX_BATCHES,
+    THREADED_WORKER_DEQUEUE_TIMEOUT_S,
+    THROTTLE_HTTP_STATUSES,
     TIMEOUT_MEDIUM,
     TIMEOUT_NETWORK_IDLE,
     TIMEOUT_PAGE_LOAD,
@@ -19,20 +53,56 @@ from shared.constants.constants import (
     TIMEOUT_SHORT,
     TRACKER_HOST_SNIPPETS,
     DEFAULT_QUERY_LIMIT,
+    DEFAULT_DB_MAX_CONCURRENCY,
 )
 
 __all__ = [
+    "BLOCK_URL_SNIPPETS",
+    "CIRCUIT_BREAKER_KEY_PREFIX",
     "DEFAULT_ACCEPT_LANGUAGE",
+    "DEFAULT_DB_MAX_CONCURRENCY",
     "DEFAULT_USER_AGENT",
     "DELAY_AFTER_SCROLL",
     "DELAY_BETWEEN_ACTIONS",
     "DELAY_INITIAL_RENDER",
+    "ENRICHMENT_CACHE_KEY_PREFIX",
+    "ENRICHMENT_CACHE_MGET_CHUNK",
+    "ENRICHMENT_ENQUEUE_WATCH_RETRIES",
+    "ENRICHMENT_PENDING_KEY_PREFIX",
+    "ENRICHMENT_PENDING_TTL_S",
+    "ENRICHMENT_PRIORITY_DEFAULT",
+    "ENRICHMENT_PRIORITY_HIGH",
+    "ENRICHMENT_PRIORITY_LOW",
+    "ENRICHMENT_TIER_AFFILIATE",
+    "ENRICHMENT_TIER_PRICE",
+    "ERROR_BANNER_SELECTORS",
+    "ERROR_TEXT_SNIPPETS",
     "FINAL_WAIT_MULTIPLIER",
+    "HTTP_MAX_CONNECTIONS",
+    "HTTP_MAX_KEEPALIVE",
+    "HUB_STREAM_BATCH_SIZE",
     "MAX_CARDS_PER_PAGE",
+    "OBSERVER_DRAIN_BATCH_SIZE",
+    "PACER_LATENCY_EWMA_ALPHA",
+    "PACER_LATENCY_MIN_SAMPLES",
+    "RATE_BUDGET_DEFAULT",
+    "RATE_BUDGET_HUB",
+    "RATE_BUDGET_PRODUCT_PAGE",
+    "RATE_BUDGET_SHARE_FLOW",
+    "RATE_LIMIT_KEY_PREFIX",
     "RESOURCE_BLOCK_TYPES",
+    "RESOURCE_BLOCK_URL_EXTENSIONS",
     "SCROLL_DELAY_MULTIPLIER",
     "SCROLL_DROP_THRESHOLD_PCT",
     "SCROLL_PIXELS",
+    "SCROLL_BUDGET_HEADROOM",
+    "SCROLL_QUIET_MS",
+    "SCROLL_TIMINGS_MAX_SAMPLES",
+    "SCROLL_TIMINGS_MIN_SAMPLES",
+    "SCROLL_WAIT_MIN_MS",
+    "STREAM_PIPELINE_MAX_BATCHES",
+    "THREADED_WORKER_DEQUEUE_TIMEOUT_S",
+    "THROTTLE_HTTP_STATUSES",
     "TIMEOUT_MEDIUM",
     "TIMEOUT_NETWORK_IDLE",
     "TIMEOUT_PAGE_LOAD",
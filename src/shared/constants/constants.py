@@ -3,6 +3,15 @@
 # Tipos de recursos a bloquear
 RESOURCE_BLOCK_TYPES = {"image", "font", "media"}
 
+# Extensões de URL bloqueadas no próprio navegador (imagens, fontes, mídia e CSS),
+# equivalentes em padrão de URL a RESOURCE_BLOCK_TYPES + stylesheet
+RESOURCE_BLOCK_URL_EXTENSIONS = (
+    "png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico",
+    "woff", "woff2", "ttf", "otf", "eot",
+    "mp4", "webm", "mp3", "m4a", "ogg",
+    "css",
+)
+
 # Hosts de trackers a bloquear
 TRACKER_HOST_SNIPPETS = (
     "doubleclick",
@@ -12,6 +21,22 @@ TRACKER_HOST_SNIPPETS = (
     "hotjar",
 )
 
+# Seletores de banners de erro na página (verificados em um único evaluate)
+ERROR_BANNER_SELECTORS = (
+    ".ui-snackbar--error",
+    '[class*="error"]',
+    '[class*="erro"]',
+)
+
+# Textos de erro comuns (comparados em minúsculas)
+ERROR_TEXT_SNIPPETS = (
+    "ocorreu um erro",
+    "não foi possível",
+    "tente novamente",
+    "erro ao carregar",
+    "sem resultados",
+)
+
 # User Agent padrão
 DEFAULT_USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
@@ -24,6 +49,9 @@ DEFAULT_ACCEPT_LANGUAGE = "pt-BR,pt;q=0.9,en;q=0.8"
 # Limites e configurações de scraping
 MAX_CARDS_PER_PAGE = 300
 SCROLL_PIXELS = 2400
+OBSERVER_DRAIN_BATCH_SIZE = 200  # Cards lidos por vez do buffer do MutationObserver
+HUB_STREAM_BATCH_SIZE = 50  # Ofertas por lote no scraping em streaming
+STREAM_PIPELINE_MAX_BATCHES = 4  # Lotes aguardando persistência no pipeline de streaming
 
 # Timeouts (em milissegundos)
 TIMEOUT_SHORT = 500  # Para verificações rápidas (cookies, erros)
@@ -42,5 +70,54 @@ SCROLL_DROP_THRESHOLD_PCT = 30  # Percentual de queda aceitável no scroll
 SCROLL_DELAY_MULTIPLIER = 0.5  # Multiplicador para delay de scroll (50%)
 FINAL_WAIT_MULTIPLIER = 3  # Multiplicador para espera final após scrolls
 
+# Agendador de scroll (tempos aprendidos entre execuções)
+SCROLL_WAIT_MIN_MS = 250  # Limite mínimo de espera por novos cards
+SCROLL_QUIET_MS = 250  # Janela sem requisições para considerar a rede ociosa
+SCROLL_BUDGET_HEADROOM = 1.5  # Folga aplicada sobre o p95 aprendido
+SCROLL_TIMINGS_MIN_SAMPLES = 5  # Amostras necessárias antes de usar o p95
+SCROLL_TIMINGS_MAX_SAMPLES = 200  # Janela deslizante de amostras persistidas
+
 # Limites de retry e processamento
 DEFAULT_QUERY_LIMIT = 100  # Limite padrão para queries de banco
+DEFAULT_DB_MAX_CONCURRENCY = 8  # Requisições simultâneas ao banco (executor dedicado)
+THREADED_WORKER_DEQUEUE_TIMEOUT_S = 5  # Espera por jobs de cada slot do worker concorrente
+
+# Cliente HTTP (leitura de páginas de produto sem navegador)
+HTTP_MAX_CONNECTIONS = 20  # Conexões simultâneas por processo
+HTTP_MAX_KEEPALIVE = 10  # Conexões mantidas abertas entre requisições
+
+# Tiers de enriquecimento (cada um com fila própria)
+ENRICHMENT_TIER_PRICE = "price"  # Preço antigo e desconto (HTTP)
+ENRICHMENT_TIER_AFFILIATE = "affiliate"  # Link e ID de afiliado (navegador)
+
+# Cache de resultados de enriquecimento (Redis)
+ENRICHMENT_CACHE_KEY_PREFIX = "enrichment:cache"  # Chaves <prefixo>:<marketplace>:<id>:<tier>
+ENRICHMENT_CACHE_MGET_CHUNK = 500  # Chaves por MGET (vários MGETs em um pipeline)
+
+# Enfileiramento idempotente (uma marca por oferta/tier aponta para o job dono)
+ENRICHMENT_PENDING_KEY_PREFIX = "enrichment:pending"  # Chaves <prefixo>:<tier>:<offer_id>
+ENRICHMENT_PENDING_TTL_S = 2 * 86400  # Limpeza de marcas órfãs (job some sem concluir)
+ENRICHMENT_ENQUEUE_WATCH_RETRIES = 5  # Tentativas quando outra execução disputa as marcas
+
+# Faixas de prioridade do enriquecimento (uma fila por faixa em cada tier)
+ENRICHMENT_PRIORITY_HIGH = "high"  # Fila <tier>-high, drenada primeiro
+ENRICHMENT_PRIORITY_DEFAULT = "default"  # Fila do próprio tier
+ENRICHMENT_PRIORITY_LOW = "low"  # Fila <tier>-low, drenada por último
+
+# Orçamentos de requisições ao Mercado Livre (compartilhados no Redis entre processos)
+RATE_LIMIT_KEY_PREFIX = "ratelimit"  # Chaves <prefixo>:<orçamento>
+CIRCUIT_BREAKER_KEY_PREFIX = "circuit"  # Chaves <prefixo>:<breaker>[:failures|:probe]
+RATE_BUDGET_DEFAULT = "ml"  # Enriquecimento completo (jobs sem tier)
+RATE_BUDGET_HUB = "ml_hub"  # Navegação da Central de Afiliados
+RATE_BUDGET_PRODUCT_PAGE = "ml_product_page"  # Páginas de produto (tier de preço)
+RATE_BUDGET_SHARE_FLOW = "ml_share_flow"  # Fluxo "Compartilhar" (tier de afiliado)
+
+# Ritmo adaptativo (AIMD) das requisições ao Mercado Livre
+THROTTLE_HTTP_STATUSES = (403, 429)  # Respostas que indicam excesso de requisições
+BLOCK_URL_SNIPPETS = (  # Destinos de redirecionamento para captcha / tela de login
+    "captcha",
+    "account-verification",
+    "/login",
+)
+PACER_LATENCY_EWMA_ALPHA = 0.2  # Peso da última latência na média móvel
+PACER_LATENCY_MIN_SAMPLES = 5  # Amostras antes de detectar picos de latência
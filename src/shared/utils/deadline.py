@@ -0,0 +1,52 @@
+"""Prazo (deadline) compartilhado entre as etapas de uma operação."""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(Exception):
+    """
+    Etapa interrompida porque o orçamento da operação acabou.
+
+    Não indica falha do serviço remoto: o ritmo adaptativo e o circuit
+    breaker não a contam.
+    """
+
+
+class Deadline:
+    """
+    Orçamento de tempo de uma operação, consumido por todas as suas etapas.
+
+    Cada etapa pede seu timeout com ``timeout_ms(limite)``: o menor entre o
+    limite próprio da etapa e o tempo restante do orçamento.
+    """
+
+    def __init__(self, budget_s: Optional[float]) -> None:
+        """
+        Args:
+            budget_s: Orçamento em segundos (None ou <= 0: sem limite)
+        """
+        self.budget_s = budget_s if budget_s and budget_s > 0 else None
+        self._expires_at = (
+            time.monotonic() + self.budget_s if self.budget_s is not None else math.inf
+        )
+
+    def remaining_s(self) -> float:
+        """Segundos restantes (infinito quando sem limite)."""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Indica se o orçamento acabou."""
+        return self.remaining_s() <= 0
+
+    def timeout_ms(self, cap_ms: int) -> int:
+        """
+        Timeout para a próxima etapa.
+
+        Nunca retorna 0, que no Playwright significa "sem timeout".
+        """
+        return max(1, int(min(cap_ms, self.remaining_s() * 1000)))
@@ -38,6 +38,13 @@ scrolls_performed_total = Counter(
     'Número total de scrolls realizados',
 )
 
+# Ofertas da Central por caminho de extração
+hub_offers_by_extraction_path_total = Counter(
+    'dealhunter_hub_offers_by_extraction_path_total',
+    'Número total de ofertas da Central por caminho de extração',
+    ['path'],  # network, dom
+)
+
 # Erros de scraping
 scraping_errors_total = Counter(
     'dealhunter_scraping_errors_total',
@@ -185,6 +192,19 @@ browser_pool_in_use = Gauge(
     'Número de browsers em uso no pool',
 )
 
+# Requisições do browser por desfecho do bloqueio
+browser_requests_total = Counter(
+    'dealhunter_browser_requests_total',
+    'Número total de requisições do browser por desfecho',
+    ['outcome'],  # blocked, allowed, routed
+)
+
+# Bytes transferidos pelas requisições permitidas
+browser_transfer_bytes_total = Counter(
+    'dealhunter_browser_transfer_bytes_total',
+    'Bytes transferidos pelas requisições permitidas do browser',
+)
+
 # Tempo aguardando browser do pool
 browser_pool_wait_seconds = Histogram(
     'dealhunter_browser_pool_wait_seconds',
@@ -233,6 +253,35 @@ def start_metrics_server(port: int = 8000) -> None:
         log(f"[metrics] Erro ao iniciar servidor de métricas: {e}")
 
 
+def track_hub_extraction_path(path: str, count: int) -> None:
+    """
+    Registra quantas ofertas da Central vieram de cada caminho de extração.
+
+    Args:
+        path: Caminho de extração (network, dom)
+        count: Número de ofertas produzidas pelo caminho
+    """
+    if count > 0:
+        hub_offers_by_extraction_path_total.labels(path=path).inc(count)
+
+
+def track_browser_requests(blocked: int, allowed: int, routed: int, allowed_bytes: int) -> None:
+    """
+    Registra o resultado do bloqueio de requisições de um contexto de browser.
+
+    Args:
+        blocked: Requisições bloqueadas pelo navegador
+        allowed: Requisições concluídas
+        routed: Requisições decididas em Python (fallback via route)
+        allowed_bytes: Bytes transferidos pelas requisições concluídas
+    """
+    for outcome, count in (("blocked", blocked), ("allowed", allowed), ("routed", routed)):
+        if count > 0:
+            browser_requests_total.labels(outcome=outcome).inc(count)
+    if allowed_bytes > 0:
+        browser_transfer_bytes_total.inc(allowed_bytes)
+
+
 # ============================================================================
 # MÉTRICAS CUSTOMIZADAS PARA RATE LIMITER
 # ============================================================================
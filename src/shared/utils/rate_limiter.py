@@ -3,20 +3,43 @@
 from __future__ import annotations
 
 import asyncio
+import math
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import timedelta
 from enum import Enum
-from typing import Optional
-
+from typing import Any, Callable, Optional
+
+from shared.constants import (
+    CIRCUIT_BREAKER_KEY_PREFIX,
+    PACER_LATENCY_EWMA_ALPHA,
+    PACER_LATENCY_MIN_SAMPLES,
+    RATE_BUDGET_DEFAULT,
+    RATE_LIMIT_KEY_PREFIX,
+    THROTTLE_HTTP_STATUSES,
+)
+from shared.utils.deadline import DeadlineExceeded
 from shared.utils.logging import log
+from shared.utils.metrics import (
+    track_circuit_breaker_failure,
+    track_circuit_breaker_rejection,
+    track_rate_limit_wait,
+    update_circuit_breaker_state,
+)
+
+# Folga de arredondamento ao comparar tokens fracionários
+_TOKEN_EPSILON = 1e-9
 
 
 class RateLimiter:
     """
-    Rate limiter assíncrono baseado em janela deslizante.
+    Rate limiter assíncrono de balde de tokens (token bucket).
 
-    Controla o número máximo de requisições em uma janela de tempo.
+    O balde guarda até ``burst`` tokens e recebe ``max_requests`` tokens por
+    ``time_window``, no relógio monotônico; cada requisição consome um token
+    em O(1). Sem token livre, a corrotina entra em uma fila FIFO e é acordada
+    por um único timer, na ordem de chegada, sem lock preso durante a espera.
     """
 
     def __init__(
@@ -24,6 +47,7 @@ class RateLimiter:
         max_requests: int,
         time_window: timedelta,
         name: str = "rate_limiter",
+        burst: Optional[int] = None,
     ) -> None:
         """
         Inicializa o rate limiter.
@@ -31,51 +55,399 @@ class RateLimiter:
         Args:
             max_requests: Número máximo de requisições permitidas
             time_window: Janela de tempo para contagem
-            name: Nome do limiter (para logs)
+            name: Nome do limiter (para logs e métricas)
+            burst: Requisições liberadas de uma vez com o balde cheio
+                (padrão: max_requests, como a janela de antes)
         """
         self.max_requests = max_requests
         self.time_window = time_window
         self.name = name
-        self.requests: list[datetime] = []
-        self._lock = asyncio.Lock()
+        self.rate = max_requests / time_window.total_seconds()  # tokens por segundo
+        self.capacity = float(max(1, burst if burst is not None else max_requests))
+        self.tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _refill(self, capacity: Optional[float] = None) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            capacity or self.capacity,
+            self.tokens + (now - self._updated_at) * self.rate,
+        )
+        self._updated_at = now
 
-    async def acquire(self) -> None:
+    def try_acquire(self) -> bool:
         """
-        Aguarda até que uma requisição possa ser feita sem violar o limite.
+        Consome um token se houver um livre agora, sem esperar.
+
+        Não fura a fila: com corrotinas aguardando, retorna False.
 
-        Bloqueia se necessário até que haja capacidade disponível.
+        Returns:
+            True se o token foi consumido
         """
-        async with self._lock:
-            now = datetime.now()
+        while self._waiters and self._waiters[0].done():
+            self._waiters.popleft()
+        if self._waiters:
+            return False
+        self._refill()
+        if self.tokens >= 1 - _TOKEN_EPSILON:
+            self.tokens -= 1
+            return True
+        return False
+
+    async def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Aguarda um token, em ordem de chegada.
 
-            # Remove requisições antigas fora da janela
-            cutoff = now - self.time_window
-            self.requests = [r for r in self.requests if r > cutoff]
+        Args:
+            timeout: Espera máxima em segundos (None: sem limite)
 
-            # Se estamos no limite, aguarda
-            if len(self.requests) >= self.max_requests:
-                oldest = self.requests[0]
-                wait_until = oldest + self.time_window
-                wait_time = (wait_until - now).total_seconds()
+        Returns:
+            True quando o token foi obtido; False se o timeout venceu antes
+        """
+        if self.try_acquire():
+            return True
+
+        loop = asyncio.get_running_loop()
+        if self._timer_loop is not loop:
+            # Fila e timer de um event loop anterior (ex.: asyncio.run por job)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
+            self._waiters.clear()
+
+        waiter: asyncio.Future[None] = loop.create_future()
+        self._waiters.append(waiter)
+        if len(self._waiters) == 1:
+            log(
+                f"[{self.name}] Rate limit atingido. "
+                f"Aguardando {max(0.0, 1 - self.tokens) / self.rate:.2f}s..."
+            )
+        self._schedule(loop)
+
+        started = time.monotonic()
+        try:
+            if timeout is None:
+                await waiter
+            else:
+                await asyncio.wait((waiter,), timeout=timeout)
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+        if waiter.cancelled():
+            return False
+
+        track_rate_limit_wait(self.name, time.monotonic() - started)
+        return True
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Agenda o timer para quando o próximo token estiver disponível."""
+        if self._timer is not None:
+            return
+        self._refill()
+        delay = max(0.0, (1 - self.tokens) / self.rate)
+        self._timer = loop.call_later(delay, self._wake)
+        self._timer_loop = loop
+
+    def _wake(self) -> None:
+        """Entrega os tokens disponíveis aos primeiros da fila."""
+        self._timer = None
+        # Com fila, o atraso do timer não é descartado pelo teto do balde: o
+        # token que venceu durante o atraso ainda é da fila
+        self._refill(self.capacity + 1)
+        while self._waiters:
+            waiter = self._waiters[0]
+            if waiter.done():
+                # Desistiu (timeout ou cancelamento)
+                self._waiters.popleft()
+                continue
+            if self.tokens < 1 - _TOKEN_EPSILON:
+                break
+            self.tokens -= 1
+            self._waiters.popleft()
+            waiter.set_result(None)
+        self.tokens = min(self.tokens, self.capacity)
+        if self._waiters and self._timer_loop is not None:
+            self._schedule(self._timer_loop)
+
+    def set_rate(self, max_requests_per_min: float) -> None:
+        """
+        Muda o ritmo do balde sem perder os tokens já acumulados.
 
-                if wait_time > 0:
-                    log(
-                        f"[{self.name}] Rate limit atingido. "
-                        f"Aguardando {wait_time:.2f}s..."
-                    )
-                    await asyncio.sleep(wait_time)
+        Usado pelo AdaptivePacer; ``max_requests`` continua sendo o nominal.
+
+        Args:
+            max_requests_per_min: Novo ritmo em requisições por minuto
+        """
+        self._refill()
+        self.rate = max_requests_per_min / 60
+        if (
+            self._timer is not None
+            and self._timer_loop is not None
+            and not self._timer_loop.is_closed()
+        ):
+            # Reagenda a próxima entrega com o novo ritmo
+            self._timer.cancel()
+            self._timer = None
+            self._schedule(self._timer_loop)
+
+    def reset(self) -> None:
+        """Enche o balde novamente."""
+        self.tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+
+# GCRA com reserva: cada chamada reserva o próximo horário livre do orçamento
+# (TAT, "theoretical arrival time") e devolve quantos ms esperar até ele, ou
+# -1 sem reservar se a espera passar de ARGV[3] (-1: sem limite). O relógio é o
+# do Redis, comum a todos os processos.
+_GCRA_LUA = """
+if redis.replicate_commands then redis.replicate_commands() end
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local max_wait = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then tat = now end
+local wait = tat - tolerance - now
+if wait < 0 then wait = 0 end
+if max_wait >= 0 and wait > max_wait then return -1 end
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now) + 1000)
+return math.ceil(wait)
+"""
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Rate limiter compartilhado entre processos (GCRA em um script Lua no Redis).
+
+    Cada ``acquire`` reserva, atomicamente, o próximo horário livre do
+    orçamento e aguarda até ele: réplicas do worker e o scraper dividem o
+    mesmo limite, em ordem de chegada. Se o Redis falhar, cai para o balde
+    de tokens local herdado de RateLimiter.
+    """
+
+    def __init__(
+        self,
+        redis_conn: Any,
+        max_requests: int,
+        time_window: timedelta,
+        name: str = "rate_limiter",
+        burst: int = 1,
+        key_prefix: str = RATE_LIMIT_KEY_PREFIX,
+    ) -> None:
+        """
+        Inicializa o rate limiter.
+
+        Args:
+            redis_conn: Conexão Redis (redis-py)
+            max_requests: Número máximo de requisições na janela
+            time_window: Janela de tempo
+            name: Nome do orçamento (chave no Redis e logs)
+            burst: Requisições liberadas de uma vez antes de espaçar
+            key_prefix: Prefixo da chave no Redis
+        """
+        super().__init__(max_requests, time_window, name)
+        self.redis = redis_conn
+        self.key = f"{key_prefix}:{name}"
+        self.burst = max(1, burst)
+        self.interval_ms = time_window.total_seconds() * 1000 / max_requests
+        self.nominal_interval_ms = self.interval_ms
+        self.tolerance_ms = self.interval_ms * (self.burst - 1)
+        self._script = redis_conn.register_script(_GCRA_LUA)
+
+    def set_rate(self, max_requests_per_min: float) -> None:
+        """
+        Muda o espaçamento usado por este processo no orçamento compartilhado.
+
+        Nunca acima do nominal: cada processo tem seu próprio pacer, e um
+        intervalo menor gravado no GCRA deixaria o conjunto acima do limite
+        combinado. O ritmo adaptativo aqui só desacelera.
+        """
+        max_requests_per_min = min(
+            max_requests_per_min, 60000 / self.nominal_interval_ms
+        )
+        super().set_rate(max_requests_per_min)
+        self.interval_ms = 60000 / max_requests_per_min
+        self.tolerance_ms = self.interval_ms * (self.burst - 1)
+
+    def _reserve(self, max_wait_ms: int = -1) -> int:
+        """Reserva um horário no orçamento; retorna a espera em ms (-1: recusado)."""
+        return int(
+            self._script(
+                keys=[self.key],
+                args=[self.interval_ms, self.tolerance_ms, max_wait_ms],
+            )
+        )
+
+    def try_acquire(self) -> bool:
+        """
+        Reserva um horário só se ele estiver livre agora.
 
-                    # Recalcula após o sleep
-                    now = datetime.now()
-                    cutoff = now - self.time_window
-                    self.requests = [r for r in self.requests if r > cutoff]
+        Returns:
+            True se a requisição pode ser feita já
+        """
+        try:
+            return self._reserve(max_wait_ms=0) == 0
+        except Exception as e:
+            log(f"[{self.name}] Redis indisponível ({e}). Usando limite local...")
+            return super().try_acquire()
 
-            # Registra a requisição
-            self.requests.append(now)
+    async def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Aguarda o horário reservado no orçamento compartilhado.
+
+        Uma ida ao Redis por chamada, fora do event loop. Com ``timeout``,
+        nada é reservado se a espera for maior que ele.
+
+        Args:
+            timeout: Espera máxima em segundos (None: sem limite)
+
+        Returns:
+            True quando a requisição pode ser feita; False se a espera
+            passaria do timeout
+        """
+        max_wait_ms = -1 if timeout is None else max(0, int(timeout * 1000))
+        try:
+            wait_ms = await asyncio.to_thread(self._reserve, max_wait_ms)
+        except Exception as e:
+            log(f"[{self.name}] Redis indisponível ({e}). Usando limite local...")
+            return await super().acquire(timeout)
+
+        if wait_ms < 0:
+            return False
+        if wait_ms > 0:
+            log(f"[{self.name}] Rate limit atingido. Aguardando {wait_ms / 1000:.2f}s...")
+            await asyncio.sleep(wait_ms / 1000)
+            track_rate_limit_wait(self.name, wait_ms / 1000)
+        return True
 
     def reset(self) -> None:
-        """Reseta o contador de requisições."""
-        self.requests = []
+        """Reseta o orçamento compartilhado e o balde local."""
+        super().reset()
+        try:
+            self.redis.delete(self.key)
+        except Exception as e:
+            log(f"[{self.name}] Erro ao resetar orçamento no Redis: {e}")
+
+
+@dataclass(frozen=True)
+class AdaptivePacingConfig:
+    """Configuração do ritmo adaptativo (AIMD) dos limiters nomeados."""
+
+    min_factor: float = 0.1  # Piso, em fração do ritmo nominal
+    max_factor: float = 3.0  # Teto, em múltiplos do ritmo nominal
+    increase_fraction: float = 0.1  # Do nominal, somado por minuto de respostas boas
+    decrease_factor: float = 0.5  # Multiplicador em bloqueio ou pico de latência
+    latency_spike_factor: float = 3.0  # Latência acima de N × a média é pico
+    decrease_cooldown_s: float = 10.0  # Intervalo mínimo entre dois cortes
+
+
+class AdaptivePacer:
+    """
+    Ritmo adaptativo (AIMD) de um rate limiter.
+
+    Cada navegação rápida aumenta o ritmo um pouco (aditivo: somadas, as
+    respostas de um minuto sobem ``increase_fraction`` do ritmo nominal).
+    403/429, captcha ou tela de login, timeouts e picos de latência cortam
+    o ritmo (multiplicativo), no máximo uma vez por ``decrease_cooldown_s``,
+    para que uma rajada de falhas simultâneas conte como um corte só.
+    """
+
+    def __init__(
+        self, limiter: RateLimiter, config: Optional[AdaptivePacingConfig] = None
+    ) -> None:
+        """
+        Args:
+            limiter: Limiter cujo ritmo é ajustado (começa no nominal)
+            config: Parâmetros do AIMD
+        """
+        self.limiter = limiter
+        self.config = config or AdaptivePacingConfig()
+        self.nominal_per_min = (
+            limiter.max_requests * 60 / limiter.time_window.total_seconds()
+        )
+        self.min_per_min = max(1.0, self.nominal_per_min * self.config.min_factor)
+        max_factor = self.config.max_factor
+        if isinstance(limiter, RedisRateLimiter):
+            # Orçamento compartilhado: o teto é o nominal (ver set_rate)
+            max_factor = min(max_factor, 1.0)
+        self.max_per_min = max(self.min_per_min, self.nominal_per_min * max_factor)
+        self.rate_per_min = self.nominal_per_min
+        self.latency_avg_s: Optional[float] = None
+        self._samples = 0
+        self._last_decrease = -math.inf
+
+    def record_response(
+        self, status: Optional[int], latency_s: float, blocked: bool = False
+    ) -> None:
+        """
+        Registra o resultado de uma navegação.
+
+        Args:
+            status: Status HTTP da resposta (None se não houve resposta)
+            latency_s: Duração da navegação em segundos
+            blocked: Se terminou em captcha ou tela de login
+        """
+        if blocked:
+            self._decrease("captcha/tela de login")
+            return
+        if status in THROTTLE_HTTP_STATUSES:
+            self._decrease(f"status {status}")
+            return
+        if status is not None and status >= 400:
+            # Erro da página (ex.: 404), não sinal de ritmo
+            return
+
+        spike = (
+            self.latency_avg_s is not None
+            and self._samples >= PACER_LATENCY_MIN_SAMPLES
+            and latency_s > self.config.latency_spike_factor * self.latency_avg_s
+        )
+        # A média acompanha também os picos: se o site ficou lento de vez,
+        # a nova latência vira a referência depois de alguns cortes
+        self._samples += 1
+        if self.latency_avg_s is None:
+            self.latency_avg_s = latency_s
+        else:
+            self.latency_avg_s += PACER_LATENCY_EWMA_ALPHA * (
+                latency_s - self.latency_avg_s
+            )
+
+        if spike:
+            self._decrease(f"pico de latência ({latency_s:.1f}s)")
+        else:
+            self._set_rate(
+                self.rate_per_min
+                + self.config.increase_fraction
+                * self.nominal_per_min
+                / max(1.0, self.rate_per_min)
+            )
+
+    def record_timeout(self) -> None:
+        """Registra uma navegação que estourou o timeout."""
+        self._decrease("timeout")
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.config.decrease_cooldown_s:
+            return
+        self._last_decrease = now
+        self._set_rate(self.rate_per_min * self.config.decrease_factor)
+        log(
+            f"[{self.limiter.name}] Reduzindo ritmo para "
+            f"{self.rate_per_min:.1f} req/min ({reason})"
+        )
+
+    def _set_rate(self, rate_per_min: float) -> None:
+        rate_per_min = min(self.max_per_min, max(self.min_per_min, rate_per_min))
+        if rate_per_min != self.rate_per_min:
+            self.rate_per_min = rate_per_min
+            self.limiter.set_rate(rate_per_min)
 
 
 class CircuitState(Enum):
@@ -96,6 +468,9 @@ class CircuitBreakerConfig:
         default_factory=lambda: timedelta(seconds=60)
     )  # Tempo que o circuito fica aberto
     half_open_max_calls: int = 1  # Máximo de chamadas no estado half-open
+    failure_window: timedelta = field(
+        default_factory=lambda: timedelta(minutes=2)
+    )  # Falhas mais antigas que isso (sem sucesso no meio) são esquecidas
 
 
 class CircuitBreakerError(Exception):
@@ -104,12 +479,32 @@ class CircuitBreakerError(Exception):
     pass
 
 
+# Valor do gauge circuit_breaker_state por estado
+_STATE_GAUGE_VALUES = {
+    CircuitState.CLOSED: 0,
+    CircuitState.OPEN: 1,
+    CircuitState.HALF_OPEN: 2,
+}
+
+# Ouvinte de mudança de estado: (breaker, estado anterior, novo estado)
+StateListener = Callable[["CircuitBreaker", CircuitState, CircuitState], None]
+
+
+def _publish_state_metric(
+    breaker: "CircuitBreaker", _old: CircuitState, new: CircuitState
+) -> None:
+    update_circuit_breaker_state(breaker.name, _STATE_GAUGE_VALUES[new])
+
+
 class CircuitBreaker:
     """
     Circuit breaker para proteção contra falhas em cascata.
 
     Abre o circuito após um número de falhas consecutivas,
     rejeitando requisições por um período de tempo.
+
+    Toda mudança de estado passa por ``_set_state``, que avisa os ouvintes
+    registrados (o primeiro atualiza o gauge ``circuit_breaker_state``).
     """
 
     def __init__(
@@ -132,6 +527,28 @@ class CircuitBreaker:
         self.last_failure_time: Optional[float] = None
         self.half_open_calls = 0
         self._lock = asyncio.Lock()
+        self.state_listeners: list[StateListener] = [_publish_state_metric]
+        _publish_state_metric(self, self.state, self.state)
+
+    def add_state_listener(self, listener: StateListener) -> None:
+        """
+        Registra uma função chamada a cada mudança de estado.
+
+        Args:
+            listener: Recebe (breaker, estado anterior, novo estado)
+        """
+        self.state_listeners.append(listener)
+
+    def _set_state(self, state: CircuitState) -> None:
+        """Muda o estado e avisa os ouvintes (só quando ele de fato muda)."""
+        if state == self.state:
+            return
+        old, self.state = self.state, state
+        for listener in self.state_listeners:
+            try:
+                listener(self, old, state)
+            except Exception as e:
+                log(f"[{self.name}] Erro em ouvinte de estado: {e}")
 
     async def call(self, func, *args, **kwargs):
         """
@@ -148,8 +565,13 @@ class CircuitBreaker:
         Raises:
             CircuitBreakerError: Se o circuito estiver aberto
         """
-        await self._check_state()
+        try:
+            release_probe = await self._check_state()
+        except CircuitBreakerError:
+            track_circuit_breaker_rejection(self.name)
+            raise
 
+        settled = False
         try:
             # Executa a função (suporta async e sync)
             if asyncio.iscoroutinefunction(func):
@@ -158,14 +580,34 @@ class CircuitBreaker:
                 result = func(*args, **kwargs)
 
             await self._on_success()
+            settled = True
             return result
 
+        except DeadlineExceeded:
+            # Orçamento da operação esgotado: não diz nada sobre o serviço
+            raise
+
         except Exception as e:
+            track_circuit_breaker_failure(self.name)
             await self._on_failure()
+            settled = True
             raise e
 
-    async def _check_state(self) -> None:
-        """Verifica e atualiza o estado do circuit breaker."""
+        finally:
+            # Cancelamento (ex.: timeout do job) e orçamento esgotado não são
+            # sucesso nem falha, mas a vaga de teste do HALF_OPEN precisa
+            # voltar, senão o circuito trava
+            if not settled and release_probe is not None:
+                release_probe()
+
+    async def _check_state(self) -> Optional[Callable[[], None]]:
+        """
+        Verifica e atualiza o estado do circuit breaker.
+
+        Returns:
+            Função que devolve a vaga de teste ocupada por esta chamada no
+            HALF_OPEN (None se nenhuma foi ocupada)
+        """
         async with self._lock:
             if self.state == CircuitState.OPEN:
                 # Verifica se é hora de tentar novamente
@@ -176,7 +618,7 @@ class CircuitBreaker:
                             f"[{self.name}] Timeout expirado. "
                             f"Mudando para HALF_OPEN..."
                         )
-                        self.state = CircuitState.HALF_OPEN
+                        self._set_state(CircuitState.HALF_OPEN)
                         self.half_open_calls = 0
                     else:
                         remaining = (
@@ -187,7 +629,7 @@ class CircuitBreaker:
                             f"Tentando novamente em {remaining:.1f}s"
                         )
 
-            elif self.state == CircuitState.HALF_OPEN:
+            if self.state == CircuitState.HALF_OPEN:
                 # Limita chamadas no estado half-open
                 if self.half_open_calls >= self.config.half_open_max_calls:
                     raise CircuitBreakerError(
@@ -195,6 +637,13 @@ class CircuitBreaker:
                         "Aguardando resultado de testes..."
                     )
                 self.half_open_calls += 1
+                return self._release_probe
+            return None
+
+    def _release_probe(self) -> None:
+        """Devolve uma vaga de teste do HALF_OPEN sem registrar resultado."""
+        if self.state == CircuitState.HALF_OPEN:
+            self.half_open_calls = max(0, self.half_open_calls - 1)
 
     async def _on_success(self) -> None:
         """Registra um sucesso."""
@@ -203,34 +652,43 @@ class CircuitBreaker:
 
             if self.state == CircuitState.HALF_OPEN:
                 self.success_count += 1
+                # Libera a vaga de teste para a próxima chamada
+                self.half_open_calls = max(0, self.half_open_calls - 1)
                 if self.success_count >= self.config.success_threshold:
                     log(
                         f"[{self.name}] Sucessos suficientes. "
                         f"Fechando circuito..."
                     )
-                    self.state = CircuitState.CLOSED
+                    self._set_state(CircuitState.CLOSED)
                     self.success_count = 0
 
     async def _on_failure(self) -> None:
         """Registra uma falha."""
         async with self._lock:
+            now = time.time()
+            if (
+                self.last_failure_time is not None
+                and now - self.last_failure_time
+                > self.config.failure_window.total_seconds()
+            ):
+                self.failure_count = 0
             self.failure_count += 1
             self.success_count = 0
-            self.last_failure_time = time.time()
+            self.last_failure_time = now
 
             if self.state == CircuitState.HALF_OPEN:
                 log(
                     f"[{self.name}] Falha em HALF_OPEN. "
                     f"Reabrindo circuito..."
                 )
-                self.state = CircuitState.OPEN
+                self._set_state(CircuitState.OPEN)
 
             elif self.failure_count >= self.config.failure_threshold:
                 log(
                     f"[{self.name}] Limite de falhas atingido "
                     f"({self.failure_count}). Abrindo circuito..."
                 )
-                self.state = CircuitState.OPEN
+                self._set_state(CircuitState.OPEN)
 
     def get_state(self) -> CircuitState:
         """Retorna o estado atual do circuit breaker."""
@@ -238,16 +696,255 @@ class CircuitBreaker:
 
     def reset(self) -> None:
         """Reseta o circuit breaker para o estado inicial."""
-        self.state = CircuitState.CLOSED
+        self._set_state(CircuitState.CLOSED)
         self.failure_count = 0
         self.success_count = 0
         self.last_failure_time = None
         self.half_open_calls = 0
 
 
+# Máquina de estados do breaker compartilhado. KEYS: estado (hash), falhas
+# na janela (contador com TTL), vagas de teste em HALF_OPEN (contador com
+# TTL, para que um processo que morreu no teste não prenda a vaga).
+# ARGV[1]: check, success, failure ou release (devolve a vaga de teste de
+# uma chamada cancelada). Retorna {estado, permitido (0/1), ms até o próximo teste}.
+_CIRCUIT_LUA = """
+if redis.replicate_commands then redis.replicate_commands() end
+local action = ARGV[1]
+local failure_threshold = tonumber(ARGV[2])
+local success_threshold = tonumber(ARGV[3])
+local timeout = tonumber(ARGV[4])
+local half_open_max = tonumber(ARGV[5])
+local window = tonumber(ARGV[6])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+
+local function open()
+  redis.call('HSET', KEYS[1], 'state', 'open', 'opened_at', now, 'successes', 0)
+  redis.call('DEL', KEYS[2], KEYS[3])
+  return {'open', 1, 0}
+end
+
+if state == 'open' then
+  local opened_at = tonumber(redis.call('HGET', KEYS[1], 'opened_at')) or 0
+  local remaining = timeout - (now - opened_at)
+  if remaining > 0 or action == 'release' then
+    -- Chamadas iniciadas antes da abertura não mudam o estado
+    if action == 'check' then return {state, 0, remaining} end
+    return {state, 1, 0}
+  end
+  redis.call('HSET', KEYS[1], 'state', 'half_open', 'successes', 0)
+  redis.call('DEL', KEYS[3])
+  state = 'half_open'
+end
+
+if state == 'half_open' then
+  if action == 'check' then
+    local probes = redis.call('INCR', KEYS[3])
+    redis.call('PEXPIRE', KEYS[3], timeout)
+    if probes > half_open_max then
+      redis.call('DECR', KEYS[3])
+      return {state, 0, 0}
+    end
+    return {state, 1, 0}
+  end
+  if action == 'failure' then return open() end
+  if redis.call('DECR', KEYS[3]) < 0 then redis.call('DEL', KEYS[3]) end
+  if action == 'release' then return {state, 1, 0} end
+  local successes = redis.call('HINCRBY', KEYS[1], 'successes', 1)
+  if successes >= success_threshold then
+    redis.call('DEL', KEYS[1], KEYS[2], KEYS[3])
+    return {'closed', 1, 0}
+  end
+  return {state, 1, 0}
+end
+
+if action == 'failure' then
+  local failures = redis.call('INCR', KEYS[2])
+  if failures == 1 then redis.call('PEXPIRE', KEYS[2], window) end
+  if failures >= failure_threshold then return open() end
+elseif action == 'success' then
+  redis.call('DEL', KEYS[2])
+end
+return {state, 1, 0}
+"""
+
+
+class RedisCircuitBreaker(CircuitBreaker):
+    """
+    Circuit breaker com estado compartilhado entre processos (Redis).
+
+    A janela de falhas, o estado e as vagas de teste do HALF_OPEN ficam no
+    Redis e mudam atomicamente em um script Lua: quando uma réplica abre o
+    circuito, todos os workers e o scraper passam a rejeitar chamadas. Cada
+    processo guarda em ``state`` o último estado visto (com os ouvintes
+    avisados na mudança). Se o Redis falhar, cai para o breaker local
+    herdado de CircuitBreaker.
+    """
+
+    def __init__(
+        self,
+        redis_conn: Any,
+        config: Optional[CircuitBreakerConfig] = None,
+        name: str = "circuit_breaker",
+        key_prefix: str = CIRCUIT_BREAKER_KEY_PREFIX,
+    ) -> None:
+        """
+        Inicializa o circuit breaker.
+
+        Args:
+            redis_conn: Conexão Redis (redis-py, síncrona)
+            config: Configuração do circuit breaker
+            name: Nome do breaker (também identifica o estado no Redis)
+            key_prefix: Prefixo das chaves no Redis
+        """
+        super().__init__(config, name)
+        self.redis = redis_conn
+        self.key = f"{key_prefix}:{name}"
+        self._keys = [self.key, f"{self.key}:failures", f"{self.key}:probe"]
+        self._script = redis_conn.register_script(_CIRCUIT_LUA)
+
+    def _run(self, action: str) -> tuple[CircuitState, bool, float]:
+        """Executa uma ação no estado compartilhado; retorna (estado, permitido, espera em s)."""
+        state, allowed, remaining_ms = self._script(
+            keys=self._keys,
+            args=[
+                action,
+                self.config.failure_threshold,
+                self.config.success_threshold,
+                int(self.config.timeout.total_seconds() * 1000),
+                self.config.half_open_max_calls,
+                int(self.config.failure_window.total_seconds() * 1000),
+            ],
+        )
+        if isinstance(state, bytes):
+            state = state.decode()
+        return CircuitState(state), bool(int(allowed)), int(remaining_ms) / 1000
+
+    async def _apply(self, action: str) -> Optional[tuple[bool, float]]:
+        """Aplica a ação no Redis e atualiza o estado local; None se o Redis falhou."""
+        try:
+            state, allowed, remaining_s = await asyncio.to_thread(self._run, action)
+        except Exception as e:
+            log(f"[{self.name}] Redis indisponível ({e}). Usando estado local...")
+            return None
+        if state != self.state:
+            log(
+                f"[{self.name}] Estado compartilhado: "
+                f"{self.state.value} -> {state.value}"
+            )
+            self._set_state(state)
+        return allowed, remaining_s
+
+    async def _check_state(self) -> Optional[Callable[[], None]]:
+        """Verifica o estado compartilhado e reserva a vaga de teste no HALF_OPEN."""
+        outcome = await self._apply("check")
+        if outcome is None:
+            return await super()._check_state()
+        allowed, remaining_s = outcome
+        if allowed:
+            if self.state == CircuitState.HALF_OPEN:
+                return self._release_shared_probe
+            return None
+        if self.state == CircuitState.OPEN:
+            raise CircuitBreakerError(
+                f"Circuit breaker aberto. "
+                f"Tentando novamente em {remaining_s:.1f}s"
+            )
+        raise CircuitBreakerError(
+            "Circuit breaker em HALF_OPEN. "
+            "Aguardando resultado de testes..."
+        )
+
+    def _release_shared_probe(self) -> None:
+        """
+        Devolve a vaga de teste no Redis.
+
+        Síncrono (roda no ``finally`` de uma chamada cancelada, onde não dá
+        para esperar uma thread); é uma única ida ao Redis, só nesse caso.
+        """
+        try:
+            self._run("release")
+        except Exception as e:
+            log(f"[{self.name}] Erro ao devolver vaga de teste no Redis: {e}")
+
+    async def _on_success(self) -> None:
+        """Registra um sucesso no estado compartilhado."""
+        if await self._apply("success") is None:
+            await super()._on_success()
+
+    async def _on_failure(self) -> None:
+        """Registra uma falha no estado compartilhado."""
+        if await self._apply("failure") is None:
+            await super()._on_failure()
+
+    def reset(self) -> None:
+        """Reseta o estado compartilhado e o local."""
+        super().reset()
+        try:
+            self.redis.delete(*self._keys)
+        except Exception as e:
+            log(f"[{self.name}] Erro ao resetar estado no Redis: {e}")
+
+
 # Instances globais para uso compartilhado
-_ml_rate_limiter: Optional[RateLimiter] = None
 _ml_circuit_breaker: Optional[CircuitBreaker] = None
+_named_rate_limiters: dict[str, RateLimiter] = {}
+# Conexão Redis dos orçamentos compartilhados (None: limiters por processo)
+_shared_redis: Optional[Any] = None
+# Ritmo adaptativo dos limiters nomeados (None: ritmo fixo)
+_pacing_config: Optional[AdaptivePacingConfig] = AdaptivePacingConfig()
+_pacers: dict[str, AdaptivePacer] = {}
+
+
+def configure_shared_rate_limits(redis_conn: Optional[Any]) -> None:
+    """
+    Faz os limiters nomeados usarem orçamentos no Redis e o circuit breaker
+    do ML usar estado compartilhado.
+
+    Chamado no boot do worker e do scraper; limiters e breaker já criados
+    são descartados para serem recriados no novo modo.
+
+    Args:
+        redis_conn: Conexão Redis (None: volta aos limiters por processo)
+    """
+    global _shared_redis, _ml_circuit_breaker
+    _shared_redis = redis_conn
+    _named_rate_limiters.clear()
+    _pacers.clear()
+    _ml_circuit_breaker = None
+
+
+def configure_adaptive_pacing(config: Optional[AdaptivePacingConfig]) -> None:
+    """
+    Define o ritmo adaptativo (AIMD) dos limiters nomeados.
+
+    Args:
+        config: Parâmetros do AIMD (None: ritmo fixo no nominal)
+    """
+    global _pacing_config
+    _pacing_config = config
+    _pacers.clear()
+
+
+def get_pacer(limiter: RateLimiter) -> Optional[AdaptivePacer]:
+    """
+    Obtém o ritmo adaptativo de um limiter.
+
+    Args:
+        limiter: Limiter (normalmente de ``get_rate_limiter``)
+
+    Returns:
+        AdaptivePacer do limiter, ou None com o ritmo adaptativo desligado
+    """
+    if _pacing_config is None:
+        return None
+    pacer = _pacers.get(limiter.name)
+    if pacer is None or pacer.limiter is not limiter:
+        pacer = AdaptivePacer(limiter, _pacing_config)
+        _pacers[limiter.name] = pacer
+    return pacer
 
 
 def get_ml_rate_limiter() -> RateLimiter:
@@ -255,33 +952,68 @@ def get_ml_rate_limiter() -> RateLimiter:
     Obtém o rate limiter global para requisições ao Mercado Livre.
 
     Returns:
-        RateLimiter configurado para ML (10 req/min)
+        RateLimiter do orçamento padrão do ML (10 req/min)
     """
-    global _ml_rate_limiter
-    if _ml_rate_limiter is None:
-        _ml_rate_limiter = RateLimiter(
-            max_requests=10,
-            time_window=timedelta(minutes=1),
-            name="ml_rate_limiter",
-        )
-    return _ml_rate_limiter
+    return get_rate_limiter(RATE_BUDGET_DEFAULT, 10)
+
+
+def get_rate_limiter(name: str, max_requests_per_min: int) -> RateLimiter:
+    """
+    Obtém (ou cria) o rate limiter de um orçamento nomeado.
+
+    Com ``configure_shared_rate_limits``, o orçamento fica no Redis e vale
+    para todos os processos (réplicas do worker e scraper); sem ele, cada
+    processo tem o seu.
+
+    Args:
+        name: Nome do orçamento (ex.: RATE_BUDGET_PRODUCT_PAGE)
+        max_requests_per_min: Requisições permitidas por minuto
+
+    Returns:
+        RateLimiter com janela de 1 minuto
+    """
+    limiter = _named_rate_limiters.get(name)
+    if limiter is None or limiter.max_requests != max_requests_per_min:
+        if _shared_redis is not None:
+            limiter = RedisRateLimiter(
+                _shared_redis,
+                max_requests=max_requests_per_min,
+                time_window=timedelta(minutes=1),
+                name=name,
+            )
+        else:
+            limiter = RateLimiter(
+                max_requests=max_requests_per_min,
+                time_window=timedelta(minutes=1),
+                name=name,
+            )
+        _named_rate_limiters[name] = limiter
+    return limiter
 
 
 def get_ml_circuit_breaker() -> CircuitBreaker:
     """
     Obtém o circuit breaker global para requisições ao Mercado Livre.
 
+    Com ``configure_shared_rate_limits``, o estado fica no Redis e vale para
+    todos os processos.
+
     Returns:
         CircuitBreaker configurado para ML
     """
     global _ml_circuit_breaker
     if _ml_circuit_breaker is None:
-        _ml_circuit_breaker = CircuitBreaker(
-            config=CircuitBreakerConfig(
-                failure_threshold=5,
-                success_threshold=2,
-                timeout=timedelta(seconds=60),
-            ),
-            name="ml_circuit_breaker",
+        config = CircuitBreakerConfig(
+            failure_threshold=5,
+            success_threshold=2,
+            timeout=timedelta(seconds=60),
         )
+        if _shared_redis is not None:
+            _ml_circuit_breaker = RedisCircuitBreaker(
+                _shared_redis, config=config, name="ml_circuit_breaker"
+            )
+        else:
+            _ml_circuit_breaker = CircuitBreaker(
+                config=config, name="ml_circuit_breaker"
+            )
     return _ml_circuit_breaker
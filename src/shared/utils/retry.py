@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import asyncio
 import random
-from typing import Callable, TypeVar
+from typing import Callable, Optional, TypeVar
 
+from shared.utils.deadline import Deadline
 from shared.utils.logging import log
 
 T = TypeVar("T")
@@ -19,6 +20,7 @@ async def retry_with_backoff(
     exponential_base: float = 2.0,
     jitter: bool = True,
     retryable_exceptions: tuple[type[Exception], ...] = (Exception,),
+    deadline: Optional[Deadline] = None,
 ) -> T:
     """
     Executa uma função assíncrona com retry e backoff exponencial.
@@ -31,6 +33,8 @@ async def retry_with_backoff(
         exponential_base: Base exponencial para o backoff
         jitter: Se deve adicionar jitter aleatório ao delay
         retryable_exceptions: Tupla de exceções que devem ser retentadas
+        deadline: Orçamento da operação: não há nova tentativa depois que ele
+            acaba, e a espera entre tentativas não passa dele
 
     Returns:
         Resultado da função
@@ -55,8 +59,8 @@ async def retry_with_backoff(
                 return result
         except retryable_exceptions as e:
             last_exception = e
-            if attempt == max_retries - 1:
-                # Última tentativa falhou
+            if attempt == max_retries - 1 or (deadline is not None and deadline.expired):
+                # Última tentativa falhou (ou o orçamento acabou)
                 log(
                     f"[retry] Tentativa {attempt + 1}/{max_retries} falhou: {type(e).__name__}: {e}"
                 )
@@ -70,6 +74,9 @@ async def retry_with_backoff(
                 jitter_amount = delay * 0.1 * random.random()
                 delay = delay + jitter_amount
 
+            if deadline is not None:
+                delay = min(delay, deadline.remaining_s())
+
             log(
                 f"[retry] Tentativa {attempt + 1}/{max_retries} falhou: "
                 f"{type(e).__name__}: {e}. Retentando em {delay:.2f}s..."
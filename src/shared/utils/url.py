@@ -14,6 +14,8 @@ from urllib.parse import (
     urlunsplit,
 )
 
+from shared.constants import BLOCK_URL_SNIPPETS
+
 ML_DOMAIN = "mercadolivre.com.br"
 ML_BASE_URL = "https://www.mercadolivre.com.br"
 
@@ -100,3 +102,9 @@ def url_with_page(base_url: str, page_num: int) -> str:
     return urlunsplit(
         (parts.scheme, parts.netloc, parts.path, new_query, parts.fragment)
     )
+
+
+def is_block_page_url(url: str) -> bool:
+    """Indica se a navegação terminou em captcha ou tela de login (bloqueio do ML)."""
+    path = (url or "").lower()
+    return any(snippet in path for snippet in BLOCK_URL_SNIPPETS)
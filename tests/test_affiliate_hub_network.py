@@ -0,0 +1,83 @@
+"""Testes para a extração de cards a partir das respostas da API da Central."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from adapters.external.affiliate_hub_network import rows_from_payload
+from adapters.external.affiliate_hub_scraper import _build_offer_from_affiliate_row
+
+
+class TestRowsFromPayload:
+    """Testes para rows_from_payload."""
+
+    def test_polycard_payload(self):
+        """Testa conversão de polycards aninhados em linhas de card."""
+        payload = {
+            "data": {
+                "polycards": [
+                    {
+                        "metadata": {
+                            "id": "MLB123456",
+                            "url": "www.mercadolivre.com.br/produto-x/p/MLB123456",
+                        },
+                        "pictures": {"pictures": [{"url": "https://img/x.webp"}]},
+                        "components": [
+                            {"type": "title", "title": {"text": "Fone Bluetooth XYZ"}},
+                            {
+                                "type": "price",
+                                "price": {
+                                    "current_price": {"value": 129.9},
+                                    "previous_price": {"value": 259.8},
+                                    "discount": {"value": 50},
+                                },
+                            },
+                            {"type": "highlight", "highlight": {"text": "GANHOS 16%"}},
+                        ],
+                    }
+                ]
+            }
+        }
+
+        rows = rows_from_payload(payload)
+
+        assert len(rows) == 1
+        row = rows[0]
+        assert row["href"] == "https://www.mercadolivre.com.br/produto-x/p/MLB123456"
+        assert row["title"] == "Fone Bluetooth XYZ"
+        assert (row["price_fraction"], row["price_cents"]) == ("129", "90")
+        assert (row["old_fraction"], row["old_cents"]) == ("259", "80")
+        assert row["discount_pct"] == "50"
+        assert row["commission_text"] == "GANHOS 16%"
+        assert row["origin"] == "network"
+
+    def test_flat_item_payload_builds_offer(self):
+        """Testa item plano da API convertido até ScrapedOffer."""
+        payload = {
+            "results": [
+                {
+                    "id": "MLB-987654",
+                    "permalink": "https://produto.mercadolivre.com.br/MLB-987654-cafeteira",
+                    "title": "Cafeteira Elétrica 30 xícaras",
+                    "price": 199,
+                    "thumbnail": "https://img/c.webp",
+                },
+                {"id": "config", "title": "não é item"},
+            ]
+        }
+
+        rows = rows_from_payload(payload)
+        assert len(rows) == 1
+
+        offer = _build_offer_from_affiliate_row(rows[0], set(), None, None)
+        assert offer is not None
+        assert offer.external_id == "MLB-987654"
+        assert offer.price_cents == 19900
+
+    def test_unrelated_payload(self):
+        """Testa que payloads sem itens não produzem linhas."""
+        assert rows_from_payload({"user": {"id": "123", "name": "x"}}) == []
@@ -0,0 +1,130 @@
+"""Testes para o scraping em streaming da Central de Afiliados."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from adapters.external import affiliate_hub_scraper
+from shared.config.settings import AffiliateConfig, MLConfig
+from shared.constants import STREAM_PIPELINE_MAX_BATCHES
+
+
+def _row(item_id: int) -> dict:
+    return {
+        "href": f"https://produto.mercadolivre.com.br/MLB-{item_id}-produto",
+        "title": f"Produto de teste {item_id}",
+        "image_url": "",
+        "price_fraction": "99",
+        "price_cents": "90",
+        "old_fraction": "",
+        "old_cents": "",
+        "discount_pct": "",
+        "commission_text": "",
+        "card_text": "",
+    }
+
+
+class TestStreamAffiliateHub:
+    """Testes para stream_affiliate_hub."""
+
+    @pytest.mark.asyncio
+    async def test_yields_deduplicated_batches(self, monkeypatch):
+        """Testa que os cards viram lotes de ofertas durante a coleta."""
+
+        @asynccontextmanager
+        async def fake_page(debug):
+            yield object()
+
+        async def fake_collect(page, *args, collector=None, **kwargs):
+            collector.add([_row(i) for i in range(1, 4)])
+            collector.add([_row(3), _row(4), _row(5)])
+            return (collector.rows, "article")
+
+        monkeypatch.setattr(affiliate_hub_scraper, "_open_hub_page", fake_page)
+        monkeypatch.setattr(affiliate_hub_scraper, "_collect_hub_rows", fake_collect)
+
+        batches = [
+            batch
+            async for batch in affiliate_hub_scraper.stream_affiliate_hub(
+                MLConfig.from_env(),
+                AffiliateConfig.from_env(),
+                max_scrolls=1,
+                scroll_delay_s=0.1,
+                batch_size=2,
+            )
+        ]
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        ids = [offer.external_id for batch in batches for offer in batch]
+        assert ids == [f"MLB-{i}" for i in range(1, 6)]
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_pauses_scrolling(self, monkeypatch):
+        """Testa que a rolagem espera o consumidor em vez de acumular lotes."""
+        scrolls: list[int] = []
+
+        @asynccontextmanager
+        async def fake_page(debug):
+            yield object()
+
+        async def fake_collect(page, *args, collector=None, **kwargs):
+            for scroll in range(20):
+                collector.add([_row(2 * scroll + 1), _row(2 * scroll + 2)])
+                await collector.hand_off()
+                scrolls.append(scroll)
+            return (collector.rows, "article")
+
+        monkeypatch.setattr(affiliate_hub_scraper, "_open_hub_page", fake_page)
+        monkeypatch.setattr(affiliate_hub_scraper, "_collect_hub_rows", fake_collect)
+
+        stream = affiliate_hub_scraper.stream_affiliate_hub(
+            MLConfig.from_env(),
+            AffiliateConfig.from_env(),
+            max_scrolls=20,
+            scroll_delay_s=0.1,
+            batch_size=2,
+        )
+        batches = [await stream.__anext__()]
+        await asyncio.sleep(0.01)
+        # Fila cheia + o lote em mãos do consumidor + o lote aguardando vaga
+        assert len(scrolls) <= STREAM_PIPELINE_MAX_BATCHES + 2
+
+        batches.extend([batch async for batch in stream])
+        assert len(batches) == 20
+        assert len(scrolls) == 20
+
+    @pytest.mark.asyncio
+    async def test_closing_stream_with_full_queue_stops_collection(self, monkeypatch):
+        """Testa que abandonar a iteração com a fila cheia encerra a coleta."""
+
+        @asynccontextmanager
+        async def fake_page(debug):
+            yield object()
+
+        async def fake_collect(page, *args, collector=None, **kwargs):
+            for scroll in range(20):
+                collector.add([_row(2 * scroll + 1), _row(2 * scroll + 2)])
+                await collector.hand_off()
+            return (collector.rows, "article")
+
+        monkeypatch.setattr(affiliate_hub_scraper, "_open_hub_page", fake_page)
+        monkeypatch.setattr(affiliate_hub_scraper, "_collect_hub_rows", fake_collect)
+
+        stream = affiliate_hub_scraper.stream_affiliate_hub(
+            MLConfig.from_env(),
+            AffiliateConfig.from_env(),
+            max_scrolls=20,
+            scroll_delay_s=0.1,
+            batch_size=2,
+        )
+        await stream.__anext__()
+        await asyncio.sleep(0.01)
+        await asyncio.wait_for(stream.aclose(), timeout=1)
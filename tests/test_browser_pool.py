@@ -0,0 +1,73 @@
+"""Testes para o browser pool no modo de browser compartilhado."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from adapters.external.browser_service import BrowserService
+from adapters.workers import browser_pool
+from adapters.workers.browser_pool import BrowserPool
+from shared.config.settings import BrowserConfig
+
+
+class _FakeContext:
+    def __init__(self) -> None:
+        self.pages: list = []
+        self.closed = False
+
+    def on(self, _event, _handler) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self) -> None:
+        self.contexts: list[_FakeContext] = []
+
+    def is_connected(self) -> bool:
+        return True
+
+    async def new_context(self, **_kwargs) -> _FakeContext:
+        ctx = _FakeContext()
+        self.contexts.append(ctx)
+        return ctx
+
+
+class TestBrowserPoolSharedBrowser:
+    """Testes para BrowserPool com BROWSER_CDP_URL definido."""
+
+    @pytest.mark.asyncio
+    async def test_pool_contexts_use_the_service_budget(self, monkeypatch):
+        """Testa que o pool ocupa vagas de BROWSER_MAX_CONTEXTS e as devolve no close."""
+        monkeypatch.setenv("BROWSER_CDP_URL", "http://browser:9222")
+        monkeypatch.setenv("BROWSER_MAX_CONTEXTS", "2")
+        service = BrowserService(BrowserConfig.from_env())
+        service.browser = browser = _FakeBrowser()
+
+        async def fake_service(_config):
+            return service
+
+        monkeypatch.setattr(browser_pool, "get_browser_service", fake_service)
+
+        pool = BrowserPool(size=3)
+        await pool.initialize()
+
+        assert pool.size == 2
+        assert len(browser.contexts) == 2
+        assert service._budget.locked()
+
+        await pool.close()
+
+        assert all(ctx.closed for ctx in browser.contexts)
+        assert not service._budget.locked()
+        # As duas vagas voltaram: abrir dois contextos não espera
+        async with service.context(), service.context():
+            pass
@@ -0,0 +1,239 @@
+"""Testes para a gravação em lote das ofertas de uma execução."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from adapters.database.repositories import DatabaseService
+from core.domain import ScrapedOffer
+from shared.config.settings import DatabaseConfig
+
+
+class _FakeQuery:
+    """Imita o encadeamento do cliente PostgREST, registrando cada requisição."""
+
+    def __init__(self, client: "_FakeClient", table: str) -> None:
+        self.client = client
+        self.table = table
+        self.op = "select"
+        self.rows: list[dict] = []
+        self.filters: dict = {}
+
+    def select(self, *_args, **_kwargs):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def in_(self, column, values):
+        self.filters[column] = list(values)
+        return self
+
+    def insert(self, rows, **_kwargs):
+        self.op, self.rows = "insert", rows if isinstance(rows, list) else [rows]
+        return self
+
+    def upsert(self, rows, **_kwargs):
+        self.op, self.rows = "upsert", rows
+        return self
+
+    def update(self, fields, **_kwargs):
+        self.op, self.rows = "update", [fields]
+        return self
+
+    def execute(self):
+        with self.client.lock:
+            self.client.calls.append((self.table, self.op, len(self.rows)))
+            after, self.client.after_next_call = self.client.after_next_call, None
+        response = self._respond()
+        if after is not None:
+            after()
+        return response
+
+    def _respond(self):
+        if self.table == "marketplaces" and self.op == "select":
+            return SimpleNamespace(data=[{"id": "mp-1"}])
+        if self.op == "select":
+            stored = self.client.stored.get(self.table, {})
+            ids = self.filters.get("id", [])
+            return SimpleNamespace(data=[dict(stored[i]) for i in ids if i in stored])
+        if self.op == "update":
+            row = self.client.stored.get(self.table, {}).get(self.filters["id"])
+            if row is None:
+                return SimpleNamespace(data=[])
+            row.update(self.rows[0])
+            return SimpleNamespace(data=[row])
+        if self.op == "upsert":
+            self.client.upserted.setdefault(self.table, []).extend(self.rows)
+            stored = self.client.stored.get(self.table, {})
+            for row in self.rows:
+                if row.get("id") in stored:
+                    stored[row["id"]] = dict(row)
+        data = [{"id": str(uuid.uuid4()), **row} for row in self.rows]
+        return SimpleNamespace(data=data)
+
+
+class _FakeClient:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str, int]] = []
+        self.lock = threading.Lock()
+        self.stored: dict[str, dict[str, dict]] = {}
+        self.upserted: dict[str, list[dict]] = {}
+        # Executado uma vez, logo depois da próxima requisição (escrita concorrente)
+        self.after_next_call = None
+
+    def table(self, name: str) -> _FakeQuery:
+        return _FakeQuery(self, name)
+
+
+def _offer(item_id: int, affiliate: bool = False) -> ScrapedOffer:
+    return ScrapedOffer(
+        marketplace="Mercado Livre",
+        external_id=f"MLB-{item_id}",
+        title=f"Produto {item_id}",
+        url=f"https://produto.mercadolivre.com.br/MLB-{item_id}",
+        image_url=None,
+        price_cents=9990,
+        old_price_cents=19990,
+        discount_pct=50,
+        commission_pct=12 if affiliate else None,
+        affiliate_link=None,
+        affiliation_id=None,
+    )
+
+
+def _config(**overrides) -> DatabaseConfig:
+    values = dict(
+        supabase_url="http://localhost",
+        supabase_key="test",
+        ingest_mode="bulk",
+        ingest_chunk_size=2,
+        max_concurrency=4,
+    )
+    values.update(overrides)
+    return DatabaseConfig(**values)
+
+
+class TestBulkIngest:
+    """Testes para DatabaseService.save_offers no modo bulk."""
+
+    @pytest.mark.asyncio
+    async def test_saves_batch_with_chunked_requests(self):
+        """Testa que o lote vira poucas requisições em bloco, sem duplicatas."""
+        client = _FakeClient()
+        service = DatabaseService(client, _config())
+        offers = [_offer(1, affiliate=True), _offer(2), _offer(3), _offer(1, affiliate=True)]
+
+        saved = await service.save_offers({"id": "run-1"}, offers)
+
+        assert sorted(saved) == ["MLB-1", "MLB-2", "MLB-3"]
+        assert saved["MLB-1"]["affiliate_info_id"]
+        # Escritas independentes rodam em paralelo: a ordem entre elas varia
+        assert client.calls[:1] == [("marketplaces", "select", 0)]
+        assert sorted(client.calls[1:3]) == [("offers", "upsert", 1), ("offers", "upsert", 2)]
+        assert sorted(client.calls[3:]) == [
+            ("affiliate_info", "insert", 1),
+            ("offer_scrape_runs", "upsert", 1),
+            ("offer_scrape_runs", "upsert", 2),
+            ("offers", "upsert", 1),
+            ("price_history", "insert", 1),
+            ("price_history", "insert", 2),
+        ]
+
+
+class TestBulkEnrichmentUpdate:
+    """Testes para OfferRepository.update_offer_enrichment_many."""
+
+    @pytest.mark.asyncio
+    async def test_updates_only_enrichment_fields(self):
+        """Testa que o lote mescla os campos e só grava as colunas de enriquecimento."""
+        client = _FakeClient()
+        client.stored["offers"] = {
+            f"o{i}": {
+                "id": f"o{i}",
+                "title": f"Produto {i}",
+                "price_cents": 1000,
+                "old_price_cents": 1500,
+                "discount_pct": None,
+                "affiliate_info_id": "a1" if i == 1 else None,
+            }
+            for i in (1, 2, 3)
+        }
+        client.stored["affiliate_info"] = {
+            "a1": {"id": "a1", "offer_id": "o1", "commission_pct": 12, "affiliate_link": None}
+        }
+        service = DatabaseService(client, _config())
+
+        updated = await service.offers.update_offer_enrichment_many(
+            [
+                {"offer_id": "o1", "old_price_cents": None, "discount_pct": 40, "affiliate_link": "https://l/1"},
+                {"offer_id": "o2", "old_price_cents": 2000, "discount_pct": 50, "affiliation_id": "x"},
+                {"offer_id": "o3", "old_price_cents": None, "discount_pct": None},
+                {"offer_id": "missing", "discount_pct": 10},
+            ],
+            chunk_size=10,
+        )
+
+        assert updated == 2
+        assert sorted(client.calls) == [
+            ("affiliate_info", "insert", 1),
+            ("affiliate_info", "update", 1),
+            ("offers", "select", 0),
+            ("offers", "update", 1),
+            ("offers", "update", 1),
+            ("offers", "update", 1),
+        ]
+        offers = client.stored["offers"]
+        assert offers["o1"]["old_price_cents"] == 1500
+        assert offers["o1"]["discount_pct"] == 40
+        assert offers["o2"]["old_price_cents"] == 2000
+        assert offers["o2"]["affiliate_info_id"]
+        assert offers["o3"]["discount_pct"] is None
+        info = client.stored["affiliate_info"]["a1"]
+        assert info["commission_pct"] == 12
+        assert info["affiliate_link"] == "https://l/1"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_to_other_columns_survive(self):
+        """Testa que colunas não enriquecidas, alteradas por outro job ou coleta, são mantidas."""
+        client = _FakeClient()
+        client.stored["offers"] = {
+            "o1": {
+                "id": "o1",
+                "title": "Produto",
+                "price_cents": 1000,
+                "old_price_cents": None,
+                "discount_pct": None,
+                "affiliate_info_id": None,
+            }
+        }
+        service = DatabaseService(client, _config())
+
+        # Durante o job do tier de preço, o job de afiliado e uma nova coleta
+        # gravam a mesma oferta
+        client.after_next_call = lambda: client.stored["offers"]["o1"].update(
+            {"affiliate_info_id": "a9", "price_cents": 900, "title": "Produto novo"}
+        )
+        await service.offers.update_offer_enrichment_many(
+            [{"offer_id": "o1", "old_price_cents": 2000, "discount_pct": 50}],
+            chunk_size=10,
+        )
+
+        assert client.stored["offers"]["o1"] == {
+            "id": "o1",
+            "title": "Produto novo",
+            "price_cents": 900,
+            "old_price_cents": 2000,
+            "discount_pct": 50,
+            "affiliate_info_id": "a9",
+        }
@@ -0,0 +1,106 @@
+"""Testes para o orçamento de tempo do enriquecimento."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from adapters.external.playwright_utils import wait_for_any_selector
+from shared.utils.deadline import Deadline
+from shared.utils.retry import retry_with_backoff
+
+
+class _FakePage:
+    """Página em que cada seletor aparece após um atraso (ou nunca)."""
+
+    def __init__(self, delays: dict[str, float]) -> None:
+        self.delays = delays
+        self.cancelled: list[str] = []
+
+    async def wait_for_selector(self, selector: str, timeout: int):
+        delay = self.delays.get(selector)
+        try:
+            if delay is None or delay * 1000 > timeout:
+                await asyncio.sleep(timeout / 1000)
+                raise TimeoutError(selector)
+            await asyncio.sleep(delay)
+            return selector
+        except asyncio.CancelledError:
+            self.cancelled.append(selector)
+            raise
+
+
+class TestDeadline:
+    """Testes para Deadline."""
+
+    def test_caps_step_timeouts_by_remaining_budget(self):
+        """Testa que o timeout da etapa é o menor entre limite e orçamento."""
+        deadline = Deadline(0.5)
+        assert deadline.timeout_ms(10000) <= 500
+        assert deadline.timeout_ms(100) == 100
+        assert not deadline.expired
+
+    def test_without_budget_never_expires(self):
+        """Testa que orçamento ausente não limita as etapas."""
+        deadline = Deadline(None)
+        assert deadline.timeout_ms(10000) == 10000
+        assert not deadline.expired
+
+    def test_expired_budget_never_returns_zero(self):
+        """Testa que o timeout nunca é 0 (sem timeout no Playwright)."""
+        deadline = Deadline(0.001)
+        time.sleep(0.01)
+        assert deadline.expired
+        assert deadline.timeout_ms(10000) == 1
+
+
+class TestRetryDeadline:
+    """Testes para o orçamento dentro do retry_with_backoff."""
+
+    @pytest.mark.asyncio
+    async def test_stops_retrying_when_budget_runs_out(self):
+        """Testa que o retry não espera nem tenta de novo além do orçamento."""
+        attempts = []
+
+        async def failing():
+            attempts.append(time.monotonic())
+            raise TimeoutError("goto")
+
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            await retry_with_backoff(
+                failing, max_retries=3, initial_delay=5.0, deadline=Deadline(0.05)
+            )
+
+        # Espera cortada no fim do orçamento e nenhuma tentativa depois dele
+        assert time.monotonic() - started < 1.0
+        assert len(attempts) == 2
+
+
+class TestWaitForAnySelector:
+    """Testes para wait_for_any_selector."""
+
+    @pytest.mark.asyncio
+    async def test_first_match_wins_and_cancels_rest(self):
+        """Testa que o primeiro seletor vence e os demais são cancelados."""
+        page = _FakePage({"#slow": 1.0, "#fast": 0.01})
+        started = time.perf_counter()
+        winner = await wait_for_any_selector(page, ["#slow", "#fast", ""], 5000)
+        assert winner == "#fast"
+        assert time.perf_counter() - started < 0.5
+        assert page.cancelled == ["#slow"]
+
+    @pytest.mark.asyncio
+    async def test_returns_none_after_single_timeout(self):
+        """Testa que sem nenhum seletor a espera dura um único timeout."""
+        page = _FakePage({})
+        started = time.perf_counter()
+        assert await wait_for_any_selector(page, ["#a", "#b"], 100) is None
+        assert time.perf_counter() - started < 0.5
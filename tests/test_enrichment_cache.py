@@ -0,0 +1,110 @@
+"""Testes para o cache de resultados de enriquecimento."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from adapters.queues.enrichment_cache import CachedEnrichment, EnrichmentCache
+
+
+class _FakePipeline:
+    """Acumula comandos e os aplica no ``execute``, como o pipeline do redis-py."""
+
+    def __init__(self, redis: "_FakeRedis") -> None:
+        self.redis = redis
+        self.commands: list[tuple] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+    def mget(self, keys):
+        self.commands.append(("mget", list(keys)))
+
+    def set(self, key, value, ex=None):
+        self.commands.append(("set", key, value, ex))
+
+    def execute(self):
+        self.redis.round_trips += 1
+        results = []
+        for command in self.commands:
+            if command[0] == "mget":
+                results.append([self.redis.data.get(key) for key in command[1]])
+            else:
+                _, key, value, ex = command
+                self.redis.data[key] = value.encode()
+                self.redis.ttls[key] = ex
+                results.append(True)
+        return results
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+        self.ttls: dict[str, int] = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def delete(self, *keys):
+        self.round_trips += 1
+        for key in keys:
+            self.data.pop(key, None)
+
+
+_ENRICHED = CachedEnrichment(
+    old_price_cents=15000,
+    discount_pct=33,
+    affiliate_link="https://mercadolivre.com/sec/abc",
+    affiliation_id="AFF1",
+)
+
+
+class TestEnrichmentCache:
+    """Testes para EnrichmentCache."""
+
+    def test_round_trip_with_tier_ttls(self):
+        """Testa gravação com TTL por tier e leitura em uma ida ao Redis."""
+        redis = _FakeRedis()
+        cache = EnrichmentCache(redis, price_ttl_s=3600, affiliate_ttl_s=86400)
+
+        cache.set_many([("mercadolivre", "MLB1", 10000, _ENRICHED)])
+        redis.round_trips = 0
+        cached = cache.get_many(
+            [("mercadolivre", "MLB1", 10000), ("mercadolivre", "MLB2", 5000)]
+        )
+
+        assert cached == {("mercadolivre", "MLB1"): _ENRICHED}
+        assert redis.round_trips == 1
+        assert redis.ttls[cache.key("mercadolivre", "MLB1", "price")] == 3600
+        assert redis.ttls[cache.key("mercadolivre", "MLB1", "affiliate")] == 86400
+
+    def test_price_change_drops_price_entry_only(self):
+        """Testa que preço diferente invalida preço antigo/desconto, mas não o afiliado."""
+        redis = _FakeRedis()
+        cache = EnrichmentCache(redis, price_ttl_s=3600, affiliate_ttl_s=86400)
+        cache.set_many([("mercadolivre", "MLB1", 10000, _ENRICHED)])
+
+        cached = cache.get_many([("mercadolivre", "MLB1", 9000)])
+
+        assert cached[("mercadolivre", "MLB1")] == CachedEnrichment(
+            affiliate_link="https://mercadolivre.com/sec/abc", affiliation_id="AFF1"
+        )
+        assert cache.key("mercadolivre", "MLB1", "price") not in redis.data
+
+    def test_empty_results_are_not_cached(self):
+        """Testa que tiers sem nenhum campo não geram entrada."""
+        redis = _FakeRedis()
+        cache = EnrichmentCache(redis, price_ttl_s=3600, affiliate_ttl_s=86400)
+
+        cache.set_many([("mercadolivre", "MLB1", 10000, CachedEnrichment())])
+
+        assert redis.data == {}
+        assert cache.get_many([("mercadolivre", "MLB1", 10000)]) == {}
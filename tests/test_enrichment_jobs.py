@@ -0,0 +1,166 @@
+"""Testes para as falhas de navegação nos jobs de enriquecimento em lote."""
+
+from __future__ import annotations
+
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# core.use_cases (importado pelos jobs) usa f-strings do Python 3.12
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (3, 12), reason="core.use_cases requer Python 3.12+"
+)
+
+
+@pytest.fixture
+def enrichment_service():
+    from core.use_cases import enrichment_service
+
+    return enrichment_service
+
+
+@pytest.fixture
+def enrichment_jobs():
+    from adapters.queues import enrichment_jobs
+
+    return enrichment_jobs
+
+
+def _open_breaker():
+    """Circuit breaker já aberto (rejeita toda chamada por uma hora)."""
+    from shared.utils.rate_limiter import (
+        CircuitBreaker,
+        CircuitBreakerConfig,
+        CircuitState,
+    )
+
+    breaker = CircuitBreaker(
+        config=CircuitBreakerConfig(failure_threshold=1, timeout=timedelta(hours=1))
+    )
+    breaker.state = CircuitState.OPEN
+    breaker.last_failure_time = time.time()
+    return breaker
+
+
+class _FailingPage:
+    """Página cujo goto sempre estoura o timeout."""
+
+    def __init__(self) -> None:
+        self.gotos = 0
+        self.url = "about:blank"
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        self.gotos += 1
+        raise TimeoutError(f"Timeout {timeout}ms exceeded")
+
+
+async def _enrich_failing_page(enrichment_service, url: str):
+    from shared.config.settings import AffiliateConfig, MLConfig
+    from shared.utils.rate_limiter import RateLimiter
+
+    return await enrichment_service._enrich_with_page(
+        page=_FailingPage(),
+        url=url,
+        current_price_cents=10000,
+        ml_config=MLConfig.from_env(),
+        affiliate_config=AffiliateConfig.from_env(),
+        timeout_ms=1000,
+        request_delay_s=0,
+        result=enrichment_service.EnrichmentResult(),
+        rate_limiter=RateLimiter(1000, timedelta(minutes=1)),
+    )
+
+
+class TestNavigationFailure:
+    """Testes para o resultado de uma página que não abriu."""
+
+    @pytest.mark.asyncio
+    async def test_goto_failure_is_flagged(self, enrichment_service, monkeypatch):
+        """Testa que goto esgotando as tentativas marca navigation_failed."""
+        from shared.utils.rate_limiter import CircuitBreaker
+
+        real_retry = enrichment_service.retry_with_backoff
+
+        async def fast_retry(func, **kwargs):
+            return await real_retry(func, **{**kwargs, "initial_delay": 0.0})
+
+        monkeypatch.setattr(enrichment_service, "retry_with_backoff", fast_retry)
+        monkeypatch.setattr(
+            enrichment_service, "get_ml_circuit_breaker", lambda: CircuitBreaker()
+        )
+
+        result = await _enrich_failing_page(enrichment_service, "https://x/MLB-1")
+
+        assert result.navigation_failed
+        assert result.old_price_cents is None
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_is_flagged(self, enrichment_service, monkeypatch):
+        """Testa que o circuito aberto marca navigation_failed."""
+        monkeypatch.setattr(enrichment_service, "get_ml_circuit_breaker", _open_breaker)
+
+        result = await _enrich_failing_page(enrichment_service, "https://x/MLB-1")
+
+        assert result.navigation_failed
+
+
+class TestBatchJobNavigationFailure:
+    """Testes para o job em lote quando a página de uma oferta não abre."""
+
+    def test_failed_offers_are_retried_not_written(
+        self, enrichment_service, enrichment_jobs, monkeypatch
+    ):
+        """Testa que a oferta sem página falha o job, com os args reduzidos a ela."""
+        updates: list[list[dict]] = []
+        cached: list[list[tuple]] = []
+
+        async def fake_enrich_offer(url, current_price_cents, **_kwargs):
+            if "MLB-2" in url:
+                return await _enrich_failing_page(enrichment_service, url)
+            return enrichment_service.EnrichmentResult(
+                old_price_cents=15000, discount_pct=33
+            )
+
+        class _Offers:
+            async def update_offer_enrichment_many(self, rows, chunk_size):
+                updates.append(rows)
+                return len(rows)
+
+        class _DatabaseService:
+            def __init__(self, *_args) -> None:
+                self.offers = _Offers()
+
+        class _Cache:
+            def set_many(self, entries):
+                cached.append(entries)
+
+        class _Job:
+            args = ()
+
+        job = _Job()
+        monkeypatch.setenv("SUPABASE_URL", "http://localhost:54321")
+        monkeypatch.setenv("SUPABASE_SERVICE_ROLE_KEY", "test-key")
+        monkeypatch.setattr(enrichment_service, "get_ml_circuit_breaker", _open_breaker)
+        monkeypatch.setattr(enrichment_jobs, "enrich_offer", fake_enrich_offer)
+        monkeypatch.setattr(enrichment_jobs, "DatabaseService", _DatabaseService)
+        monkeypatch.setattr(enrichment_jobs, "get_client", lambda: None)
+        monkeypatch.setattr(enrichment_jobs, "get_enrichment_cache", lambda _c: _Cache())
+        monkeypatch.setattr(enrichment_jobs, "get_worker_runtime", lambda: None)
+        monkeypatch.setattr(enrichment_jobs, "get_current_job", lambda: job)
+
+        items = [
+            ("o1", "https://x/MLB-1", 10000, "mercadolivre", "MLB1"),
+            ("o2", "https://x/MLB-2", 10000, "mercadolivre", "MLB2"),
+        ]
+        with pytest.raises(enrichment_jobs.EnrichmentBatchError):
+            enrichment_jobs.enrich_prices_job(items)
+
+        assert job.args == ([items[1]],)
+        assert [row["offer_id"] for row in updates[0]] == ["o1"]
+        assert [entry[1] for entry in cached[0]] == ["MLB1"]
@@ -0,0 +1,133 @@
+"""Testes para a prioridade de enriquecimento das ofertas."""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from adapters.external.affiliate_hub_network import rows_from_payload
+from adapters.external.affiliate_hub_scraper import _HubOfferBuilder
+from core.domain import ScrapedOffer, offer_priority_score, priority_band
+from shared.config.settings import EnrichmentConfig
+
+_OFFER = ScrapedOffer(
+    marketplace="mercadolivre",
+    external_id="MLB1",
+    title="Produto",
+    url="https://produto.mercadolivre.com.br/MLB-1",
+    image_url=None,
+    price_cents=10000,
+    old_price_cents=None,
+    discount_pct=None,
+    commission_pct=None,
+    affiliate_link=None,
+    affiliation_id=None,
+)
+
+
+class TestOfferPriorityScore:
+    """Testes para offer_priority_score e priority_band."""
+
+    def test_big_discount_with_commission_beats_small_discount(self):
+        """Testa que 70% off com 16% de comissão fica à frente de 5% off."""
+        top = offer_priority_score(replace(_OFFER, discount_pct=70, commission_pct=16))
+        weak = offer_priority_score(replace(_OFFER, discount_pct=5))
+
+        assert top > weak
+        assert priority_band(top, high_score=60, low_score=20) == "high"
+        assert priority_band(weak, high_score=60, low_score=20) == "low"
+        assert priority_band(35, high_score=60, low_score=20) == "default"
+
+    def test_discount_falls_back_to_old_price(self):
+        """Testa que, sem discount_pct, o desconto vem do preço antigo."""
+        by_old_price = replace(_OFFER, old_price_cents=20000)
+
+        assert offer_priority_score(by_old_price) == offer_priority_score(
+            replace(_OFFER, discount_pct=50)
+        )
+
+    def test_commission_earnings_break_ties(self):
+        """Testa que, com o mesmo desconto e comissão, o item mais caro vale mais."""
+        cheap = replace(_OFFER, discount_pct=30, commission_pct=10)
+        expensive = replace(cheap, price_cents=500000)
+
+        assert offer_priority_score(expensive) > offer_priority_score(cheap)
+
+    def test_tier_queues_in_priority_order(self, monkeypatch):
+        """Testa as filas de cada faixa na ordem de consumo do worker."""
+        monkeypatch.setenv("ENRICHMENT_QUEUE_NAME", "enr")
+
+        price_tier = EnrichmentConfig.from_env().price_tier
+
+        assert price_tier.queue_names == ("enr-price-high", "enr-price", "enr-price-low")
+
+
+class TestHubOfferPriority:
+    """Testes para a prioridade das ofertas montadas a partir dos cards da Central."""
+
+    def test_dom_card_discount_reaches_score(self):
+        """Testa que o desconto e o preço antigo do card DOM entram no score."""
+        offer = _HubOfferBuilder().build(
+            {
+                "href": "https://produto.mercadolivre.com.br/MLB-111-fone",
+                "title": "Fone Bluetooth",
+                "image_url": "",
+                "price_fraction": "70",
+                "price_cents": "",
+                "old_fraction": "100",
+                "old_cents": "",
+                "discount_pct": "30",
+                "commission_text": "GANHOS 10%",
+                "card_text": "",
+            }
+        )
+
+        assert offer is not None
+        assert (offer.old_price_cents, offer.discount_pct) == (10000, 30)
+        assert offer_priority_score(offer) == offer_priority_score(
+            replace(_OFFER, price_cents=7000, discount_pct=30, commission_pct=10)
+        )
+        assert offer_priority_score(offer) > offer_priority_score(
+            replace(offer, old_price_cents=None, discount_pct=None)
+        )
+
+    def test_network_card_without_discount_uses_old_price(self):
+        """Testa que, sem desconto no payload, ele vem do preço antigo do card."""
+        rows = rows_from_payload(
+            {
+                "results": [
+                    {
+                        "id": "MLB-222",
+                        "permalink": "https://produto.mercadolivre.com.br/MLB-222-x",
+                        "title": "Cafeteira",
+                        "price": 150,
+                        "original_price": 200,
+                    }
+                ]
+            }
+        )
+
+        offer = _HubOfferBuilder().build(rows[0])
+
+        assert offer is not None
+        assert (offer.old_price_cents, offer.discount_pct) == (20000, 25)
+        assert offer_priority_score(offer) >= 25
+
+    def test_implausible_card_values_are_dropped(self):
+        """Testa que preço antigo menor que o atual e desconto de 100% ficam None."""
+        offer = _HubOfferBuilder().build(
+            {
+                "href": "https://produto.mercadolivre.com.br/MLB-333-x",
+                "title": "Produto",
+                "price_fraction": "100",
+                "old_fraction": "90",
+                "discount_pct": "100",
+            }
+        )
+
+        assert offer is not None
+        assert (offer.old_price_cents, offer.discount_pct) == (None, None)
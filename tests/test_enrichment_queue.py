@@ -0,0 +1,235 @@
+"""Testes para o enqueue idempotente dos jobs de enriquecimento."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+import redis as redis_module
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from adapters.queues.enrichment_queue import enqueue_unique_batches
+from shared.constants import (
+    ENRICHMENT_ENQUEUE_WATCH_RETRIES,
+    ENRICHMENT_PENDING_KEY_PREFIX,
+    ENRICHMENT_PENDING_TTL_S,
+)
+
+
+class _FakePipeline:
+    """
+    Pipeline com WATCH/MULTI, como o do redis-py.
+
+    Sob WATCH os comandos rodam na hora; depois de ``multi`` são acumulados e
+    aplicados no ``execute``, que falha com WatchError se uma chave observada
+    mudou nesse meio tempo.
+    """
+
+    def __init__(self, redis: "_FakeRedis") -> None:
+        self.redis = redis
+        self.commands: list[tuple] = []
+        self.watched: dict[str, int] = {}
+        self.buffering = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+    def watch(self, *keys):
+        self.watched = {key: self.redis.versions.get(key, 0) for key in keys}
+        self.buffering = False
+
+    def multi(self):
+        self.buffering = True
+
+    def mget(self, keys):
+        if not self.buffering:
+            return [self.redis.data.get(key) for key in keys]
+        self.commands.append(("mget", list(keys)))
+
+    def hget(self, key, field):
+        self.commands.append(("hget", key, field))
+
+    def set(self, key, value, ex=None):
+        self.commands.append(("set", key, value, ex))
+
+    def execute(self):
+        commands, watched = self.commands, self.watched
+        self.commands, self.watched, self.buffering = [], {}, True
+        if watched:
+            self.redis.transactions += 1
+            if self.redis.interfere is not None:
+                self.redis.interfere()
+            if any(self.redis.versions.get(key, 0) != v for key, v in watched.items()):
+                raise redis_module.WatchError("Watched variable changed.")
+
+        results = []
+        for command in commands:
+            if command[0] == "hget":
+                _, key, field = command
+                results.append(self.redis.hashes.get(key, {}).get(field))
+            elif command[0] == "enqueue":
+                self.redis.enqueued.append(command[1:])
+                results.append(True)
+            else:
+                _, key, value, ex = command
+                self.redis.write(key, value.encode())
+                self.redis.ttls[key] = ex
+                results.append(True)
+        return results
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+        self.versions: dict[str, int] = {}
+        self.ttls: dict[str, int] = {}
+        self.hashes: dict[str, dict[str, bytes]] = {}
+        self.enqueued: list[tuple] = []
+        self.transactions = 0
+        self.interfere = None
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def write(self, key: str, value: bytes) -> None:
+        self.data[key] = value
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+
+class _FakeQueue:
+    """Fila RQ mínima: o enqueue vira um comando do pipeline recebido."""
+
+    name = "enrichment-price"
+
+    def __init__(self, redis: _FakeRedis) -> None:
+        self.connection = redis
+
+    def enqueue(self, func, batch, job_id, job_timeout, retry, pipeline):
+        pipeline.commands.append(("enqueue", job_id, [item[0] for item in batch]))
+
+
+def _job() -> None:
+    pass
+
+
+def _items(*offer_ids: str) -> list[tuple]:
+    return [
+        (offer_id, f"https://produto.mercadolivre.com.br/{offer_id}", 10000)
+        for offer_id in offer_ids
+    ]
+
+
+def _pending(offer_id: str) -> str:
+    return f"{ENRICHMENT_PENDING_KEY_PREFIX}:price:{offer_id}"
+
+
+def _own(redis: _FakeRedis, offer_id: str, job_id: str, status: str | None) -> None:
+    """Marca a oferta como do job ``job_id`` (status None: job já expirou)."""
+    redis.write(_pending(offer_id), job_id.encode())
+    if status is not None:
+        redis.hashes[f"rq:job:{job_id}"] = {"status": status.encode()}
+
+
+class TestEnqueueUniqueBatches:
+    """Testes para enqueue_unique_batches."""
+
+    def _enqueue(self, redis: _FakeRedis, items: list[tuple], batch_size: int = 10):
+        return enqueue_unique_batches(
+            _FakeQueue(redis),
+            _job,
+            "price",
+            items,
+            batch_size=batch_size,
+            job_timeout="5m",
+        )
+
+    def test_marks_offers_and_enqueues_batches(self):
+        """Testa que as ofertas novas viram lotes e recebem a marca do job dono."""
+        redis = _FakeRedis()
+
+        job_ids, skipped = self._enqueue(
+            redis, _items("o1", "o2", "o3", "o1"), batch_size=2
+        )
+
+        assert job_ids == ["enrich-price-o1", "enrich-price-o3"]
+        assert skipped == 0
+        assert redis.enqueued == [
+            ("enrich-price-o1", ["o1", "o2"]),
+            ("enrich-price-o3", ["o3"]),
+        ]
+        assert redis.data[_pending("o2")] == b"enrich-price-o1"
+        assert redis.ttls[_pending("o2")] == ENRICHMENT_PENDING_TTL_S
+
+    @pytest.mark.parametrize("status", ["queued", "started", "scheduled"])
+    def test_skips_offer_with_active_owner(self, status):
+        """Testa que a oferta cujo job ainda vai rodar é pulada."""
+        redis = _FakeRedis()
+        _own(redis, "o1", "enrich-price-o0", status)
+
+        job_ids, skipped = self._enqueue(redis, _items("o1", "o2"))
+
+        assert job_ids == ["enrich-price-o2"]
+        assert skipped == 1
+        assert redis.enqueued == [("enrich-price-o2", ["o2"])]
+        assert redis.data[_pending("o1")] == b"enrich-price-o0"
+
+    @pytest.mark.parametrize("status", ["finished", "failed", "canceled", None])
+    def test_reenqueues_offer_with_finished_owner(self, status):
+        """Testa que a oferta cujo job terminou, falhou ou expirou volta à fila."""
+        redis = _FakeRedis()
+        _own(redis, "o1", "enrich-price-o0", status)
+
+        job_ids, skipped = self._enqueue(redis, _items("o1", "o2"))
+
+        assert job_ids == ["enrich-price-o1"]
+        assert skipped == 0
+        assert redis.enqueued == [("enrich-price-o1", ["o1", "o2"])]
+        assert redis.data[_pending("o1")] == b"enrich-price-o1"
+
+    def test_skips_offer_whose_marker_expired_with_job_active(self):
+        """Testa que, sem marca, o job com o ID da própria oferta ainda ativo a pula."""
+        redis = _FakeRedis()
+        # Retry tardio: a marca de o1 expirou, mas o job que ela abriu segue agendado
+        redis.hashes["rq:job:enrich-price-o1"] = {"status": b"scheduled"}
+
+        job_ids, skipped = self._enqueue(redis, _items("o1", "o2"))
+
+        assert job_ids == ["enrich-price-o2"]
+        assert skipped == 1
+        assert redis.enqueued == [("enrich-price-o2", ["o2"])]
+        assert _pending("o1") not in redis.data
+
+    def test_retries_after_watch_error(self):
+        """Testa que a transação é refeita quando outra execução mexe nas marcas."""
+        redis = _FakeRedis()
+
+        def other_run_claims_o1():
+            redis.interfere = None
+            _own(redis, "o1", "enrich-price-other", "queued")
+
+        redis.interfere = other_run_claims_o1
+
+        job_ids, skipped = self._enqueue(redis, _items("o1", "o2"))
+
+        assert redis.transactions == 2
+        # A segunda tentativa já vê o dono ativo gravado pela outra execução
+        assert job_ids == ["enrich-price-o2"]
+        assert skipped == 1
+        assert redis.enqueued == [("enrich-price-o2", ["o2"])]
+
+    def test_raises_after_watch_retries(self):
+        """Testa que a disputa contínua esgota as tentativas e levanta WatchError."""
+        redis = _FakeRedis()
+        redis.interfere = lambda: redis.write(_pending("o1"), b"enrich-price-other")
+
+        with pytest.raises(redis_module.WatchError):
+            self._enqueue(redis, _items("o1", "o2"))
+
+        assert redis.transactions == ENRICHMENT_ENQUEUE_WATCH_RETRIES
+        assert redis.enqueued == []
@@ -0,0 +1,83 @@
+"""Testes para os tiers de enriquecimento (preço e afiliado)."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.domain import ScrapedOffer, needed_enrichment_tiers
+from shared.config.settings import EnrichmentConfig
+from shared.constants import ENRICHMENT_TIER_AFFILIATE, ENRICHMENT_TIER_PRICE
+
+# Card da Central: sem preço antigo, desconto nem afiliado
+_CARD = ScrapedOffer(
+    marketplace="mercadolivre",
+    external_id="MLB1",
+    title="Produto",
+    url="https://produto.mercadolivre.com.br/MLB-1",
+    image_url=None,
+    price_cents=10000,
+    old_price_cents=None,
+    discount_pct=None,
+    commission_pct=12,
+    affiliate_link=None,
+    affiliation_id=None,
+)
+
+
+class TestEnrichmentTierConfig:
+    """Testes para a configuração dos tiers."""
+
+    def test_tiers_read_their_own_env(self, monkeypatch):
+        """Testa fila, concorrência, ritmo e retries por tier."""
+        monkeypatch.setenv("ENRICHMENT_QUEUE_NAME", "enr")
+        monkeypatch.setenv("ENRICHMENT_PRICE_CONCURRENCY", "12")
+        monkeypatch.setenv("ENRICHMENT_AFFILIATE_RETRY_INTERVALS", "10,20")
+        monkeypatch.setenv("ENRICHMENT_AFFILIATE_MAX_RETRIES", "2")
+        monkeypatch.setenv("ENRICHMENT_WORKER_TIERS", "affiliate, bogus")
+
+        config = EnrichmentConfig.from_env()
+
+        assert config.price_tier.queue_name == "enr-price"
+        assert config.price_tier.concurrency == 12
+        assert config.affiliate_tier.retry_intervals_s == (10, 20)
+        assert config.affiliate_tier.max_retries == 2
+        assert config.worker_tiers == ("affiliate",)
+
+
+class TestNeededEnrichmentTiers:
+    """Testes para needed_enrichment_tiers."""
+
+    def test_new_offer_needs_both_tiers(self):
+        """Testa que uma oferta sem nada enriquecido vai para os dois tiers."""
+        assert needed_enrichment_tiers(_CARD, {"id": "o1"}) == (
+            ENRICHMENT_TIER_PRICE,
+            ENRICHMENT_TIER_AFFILIATE,
+        )
+
+    def test_enriched_row_skips_both_tiers(self):
+        """Testa que a linha já enriquecida no banco não volta para a fila."""
+        saved = {
+            "id": "o1",
+            "old_price_cents": 15000,
+            "discount_pct": 33,
+            "affiliate_info_id": "a1",
+            "affiliate_info": {"affiliate_link": "https://l/1", "affiliation_id": "X1"},
+        }
+
+        assert needed_enrichment_tiers(_CARD, saved) == ()
+
+    def test_commission_only_affiliate_info_still_needs_affiliate_tier(self):
+        """Testa que affiliate_info só com comissão (da ingestão) não conta como capturado."""
+        saved = {
+            "id": "o1",
+            "old_price_cents": 15000,
+            "discount_pct": 33,
+            "affiliate_info_id": "a1",
+            "affiliate_info": {"affiliate_link": None, "affiliation_id": None},
+        }
+
+        assert needed_enrichment_tiers(_CARD, saved) == (ENRICHMENT_TIER_AFFILIATE,)
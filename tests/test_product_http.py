@@ -0,0 +1,118 @@
+"""Testes da leitura de páginas de produto por HTTP, com fixtures servidas localmente."""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import sys
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from adapters.external.product_http import (
+    close_http_client,
+    fetch_product_page,
+    parse_product_html,
+)
+from adapters.external.product_page import resolve_prices
+from shared.config.settings import MLConfig
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "product_pages"
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *_args) -> None:
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    """Servidor HTTP local com as páginas salvas."""
+    handler = functools.partial(_QuietHandler, directory=str(FIXTURES_DIR))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class TestFetchProductPage:
+    """Testes para fetch_product_page + resolve_prices."""
+
+    @pytest.mark.asyncio
+    async def test_reads_previous_price_and_discount(self, base_url):
+        """Testa os seletores de preço antigo e desconto no HTML do servidor."""
+        try:
+            data = await fetch_product_page(
+                f"{base_url}/with_previous_price.html", MLConfig.from_env()
+            )
+        finally:
+            await close_http_client()
+
+        assert data["old_fraction"] == "129"
+        assert data["old_cents"] == "90"
+        assert data["discount_text"] == "40% OFF"
+        assert data["structured_price"] == 77.9
+        assert resolve_prices(data, 7790) == (12990, 40)
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_embedded_state(self, base_url):
+        """Testa o preço original do estado embutido sem seletores de preço antigo."""
+        try:
+            data = await fetch_product_page(
+                f"{base_url}/structured_only.html", MLConfig.from_env()
+            )
+            missing = await fetch_product_page(f"{base_url}/missing.html", MLConfig.from_env())
+        finally:
+            await close_http_client()
+
+        assert data["old_fraction"] == ""
+        assert (data["structured_price"], data["structured_original_price"]) == (150.0, 300.0)
+        assert resolve_prices(data, 15000) == (30000, 50)
+        assert missing is None
+
+
+_NESTED_HTML = """
+<div class="price">
+  <section><span class="value">10</span></section>
+  <span class="value">20</span>
+</div>
+<p class="off">30% OFF</p>
+"""
+
+
+def _parse(**selectors):
+    return parse_product_html(
+        _NESTED_HTML, dataclasses.replace(MLConfig.from_env(), **selectors)
+    )
+
+
+class TestParseProductHtml:
+    """Testes para os seletores CSS aceitos por parse_product_html."""
+
+    def test_child_combinator_skips_deeper_descendants(self):
+        """Testa que ``>`` só casa com o filho direto."""
+        assert _parse(old_fraction_selector="div.price > span.value")["old_fraction"] == "20"
+        assert _parse(old_fraction_selector="div.price span.value")["old_fraction"] == "10"
+        assert _parse(old_fraction_selector="div>section>span")["old_fraction"] == "10"
+
+    def test_selector_list_matches_any_alternative(self):
+        """Testa que ``a, b`` casa com o primeiro elemento de qualquer alternativa."""
+        data = _parse(discount_selector="span.discount, p.off")
+        assert data["discount_text"] == "30% OFF"
+
+    @pytest.mark.parametrize(
+        "selector",
+        ["span:nth-child(2)", "#price", "div + span", "span[data-x]", "div.price >"],
+    )
+    def test_unsupported_selector_defers_to_browser(self, selector):
+        """Testa que CSS fora do subconjunto não é lido por HTTP (None: navegador)."""
+        assert _parse(old_cents_selector=selector) is None
@@ -0,0 +1,41 @@
+"""Testes para a interpretação dos dados da página de produto."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from adapters.external.product_page import _empty_page_data, resolve_prices
+
+
+def _data(**values):
+    data = _empty_page_data()
+    data.update(values)
+    return data
+
+
+class TestResolvePrices:
+    """Testes para resolve_prices."""
+
+    def test_selectors_take_precedence(self):
+        """Testa que fração/centavos e texto de desconto vêm primeiro."""
+        data = _data(
+            old_fraction="1.299",
+            old_cents="90",
+            discount_text="40% OFF",
+            structured_original_price=2000.0,
+        )
+        assert resolve_prices(data, 77990) == (129990, 40)
+
+    def test_falls_back_to_structured_state(self):
+        """Testa o preço do estado embutido e o desconto calculado."""
+        data = _data(structured_price=50.0, structured_original_price=100.0)
+        assert resolve_prices(data, 5000) == (10000, 50)
+
+    def test_ignores_structured_price_not_above_current(self):
+        """Testa que um preço original <= atual não é usado."""
+        data = _data(structured_original_price=50.0)
+        assert resolve_prices(data, 5000) == (None, None)
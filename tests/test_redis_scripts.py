@@ -0,0 +1,245 @@
+"""Testes dos scripts Lua de estado compartilhado contra um Redis real.
+
+Requer TEST_REDIS_URL (ex.: redis://localhost:6379/15). Cada teste usa um prefixo
+de chaves próprio, removido ao final.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from shared.utils.rate_limiter import (
+    AdaptivePacer,
+    CircuitBreakerConfig,
+    CircuitBreakerError,
+    CircuitState,
+    RedisCircuitBreaker,
+    RedisRateLimiter,
+)
+
+TEST_REDIS_URL = os.getenv("TEST_REDIS_URL", "")
+
+pytestmark = [
+    pytest.mark.requires_redis,
+    pytest.mark.skipif(not TEST_REDIS_URL, reason="TEST_REDIS_URL não definido"),
+]
+
+
+@pytest.fixture
+def redis_conn():
+    """Conexão com o Redis de teste."""
+    redis = pytest.importorskip("redis")
+    conn = redis.from_url(TEST_REDIS_URL)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def key_prefix(redis_conn):
+    """Prefixo de chaves exclusivo do teste."""
+    prefix = f"test:{uuid.uuid4().hex[:8]}"
+    yield prefix
+    keys = list(redis_conn.scan_iter(f"{prefix}:*"))
+    if keys:
+        redis_conn.delete(*keys)
+
+
+def _limiter(redis_conn, key_prefix: str, burst: int = 1) -> RedisRateLimiter:
+    # 60 requisições em 6s: uma a cada 100ms
+    return RedisRateLimiter(
+        redis_conn,
+        max_requests=60,
+        time_window=timedelta(seconds=6),
+        name="ml",
+        burst=burst,
+        key_prefix=key_prefix,
+    )
+
+
+class TestGcraScript:
+    """Testes do _GCRA_LUA com dois limiters na mesma chave."""
+
+    def test_two_limiters_share_spacing(self, redis_conn, key_prefix):
+        """Testa que dois processos na mesma chave se espaçam pelo intervalo."""
+        first = _limiter(redis_conn, key_prefix)
+        second = _limiter(redis_conn, key_prefix)
+
+        assert first._reserve() == 0
+        assert 50 < second._reserve() <= 100
+        assert 150 < first._reserve() <= 200
+
+    def test_burst_releases_requests_at_once(self, redis_conn, key_prefix):
+        """Testa que o burst libera requisições sem espera antes de espaçar."""
+        first = _limiter(redis_conn, key_prefix, burst=2)
+        second = _limiter(redis_conn, key_prefix, burst=2)
+
+        assert first._reserve() == 0
+        assert second._reserve() == 0
+        assert 50 < first._reserve() <= 100
+
+    def test_refuses_without_reserving_when_wait_exceeds_max_wait(
+        self, redis_conn, key_prefix
+    ):
+        """Testa que a espera acima de max_wait é recusada sem consumir o orçamento."""
+        first = _limiter(redis_conn, key_prefix)
+        second = _limiter(redis_conn, key_prefix)
+
+        assert first._reserve() == 0
+        assert first._reserve() > 0
+        assert second._reserve(max_wait_ms=50) == -1
+        assert second.try_acquire() is False
+        # As recusas não empurraram o próximo horário livre
+        assert 150 < second._reserve() <= 200
+
+    @pytest.mark.asyncio
+    async def test_acquire_with_short_timeout_returns_false(
+        self, redis_conn, key_prefix
+    ):
+        """Testa que acquire com timeout menor que a espera retorna False."""
+        first = _limiter(redis_conn, key_prefix)
+        second = _limiter(redis_conn, key_prefix)
+
+        assert await first.acquire() is True
+        assert await second.acquire(timeout=0.01) is False
+        assert await second.acquire(timeout=1) is True
+
+
+    def test_pacers_stay_under_nominal_budget(self, redis_conn, key_prefix):
+        """Testa que sequências de sucesso nos dois pacers não aceleram o orçamento."""
+        first = _limiter(redis_conn, key_prefix)
+        second = _limiter(redis_conn, key_prefix)
+        pacers = [AdaptivePacer(first), AdaptivePacer(second)]
+        for _ in range(200):
+            for pacer in pacers:
+                pacer.record_response(200, 0.5)
+
+        waits = [(first, second)[i % 2]._reserve() for i in range(10)]
+
+        # 10 requisições ocupam pelo menos 9 intervalos nominais de 100ms
+        assert waits[-1] > 850
+
+
+def _breaker(redis_conn, key_prefix: str) -> RedisCircuitBreaker:
+    return RedisCircuitBreaker(
+        redis_conn,
+        CircuitBreakerConfig(
+            failure_threshold=2,
+            success_threshold=2,
+            timeout=timedelta(milliseconds=200),
+            half_open_max_calls=1,
+        ),
+        name="ml",
+        key_prefix=key_prefix,
+    )
+
+
+async def _fail() -> None:
+    raise RuntimeError("falha")
+
+
+async def _succeed() -> str:
+    return "ok"
+
+
+class TestCircuitScript:
+    """Testes do _CIRCUIT_LUA com dois breakers na mesma chave."""
+
+    async def _open(self, breaker: RedisCircuitBreaker) -> None:
+        for _ in range(breaker.config.failure_threshold):
+            with pytest.raises(RuntimeError):
+                await breaker.call(_fail)
+
+    @pytest.mark.asyncio
+    async def test_failures_in_one_instance_open_both(self, redis_conn, key_prefix):
+        """Testa que as falhas de um processo abrem o circuito para o outro."""
+        first = _breaker(redis_conn, key_prefix)
+        second = _breaker(redis_conn, key_prefix)
+
+        await self._open(first)
+
+        assert first.state == CircuitState.OPEN
+        with pytest.raises(CircuitBreakerError):
+            await second.call(_succeed)
+        assert second.state == CircuitState.OPEN
+
+    @pytest.mark.asyncio
+    async def test_goes_half_open_after_timeout(self, redis_conn, key_prefix):
+        """Testa que, passado o timeout, a próxima chamada vira teste em HALF_OPEN."""
+        first = _breaker(redis_conn, key_prefix)
+        second = _breaker(redis_conn, key_prefix)
+        await self._open(first)
+
+        await asyncio.sleep(0.25)
+
+        assert await second.call(_succeed) == "ok"
+        assert second.state == CircuitState.HALF_OPEN
+
+    @pytest.mark.asyncio
+    async def test_allows_only_half_open_max_calls_probes(
+        self, redis_conn, key_prefix
+    ):
+        """Testa que só half_open_max_calls testes rodam ao mesmo tempo."""
+        first = _breaker(redis_conn, key_prefix)
+        second = _breaker(redis_conn, key_prefix)
+        await self._open(first)
+        await asyncio.sleep(0.25)
+
+        probe_started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_probe() -> str:
+            probe_started.set()
+            await release.wait()
+            return "ok"
+
+        probe = asyncio.create_task(first.call(slow_probe))
+        await probe_started.wait()
+
+        with pytest.raises(CircuitBreakerError):
+            await second.call(_succeed)
+
+        release.set()
+        assert await probe == "ok"
+        # A vaga voltou: o outro processo pode testar
+        assert await second.call(_succeed) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_closes_after_success_threshold(self, redis_conn, key_prefix):
+        """Testa que success_threshold sucessos em HALF_OPEN fecham o circuito para ambos."""
+        first = _breaker(redis_conn, key_prefix)
+        second = _breaker(redis_conn, key_prefix)
+        await self._open(first)
+        await asyncio.sleep(0.25)
+
+        await first.call(_succeed)
+        assert first.state == CircuitState.HALF_OPEN
+        await second.call(_succeed)
+
+        assert second.state == CircuitState.CLOSED
+        await first.call(_succeed)
+        assert first.state == CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_reopens(self, redis_conn, key_prefix):
+        """Testa que uma falha em HALF_OPEN reabre o circuito para ambos."""
+        first = _breaker(redis_conn, key_prefix)
+        second = _breaker(redis_conn, key_prefix)
+        await self._open(first)
+        await asyncio.sleep(0.25)
+
+        with pytest.raises(RuntimeError):
+            await second.call(_fail)
+
+        assert second.state == CircuitState.OPEN
+        with pytest.raises(CircuitBreakerError):
+            await first.call(_succeed)
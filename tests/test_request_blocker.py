@@ -0,0 +1,88 @@
+"""Testes para o bloqueio de requisições no navegador."""
+
+from __future__ import annotations
+
+import re
+import sys
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from adapters.external import request_blocker
+from adapters.external.request_blocker import RequestBlocker, compile_block_patterns
+from adapters.workers.browser_pool import BrowserPool
+
+
+def _matches(pattern: str, url: str) -> bool:
+    """Aplica um padrão com curinga ``*`` como o Chromium (resto literal)."""
+    regex = ".*".join(re.escape(part) for part in pattern.split("*"))
+    return re.fullmatch(regex, url) is not None
+
+
+def _blocked(url: str) -> bool:
+    return any(_matches(pattern, url) for pattern in compile_block_patterns())
+
+
+class TestCompileBlockPatterns:
+    """Testes para compile_block_patterns."""
+
+    def test_blocks_heavy_resources_and_trackers(self):
+        """Testa que imagens, fontes, CSS e trackers viram padrões de URL."""
+        assert _blocked("https://http2.mlstatic.com/D_NQ_NP_123-O.webp")
+        assert _blocked("https://http2.mlstatic.com/fonts/proxima-nova.woff2?v=3")
+        assert _blocked("https://http2.mlstatic.com/frontend-assets/ui.css")
+        assert _blocked("https://www.googletagmanager.com/gtm.js?id=GTM-1")
+        assert _blocked("https://connect.facebook.net/en_US/fbevents.js")
+
+    def test_allows_pages_scripts_and_api(self):
+        """Testa que páginas, scripts e chamadas de API seguem liberados."""
+        assert not _blocked("https://www.mercadolivre.com.br/afiliados/hub")
+        assert not _blocked("https://http2.mlstatic.com/frontend-assets/app.js")
+        assert not _blocked("https://api.mercadolibre.com/items?ids=MLB123")
+        assert not _blocked("https://www.mercadolivre.com.br/p/MLB-123-cssless")
+
+
+class TestRequestStatsPublishing:
+    """Testes para a publicação periódica das contagens do bloqueio."""
+
+    def _blocker(self, blocked: int, allowed: int, allowed_bytes: int) -> RequestBlocker:
+        blocker = RequestBlocker()
+        for _ in range(blocked):
+            blocker._on_loading_failed({"blockedReason": "inspector", "type": "Image"})
+        for _ in range(allowed):
+            blocker._on_loading_finished({"encodedDataLength": allowed_bytes // allowed})
+        return blocker
+
+    def test_pool_publishes_totals_and_resets(self, monkeypatch):
+        """Testa que o pool soma os contextos, publica uma vez e zera as contagens."""
+        published = []
+        monkeypatch.setattr(
+            request_blocker,
+            "track_browser_requests",
+            lambda *counts: published.append(counts),
+        )
+        pool = BrowserPool(size=2)
+        pool._blockers = [self._blocker(3, 2, 2048), self._blocker(1, 1, 512)]
+
+        pool.flush_request_stats()
+        pool.flush_request_stats()
+
+        assert published == [(4, 3, 0, 2560), (0, 0, 0, 0)]
+        assert all(blocker.stats.blocked == 0 for blocker in pool._blockers)
+
+    def test_log_summary_does_not_double_count(self, monkeypatch):
+        """Testa que as contagens já publicadas não voltam no log_summary."""
+        published = []
+        monkeypatch.setattr(
+            request_blocker,
+            "track_browser_requests",
+            lambda *counts: published.append(counts),
+        )
+        blocker = self._blocker(2, 1, 100)
+
+        blocker.log_summary()
+        blocker._on_loading_finished({"encodedDataLength": 50})
+        blocker.log_summary()
+
+        assert published == [(2, 1, 0, 100), (0, 1, 0, 50)]
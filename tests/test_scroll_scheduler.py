@@ -0,0 +1,120 @@
+"""Testes para o agendador de scroll e seus tempos aprendidos."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from adapters.external.scroll_scheduler import (
+    ScrollScheduler,
+    ScrollTimings,
+    percentile,
+)
+from shared.constants import SCROLL_TIMINGS_MAX_SAMPLES, SCROLL_WAIT_MIN_MS
+
+
+class TestPercentile:
+    """Testes para percentile."""
+
+    def test_percentile_interpolation(self):
+        """Testa percentis com interpolação linear."""
+        values = [400.0, 100.0, 300.0, 200.0, 500.0]
+        assert percentile(values, 50) == 300.0
+        assert percentile(values, 95) == 480.0
+        assert percentile(values, 100) == 500.0
+        assert percentile([], 95) is None
+
+
+class TestScrollTimings:
+    """Testes para ScrollTimings."""
+
+    def test_budget_uses_learned_p95(self):
+        """Testa que o limite vem do p95 aprendido, dentro dos limites."""
+        timings = ScrollTimings()
+        assert timings.budget_ms(fallback_ms=3000) == 3000
+
+        for value in (100, 120, 140, 160, 200):
+            timings.record(value)
+        assert timings.budget_ms(fallback_ms=3000) == max(SCROLL_WAIT_MIN_MS, 288)
+
+        timings.record(10_000)
+        assert timings.budget_ms(fallback_ms=3000) == 3000
+
+    def test_save_and_load_roundtrip(self, tmp_path):
+        """Testa persistência da janela de amostras entre execuções."""
+        path = tmp_path / "scroll_timings.json"
+        timings = ScrollTimings()
+        for value in range(SCROLL_TIMINGS_MAX_SAMPLES + 10):
+            timings.record(float(value))
+        timings.save(path)
+
+        loaded = ScrollTimings.load(path)
+        assert len(loaded.samples_ms) == SCROLL_TIMINGS_MAX_SAMPLES
+        assert loaded.samples_ms[-1] == float(SCROLL_TIMINGS_MAX_SAMPLES + 9)
+        assert loaded.run_samples_ms == []
+
+        path.write_text("{not json", encoding="utf-8")
+        assert ScrollTimings.load(path).samples_ms == []
+
+
+class _Handle:
+    def __init__(self, value) -> None:
+        self.value = value
+
+    async def json_value(self):
+        return self.value
+
+
+class _FakePage:
+    """Página cujos cards crescem para ``grown_count`` após ``growth_delay_s``."""
+
+    def __init__(self, grown_count: int, growth_delay_s: float | None) -> None:
+        self.grown_count = grown_count
+        self.growth_delay_s = growth_delay_s
+
+    def on(self, _event, _handler) -> None:
+        pass
+
+    async def wait_for_function(self, _js, arg, timeout):
+        if self.growth_delay_s is None or self.growth_delay_s * 1000 > timeout:
+            await asyncio.sleep(timeout / 1000)
+            raise TimeoutError(f"Timeout {timeout}ms exceeded")
+        await asyncio.sleep(self.growth_delay_s)
+        return _Handle(self.grown_count)
+
+
+class _Request:
+    resource_type = "xhr"
+
+
+class TestScrollSchedulerWaitForGrowth:
+    """Testes para ScrollScheduler.wait_for_growth."""
+
+    def _scheduler(self, page: _FakePage) -> ScrollScheduler:
+        return ScrollScheduler(page, "div.card", ScrollTimings(), fallback_ms=3000)
+
+    @pytest.mark.asyncio
+    async def test_returns_new_count_when_cards_grow(self):
+        """Testa que o crescimento encerra a espera com o novo número de cards."""
+        scheduler = self._scheduler(_FakePage(grown_count=30, growth_delay_s=0.0))
+        # Requisição pendente: a rede não fica ociosa antes dos cards
+        scheduler._on_request(_Request())
+
+        assert await scheduler.wait_for_growth(20, timeout_ms=2000) == 30
+        assert scheduler.timings.samples_ms == []
+
+    @pytest.mark.asyncio
+    async def test_idle_network_ends_wait_early(self):
+        """Testa que, sem requisições pendentes, a espera acaba sem ir até o limite."""
+        scheduler = self._scheduler(_FakePage(grown_count=30, growth_delay_s=None))
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        assert await scheduler.wait_for_growth(20, timeout_ms=5000) == 20
+        assert loop.time() - started < 1.0
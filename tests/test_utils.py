@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import pytest
 
+import math
 import sys
 from pathlib import Path
 
@@ -81,13 +82,165 @@ class TestRateLimiter:
 
         limiter = RateLimiter(max_requests=2, time_window=timedelta(seconds=1))
 
-        # Primeira requisição deve passar
-        await limiter.acquire()
-        assert len(limiter.requests) == 1
+        # As duas primeiras requisições usam o balde cheio, sem esperar
+        assert await limiter.acquire() is True
+        assert await limiter.acquire() is True
+        assert limiter.tokens < 1
 
-        # Segunda requisição deve passar
-        await limiter.acquire()
-        assert len(limiter.requests) == 2
+        # Sem token livre: try_acquire não espera e acquire respeita o timeout
+        assert limiter.try_acquire() is False
+        assert await limiter.acquire(timeout=0.01) is False
+
+    @pytest.mark.asyncio
+    async def test_rate_limiter_wakes_waiters_in_fifo_order(self):
+        """Testa que centenas de corrotinas são atendidas na ordem de chegada."""
+        import asyncio
+        from datetime import timedelta
+        from shared.utils.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(
+            max_requests=2000, time_window=timedelta(seconds=1), burst=1
+        )
+        order: list[int] = []
+
+        async def waiter(index: int) -> None:
+            await limiter.acquire()
+            order.append(index)
+
+        await asyncio.gather(*(waiter(i) for i in range(300)))
+
+        assert order == list(range(300))
+
+    @pytest.mark.asyncio
+    async def test_shared_limiter_falls_back_to_local_window(self):
+        """Testa que, sem Redis, o orçamento compartilhado usa o balde local."""
+        from shared.utils.rate_limiter import (
+            RedisRateLimiter,
+            configure_shared_rate_limits,
+            get_rate_limiter,
+        )
+
+        class _DownRedis:
+            def register_script(self, _script):
+                def run(**_kwargs):
+                    raise ConnectionError("redis fora do ar")
+
+                return run
+
+        configure_shared_rate_limits(_DownRedis())
+        try:
+            limiter = get_rate_limiter("ml_test_budget", 5)
+            assert isinstance(limiter, RedisRateLimiter)
+            assert limiter.interval_ms == 12000
+
+            assert await limiter.acquire() is True
+            assert limiter.tokens == limiter.capacity - 1
+        finally:
+            configure_shared_rate_limits(None)
+
+
+class TestAdaptivePacer:
+    """Testes para o ritmo adaptativo (AIMD)."""
+
+    def _pacer(self, **config):
+        from datetime import timedelta
+        from shared.utils.rate_limiter import (
+            AdaptivePacer,
+            AdaptivePacingConfig,
+            RateLimiter,
+        )
+
+        limiter = RateLimiter(max_requests=10, time_window=timedelta(minutes=1))
+        return AdaptivePacer(limiter, AdaptivePacingConfig(**config))
+
+    def test_fast_responses_raise_rate_up_to_ceiling(self):
+        """Testa o aumento aditivo com respostas rápidas, limitado ao teto."""
+        pacer = self._pacer(max_factor=2.0)
+
+        # Um minuto de respostas (10) soma 10% do nominal
+        for _ in range(10):
+            pacer.record_response(200, 0.5)
+        assert pacer.rate_per_min == pytest.approx(11.0, abs=0.1)
+        assert pacer.limiter.rate == pytest.approx(pacer.rate_per_min / 60)
+
+        for _ in range(500):
+            pacer.record_response(200, 0.5)
+        assert pacer.rate_per_min == 20.0
+
+    def test_throttling_halves_rate_once_per_cooldown(self):
+        """Testa que 429 e captcha cortam o ritmo pela metade, com cooldown."""
+        pacer = self._pacer(decrease_cooldown_s=60.0)
+
+        pacer.record_response(429, 0.5)
+        pacer.record_response(200, 0.5, blocked=True)
+        assert pacer.rate_per_min == pytest.approx(5.0)
+
+        pacer._last_decrease -= 60.0
+        pacer.record_timeout()
+        assert pacer.rate_per_min == pytest.approx(2.5)
+
+        # 404 é erro da página, não sinal de ritmo
+        pacer.record_response(404, 0.5)
+        assert pacer.rate_per_min == pytest.approx(2.5)
+
+    def test_latency_spike_reduces_rate(self):
+        """Testa que uma latência muito acima da média reduz o ritmo."""
+        pacer = self._pacer(increase_fraction=0.0, min_factor=0.5)
+        for _ in range(10):
+            pacer.record_response(200, 1.0)
+
+        pacer.record_response(200, 5.0)
+        assert pacer.rate_per_min == pytest.approx(5.0)
+
+        # Já está no piso (0.5 × nominal)
+        pacer._last_decrease -= 60.0
+        pacer.record_response(429, 1.0)
+        assert pacer.rate_per_min == pytest.approx(5.0)
+
+
+    def test_shared_limiters_never_pace_above_nominal(self):
+        """Testa que dois limiters na mesma chave não passam do nominal somados."""
+        from datetime import timedelta
+        from shared.utils.rate_limiter import AdaptivePacer, RedisRateLimiter
+
+        redis = _FakeGcraRedis()
+        limiters = [
+            RedisRateLimiter(redis, max_requests=60, time_window=timedelta(minutes=1))
+            for _ in range(2)
+        ]
+        pacers = [AdaptivePacer(limiter) for limiter in limiters]
+        for _ in range(200):
+            for pacer in pacers:
+                pacer.record_response(200, 0.5)
+
+        assert all(limiter.interval_ms == 1000 for limiter in limiters)
+        # 20 reservas alternadas no mesmo instante: a última espera 19 intervalos
+        waits = [limiters[i % 2]._reserve() for i in range(20)]
+        assert waits[-1] >= 19 * 1000
+
+        # O corte continua valendo: o ritmo cai abaixo do nominal
+        pacers[0].record_response(429, 0.5)
+        assert limiters[0].interval_ms == 2000
+
+
+class _FakeGcraRedis:
+    """Redis em memória com o GCRA do _GCRA_LUA e o relógio parado."""
+
+    def __init__(self) -> None:
+        self.tat: dict[str, float] = {}
+        self.now_ms = 0.0
+
+    def register_script(self, _source):
+        def gcra(keys, args):
+            interval, tolerance, max_wait = (float(arg) for arg in args)
+            tat = max(self.tat.get(keys[0], self.now_ms), self.now_ms)
+            wait = max(0.0, tat - tolerance - self.now_ms)
+            if max_wait >= 0 and wait > max_wait:
+                return -1
+            self.tat[keys[0]] = tat + interval
+            return math.ceil(wait)
+
+        return gcra
 
 
 class TestCircuitBreaker:
@@ -114,3 +267,120 @@ class TestCircuitBreaker:
 
         # Circuit deve estar aberto
         assert breaker.state == CircuitState.OPEN
+
+    @pytest.mark.asyncio
+    async def test_state_changes_update_gauge_and_listeners(self):
+        """Testa que as mudanças de estado avisam os ouvintes e o gauge."""
+        from datetime import timedelta
+        from prometheus_client import REGISTRY
+        from shared.utils.rate_limiter import CircuitBreaker, CircuitBreakerConfig, CircuitState
+
+        breaker = CircuitBreaker(
+            config=CircuitBreakerConfig(
+                failure_threshold=1, success_threshold=2, timeout=timedelta(0)
+            ),
+            name="test_gauge_breaker",
+        )
+        changes = []
+        breaker.add_state_listener(lambda _b, old, new: changes.append((old, new)))
+
+        def gauge():
+            return REGISTRY.get_sample_value(
+                "dealhunter_circuit_breaker_state",
+                {"breaker_name": "test_gauge_breaker"},
+            )
+
+        assert gauge() == 0
+        with pytest.raises(ZeroDivisionError):
+            await breaker.call(lambda: 1 / 0)
+        assert gauge() == 1
+
+        # Com a vaga de teste liberada a cada sucesso, dois testes fecham o circuito
+        assert await breaker.call(lambda: "ok") == "ok"
+        assert gauge() == 2
+        assert await breaker.call(lambda: "ok") == "ok"
+        assert gauge() == 0
+        assert changes == [
+            (CircuitState.CLOSED, CircuitState.OPEN),
+            (CircuitState.OPEN, CircuitState.HALF_OPEN),
+            (CircuitState.HALF_OPEN, CircuitState.CLOSED),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_releases_half_open_slot(self):
+        """Testa que uma chamada de teste cancelada não trava o HALF_OPEN."""
+        import asyncio
+        from datetime import timedelta
+        from shared.utils.rate_limiter import CircuitBreaker, CircuitBreakerConfig, CircuitState
+
+        breaker = CircuitBreaker(
+            config=CircuitBreakerConfig(failure_threshold=1, timeout=timedelta(0))
+        )
+        with pytest.raises(ZeroDivisionError):
+            await breaker.call(lambda: 1 / 0)
+
+        # A chamada de teste é cancelada de fora (ex.: timeout do job)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(breaker.call(asyncio.sleep, 10), timeout=0.01)
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.half_open_calls == 0
+
+        assert await breaker.call(lambda: "ok") == "ok"
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_is_neither_failure_nor_success(self):
+        """Testa que DeadlineExceeded não abre o circuito nem ocupa a vaga de teste."""
+        from datetime import timedelta
+        from shared.utils.deadline import DeadlineExceeded
+        from shared.utils.rate_limiter import CircuitBreaker, CircuitBreakerConfig, CircuitState
+
+        def out_of_budget():
+            raise DeadlineExceeded("orçamento esgotado")
+
+        breaker = CircuitBreaker(
+            config=CircuitBreakerConfig(failure_threshold=1, timeout=timedelta(0))
+        )
+        with pytest.raises(DeadlineExceeded):
+            await breaker.call(out_of_budget)
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.failure_count == 0
+
+        with pytest.raises(ZeroDivisionError):
+            await breaker.call(lambda: 1 / 0)
+        with pytest.raises(DeadlineExceeded):
+            await breaker.call(out_of_budget)
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.half_open_calls == 0
+        assert breaker.success_count == 0
+
+    @pytest.mark.asyncio
+    async def test_shared_breaker_falls_back_to_local_state(self):
+        """Testa que, sem Redis, o breaker compartilhado usa o estado local."""
+        from shared.utils.rate_limiter import (
+            CircuitBreakerError,
+            CircuitState,
+            RedisCircuitBreaker,
+            configure_shared_rate_limits,
+            get_ml_circuit_breaker,
+        )
+
+        class _DownRedis:
+            def register_script(self, _script):
+                def run(**_kwargs):
+                    raise ConnectionError("redis fora do ar")
+
+                return run
+
+        configure_shared_rate_limits(_DownRedis())
+        try:
+            breaker = get_ml_circuit_breaker()
+            assert isinstance(breaker, RedisCircuitBreaker)
+
+            for _ in range(breaker.config.failure_threshold):
+                with pytest.raises(ZeroDivisionError):
+                    await breaker.call(lambda: 1 / 0)
+            assert breaker.state == CircuitState.OPEN
+            with pytest.raises(CircuitBreakerError):
+                await breaker.call(lambda: "ok")
+        finally:
+            configure_shared_rate_limits(None)
@@ -0,0 +1,80 @@
+"""Testes para o runtime de event loop persistente do worker."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from rq.timeouts import JobTimeoutException, TimerDeathPenalty
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from adapters.workers import worker_runtime
+
+
+def _patch_resources(monkeypatch, warmed: list) -> None:
+    async def fake_pool(size):
+        warmed.append(asyncio.get_running_loop())
+
+    async def fake_close():
+        pass
+
+    monkeypatch.setattr(worker_runtime, "init_db", lambda config: None)
+    monkeypatch.setattr(worker_runtime, "get_browser_pool", fake_pool)
+    monkeypatch.setattr(worker_runtime, "close_browser_pool", fake_close)
+    monkeypatch.setattr(worker_runtime, "close_browser_service", fake_close)
+    monkeypatch.setattr(worker_runtime, "close_http_client", fake_close)
+    monkeypatch.setattr(worker_runtime, "configure_rate_limits", lambda config: False)
+
+
+_CONFIG = SimpleNamespace(database=None, enrichment=SimpleNamespace(worker_concurrency=2))
+
+
+class TestWorkerRuntime:
+    """Testes para WorkerRuntime."""
+
+    def test_jobs_share_one_warm_loop(self, monkeypatch):
+        """Testa que o aquecimento roda uma vez e os jobs usam o mesmo loop."""
+        warmed: list[asyncio.AbstractEventLoop] = []
+        _patch_resources(monkeypatch, warmed)
+
+        async def job():
+            await asyncio.sleep(0)
+            return asyncio.get_running_loop()
+
+        runtime = worker_runtime.WorkerRuntime(_CONFIG)
+        runtime.start()
+        try:
+            loops = {runtime.run(job()) for _ in range(3)}
+            assert loops == {runtime.loop}
+            assert warmed == [runtime.loop]
+        finally:
+            runtime.stop()
+        assert not runtime.running
+
+    def test_thread_timeout_cancels_job(self, monkeypatch):
+        """Testa que o timeout por timer (workers em threads) interrompe e cancela o job."""
+        _patch_resources(monkeypatch, [])
+        cancelled = []
+
+        async def slow_job():
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        runtime = worker_runtime.WorkerRuntime(_CONFIG)
+        runtime.start()
+        try:
+            with pytest.raises(JobTimeoutException):
+                with TimerDeathPenalty(1, JobTimeoutException):
+                    runtime.run(slow_job())
+            runtime.run(asyncio.sleep(0.1))
+            assert cancelled == [True]
+        finally:
+            runtime.stop()